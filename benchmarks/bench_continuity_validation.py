@@ -0,0 +1,91 @@
+"""Wall time of ContinuityValidation on regular series with many outages.
+
+Generates a series with ``--interval`` seconds between points, removes
+``--n_gaps`` outages of 1 to ``--max_gap`` points and times the imputation and
+the ablation of the primitive. The row-by-row imputation the primitive used
+before is timed too, up to ``--legacy_max`` points; beyond that it takes hours.
+
+    python benchmarks/bench_continuity_validation.py --n_samples 10000 100000 259200 --n_gaps 2000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from d3m import container
+
+from tods.data_processing.ContinuityValidation import ContinuityValidationPrimitive
+
+
+def _legacy_imputation(inputs, interval):
+    # _continuity_imputation before the vectorized rewrite, kept for comparison
+    time1 = inputs.iloc[0]['timestamp']
+    for i in range(1, inputs.shape[0]):
+        time2 = inputs.iloc[i]['timestamp']
+        if time2 - time1 != interval:
+            blank_number = int((time2 - time1) / interval)
+            for j in range(1, blank_number):
+                row = {'timestamp': [time1 + interval * j], 'ground_truth': [int(inputs.iloc[i]['ground_truth'])]}
+                for col in list(inputs.columns.values):
+                    if not col in ['d3mIndex', 'timestamp', 'ground_truth']:
+                        row[col] = [inputs.iloc[i-1][col] + (inputs.iloc[i][col] - inputs.iloc[i-1][col]) / blank_number * j]
+                inputs = pd.concat([inputs, pd.DataFrame(row)], ignore_index=True, sort=False)
+        time1 = time2
+    inputs.sort_values("timestamp", inplace=True)
+    return inputs
+
+
+def _series(n_samples, n_gaps, max_gap, interval, random_state):
+    keep = np.ones(n_samples, dtype=bool)
+    for start, length in zip(random_state.randint(1, n_samples - max_gap - 1, n_gaps),
+                             random_state.randint(1, max_gap + 1, n_gaps)):
+        keep[start:start + length] = False
+    n_kept = int(keep.sum())
+    return container.DataFrame({
+        'd3mIndex': np.arange(n_kept),
+        'timestamp': (np.arange(n_samples) * interval)[keep],
+        'value_0': random_state.rand(n_kept),
+        'value_1': random_state.rand(n_kept),
+        'ground_truth': random_state.randint(0, 2, n_kept),
+    }, columns=['d3mIndex', 'timestamp', 'value_0', 'value_1', 'ground_truth'], generate_metadata=True)
+
+
+def _time(inputs, continuity_option, interval):
+    hyperparams = ContinuityValidationPrimitive.metadata.get_hyperparams().defaults().replace({
+        'continuity_option': continuity_option, 'interval': interval,
+    })
+    primitive = ContinuityValidationPrimitive(hyperparams=hyperparams)
+    start = time.perf_counter()
+    outputs = primitive.produce(inputs=inputs).value
+    return time.perf_counter() - start, outputs.shape[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ContinuityValidation.')
+    parser.add_argument('--n_samples', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--n_gaps', type=int, default=2000)
+    parser.add_argument('--max_gap', type=int, default=30)
+    parser.add_argument('--interval', type=float, default=10.)
+    parser.add_argument('--legacy_max', type=int, default=10000)
+    args = parser.parse_args()
+
+    random_state = np.random.RandomState(0)
+    print('{:>10} {:>8} {:>14} {:>14} {:>14}'.format('n_samples', 'n_rows', 'imputation (s)', 'ablation (s)',
+                                                     'legacy (s)'))
+    for n_samples in args.n_samples:
+        inputs = _series(n_samples, min(args.n_gaps, n_samples // (4 * args.max_gap)), args.max_gap,
+                         args.interval, random_state)
+        imputation, _ = _time(inputs, 'imputation', args.interval)
+        ablation, _ = _time(inputs, 'ablation', args.interval)
+        legacy = float('nan')
+        if n_samples <= args.legacy_max:
+            start = time.perf_counter()
+            _legacy_imputation(pd.DataFrame(inputs), args.interval)
+            legacy = time.perf_counter() - start
+        print('{:>10} {:>8} {:>14.3f} {:>14.3f} {:>14.3f}'.format(n_samples, inputs.shape[0], imputation,
+                                                                  ablation, legacy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Start-up time and memory of `import tods`.
+
+Each scenario runs in a fresh interpreter, which reports the time its
+statements took and its peak RSS:
+
+- ``import tods``: the primitives are not imported
+- ``one primitive``: ``import tods`` and the first use of ``--primitive``
+- ``eager``: ``import tods`` and every primitive and estimator, which is what
+  ``import tods`` did before the primitives were loaded lazily
+
+    python benchmarks/bench_import.py --repeat 5 --primitive HBOSPrimitive
+"""
+import argparse
+import subprocess
+import sys
+
+_CHILD = '''
+import resource, time
+start = time.perf_counter()
+{statements}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def _run(statements, repeat):
+    timings, rss = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _CHILD.format(statements=statements)], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        timings.append(float(output[-2]))
+        rss.append(int(output[-1]))
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return min(timings), max(rss) / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the start-up of the tods package.')
+    parser.add_argument('--primitive', default='HBOSPrimitive')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios = [
+        ('import tods', 'import tods'),
+        ('one primitive', 'import tods\ntods.{}'.format(args.primitive)),
+        ('eager', 'import tods\nfor name in tods.__all__: getattr(tods, name)'),
+    ]
+
+    print('{:>15} {:>10} {:>10}'.format('scenario', 'time (s)', 'RSS (MB)'))
+    for name, statements in scenarios:
+        elapsed, rss = _run(statements, args.repeat)
+        print('{:>15} {:>10.3f} {:>10.1f}'.format(name, elapsed, rss))
+
+
+if __name__ == '__main__':
+    main()
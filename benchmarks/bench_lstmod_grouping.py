@@ -0,0 +1,94 @@
+"""Wall time of the attack-window grouping of LSTMOutlierDetector.decision_function.
+
+Compares the per-window Python loops the detector used before with the
+vectorized ``_group_attack_windows`` on synthetic relative errors. The loops
+are only timed up to ``--legacy_max`` points, beyond that they take minutes.
+
+    python benchmarks/bench_lstmod_grouping.py --n_samples 100000 1000000 10000000 --min_attack_time 5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tods.detection_algorithm.core.LSTMOD import _group_attack_windows
+
+
+def _legacy_group_attack_windows(relative_error, error_num_buf, min_attack_time, diff_group_method):
+    # decision_function before the vectorized rewrite, kept for comparison
+    relative_error_left_inds = np.ones((len(relative_error), )) * len(relative_error)
+    relative_error_right_inds = np.zeros((len(relative_error), ))
+    danger_coefficient = np.zeros(relative_error.shape)
+    averaged_relative_error = np.zeros(relative_error.shape)
+
+    if diff_group_method == 'average':
+        calculated_times = np.zeros(relative_error.shape)
+        for i in range(len(relative_error) - min_attack_time + 1):
+            dc_tmp = error_num_buf[i:i+min_attack_time].sum() / min_attack_time
+            are_tmp = relative_error[i:i+min_attack_time].sum() / min_attack_time
+            for j in range(min_attack_time):
+                averaged_relative_error[i + j] += are_tmp
+                danger_coefficient[i + j] += dc_tmp
+                calculated_times[i + j] += 1
+                relative_error_left_inds[i + j] = i if i < relative_error_left_inds[i + j] else relative_error_left_inds[i + j]
+                relative_error_right_inds[i + j] = i+min_attack_time if i+min_attack_time > relative_error_right_inds[i + j] else relative_error_left_inds[i + j]
+        danger_coefficient /= calculated_times
+        averaged_relative_error /= calculated_times
+        return danger_coefficient, averaged_relative_error, relative_error_left_inds, relative_error_right_inds
+
+    if diff_group_method == 'min':
+        danger_coefficient += float('inf')
+        averaged_relative_error += float('inf')
+    for i in range(len(relative_error) - min_attack_time + 1):
+        dc_tmp = error_num_buf[i:i+min_attack_time].sum() / min_attack_time
+        are_tmp = relative_error[i:i+min_attack_time].sum() / min_attack_time
+        for j in range(min_attack_time):
+            if diff_group_method == 'max':
+                better_are, better_dc = are_tmp > averaged_relative_error[i + j], dc_tmp > danger_coefficient[i + j]
+            else:
+                better_are, better_dc = are_tmp < averaged_relative_error[i + j], dc_tmp < danger_coefficient[i + j]
+            if better_are or better_dc:
+                relative_error_left_inds[i + j] = i
+                relative_error_right_inds[i + j] = i+min_attack_time
+            if better_are:
+                averaged_relative_error[i + j] = are_tmp
+            if better_dc:
+                danger_coefficient[i + j] = dc_tmp
+    return danger_coefficient, averaged_relative_error, relative_error_left_inds, relative_error_right_inds
+
+
+VARIANTS = {
+    'legacy': _legacy_group_attack_windows,
+    'vectorized': _group_attack_windows,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the LSTMOD attack-window grouping.')
+    parser.add_argument('--n_samples', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--min_attack_time', type=int, default=5)
+    parser.add_argument('--methods', nargs='+', default=['average', 'max', 'min'])
+    parser.add_argument('--legacy_max', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print('min_attack_time={}'.format(args.min_attack_time))
+    print('{:>10} {:>8} {:>12} {:>10} {:>10}'.format('n_samples', 'method', 'variant', 'time (s)', 'identical'))
+    for n_samples in args.n_samples:
+        random_state = np.random.RandomState(0)
+        relative_error = random_state.exponential(size=n_samples)
+        error_num_buf = (relative_error > np.percentile(relative_error, 90)).astype(int)
+        for method in args.methods:
+            outputs = {}
+            for variant, function in VARIANTS.items():
+                if variant == 'legacy' and n_samples > args.legacy_max:
+                    continue
+                start = time.perf_counter()
+                outputs[variant] = function(relative_error, error_num_buf, args.min_attack_time, method)
+                elapsed = time.perf_counter() - start
+                identical = '' if variant == 'legacy' or 'legacy' not in outputs else \
+                    all(np.array_equal(a, b) for a, b in zip(outputs[variant], outputs['legacy']))
+                print('{:>10} {:>8} {:>12} {:>10.3f} {:>10}'.format(n_samples, method, variant, elapsed, str(identical)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Wall time of the sk_interface detectors with and without the ndarray fast path.
+
+The slow path wraps every system into a d3m DataFrame and generates its
+metadata before each fit and produce; the fast path hands the ndarrays to the
+detector directly. Each path is also timed with the systems spread over
+``--n_jobs`` workers.
+
+    python benchmarks/bench_ski_fast_path.py --detector KNN --n_systems 8 --n_samples 5000 --n_jobs 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tods.sk_interface.detection_algorithm.KNN_skinterface import KNNSKI
+from tods.sk_interface.detection_algorithm.IsolationForest_skinterface import IsolationForestSKI
+from tods.sk_interface.detection_algorithm.AutoRegODetector_skinterface import AutoRegODetectorSKI
+
+DETECTORS = {
+    'KNN': KNNSKI,
+    'IsolationForest': IsolationForestSKI,
+    'AutoRegODetector': AutoRegODetectorSKI,
+}
+
+
+def _time(detector, X_train, X_test, n_systems, repeat, **kwargs):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transformer = DETECTORS[detector](system_num=n_systems, **kwargs)
+        transformer.fit(X_train if n_systems > 1 else X_train[0])
+        transformer.predict_score(X_test if n_systems > 1 else X_test[0])
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the BaseSKI fast path.')
+    parser.add_argument('--detector', choices=list(DETECTORS), default='KNN')
+    parser.add_argument('--n_systems', type=int, default=4)
+    parser.add_argument('--n_samples', type=int, default=2000)
+    parser.add_argument('--n_features', type=int, default=3)
+    parser.add_argument('--n_jobs', type=int, default=-1)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    random_state = np.random.RandomState(0)
+    X_train = [random_state.rand(args.n_samples, args.n_features) for _ in range(args.n_systems)]
+    X_test = [random_state.rand(args.n_samples, args.n_features) for _ in range(args.n_systems)]
+
+    print('detector={} n_systems={} n_samples={} n_features={} executor={}'.format(
+        args.detector, args.n_systems, args.n_samples, args.n_features, args.executor))
+    print('{:>10} {:>8} {:>10} {:>8}'.format('path', 'n_jobs', 'time (s)', 'speedup'))
+    baseline = None
+    for fast_path in [False, True]:
+        for n_jobs in [1, args.n_jobs]:
+            elapsed = _time(args.detector, X_train, X_test, args.n_systems, args.repeat,
+                            fast_path=fast_path, n_jobs=n_jobs, executor=args.executor)
+            baseline = baseline or elapsed
+            print('{:>10} {:>8} {:>10.3f} {:>8.2f}'.format(
+                'fast' if fast_path else 'd3m', n_jobs, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
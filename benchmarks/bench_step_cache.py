@@ -0,0 +1,66 @@
+"""Wall time of refitting and rescoring the sk_interface detectors with the step cache.
+
+Each detector is fitted and scored on the same systems ``--repeat`` times,
+as a tuning loop re-running a configuration does: without a cache, with an
+empty cache directory (every step is computed and stored), and with the
+cache directory left by the previous run (every step is read back).
+
+    python benchmarks/bench_step_cache.py --detector KNN --n_systems 4 --n_samples 5000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from tods.sk_interface.detection_algorithm.KNN_skinterface import KNNSKI
+from tods.sk_interface.detection_algorithm.IsolationForest_skinterface import IsolationForestSKI
+from tods.sk_interface.detection_algorithm.AutoRegODetector_skinterface import AutoRegODetectorSKI
+
+DETECTORS = {
+    'KNN': KNNSKI,
+    'IsolationForest': IsolationForestSKI,
+    'AutoRegODetector': AutoRegODetectorSKI,
+}
+
+
+def _run(detector, X_train, X_test, **kwargs):
+    start = time.perf_counter()
+    transformer = DETECTORS[detector](system_num=len(X_train), **kwargs)
+    transformer.fit(X_train if len(X_train) > 1 else X_train[0])
+    transformer.predict_score(X_test if len(X_test) > 1 else X_test[0])
+    return time.perf_counter() - start, transformer.step_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the BaseSKI step cache.')
+    parser.add_argument('--detector', choices=list(DETECTORS), default='KNN')
+    parser.add_argument('--n_systems', type=int, default=4)
+    parser.add_argument('--n_samples', type=int, default=2000)
+    parser.add_argument('--n_features', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    random_state = np.random.RandomState(0)
+    X_train = [random_state.rand(args.n_samples, args.n_features) for _ in range(args.n_systems)]
+    X_test = [random_state.rand(args.n_samples, args.n_features) for _ in range(args.n_systems)]
+
+    print('detector={} n_systems={} n_samples={} n_features={}'.format(
+        args.detector, args.n_systems, args.n_samples, args.n_features))
+    print('{:>10} {:>10} {:>6} {:>6} {:>8}'.format('cache', 'time (s)', 'hits', 'misses', 'speedup'))
+
+    baseline = min(_run(args.detector, X_train, X_test)[0] for _ in range(args.repeat))
+    print('{:>10} {:>10.3f} {:>6} {:>6} {:>8.2f}'.format('none', baseline, '', '', 1.))
+
+    cold, warm = [], []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(_run(args.detector, X_train, X_test, cache_dir=cache_dir))
+            warm.append(_run(args.detector, X_train, X_test, cache_dir=cache_dir))
+    for name, runs in [('cold', cold), ('warm', warm)]:
+        elapsed, cache = min(runs, key=lambda run: run[0])
+        print('{:>10} {:>10.3f} {:>6} {:>6} {:>8.2f}'.format(name, elapsed, cache.hits, cache.misses, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Peak memory of the windowing engine used by the collective detectors.
+
+Each variant runs in a fresh process so that ``ru_maxrss`` reports the peak
+resident set size of that variant only.
+
+    python benchmarks/bench_sub_matrices.py --n_samples 1000000 --n_features 3 --window_size 100
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import numpy as np
+
+from tods.detection_algorithm.core.utility import get_sub_matrices, \
+    get_sub_matrices_view, get_sub_sequences_length
+
+
+def _legacy_get_sub_matrices(X, window_size, step=1, flatten_order='F'):
+    # get_sub_matrices before the strided rewrite, kept for comparison
+    X = np.asarray(X).astype(np.float64)
+    n_samples, n_sequences = X.shape[0], X.shape[1]
+    valid_len = get_sub_sequences_length(n_samples, window_size, step)
+
+    X_sub = []
+    X_left_inds = []
+    X_right_inds = []
+    for i in list(range(0, n_samples, step))[:valid_len]:
+        X_sub.append(X[i: i + window_size, :])
+        X_left_inds.append(i)
+        X_right_inds.append(i + window_size)
+    X_sub = np.asarray(X_sub)
+
+    temp_array = np.zeros([valid_len, window_size * n_sequences])
+    for i in range(valid_len):
+        temp_array[i, :] = X_sub[i, :, :].flatten(order=flatten_order)
+    return temp_array, np.asarray(X_left_inds), np.asarray(X_right_inds)
+
+
+VARIANTS = {
+    'legacy': lambda X, w, s: _legacy_get_sub_matrices(X, w, s),
+    'flatten': lambda X, w, s: get_sub_matrices(X, w, s),
+    'view': lambda X, w, s: get_sub_matrices_view(X, w, s),
+}
+
+
+def _run(variant, n_samples, n_features, window_size, step, queue):
+    X = np.random.RandomState(0).rand(n_samples, n_features)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    VARIANTS[variant](X, window_size, step)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, baseline, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark get_sub_matrices.')
+    parser.add_argument('--n_samples', type=int, default=200000)
+    parser.add_argument('--n_features', type=int, default=3)
+    parser.add_argument('--window_size', type=int, default=100)
+    parser.add_argument('--step', type=int, default=1)
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS))
+    args = parser.parse_args()
+
+    print('n_samples={} n_features={} window_size={} step={}'.format(
+        args.n_samples, args.n_features, args.window_size, args.step))
+    print('{:>10} {:>10} {:>16}'.format('variant', 'time (s)', 'peak RSS (MB)'))
+    for variant in args.variants:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_run, args=(
+            variant, args.n_samples, args.n_features, args.window_size,
+            args.step, queue))
+        process.start()
+        elapsed, baseline, peak = queue.get()
+        process.join()
+        # ru_maxrss is reported in kilobytes on Linux
+        print('{:>10} {:>10.3f} {:>16.1f}'.format(
+            variant, elapsed, (peak - baseline) / 1024.))
+
+
+if __name__ == '__main__':
+    main()
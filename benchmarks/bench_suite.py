@@ -0,0 +1,301 @@
+"""Throughput, latency and memory of every primitive, recorded per commit.
+
+Each case fits (when the primitive learns) and produces one primitive on
+synthetic systems from ``generate_3D_data``, through the d3m interface
+(``set_training_data``/``fit``/``produce`` on container DataFrames) or through
+its sk_interface estimator (``fit``/``predict``/``produce`` on ndarrays).
+Cases run one at a time, each in a fresh process, so that the peak RSS of a
+case is not that of the cases before it and a crashing or hanging primitive
+only loses its own case.
+
+The cases are the product of the lengths, feature counts, window sizes and
+system counts given; a primitive without a ``window_size`` hyperparameter
+only runs with the first window size. The primitives of the data_processing
+package get a leading integer ``timestamp`` column, which most of them need.
+
+Every run appends one record to a JSON history, keyed by the current git
+commit, with the wall time, peak RSS and rows per second of every case.
+Two commits of the history are then compared with ``--compare``:
+
+    python benchmarks/bench_suite.py --lengths 1000 100000 --packages detection_algorithm --interfaces sk
+    python benchmarks/bench_suite.py --compare 5d6d3e3 HEAD
+"""
+import argparse
+import datetime
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+import traceback
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PACKAGES = ('data_processing', 'timeseries_processing', 'feature_analysis', 'detection_algorithm')
+INTERFACES = ('d3m', 'sk')
+HISTORY_PATH = os.path.join(ROOT, 'benchmarks', 'history.json')
+
+# ratio of wall times above which --compare reports a regression
+REGRESSION_RATIO = 1.1
+
+
+def _max_rss_mb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+def make_systems(n_samples, n_features, n_systems, random_state=0):
+    """A list of n_systems arrays of shape (n_samples, n_features).
+    """
+    from tods.sk_interface.utils.data import generate_3D_data
+
+    # only the training part is used, the primitives are scored on the data they were fitted on
+    X_train = generate_3D_data(n_sys=n_systems, n_train=n_samples, n_test=10, n_features=n_features,
+                               behaviour='new', random_state=random_state)[0]
+    return X_train if n_systems > 1 else [X_train]
+
+
+def _run_d3m(case, systems):
+    from d3m import container
+    from d3m.primitive_interfaces.transformer import TransformerPrimitiveBase
+
+    primitive_class = getattr(importlib.import_module(case['module']), case['name'])
+    hyperparams = primitive_class.metadata.get_hyperparams().defaults()
+    uses_window = 'window_size' in hyperparams
+    if uses_window:
+        hyperparams = hyperparams.replace({'window_size': case['window_size']})
+
+    frames = []
+    for X in systems:
+        columns = {str(column): X[:, column] for column in range(X.shape[1])}
+        if case['package'] == 'data_processing':
+            columns = dict(timestamp=list(range(len(X))), **columns)
+        frames.append(container.DataFrame(columns, generate_metadata=True))
+
+    start = time.perf_counter()
+    for frame in frames:
+        primitive = primitive_class(hyperparams=hyperparams)
+        if not isinstance(primitive, TransformerPrimitiveBase):
+            primitive.set_training_data(inputs=frame)
+            primitive.fit()
+        primitive.produce(inputs=frame)
+    return time.perf_counter() - start, uses_window
+
+
+def _run_sk(case, systems):
+    estimator_class = getattr(importlib.import_module(case['module']), case['name'])
+    system_num = len(systems)
+    data = systems if system_num > 1 else systems[0]
+
+    uses_window = 'window_size' in estimator_class(system_num=system_num).primitives[0].hyperparams
+    kwargs = {'window_size': case['window_size']} if uses_window else {}
+
+    start = time.perf_counter()
+    estimator = estimator_class(system_num=system_num, **kwargs)
+    if estimator.fit_available:
+        estimator.fit(data)
+    if estimator.fit_available and estimator.predict_available:
+        estimator.predict(data)
+    else:
+        estimator.produce(data)
+    return time.perf_counter() - start, uses_window
+
+
+def _run_case(case, connection):
+    try:
+        systems = make_systems(case['n_samples'], case['n_features'], case['n_systems'])
+        rss_before = _max_rss_mb()
+        run = _run_d3m if case['interface'] == 'd3m' else _run_sk
+        wall_time, uses_window = run(case, systems)
+        peak_rss = _max_rss_mb()
+        connection.send({
+            'status': 'ok',
+            'wall_time': wall_time,
+            'rows_per_sec': case['n_samples'] * case['n_systems'] / wall_time if wall_time > 0 else None,
+            'peak_rss_mb': peak_rss,
+            # the peak of the case itself, if it exceeded that of the imports and data generation
+            'peak_rss_increase_mb': peak_rss - rss_before,
+            'uses_window': uses_window,
+        })
+    except BaseException as error:
+        connection.send({'status': 'error', 'error': '{}: {}'.format(type(error).__name__, error),
+                         'traceback': traceback.format_exc()})
+    finally:
+        connection.close()
+
+
+def run_case(case, timeout=None):
+    """Run a case in a fresh process and return its measurements.
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(case, sender))
+    process.start()
+    sender.close()
+
+    result = {'status': 'crashed'}
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            pass
+    else:
+        result = {'status': 'timeout'}
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return result
+
+
+def primitives(packages, interfaces, pattern=None):
+    """(interface, package, class name, module) of every primitive and estimator to run.
+    """
+    from tods.common import lazy
+
+    selected = []
+    for package in packages:
+        if 'd3m' in interfaces:
+            for name, module in sorted(lazy.primitives('tods.' + package).items()):
+                selected.append(('d3m', package, name, module))
+        if 'sk' in interfaces:
+            for name, module in sorted(lazy.estimators('tods.sk_interface.' + package).items()):
+                selected.append(('sk', package, name, module))
+    if pattern is not None:
+        selected = [entry for entry in selected if re.search(pattern, entry[2])]
+    return selected
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                       universal_newlines=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_record(path, record):
+    history = load_history(path)
+    history.append(record)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def _case_key(result):
+    return (result['interface'], result['name'], result['n_samples'], result['n_features'],
+            result['window_size'], result['n_systems'])
+
+
+def _find_record(history, revision):
+    if revision == 'HEAD':
+        revision = git_commit() or ''
+    matches = [record for record in history if (record['commit'] or '').startswith(revision)]
+    if not matches:
+        raise SystemExit('No run of {} in the history.'.format(revision))
+    # the latest run of the commit
+    return matches[-1]
+
+
+def compare(history, base, head, threshold=REGRESSION_RATIO):
+    """Print the wall time of every case run by both commits, and return the number of regressions.
+    """
+    base_results = {_case_key(result): result for result in _find_record(history, base)['results']}
+    head_results = {_case_key(result): result for result in _find_record(history, head)['results']}
+
+    print('{:>4} {:<36} {:>9} {:>4} {:>6} {:>4} {:>10} {:>10} {:>7}'.format(
+        'if', 'name', 'n_samples', 'feat', 'window', 'sys', 'base (s)', 'head (s)', 'ratio'))
+    n_regressions = 0
+    for key in sorted(set(base_results) & set(head_results), key=str):
+        before, after = base_results[key], head_results[key]
+        if before['status'] != 'ok' or after['status'] != 'ok':
+            ratio, flag = None, '{} -> {}'.format(before['status'], after['status'])
+        else:
+            ratio = after['wall_time'] / before['wall_time']
+            flag = 'slower' if ratio > threshold else ('faster' if ratio < 1 / threshold else '')
+            n_regressions += ratio > threshold
+        print('{:>4} {:<36} {:>9} {:>4} {:>6} {:>4} {:>10} {:>10} {:>7} {}'.format(
+            key[0], key[1], key[2], key[3], str(key[4]), key[5],
+            '{:.4f}'.format(before['wall_time']) if before['status'] == 'ok' else '-',
+            '{:.4f}'.format(after['wall_time']) if after['status'] == 'ok' else '-',
+            '{:.2f}'.format(ratio) if ratio is not None else '-', flag))
+    return n_regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every primitive and record the results per commit.')
+    parser.add_argument('--lengths', type=lambda value: int(float(value)), nargs='+', default=[1000, 10000],
+                        help='series lengths, e.g. 1e3 1e5 1e7')
+    parser.add_argument('--features', type=int, nargs='+', default=[3])
+    parser.add_argument('--window_sizes', type=int, nargs='+', default=[10])
+    parser.add_argument('--systems', type=int, nargs='+', default=[1])
+    parser.add_argument('--packages', choices=PACKAGES, nargs='+', default=list(PACKAGES))
+    parser.add_argument('--interfaces', choices=INTERFACES, nargs='+', default=list(INTERFACES))
+    parser.add_argument('--filter', default=None, help='regular expression on the primitive or estimator names')
+    parser.add_argument('--timeout', type=float, default=600., help='seconds after which a case is stopped')
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'),
+                        help='compare the runs of two commits in the history instead of running')
+    args = parser.parse_args()
+
+    if args.compare:
+        n_regressions = compare(load_history(args.history), *args.compare)
+        sys.exit(1 if n_regressions else 0)
+
+    results = []
+    print('{:>4} {:<36} {:>9} {:>4} {:>6} {:>4} {:>10} {:>12} {:>9}'.format(
+        'if', 'name', 'n_samples', 'feat', 'window', 'sys', 'time (s)', 'rows/s', 'rss (MB)'))
+    for interface, package, name, module in primitives(args.packages, args.interfaces, args.filter):
+        uses_window = True
+        for n_samples in args.lengths:
+            for n_features in args.features:
+                for n_systems in args.systems:
+                    for window_index, window_size in enumerate(args.window_sizes):
+                        if window_index > 0 and not uses_window:
+                            break
+                        case = dict(interface=interface, package=package, name=name, module=module,
+                                    n_samples=n_samples, n_features=n_features,
+                                    window_size=window_size, n_systems=n_systems)
+                        result = run_case(case, args.timeout)
+                        uses_window = result.pop('uses_window', uses_window)
+                        if not uses_window:
+                            case['window_size'] = None
+                        case.update(result)
+                        results.append(case)
+
+                        if result['status'] == 'ok':
+                            print('{:>4} {:<36} {:>9} {:>4} {:>6} {:>4} {:>10.4f} {:>12.0f} {:>9.1f}'.format(
+                                interface, name, n_samples, n_features, str(case['window_size']), n_systems,
+                                result['wall_time'], result['rows_per_sec'] or 0, result['peak_rss_mb']))
+                        else:
+                            print('{:>4} {:<36} {:>9} {:>4} {:>6} {:>4} {} {}'.format(
+                                interface, name, n_samples, n_features, str(case['window_size']), n_systems,
+                                result['status'], result.get('error', '')))
+
+    save_record(args.history, {
+        'commit': git_commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'arguments': {key: value for key, value in vars(args).items() if key not in ('history', 'compare')},
+        'results': results,
+    })
+
+
+if __name__ == '__main__':
+    main()
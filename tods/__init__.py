@@ -1,6 +1,22 @@
 from .utils import *
-from tods.data_processing import *
-from tods.timeseries_processing import *
-from tods.feature_analysis import *
-from tods.detection_algorithm import *
-from tods.sk_interface import *
+
+# The primitives and sk_interface estimators are imported on first use, see tods.common.lazy.
+# `from tods import *` still imports all of them.
+from .common import lazy as _lazy
+
+_PACKAGES = ('tods.data_processing', 'tods.timeseries_processing', 'tods.feature_analysis',
+             'tods.detection_algorithm')
+
+_names = {}
+for _package in _PACKAGES:
+    _names.update(_lazy.primitives(_package))
+for _package in ('tods.sk_interface.data_ensemble', 'tods.sk_interface.feature_analysis',
+                 'tods.sk_interface.detection_algorithm'):
+    _names.update(_lazy.estimators(_package))
+
+from . import data_processing, timeseries_processing, feature_analysis, detection_algorithm, sk_interface
+
+__getattr__, __dir__, _lazy_all = _lazy.attach(__name__, _names)
+__all__ = [name for name in dir(utils) if not name.startswith('_')] + _lazy_all
+
+del _package
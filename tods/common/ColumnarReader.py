@@ -0,0 +1,221 @@
+import typing
+import os
+import uuid
+from urllib import parse as url_parse
+
+import frozendict
+import numpy
+import pandas
+
+from d3m import container
+from d3m.metadata import base as metadata_base
+from d3m.base import primitives
+
+__all__ = ('ColumnarReaderPrimitive', 'read_columnar_file')
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+NPY_EXTENSIONS = ('.npy', )
+NPZ_EXTENSIONS = ('.npz', )
+
+
+def _import_pyarrow(path: str) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        raise ImportError("Reading '{path}' requires pyarrow, which is not installed.".format(path=path)) from error
+
+
+def _array_columns(array: numpy.ndarray, path: str, columns: typing.Optional[typing.Sequence[str]]) -> pandas.DataFrame:
+    if array.dtype.names is not None:
+        # A structured array has one named column per field.
+        names = list(columns) if columns is not None else list(array.dtype.names)
+        return pandas.DataFrame({name: array[name] for name in names}, columns=names)
+
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    if array.ndim != 2:
+        raise ValueError("Array in '{path}' has {ndim} dimensions, a table has at most 2.".format(path=path, ndim=array.ndim))
+
+    # A plain array has no column names: columns names them, all of them, in order.
+    if columns is None:
+        names = [str(column_index) for column_index in range(array.shape[1])]
+    elif len(columns) == array.shape[1]:
+        names = list(columns)
+    else:
+        raise ValueError("Array in '{path}' has {n_columns} columns, but {n_names} names were given.".format(
+            path=path, n_columns=array.shape[1], n_names=len(columns),
+        ))
+    return pandas.DataFrame(array, columns=names, copy=False)
+
+
+def read_columnar_file(path: str, columns: typing.Optional[typing.Sequence[str]] = None, *,
+                       memory_map: bool = True) -> pandas.DataFrame:
+    """
+    Read a table from a Parquet, Arrow IPC/Feather, ``.npy`` or ``.npz`` file, keeping the dtypes of its columns.
+
+    Args:
+        path: the file, its format is given by its extension
+        columns: the names of the columns to read, in this order, all of them if None. The columns of a
+            plain (not structured) ``.npy`` array have no names, they are named by ``columns``, which must then
+            name all of them, or by their index.
+        memory_map: memory-map Arrow IPC/Feather and ``.npy`` files, so that numeric columns are views of the
+            file, and let pyarrow memory-map Parquet files while decoding them. ``.npz`` archives cannot be
+            memory-mapped, only the arrays named in ``columns`` are read from them.
+
+    Returns:
+        pandas.DataFrame
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PARQUET_EXTENSIONS:
+        _import_pyarrow(path)
+        import pyarrow.parquet
+
+        table = pyarrow.parquet.read_table(path, columns=columns, memory_map=memory_map)
+        # Columns are converted one at a time, releasing the Arrow buffers as they go.
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    if extension in ARROW_EXTENSIONS:
+        _import_pyarrow(path)
+        import pyarrow.feather
+
+        table = pyarrow.feather.read_table(path, columns=columns, memory_map=memory_map)
+        # Without consolidating the columns into blocks, numeric columns without missing values are not copied.
+        return table.to_pandas(split_blocks=True)
+
+    if extension in NPY_EXTENSIONS:
+        array = numpy.load(path, mmap_mode='r' if memory_map else None, allow_pickle=False)
+        return _array_columns(array, path, columns)
+
+    if extension in NPZ_EXTENSIONS:
+        with numpy.load(path, allow_pickle=False) as archive:
+            names = list(columns) if columns is not None else list(archive.files)
+            data = {}
+            for name in names:
+                array = archive[name]
+                if array.ndim != 1:
+                    raise ValueError("Array '{name}' in '{path}' has {ndim} dimensions, a column has 1.".format(
+                        name=name, path=path, ndim=array.ndim,
+                    ))
+                data[name] = array
+        return pandas.DataFrame(data, columns=names)
+
+    raise ValueError("Unsupported file extension '{extension}' of '{path}', supported are: {extensions}.".format(
+        extension=extension, path=path,
+        extensions=', '.join(PARQUET_EXTENSIONS + ARROW_EXTENSIONS + NPY_EXTENSIONS + NPZ_EXTENSIONS),
+    ))
+
+
+class ColumnarReaderPrimitive(primitives.FileReaderPrimitiveBase):    # pragma: no cover
+    """
+    A primitive which reads columns referencing Parquet, Arrow IPC/Feather, ``.npy`` and ``.npz`` files.
+
+    Each column which has ``https://metadata.datadrivendiscovery.org/types/FileName`` semantic type
+    and a supported media type has every filename read as a pandas DataFrame, like ``CSVReaderPrimitive``
+    does for CSV files. Unlike CSV files, these files are typed: columns keep their dtypes instead of being
+    read as strings, so that ``ColumnParserPrimitive`` leaves them as they are. Only the columns listed in
+    ``file_columns`` metadata are read, and files are memory-mapped where the format allows it.
+    Reading Parquet and Arrow files requires pyarrow.
+    """
+
+    _supported_media_types = (
+        'application/vnd.apache.parquet',
+        'application/x-parquet',
+        'application/vnd.apache.arrow.file',
+        'application/x-feather',
+        'application/x-npy',
+        'application/x-npz',
+    )
+    _file_structural_type = container.DataFrame
+    _file_semantic_types = ('https://metadata.datadrivendiscovery.org/types/Table', 'https://metadata.datadrivendiscovery.org/types/Timeseries')
+
+    metadata = metadata_base.PrimitiveMetadata(
+        {
+            'id': str(uuid.uuid3(uuid.NAMESPACE_DNS, 'ColumnarReaderPrimitive')),
+            'version': '0.1.0',
+            'name': 'Columns Parquet, Arrow and NumPy reader',
+            'python_path': 'd3m.primitives.tods.common.columnar_reader',
+            'keywords': ['Parquet', 'Arrow', 'Feather', 'NumPy', 'reader'],
+            'source': {
+                'name': "DATALab@Texas A&M University",
+                'contact': 'mailto:khlai037@tamu.edu',
+            },
+            'algorithm_types': [
+                metadata_base.PrimitiveAlgorithmType.FILE_MANIPULATION,
+            ],
+            'supported_media_types': _supported_media_types,
+            'primitive_family': metadata_base.PrimitiveFamily.DATA_TRANSFORMATION,
+        }
+    )
+
+    def _read_fileuri(self, metadata: frozendict.FrozenOrderedDict, fileuri: str) -> container.DataFrame:
+        expected_names = None
+        if metadata.get('file_columns', None) is not None:
+            expected_names = []
+            for column in metadata['file_columns']:
+                expected_names.append(column['column_name'])
+
+        parsed_uri = url_parse.urlparse(fileuri, allow_fragments=False)
+        if parsed_uri.scheme not in ('', 'file'):
+            raise ValueError("Only local files can be read, not '{fileuri}'.".format(fileuri=fileuri))
+        file_path = url_parse.unquote(parsed_uri.path)
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError("Data file for table '{file_path}' cannot be found.".format(
+                file_path=fileuri,
+            ))
+
+        data = read_columnar_file(file_path, expected_names)
+
+        column_names = [str(column_name) for column_name in data.columns]
+
+        if expected_names is not None and expected_names != column_names:
+            raise ValueError("Mismatch between column names in data {column_names} and expected names {expected_names}.".format(
+                column_names=column_names,
+                expected_names=expected_names,
+            ))
+
+        # Structural types are generated from the dtypes of the columns.
+        data = container.DataFrame(data, {
+            'schema': metadata_base.CONTAINER_SCHEMA_VERSION,
+            'structural_type': container.DataFrame,
+        }, generate_metadata=True)
+
+        for i, column_name in enumerate(column_names):
+            data.metadata = data.metadata.update((metadata_base.ALL_ELEMENTS, i), {
+                'name': column_name,
+            })
+        return data
+
+    def _produce_column_metadata(self, inputs_metadata: metadata_base.DataMetadata, column_index: int,
+                                 read_files: typing.Sequence[typing.Any]) -> metadata_base.DataMetadata:
+        # We do not pass "read_files" to parent method but we apply it at the end of this method ourselves.
+        column_metadata = super()._produce_column_metadata(inputs_metadata, column_index, [])
+        column_metadata = column_metadata.update_column(0, {
+            # Clear metadata useful for filename columns.
+            'file_columns': metadata_base.NO_VALUE,
+        })
+
+        # We might have metadata about columns, apply it here. Semantic types are the same as
+        # when reading a CSV file, structural types are those of the read columns.
+        column_meta = inputs_metadata.query_column(column_index)
+        if column_meta.get('file_columns', None):
+            for i, column in enumerate(column_meta['file_columns']):
+                column_metadata = column_metadata.update((metadata_base.ALL_ELEMENTS, 0, metadata_base.ALL_ELEMENTS, i), column)
+                column_metadata = column_metadata.update(
+                    (metadata_base.ALL_ELEMENTS, 0, metadata_base.ALL_ELEMENTS, i),
+                    {
+                        'column_name': metadata_base.NO_VALUE,
+                        'column_index': metadata_base.NO_VALUE,
+                    }
+                )
+
+        # A DataFrame is always a table as well.
+        column_metadata = column_metadata.add_semantic_type((metadata_base.ALL_ELEMENTS, 0), 'https://metadata.datadrivendiscovery.org/types/Table')
+
+        # This makes sure that metadata read from data override any metadata from metadata.
+        for row_index, file in enumerate(read_files):
+            column_metadata = file.metadata.copy_to(column_metadata, (), (row_index, 0))
+
+        return column_metadata
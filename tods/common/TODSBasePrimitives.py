@@ -11,6 +11,9 @@ from d3m.metadata import base as metadata_base, hyperparams, params
 from d3m import container
 from d3m import utils
 
+from .executor import run_systems
+from .profiling import traced
+
 __all__ = ('TODSTransformerPrimitiveBase',)
 
 class TODSTransformerPrimitiveBase(transformer.TransformerPrimitiveBase[Inputs, Outputs, Hyperparams]): # pragma: no cover
@@ -26,6 +29,7 @@ class TODSTransformerPrimitiveBase(transformer.TransformerPrimitiveBase[Inputs,
     def __init__(self, *, hyperparams: Hyperparams) -> None:
         super().__init__(hyperparams=hyperparams)
 
+    @traced
     def produce(self, *, inputs: container.DataFrame, timeout: float = None, iterations: int = None) -> CallResult[container.DataFrame]:
 
         is_system = len(inputs.iloc[0, 0].shape) != 0 # check the shape of first row first column, if not a single data entry(,) then it is system-wise data (row, col)
@@ -66,16 +70,25 @@ class TODSTransformerPrimitiveBase(transformer.TransformerPrimitiveBase[Inputs,
 
     def _forward(self, data, method):
         """
-        General Forward Function to feed system data one-by-one to the primitive
+        General Forward Function to feed system data to the primitive, spread over n_jobs workers
         """
-        col_name = list(data.columns)[0]
-        for i, _ in data.iterrows():
-            sys_data = data.iloc[i][col_name]
-            produce_func = getattr(self, method, None)
-            out = produce_func(inputs=sys_data)
-            data.iloc[i][col_name] = out.value
+        results = run_systems(self, method, data.iloc[:, 0])
+        for i, out in enumerate(results):
+            data.iat[i, 0] = out.value
         return data
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        """
+        Number of rows before a row that the outputs of the row depend on, used by
+        tods.common.chunked to run the primitive on chunks of the rows.
+
+        Returns:
+            int, or None if the outputs of a row depend on rows after it or on all of them,
+            or if the primitive does not produce one row per input row
+        """
+        return None
+
 class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inputs, Outputs, Params, Hyperparams]):# pragma: no cover
 
     def __init__(self, *, hyperparams: Hyperparams, 
@@ -83,6 +96,7 @@ class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inpu
             docker_containers: Dict[str, DockerContainer] = None) -> None:
         super().__init__(hyperparams=hyperparams, random_seed=random_seed, docker_containers=docker_containers)
 
+    @traced
     def produce(self, *, inputs: container.DataFrame, timeout: float = None, iterations: int = None) -> CallResult[container.DataFrame]:
 
         is_system = len(inputs.iloc[0, 0].shape) != 0 # check the shape of first row first column, if not a single data entry(,) then it is system-wise data (row, col)
@@ -94,6 +108,7 @@ class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inpu
 
         return CallResult(outputs) 
 
+    @traced
     def produce_score(self, *, inputs: container.DataFrame, timeout: float = None, iterations: int = None) -> CallResult[container.DataFrame]:
         is_system = len(inputs.iloc[0, 0].shape) != 0 # check the shape of first row first column, if not a single data entry(,) then it is system-wise data (row, col)
         if is_system: 
@@ -104,16 +119,15 @@ class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inpu
 
         return CallResult(outputs) 
 
+    @traced
     def fit(self, *, timeout: float = None, iterations: int = None) -> CallResult[None]:
         """
         A noop.
         """
         is_system = len(self._inputs.iloc[0, 0].shape) != 0 # check the shape of first row first column, if not a single data entry(,) then it is system-wise data (row, col)
         if is_system: 
-            data = inputs
-            col_name = list(data.columns)[0]
-            for i, _ in data.iterrows():
-                sys_data = data.iloc[i][col_name]
+            data = self._inputs
+            for sys_data in data.iloc[:, 0]:
                 self.set_training_data(inputs=sys_data)
                 self._fit()
         else:
@@ -122,23 +136,16 @@ class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inpu
 
         return CallResult(None)
 
+    @traced
     def fit_multi_produce(self, *, produce_methods: typing.Sequence[str], inputs: Inputs, timeout: float = None, iterations: int = None) -> MultiCallResult:
         is_system = len(inputs.iloc[0, 0].shape) != 0 # check the shape of first row first column, if not a single data entry(,) then it is system-wise data (row, col)
         if is_system: 
             data = inputs
             produce_method = produce_methods[0]
-            col_name = list(data.columns)[0]
-            results = []
-            for i, _ in data.iterrows():
-                sys_data = data.iloc[i][col_name]
-                self.set_training_data(inputs=sys_data)
-                fit_result = self._fit()
-                if produce_method == "produce":
-                    out = self._produce(inputs=sys_data, timeout=timeout)
-                else:
-                    out = self._produce_score(inputs=sys_data, timeout=timeout)
-                data.iloc[i][col_name] = out.value
-                results.append(out)
+            method = '_produce' if produce_method == "produce" else '_produce_score'
+            results = run_systems(self, method, data.iloc[:, 0], fit=True, timeout=timeout)
+            for i, out in enumerate(results):
+                data.iat[i, 0] = out.value
             iterations_done = None
             for result in results:
                 if result.iterations_done is not None:
@@ -189,12 +196,16 @@ class TODSUnsupervisedLearnerPrimitiveBase(UnsupervisedLearnerPrimitiveBase[Inpu
 
     def _forward(self, data, method):
         """
-        General Forward Function to feed system data one-by-one to the primitive
+        General Forward Function to feed system data to the primitive, spread over n_jobs workers
         """
-        col_name = list(data.columns)[0]
-        for i, _ in data.iterrows():
-            sys_data = data.iloc[i][col_name]
-            produce_func = getattr(self, method, None)
-            out = produce_func(inputs=sys_data)
-            data.iloc[i][col_name] = out.value
+        results = run_systems(self, method, data.iloc[:, 0])
+        for i, out in enumerate(results):
+            data.iat[i, 0] = out.value
         return data
+
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        """
+        See ``TODSTransformerPrimitiveBase._lookback``.
+        """
+        return None
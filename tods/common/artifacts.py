@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""Compact on-disk artifacts of fitted detectors.
+
+``get_params`` hands back the live detector, so pickling a fitted pipeline
+copies every array of every sklearn, pyod and Keras object into one opaque
+stream that each worker has to read and deserialize whole. An artifact is a
+directory instead::
+
+    header.json     format version, detector family and class, file list
+    state.pkl       the object graph, without its large arrays and models
+    arrays/<i>.npy  every numeric array of at least MMAP_MIN_BYTES
+    models/<i>.json the architecture of every Keras model
+    models/<i>.h5   its weights
+
+The object graph is pickled as usual, except that arrays and Keras models are
+written to their own files and referenced by persistent id. Arrays are loaded
+memory-mapped copy-on-write, so that worker processes scoring with the same
+artifact share its pages until one of them writes to an array.
+
+Detectors are grouped into families, looked up by base class in a registry.
+A family names the attributes only needed by training (the training-set
+scores, the windows the model was trained on, the Keras training history);
+``strip_training_state`` replaces them with empty placeholders, so that
+``check_is_fitted`` still passes but the artifact only holds what scoring
+needs. Scoring methods relative to the training scores, such as
+``predict_proba``, are not available on a stripped detector.
+"""
+import copy
+import json
+import os
+import pickle
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+__all__ = ('ArtifactFamily', 'register_family', 'family_of', 'save_artifact', 'load_artifact', 'read_header')
+
+ARTIFACT_FORMAT = 1
+
+HEADER_FILE = 'header.json'
+STATE_FILE = 'state.pkl'
+ARRAYS_DIR = 'arrays'
+MODELS_DIR = 'models'
+
+# arrays smaller than a page are left in the pickle, memory-mapping them would share nothing
+MMAP_MIN_BYTES = 4096
+
+# attributes of primitive params, next to the detector in ``clf_``, only needed by training
+PARAMS_TRAINING_ONLY = ('left_inds_', 'right_inds_')
+
+
+class ArtifactFamily(object):
+    """Detectors that derive from one base class.
+
+    Parameters
+    ----------
+    name : str
+        The name recorded in the artifact header.
+
+    base : str
+        The qualified name of the base class, e.g.
+        ``'pyod.models.base.BaseDetector'``. It is matched against the names
+        of the detector's classes, so that the registry imports nothing.
+
+    training_only : tuple of str
+        The attributes only needed by training. A dotted name refers to an
+        attribute of an attribute.
+    """
+
+    def __init__(self, name, base, training_only=()):
+        self.name = name
+        self.base = base
+        self.training_only = tuple(training_only)
+
+    def matches(self, obj):
+        return any(_qualified_name(cls) == self.base for cls in type(obj).__mro__)
+
+    def strip(self, obj):
+        """A shallow copy of obj with its training-only attributes replaced by placeholders.
+        """
+        obj = copy.copy(obj)
+        for name in self.training_only:
+            _strip_attribute(obj, name.split('.'))
+        return obj
+
+
+GENERIC_FAMILY = ArtifactFamily('generic', 'builtins.object')
+
+_FAMILIES = OrderedDict()
+
+
+def register_family(name, base, training_only=()):
+    """Register the family of the detectors deriving from base.
+
+    Families registered later take precedence, so a family can be
+    registered for a subclass of the base of another one.
+    """
+    _FAMILIES[name] = ArtifactFamily(name, base, training_only)
+    _FAMILIES.move_to_end(name, last=False)
+    return _FAMILIES[name]
+
+
+def family_of(obj):
+    """The registered family of a detector, the generic family if none matches.
+    """
+    for family in _FAMILIES.values():
+        if family.matches(obj):
+            return family
+    return GENERIC_FAMILY
+
+
+register_family('pyod', 'pyod.models.base.BaseDetector',
+                training_only=('decision_scores_', 'labels_', 'history_'))
+register_family('collective', 'tods.detection_algorithm.core.CollectiveBase.CollectiveBaseDetector',
+                training_only=('decision_scores_', 'labels_', 'left_inds_', 'right_inds_'))
+register_family('telemanom', 'tods.detection_algorithm.Telemanom.Detector',
+                training_only=('decision_scores_', 'labels_', 'left_inds_', 'right_inds_',
+                               '_channel.train', '_channel.X_train', '_channel.y_train'))
+
+
+def _qualified_name(cls):
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def _placeholder(value):
+    if isinstance(value, np.ndarray):
+        return np.empty((0, ) + value.shape[1:], dtype=value.dtype)
+    return None
+
+
+def _strip_attribute(obj, path):
+    attributes = getattr(obj, '__dict__', None)
+    if attributes is None or attributes.get(path[0]) is None:
+        return
+    if len(path) == 1:
+        attributes[path[0]] = _placeholder(attributes[path[0]])
+        return
+    # copy every object on the path, so that the fitted detector itself is left untouched
+    attributes[path[0]] = copy.copy(attributes[path[0]])
+    _strip_attribute(attributes[path[0]], path[1:])
+
+
+def _detector(obj):
+    # primitive params hold their detector in clf_
+    if isinstance(obj, Mapping) and 'clf_' in obj:
+        return obj['clf_']
+    return obj
+
+
+def _is_keras_model(obj):
+    return any(cls.__name__ == 'Model' and cls.__module__.startswith(('tensorflow', 'keras')) for cls in type(obj).__mro__)
+
+
+class _ArtifactPickler(pickle.Pickler):
+
+    def __init__(self, file, path):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._path = path
+        self._ids = {}
+        self.arrays = []
+        self.models = []
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray):
+            if type(obj) not in (np.ndarray, np.memmap) or obj.dtype.hasobject or obj.nbytes < MMAP_MIN_BYTES:
+                return None
+        elif not _is_keras_model(obj):
+            return None
+
+        # an object referenced twice is written once
+        key = id(obj)
+        if key in self._ids:
+            return self._ids[key][1]
+
+        if isinstance(obj, np.ndarray):
+            name = '{}/{}.npy'.format(ARRAYS_DIR, len(self.arrays))
+            np.save(os.path.join(self._path, name), np.asarray(obj), allow_pickle=False)
+            self.arrays.append({'file': name, 'dtype': str(obj.dtype), 'shape': list(obj.shape)})
+            pid = ('array', name)
+        else:
+            name = '{}/{}'.format(MODELS_DIR, len(self.models))
+            with open(os.path.join(self._path, name + '.json'), 'w') as f:
+                f.write(obj.to_json())
+            obj.save_weights(os.path.join(self._path, name + '.h5'))
+            self.models.append(name)
+            pid = ('keras', name)
+        # keep obj alive, so that its id is not reused by another object while pickling
+        self._ids[key] = (obj, pid)
+        return pid
+
+
+class _ArtifactUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, path, mmap):
+        super().__init__(file)
+        self._path = path
+        self._mmap = mmap
+
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind == 'array':
+            return np.load(os.path.join(self._path, name), mmap_mode='c' if self._mmap else None,
+                           allow_pickle=False)
+        if kind == 'keras':
+            from tensorflow.keras.models import model_from_json
+            with open(os.path.join(self._path, name + '.json')) as f:
+                model = model_from_json(f.read())
+            model.load_weights(os.path.join(self._path, name + '.h5'))
+            return model
+        raise pickle.UnpicklingError("Unknown artifact reference: {!r}".format(pid))
+
+
+def save_artifact(obj, path, strip_training_state=False):
+    """Write a fitted detector, or the params of a primitive, to an artifact.
+
+    Parameters
+    ----------
+    obj : object
+        The detector, or primitive params holding it in ``clf_``.
+
+    path : str
+        The artifact directory, created if needed.
+
+    strip_training_state : bool, optional (default=False)
+        Replace the attributes only needed by training with placeholders.
+
+    Returns
+    -------
+    header : dict
+        The header written to ``header.json``.
+    """
+    detector = _detector(obj)
+    family = family_of(detector)
+    stripped = []
+    if strip_training_state:
+        stripped = [name for name in family.training_only if getattr(detector, name.split('.')[0], None) is not None]
+        if detector is obj:
+            obj = detector = family.strip(detector)
+        else:
+            obj = copy.copy(obj)
+            for name in PARAMS_TRAINING_ONLY:
+                if obj.get(name) is not None:
+                    obj[name] = _placeholder(obj[name])
+            obj['clf_'] = detector = family.strip(detector)
+
+    for directory in (ARRAYS_DIR, MODELS_DIR):
+        os.makedirs(os.path.join(path, directory), exist_ok=True)
+    with open(os.path.join(path, STATE_FILE), 'wb') as f:
+        pickler = _ArtifactPickler(f, path)
+        pickler.dump(obj)
+
+    header = OrderedDict([
+        ('format', ARTIFACT_FORMAT),
+        ('family', family.name),
+        ('class', _qualified_name(type(detector))),
+        ('stripped', stripped),
+        ('arrays', pickler.arrays),
+        ('models', pickler.models),
+    ])
+    # the header is written last, so that a directory with a header is a complete artifact
+    with open(os.path.join(path, HEADER_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+    return header
+
+
+def read_header(path):
+    """The header of an artifact.
+    """
+    with open(os.path.join(path, HEADER_FILE)) as f:
+        header = json.load(f)
+    if header.get('format') != ARTIFACT_FORMAT:
+        raise ValueError("Unsupported artifact format {!r} in '{}'.".format(header.get('format'), path))
+    return header
+
+
+def load_artifact(path, mmap=True):
+    """Load an object written by ``save_artifact``.
+
+    Parameters
+    ----------
+    path : str
+        The artifact directory.
+
+    mmap : bool, optional (default=True)
+        Memory-map the arrays copy-on-write instead of reading them.
+
+    Returns
+    -------
+    obj : object
+    """
+    read_header(path)
+    with open(os.path.join(path, STATE_FILE), 'rb') as f:
+        return _ArtifactUnpickler(f, path, mmap).load()
@@ -0,0 +1,162 @@
+"""Produce a fitted pipeline on a long series, one chunk of rows at a time.
+
+Producing a pipeline on a whole series holds the series and the outputs of
+every step in memory at once. ``produce_chunked`` runs the fitted pipeline
+on consecutive chunks of ``chunk_size`` rows instead, and appends the
+outputs of each chunk to a CSV file, so that only one chunk and its
+intermediate outputs are in memory at a time.
+
+A step with a window computes the outputs of a row from the rows before it,
+so each chunk is produced together with a halo of the rows just before it,
+whose outputs are dropped. A primitive declares how many rows back it reads
+with a ``_lookback(hyperparams)`` classmethod, see
+``TODSTransformerPrimitiveBase._lookback``: 0 for primitives which compute
+each row on its own, ``window_size - 1`` for a trailing window. Lookbacks add
+up along the steps of the pipeline, and the halo is the largest total over
+the pipeline outputs, so each row is produced from the same rows as when the
+whole series is produced at once. Pipelines with a step that does not
+declare a finite lookback, because it reads the rows after a row or the
+whole series, or changes the number of rows, cannot be run in chunks.
+"""
+import typing
+
+import pandas
+
+from d3m import container
+from d3m import runtime as runtime_module
+from d3m.base import utils as base_utils
+from d3m.metadata import base as metadata_base
+from d3m.metadata import pipeline as pipeline_module
+
+__all__ = ('primitive_lookback', 'pipeline_lookback', 'produce_chunked')
+
+# rows produced at once by default
+CHUNK_SIZE = 100000
+
+
+def primitive_lookback(primitive_class, hyperparams) -> int:
+    """
+    Number of rows before a row that a primitive reads to produce the row.
+    Args:
+        primitive_class: the primitive
+        hyperparams: its hyperparams
+
+    Returns:
+        int
+
+    Raises:
+        ValueError: if the primitive does not declare a finite lookback
+    """
+    lookback = getattr(primitive_class, '_lookback', None)
+    rows = lookback(hyperparams) if lookback is not None else None
+    if rows is None:
+        raise ValueError("Primitive '{python_path}' does not declare a finite lookback with these hyperparams, "
+                         "it cannot be produced in chunks.".format(
+                             python_path=primitive_class.metadata.query()['python_path'],
+                         ))
+    return rows
+
+
+def _step_hyperparams(step, overrides: typing.Optional[typing.Dict]):
+    values = {}
+    for name, hyperparameter in step.hyperparams.items():
+        if hyperparameter['type'] != metadata_base.ArgumentType.VALUE:
+            raise ValueError("Hyperparameter '{name}' of step {index} is not set to a value, the lookback of the step "
+                             "cannot be computed.".format(name=name, index=step.index))
+        values[name] = hyperparameter['data']
+    if overrides:
+        values.update(overrides)
+    return step.primitive.metadata.get_hyperparams().defaults().replace(values)
+
+
+def pipeline_lookback(pipeline, hyperparams: typing.Optional[typing.Sequence] = None) -> int:
+    """
+    Number of rows before a row that a pipeline reads to produce the row.
+
+    The lookback of a step output is the lookback of the step plus the largest lookback of
+    its arguments; pipeline inputs have none.
+    Args:
+        pipeline: a d3m Pipeline
+        hyperparams: hyperparams overriding those of each step, as given to the d3m Runtime
+
+    Returns:
+        int, the largest lookback of the pipeline outputs
+
+    Raises:
+        ValueError: if a step is not a primitive, or does not declare a finite lookback
+    """
+    lookbacks: typing.Dict[str, int] = {}
+    for step in pipeline.steps:
+        if not isinstance(step, pipeline_module.PrimitiveStep):
+            raise ValueError("Step {index} is not a primitive step, the pipeline cannot be produced in chunks.".format(
+                index=step.index,
+            ))
+
+        overrides = hyperparams[step.index] if hyperparams is not None else None
+        rows = primitive_lookback(step.primitive, _step_hyperparams(step, overrides))
+
+        arguments = []
+        for argument in step.arguments.values():
+            data = argument['data']
+            for data_reference in (data if isinstance(data, list) else [data]):
+                arguments.append(lookbacks.get(data_reference, 0))
+        for output_id in step.outputs:
+            lookbacks['steps.{i}.{output_id}'.format(i=step.index, output_id=output_id)] = rows + max(arguments, default=0)
+
+    return max((lookbacks.get(output['data'], 0) for output in pipeline.outputs), default=0)
+
+
+def produce_chunked(fitted_runtime: runtime_module.Runtime, dataset: container.Dataset, output_path: str, *,
+                    chunk_size: int = CHUNK_SIZE, output: str = 'outputs.0') -> int:
+    """
+    Produce a fitted pipeline on chunks of the rows of a dataset, and write its outputs to a CSV file.
+
+    Each chunk is produced with a halo of the ``pipeline_lookback`` rows before it, so the
+    written rows are the same as if the whole dataset was produced at once. Rows are taken
+    from the main resource of the dataset, which can be memory-mapped, see
+    ``tods.utils.generate_dataset_from_file``.
+    Args:
+        fitted_runtime: a d3m Runtime whose pipeline is fitted
+        dataset: the dataset to produce
+        output_path: the CSV file the outputs are written to, one row per row of the dataset
+        chunk_size: number of rows produced at once, without the halo. Chunks are at least one row
+            longer than the halo.
+        output: the pipeline output to write
+
+    Returns:
+        int, the number of rows written
+
+    Raises:
+        ValueError: if the pipeline cannot be produced in chunks
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1, got {chunk_size}.".format(chunk_size=chunk_size))
+
+    halo = pipeline_lookback(fitted_runtime.pipeline, fitted_runtime.hyperparams)
+    # The first chunk has no halo, it must be as long as the windows.
+    chunk_size = max(chunk_size, halo + 1)
+    resource_id, resource = base_utils.get_tabular_resource(dataset, None)
+    n_rows = len(resource)
+
+    n_written = 0
+    with open(output_path, 'w', newline='') as output_file:
+        for start in range(0, n_rows, chunk_size):
+            stop = min(start + chunk_size, n_rows)
+            first = max(start - halo, 0)
+            chunk = dataset.select_rows({resource_id: range(first, stop)})
+
+            result = fitted_runtime.produce(inputs=[chunk])
+            result.check_success()
+            outputs = result.values[output]
+
+            if len(outputs) != stop - first:
+                raise ValueError("Pipeline produced {n_outputs} rows from {n_inputs}, only pipelines producing one row "
+                                 "per input row can be produced in chunks.".format(
+                                     n_outputs=len(outputs), n_inputs=stop - first,
+                                 ))
+
+            # Plain pandas, so that the column names are written once, for the first chunk.
+            pandas.DataFrame.to_csv(outputs.iloc[start - first:], output_file, header=start == 0, index=False)
+            n_written += stop - start
+
+    return n_written
@@ -0,0 +1,235 @@
+"""Run a primitive over every system of a system-wise input.
+
+A system-wise input is a DataFrame whose first column holds one DataFrame
+per system. Systems are independent, so they can be fitted and scored on
+several cores: ``run_systems`` fans them out to a thread or process pool,
+returns the results in the order of the systems, and raises a single
+``SystemExecutionError`` listing every system that failed.
+
+Process workers receive the primitive once, when they start. Each system is
+then sent on its own; numeric systems travel through shared memory instead
+of being pickled.
+
+``map_systems`` is the plain variant for callers that already hold one
+primitive per system, such as the sk_interface.
+"""
+import concurrent.futures
+import copy
+import os
+import typing
+
+import numpy
+
+try:
+    from multiprocessing import shared_memory
+except ImportError: # pragma: no cover
+    shared_memory = None
+
+from d3m import container
+
+__all__ = ('SystemExecutionError', 'run_systems', 'map_systems')
+
+EXECUTORS = ('thread', 'process')
+
+
+class SystemExecutionError(RuntimeError):
+    """
+    Raised when one or more systems of a system-wise input failed.
+
+    Attributes:
+        errors: dict mapping the position of each failed system to its exception
+    """
+
+    def __init__(self, errors: typing.Dict[int, BaseException]) -> None:
+        self.errors = errors
+        super().__init__('{} system(s) failed: {}'.format(
+            len(errors), '; '.join('system {}: {!r}'.format(system, error)
+                                   for system, error in sorted(errors.items()))))
+
+
+class _SharedFrame:
+    """
+    A system frame whose values live in a shared memory block.
+    """
+
+    def __init__(self, frame: container.DataFrame) -> None:
+        values = numpy.ascontiguousarray(frame.values)
+        self._memory = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        numpy.ndarray(values.shape, dtype=values.dtype, buffer=self._memory.buf)[...] = values
+
+        self.name = self._memory.name
+        self.shape = values.shape
+        self.dtype = values.dtype
+        self.columns = frame.columns
+        self.index = frame.index
+        self.metadata = frame.metadata
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_memory']
+        return state
+
+    def load(self) -> container.DataFrame:
+        memory = shared_memory.SharedMemory(name=self.name)
+        try:
+            values = numpy.array(numpy.ndarray(self.shape, dtype=self.dtype, buffer=memory.buf))
+        finally:
+            memory.close()
+        frame = container.DataFrame(values, columns=self.columns, index=self.index, generate_metadata=False)
+        frame.metadata = self.metadata
+        return frame
+
+    def release(self) -> None:
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _can_share(frame) -> bool:
+    if shared_memory is None or not isinstance(frame, container.DataFrame):
+        return False
+    dtypes = set(frame.dtypes)
+    return len(dtypes) == 1 and dtypes.pop().kind in 'biuf'
+
+
+def _run_system(primitive, method: str, inputs: container.DataFrame, fit: bool, timeout: typing.Optional[float]):
+    if fit:
+        primitive.set_training_data(inputs=inputs)
+        primitive._fit()
+    return getattr(primitive, method)(inputs=inputs, timeout=timeout)
+
+
+_worker_primitive = None
+
+
+def _init_worker(primitive) -> None:
+    global _worker_primitive
+    _worker_primitive = primitive
+
+
+def _run_worker_system(method: str, inputs, fit: bool, timeout: typing.Optional[float]):
+    if isinstance(inputs, _SharedFrame):
+        inputs = inputs.load()
+    return _run_system(_worker_primitive, method, inputs, fit, timeout)
+
+
+def _effective_n_jobs(n_jobs: int, n_systems: int) -> int:
+    if n_jobs < 0:
+        n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return max(min(n_jobs, n_systems), 1)
+
+
+def _check_executor(executor: str) -> None:
+    if executor not in EXECUTORS:
+        raise ValueError("executor must be one of {}, got {!r}".format(EXECUTORS, executor))
+
+
+def _gather(futures, results: list, errors: dict) -> None:
+    for position, future in enumerate(futures):
+        try:
+            results[position] = future.result()
+        except Exception as error:
+            errors[position] = error
+
+
+def map_systems(func: typing.Callable, arguments: typing.Sequence[tuple], *, n_jobs: int = 1,
+                executor: str = 'thread') -> typing.List[typing.Any]:
+    """
+    Call func once per system, with the arguments of that system.
+
+    Unlike run_systems, nothing is copied: func is responsible for the state it touches,
+    and with the process executor func and its arguments must be picklable.
+    Args:
+        func: the function to call
+        arguments: the tuple of positional arguments of each system
+        n_jobs: number of workers, -1 for all cores
+        executor: 'thread' or 'process'
+
+    Returns:
+        list of the results of func, in the order of the systems
+    """
+    _check_executor(executor)
+
+    arguments = list(arguments)
+    n_jobs = _effective_n_jobs(n_jobs, len(arguments))
+    results = [None] * len(arguments)
+    errors = {}
+
+    if n_jobs == 1:
+        for position, args in enumerate(arguments):
+            try:
+                results[position] = func(*args)
+            except Exception as error:
+                errors[position] = error
+    else:
+        pool_class = concurrent.futures.ThreadPoolExecutor if executor == 'thread' \
+            else concurrent.futures.ProcessPoolExecutor
+        with pool_class(max_workers=n_jobs) as pool:
+            _gather([pool.submit(func, *args) for args in arguments], results, errors)
+
+    if errors:
+        raise SystemExecutionError(errors)
+    return results
+
+
+def run_systems(primitive, method: str, systems: typing.Sequence[container.DataFrame], *, fit: bool = False,
+                timeout: float = None, n_jobs: int = None, executor: str = None) -> typing.List[typing.Any]:
+    """
+    Call a produce method of the primitive on every system, optionally fitting it on the system first.
+
+    With one job the primitive itself is used, one system after the other. Otherwise every thread
+    works on its own copy of the primitive and every process on the copy it received at start-up,
+    so the state of the primitive is left untouched.
+    Args:
+        primitive: the primitive to run
+        method: name of the method to call, e.g. '_produce' or '_produce_score'
+        systems: the DataFrame of each system
+        fit: whether to fit the primitive on each system before calling the method
+        timeout: passed to the method
+        n_jobs: number of workers, -1 for all cores. Defaults to the 'n_jobs' hyperparameter, or 1.
+        executor: 'thread' or 'process'. Defaults to the 'executor' hyperparameter, or 'process'.
+
+    Returns:
+        list of the results of the method, in the order of the systems
+    """
+    hyperparams = getattr(primitive, 'hyperparams', None) or {}
+    if n_jobs is None:
+        n_jobs = hyperparams.get('n_jobs', 1)
+    if executor is None:
+        executor = hyperparams.get('executor', 'process')
+    _check_executor(executor)
+
+    systems = list(systems)
+    n_jobs = _effective_n_jobs(n_jobs, len(systems))
+    results = [None] * len(systems)
+    errors = {}
+
+    if n_jobs == 1:
+        for position, inputs in enumerate(systems):
+            try:
+                results[position] = _run_system(primitive, method, inputs, fit, timeout)
+            except Exception as error:
+                errors[position] = error
+
+    elif executor == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(_run_system, copy.deepcopy(primitive) if fit else copy.copy(primitive),
+                                   method, inputs, fit, timeout)
+                       for inputs in systems]
+            _gather(futures, results, errors)
+
+    else:
+        shared = [_SharedFrame(inputs) if _can_share(inputs) else None for inputs in systems]
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                                        initargs=(primitive,)) as pool:
+                futures = [pool.submit(_run_worker_system, method, shared_inputs or inputs, fit, timeout)
+                           for inputs, shared_inputs in zip(systems, shared)]
+                _gather(futures, results, errors)
+        finally:
+            for shared_inputs in shared:
+                if shared_inputs is not None:
+                    shared_inputs.release()
+
+    if errors:
+        raise SystemExecutionError(errors)
+    return results
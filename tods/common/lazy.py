@@ -0,0 +1,106 @@
+"""Load the primitives of a package on first use.
+
+Importing a primitive module imports its backend: tensorflow for Telemanom,
+DeepLog and LSTMOD, tf.compat.v1 for DAGMM, stumpy and numba for the matrix
+profile, pyod for the pyod detectors. The tods packages therefore do not
+import their primitives up front. Their ``__getattr__`` (PEP 562) imports the
+module of a primitive when the primitive is first looked up, so
+``from tods import HBOSPrimitive`` pays for pyod but not for tensorflow.
+
+The primitives of each package are listed in ``resources/.entry_points.ini``,
+the file the d3m entry points are generated from. The sk_interface estimators
+are found from their module names, ``<Name>_skinterface`` defines ``<Name>SKI``.
+"""
+import configparser
+import functools
+import importlib
+import os
+import pkgutil
+import typing
+
+__all__ = ('ENTRY_POINTS_PATH', 'entry_points', 'primitives', 'estimators', 'attach')
+
+ENTRY_POINTS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', '.entry_points.ini')
+
+_SKI_SUFFIX = '_skinterface'
+
+
+@functools.lru_cache(maxsize=None)
+def entry_points(path: str = ENTRY_POINTS_PATH) -> typing.Dict[str, typing.Tuple[str, str]]:
+    """
+    Read the d3m primitive entry points.
+    Args:
+        path: the .entry_points.ini file
+
+    Returns:
+        dict mapping each primitive path to the module and the class name of the primitive
+    """
+    parser = configparser.ConfigParser(delimiters=('=',))
+    parser.optionxform = str
+    parser.read(path)
+
+    result = {}
+    for primitive_path, target in parser.items('d3m.primitives'):
+        module, _, name = target.strip().partition(':')
+        result[primitive_path] = (module, name)
+    return result
+
+
+def primitives(package: str, path: str = ENTRY_POINTS_PATH) -> typing.Dict[str, str]:
+    """
+    The primitives defined by the modules of a package.
+    Args:
+        package: the package, e.g. 'tods.detection_algorithm'
+        path: the .entry_points.ini file
+
+    Returns:
+        dict mapping each primitive class name to its module
+    """
+    return {name: module for module, name in entry_points(path).values()
+            if module.rpartition('.')[0] == package}
+
+
+def estimators(package: str) -> typing.Dict[str, str]:
+    """
+    The sk_interface estimators defined by the modules of a package.
+    Args:
+        package: the package, e.g. 'tods.sk_interface.detection_algorithm'
+
+    Returns:
+        dict mapping each estimator class name to its module
+    """
+    directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), *package.split('.')[1:])
+    return {module_info.name[:-len(_SKI_SUFFIX)] + 'SKI': '{}.{}'.format(package, module_info.name)
+            for module_info in pkgutil.iter_modules([directory])
+            if module_info.name.endswith(_SKI_SUFFIX)}
+
+
+def attach(package: str, names: typing.Dict[str, str]):
+    """
+    Make the given names lazy attributes of a package.
+
+    Meant to be called from the __init__ of the package:
+
+        __getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.primitives(__name__))
+
+    A name is imported from its module on first access and then kept in the namespace of the package.
+    Args:
+        package: the name of the package
+        names: dict mapping each attribute name to the module that defines it
+
+    Returns:
+        the __getattr__ and __dir__ functions and the __all__ list of the package
+    """
+    names = dict(names)
+
+    def __getattr__(name):
+        if name not in names:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+        value = getattr(importlib.import_module(names[name]), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(importlib.import_module(package))) | set(names))
+
+    return __getattr__, __dir__, sorted(names)
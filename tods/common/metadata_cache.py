@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Cached column metadata of the outputs of the primitives.
+
+Wrapping the predictions of a primitive into a container DataFrame generates
+its metadata, then updates it one output column at a time. Each update copies
+the metadata, so the cost grows with the number of columns. It is paid on
+every call, although the metadata is the same from one call to the next:
+only the number of rows changes.
+
+``wrap_predictions`` builds the metadata the usual way the first time, and
+keeps it as a template keyed by:
+
+- the class of the primitive and its hyperparams,
+- the metadata of every input column,
+- the labels and dtypes of the output columns,
+- whatever else the primitive passes in ``key``, e.g. the indices of the
+  columns it was fitted on.
+
+Later calls with the same key build the DataFrame without generating any
+metadata. They stamp the template on it with a single update of the number
+of rows.
+
+Outputs holding Python objects are not cached: their structural types depend
+on the values. Setting the ``TODS_METADATA_CACHE`` environment variable to
+``0`` disables the cache.
+"""
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Set
+
+from d3m import container
+
+__all__ = ('wrap_predictions', 'enable', 'disable', 'clear', 'info')
+
+MAX_TEMPLATES = 256
+
+_templates = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'uncacheable': 0}
+_enabled = os.environ.get('TODS_METADATA_CACHE', '1') != '0'
+
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return tuple((name, _freeze(item)) for name, item in value.items())
+    if isinstance(value, (list, tuple, Set)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _template_key(primitive, inputs, outputs, key):
+    if any(dtype.hasobject for dtype in outputs.dtypes):
+        return None
+    inputs_metadata = inputs.metadata
+    try:
+        template_key = (
+            type(primitive),
+            _freeze(primitive.hyperparams),
+            tuple(_freeze(inputs_metadata.query_column(index)) for index in range(inputs.shape[1])),
+            tuple(outputs.columns),
+            tuple(outputs.dtypes),
+            _freeze(key),
+        )
+        hash(template_key)
+    except (KeyError, TypeError):
+        return None
+    return template_key
+
+
+def wrap_predictions(primitive, inputs, predictions, build_metadata, key=()):
+    """Wrap predictions into a container DataFrame, with cached metadata.
+
+    Args:
+        primitive: the primitive producing the predictions
+        inputs: Container Dataframe the predictions were computed from
+        predictions: array-like data (n_samples, n_features)
+        build_metadata: function of the outputs, with generated metadata, returning their final metadata
+        key: anything else the metadata depends on
+
+    Returns:
+        Dataframe
+    """
+    if not _enabled:
+        outputs = container.DataFrame(predictions, generate_metadata=True)
+        outputs.metadata = build_metadata(outputs)
+        return outputs
+
+    outputs = container.DataFrame(predictions, generate_metadata=False)
+    template_key = _template_key(primitive, inputs, outputs, key)
+    template = None
+    if template_key is not None:
+        with _lock:
+            template = _templates.get(template_key)
+            if template is not None:
+                _templates.move_to_end(template_key)
+                _stats['hits'] += 1
+
+    if template is not None:
+        # metadata is immutable, every update returns a new object and the template is left untouched
+        outputs.metadata = template.update((), {'dimension': {'length': outputs.shape[0]}})
+        return outputs
+
+    outputs.metadata = outputs.metadata.generate(outputs)
+    outputs.metadata = build_metadata(outputs)
+    with _lock:
+        if template_key is None:
+            _stats['uncacheable'] += 1
+            return outputs
+        _stats['misses'] += 1
+        _templates[template_key] = outputs.metadata
+        while len(_templates) > MAX_TEMPLATES:
+            _templates.popitem(last=False)
+    return outputs
+
+
+def enable():
+    """Use the cached templates.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Build the metadata of every output, as if there were no cache.
+    """
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    """Drop every template, and reset the statistics.
+    """
+    with _lock:
+        _templates.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def info():
+    """Hits, misses, outputs that could not be cached, and number of templates.
+    """
+    with _lock:
+        return dict(_stats, templates=len(_templates), enabled=_enabled)
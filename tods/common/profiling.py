@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""Per-call profiling of the primitives.
+
+The public entry points of the base primitives (``fit``, ``produce``,
+``produce_score``, ``fit_multi_produce``) and of the sk_interface estimators
+are decorated with ``traced``. While at least one sink is enabled, each call
+emits an event with:
+
+- the wall time and the CPU time of the process,
+- the time spent generating d3m metadata, and the rest (``kernel_time``),
+- the peak memory allocated by Python during the call, when tracemalloc is
+  traced (``trace_memory=True``),
+- the shapes of the inputs and of the outputs.
+
+Calls made inside a traced call (a primitive fitted by an sk_interface
+estimator, say) emit their own events, with a larger ``depth``; the time and
+memory of the inner calls are included in those of the outer one. Before
+Python 3.9 the peak of tracemalloc cannot be reset, so only the outermost
+calls measure memory, and they clear the traces of tracemalloc when they
+start. With no sink enabled, a traced method only checks that the list of
+sinks is empty.
+
+    from tods.common import profiling
+
+    with profiling.profile(profiling.ChromeTraceSink('trace.json'), trace_memory=True):
+        pipeline_result = evaluate_pipeline(dataset, pipeline)
+
+The trace opens in chrome://tracing or https://ui.perfetto.dev. Setting the
+``TODS_TRACE`` environment variable to a file name enables a JSON lines sink
+on import, which also covers worker processes: each event is appended as a
+single line.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+__all__ = ('traced', 'enable', 'disable', 'profile', 'LoggingSink', 'JSONLinesSink', 'ChromeTraceSink',
+           'write_chrome_trace')
+
+_sinks = []
+_lock = threading.RLock()
+_local = threading.local()
+_started_tracemalloc = False
+_generate_metadata = None
+# tracemalloc.reset_peak is new in Python 3.9
+_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+def _shape(value):
+    if value is None:
+        return None
+    # CallResult and MultiCallResult
+    if hasattr(value, 'values') and isinstance(getattr(value, 'values'), dict):
+        return {name: _shape(output) for name, output in value.values.items()}
+    if hasattr(value, 'value') and not hasattr(value, 'shape'):
+        return _shape(value.value)
+    if hasattr(value, 'shape'):
+        return list(value.shape)
+    if isinstance(value, (list, tuple)):
+        return [_shape(item) for item in value]
+    return None
+
+
+class _Call(object):
+    """An event being measured, and the metadata time of the calls inside it.
+    """
+
+    def __init__(self, name, input_shape):
+        self.name = name
+        self.input_shape = input_shape
+        self.output_shape = None
+        self.metadata_time = 0.
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+
+        self.memory = tracemalloc.is_tracing() and (_RESET_PEAK or parent is None)
+        if self.memory:
+            if not _RESET_PEAK:
+                # the peak is reset with the traces, the memory allocated before the call is no longer counted
+                tracemalloc.clear_traces()
+            self.memory_start, peak = tracemalloc.get_traced_memory()
+            self.memory_peak = self.memory_start
+            if parent is not None and parent.memory:
+                # keep the peak of the parent so far, before it is reset for this call
+                parent.memory_peak = max(parent.memory_peak, peak)
+            if _RESET_PEAK:
+                tracemalloc.reset_peak()
+        self.start = time.time()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time.perf_counter() - self.wall_start
+        cpu_time = time.process_time() - self.cpu_start
+        stack = _local.stack
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        peak_memory = None
+        if self.memory:
+            self.memory_peak = max(self.memory_peak, tracemalloc.get_traced_memory()[1])
+            peak_memory = self.memory_peak - self.memory_start
+            if parent is not None and parent.memory:
+                parent.memory_peak = max(parent.memory_peak, self.memory_peak)
+                tracemalloc.reset_peak()
+        if parent is not None:
+            parent.metadata_time += self.metadata_time
+
+        event = {
+            'name': self.name,
+            'start': self.start,
+            'wall_time': wall_time,
+            'cpu_time': cpu_time,
+            'metadata_time': self.metadata_time,
+            'kernel_time': max(wall_time - self.metadata_time, 0.),
+            'peak_memory': peak_memory,
+            'input_shape': self.input_shape,
+            'output_shape': self.output_shape,
+            'depth': self.depth,
+            'pid': os.getpid(),
+            'thread': threading.get_ident(),
+        }
+        if exc_type is not None:
+            event['error'] = '{}: {}'.format(exc_type.__name__, exc_value)
+        for sink in list(_sinks):
+            sink.emit(event)
+        return False
+
+
+def traced(method):
+    """Emit an event for every call of method while profiling is enabled.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _sinks:
+            return method(self, *args, **kwargs)
+
+        inputs = kwargs.get('inputs', args[0] if args else getattr(self, '_inputs', None))
+        with _Call('{}.{}'.format(type(self).__name__, method.__name__), _shape(inputs)) as call:
+            result = method(self, *args, **kwargs)
+            call.output_shape = _shape(result)
+        return result
+
+    return wrapper
+
+
+def _patch_metadata():
+    # metadata generation is timed by wrapping DataMetadata.generate while profiling
+    global _generate_metadata
+    try:
+        from d3m.metadata import base as metadata_base
+    except ImportError:
+        return
+    if _generate_metadata is not None:
+        return
+    generate = _generate_metadata = metadata_base.DataMetadata.generate
+
+    @functools.wraps(generate)
+    def timed_generate(self, *args, **kwargs):
+        stack = getattr(_local, 'stack', None)
+        # generate may call itself for nested values, only the outermost call is timed
+        if not stack or getattr(_local, 'in_generate', False):
+            return generate(self, *args, **kwargs)
+        _local.in_generate = True
+        start = time.perf_counter()
+        try:
+            return generate(self, *args, **kwargs)
+        finally:
+            _local.in_generate = False
+            stack[-1].metadata_time += time.perf_counter() - start
+
+    metadata_base.DataMetadata.generate = timed_generate
+
+
+def _unpatch_metadata():
+    global _generate_metadata
+    if _generate_metadata is not None:
+        from d3m.metadata import base as metadata_base
+        metadata_base.DataMetadata.generate = _generate_metadata
+        _generate_metadata = None
+
+
+def enable(*sinks, trace_memory=False):
+    """Start sending events to the given sinks.
+
+    Args:
+        sinks: objects with ``emit(event)`` and ``close()`` methods
+        trace_memory: start tracemalloc, if not yet tracing, to measure the peak memory of each call
+    """
+    global _started_tracemalloc
+    with _lock:
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        _patch_metadata()
+        _sinks.extend(sinks)
+
+
+def disable():
+    """Stop profiling, and close and remove every sink.
+    """
+    global _started_tracemalloc
+    with _lock:
+        sinks = list(_sinks)
+        del _sinks[:]
+        _unpatch_metadata()
+        if _started_tracemalloc:
+            tracemalloc.stop()
+            _started_tracemalloc = False
+    for sink in sinks:
+        sink.close()
+
+
+class profile(object):
+    """Context manager that enables profiling with the given sinks, and disables it on exit.
+    """
+
+    def __init__(self, *sinks, trace_memory=False):
+        self.sinks = sinks
+        self.trace_memory = trace_memory
+
+    def __enter__(self):
+        enable(*self.sinks, trace_memory=self.trace_memory)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        disable()
+        return False
+
+
+class LoggingSink(object):
+    """Log one line per call.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def emit(self, event):
+        self.logger.log(self.level, '%s%s: %.4fs wall, %.4fs cpu, %.4fs metadata, peak %s, %s -> %s%s',
+                        '  ' * event['depth'], event['name'], event['wall_time'], event['cpu_time'],
+                        event['metadata_time'], event['peak_memory'], event['input_shape'], event['output_shape'],
+                        ', ' + event['error'] if 'error' in event else '')
+
+    def close(self):
+        pass
+
+
+class JSONLinesSink(object):
+    """Append one JSON object per call to a file.
+
+    Each event is written with a single write to a file opened in append
+    mode, so that several processes can share the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a')
+
+    def emit(self, event):
+        line = json.dumps(event) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def write_chrome_trace(events, path):
+    """Write events in the Chrome trace event format.
+
+    Args:
+        events: the events emitted by the traced calls, e.g. read back from a JSON lines file
+        path: the trace file
+    """
+    trace_events = []
+    for event in events:
+        args = {key: value for key, value in event.items()
+                if key not in ('name', 'start', 'wall_time', 'pid', 'thread')}
+        trace_events.append({
+            'name': event['name'],
+            'cat': 'tods',
+            'ph': 'X',
+            'ts': event['start'] * 1e6,
+            'dur': event['wall_time'] * 1e6,
+            'pid': event['pid'],
+            'tid': event['thread'],
+            'args': args,
+        })
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+
+class ChromeTraceSink(object):
+    """Collect the events, and write them as a Chrome trace on close.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._events = []
+
+    def emit(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def close(self):
+        with self._lock:
+            write_chrome_trace(self._events, self.path)
+
+
+if os.environ.get('TODS_TRACE'):
+    enable(JSONLinesSink(os.environ['TODS_TRACE']))
+    atexit.register(disable)
@@ -0,0 +1,204 @@
+"""Content-addressed cache of primitive step outputs on local disk.
+
+Tuning and re-running pipelines runs the same steps on the same inputs over
+and over. A step output is stored under a key made of everything it is
+computed from: the primitive id and version, its hyperparams, its random
+seed and fingerprints of its inputs, which digest their bytes together with
+their column schema (``array_digest``, and ``value_digest`` of
+``tods.searcher.runtime`` for d3m containers). As the key only depends on
+content, entries stay valid across runs and processes, and several
+processes can share one directory.
+
+Each entry is one file holding the pickled value, in which arrays are raw
+bytes. It is written to a temporary file and renamed, so that readers never
+see a partial entry. Reading an entry touches it, and when the entries grow
+over ``max_bytes`` the least recently used ones are removed.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import typing
+
+import numpy
+
+__all__ = ('DiskStepCache', 'array_digest', 'step_key')
+
+# size of the cache directory by default
+MAX_BYTES = 2 ** 30
+
+ENTRY_SUFFIX = '.pkl'
+
+# dtype kinds whose bytes are the values
+_NUMERIC_KINDS = 'biufcmM'
+
+
+def array_digest(array) -> typing.Optional[str]:
+    """
+    Digest of the dtype, shape and bytes of a numeric ndarray.
+    Args:
+        array: ndarray
+
+    Returns:
+        hex digest, or None if the array is not numeric
+    """
+    if not isinstance(array, numpy.ndarray) or array.dtype.kind not in _NUMERIC_KINDS:
+        return None
+    digest = hashlib.sha1(repr((array.dtype.str, array.shape)).encode())
+    digest.update(numpy.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+def step_key(*parts) -> str:
+    """
+    Key of a step, made of its JSON-serializable parts; other values are keyed by their str.
+    """
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class DiskStepCache:
+    """
+    Step outputs stored in a directory, with least recently used eviction.
+
+    Args:
+        directory: where the entries are stored, created if needed
+        max_bytes: size of the entries above which the least recently used ones are removed
+
+    Attributes:
+        hits: number of entries read
+        misses: number of keys without an entry
+        evictions: number of entries removed to stay under max_bytes
+    """
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # size of the entries, scanned on the first put
+        self._size: typing.Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str):
+        """
+        The value stored under key, None if there is none; None itself is never stored.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # never stored, removed by another process in the meantime, or stored by other code
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> bool:
+        """
+        Store value under key.
+
+        Returns:
+            False if the value is None, cannot be pickled or is larger than max_bytes, and is not stored
+        """
+        if value is None:
+            # get could not tell it from a missing entry
+            return False
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        path = self._path(key)
+        try:
+            # an entry already under key is replaced, its size no longer counts
+            replaced_size = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced_size = 0
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced_size
+            if self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def _entries(self) -> typing.List[typing.Tuple[float, int, str]]:
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        # Other processes may have added or removed entries, so the directory is scanned again.
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> typing.Dict[str, int]:
+        """
+        Counters and size of the cache.
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
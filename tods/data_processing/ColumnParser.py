@@ -4,6 +4,7 @@ import typing
 import uuid
 
 import numpy  # type: ignore
+import pandas  # type: ignore
 
 from d3m import container, utils as d3m_utils
 from d3m.base import utils as base_utils
@@ -18,6 +19,11 @@ Inputs = container.DataFrame
 Outputs = container.DataFrame
 
 
+def _are_strings(values: numpy.ndarray) -> bool:
+    # Empty columns and columns with missing values are parsed value by value, as they always were.
+    return len(values) > 0 and pandas.api.types.infer_dtype(values, skipna=False) == 'string'
+
+
 class Hyperparams(hyperparams.Hyperparams):
     parse_semantic_types = hyperparams.Set(
         elements=hyperparams.Enumeration(
@@ -134,6 +140,10 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> typing.Optional[int]:
+        return 0
+
     def _can_use_column(self, inputs_metadata: metadata_base.DataMetadata, column_index: int) -> bool:   # pragma: no cover
         column_metadata = inputs_metadata.query((metadata_base.ALL_ELEMENTS, column_index))
 
@@ -269,17 +279,26 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
     def _parse_boolean_metadata(cls, inputs_metadata: metadata_base.DataMetadata, column_index: metadata_base.SimpleSelectorSegment) -> metadata_base.DataMetadata:
         return cls._parse_categorical_metadata(inputs_metadata, column_index) # pragma: no cover
 
+    @classmethod
+    def _hash_value(cls, value: str) -> int:
+        value_hash = hashlib.sha256(value.encode('utf8'))
+        return int.from_bytes(value_hash.digest()[0:8], byteorder='little') ^ int.from_bytes(value_hash.digest()[8:16], byteorder='little') ^ \
+            int.from_bytes(value_hash.digest()[16:24], byteorder='little') ^ int.from_bytes(value_hash.digest()[24:32], byteorder='little')
+
     @classmethod
     def _parse_categorical_data(cls, inputs: Inputs, column_index: metadata_base.SimpleSelectorSegment) -> Outputs: # pragma: no cover
-        values_map: typing.Dict[str, int] = {}
-        for value in inputs.iloc[:, column_index]:
-            value = value.strip()
-            if value not in values_map:
-                value_hash = hashlib.sha256(value.encode('utf8'))
-                values_map[value] = int.from_bytes(value_hash.digest()[0:8], byteorder='little') ^ int.from_bytes(value_hash.digest()[8:16], byteorder='little') ^ \
-                    int.from_bytes(value_hash.digest()[16:24], byteorder='little') ^ int.from_bytes(value_hash.digest()[24:32], byteorder='little')
-
-        outputs = container.DataFrame({inputs.columns[column_index]: [values_map[value.strip()] for value in inputs.iloc[:, column_index]]}, generate_metadata=False)
+        values = inputs.iloc[:, column_index].to_numpy(dtype=object)
+        codes, uniques = pandas.factorize(values)
+
+        if len(values) and (codes >= 0).all():
+            # Only distinct values are stripped and hashed. Hashes are converted by pandas like a list of
+            # hashes of every value would be, into int64 or uint64 depending on their range.
+            hashes = pandas.Series([cls._hash_value(value.strip()) for value in uniques]).to_numpy()[codes]
+        else:
+            # Missing values cannot be stripped, this fails as it always did.
+            hashes = [cls._hash_value(value.strip()) for value in values]
+
+        outputs = container.DataFrame({inputs.columns[column_index]: hashes}, generate_metadata=False)
         outputs.metadata = cls._parse_categorical_metadata(inputs.metadata, column_index)
 
         return outputs
@@ -302,10 +321,35 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
                 # No luck, use NaN to represent a missing value.
                 return float('nan')
 
+    @classmethod
+    def _parse_integer_values(cls, values: numpy.ndarray) -> typing.Union[numpy.ndarray, typing.List]:
+        """
+        Same values as ``_str_to_int`` of every value, in the same dtype once in a DataFrame.
+        """
+        if _are_strings(values):
+            try:
+                # Casting an object array calls int() on every value, which ignores surrounding whitespace.
+                return values.astype(numpy.int64)
+            except (ValueError, OverflowError):
+                pass
+
+            floats = numpy.asarray(cls._parse_float_values(values), dtype=numpy.float64)
+            missing = numpy.isnan(floats)
+            if missing.any() and not numpy.isinf(floats).any():
+                # A missing value makes the whole column float, where int(float(value)) is truncation,
+                # and integers are the same whether parsed by int() or by float(). Adding zero turns -0.0 into 0.0.
+                return numpy.trunc(floats) + 0.
+            if not missing.any() and (numpy.abs(floats) < 2 ** 53).all():
+                # Below 2 ** 53 integers are represented exactly by floats.
+                return numpy.trunc(floats).astype(numpy.int64)
+
+        return [cls._str_to_int(value) for value in values]
+
     @classmethod
     def _parse_integer(cls, inputs: Inputs, column_index: metadata_base.SimpleSelectorSegment,
                        integer_required: bool) -> container.DataFrame:
-        outputs = container.DataFrame({inputs.columns[column_index]: [cls._str_to_int(value) for value in inputs.iloc[:, column_index]]}, generate_metadata=False)
+        values = cls._parse_integer_values(inputs.iloc[:, column_index].to_numpy(dtype=object))
+        outputs = container.DataFrame({inputs.columns[column_index]: values}, generate_metadata=False)
 
         if outputs.dtypes.iloc[0].kind == 'f':
             structural_type: type = float
@@ -336,9 +380,35 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
         except ValueError: # pragma: no cover
             return float('nan')
 
+    @classmethod
+    def _parse_float_values(cls, values: numpy.ndarray) -> typing.Union[numpy.ndarray, typing.List]:
+        """
+        Same values as ``_str_to_float`` of every value.
+        """
+        if not _are_strings(values):
+            return [cls._str_to_float(value) for value in values]
+
+        try:
+            # Casting an object array calls float() on every value, which ignores surrounding whitespace.
+            return values.astype(numpy.float64)
+        except ValueError:
+            pass
+
+        # pandas finds the values which cannot be parsed, those are left to "_str_to_float"
+        # (which also parses "nan" and numbers with underscores) and the others are parsed by float().
+        floats = pandas.to_numeric(values, errors='coerce').astype(numpy.float64)
+        invalid = numpy.isnan(floats)
+        try:
+            floats[~invalid] = values[~invalid].astype(numpy.float64)
+        except ValueError:
+            return [cls._str_to_float(value) for value in values]
+        floats[invalid] = [cls._str_to_float(value) for value in values[invalid]]
+        return floats
+
     @classmethod
     def _parse_float_data(cls, inputs: Inputs, column_index: metadata_base.SimpleSelectorSegment) -> Outputs:
-        outputs = container.DataFrame({inputs.columns[column_index]: [cls._str_to_float(value) for value in inputs.iloc[:, column_index]]}, generate_metadata=False)
+        values = cls._parse_float_values(inputs.iloc[:, column_index].to_numpy(dtype=object))
+        outputs = container.DataFrame({inputs.columns[column_index]: values}, generate_metadata=False)
         outputs.metadata = cls._parse_float_metadata(inputs.metadata, column_index)
 
         return outputs
@@ -351,15 +421,18 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
     @classmethod
     def _parse_float_vector_data(cls, inputs: Inputs, column_index: metadata_base.SimpleSelectorSegment) -> Outputs: # pragma: no cover
         # We are pretty strict here because we are assuming this was generated programmatically.
-        outputs = container.DataFrame(
-            {
-                inputs.columns[column_index]: [
-                    container.ndarray([cls._str_to_float(value) for value in values.split(',')])
-                    for values in inputs.iloc[:, column_index]
-                ],
-            },
-            generate_metadata=False,
-        )
+        column = inputs.iloc[:, column_index].to_numpy(dtype=object)
+        if _are_strings(column):
+            # All vectors are split at once, and the resulting arrays are views of one array of floats.
+            lengths = numpy.fromiter((values.count(',') for values in column), dtype=numpy.int64, count=len(column)) + 1
+            floats = cls._parse_float_values(numpy.array(','.join(column).split(','), dtype=object))
+            vectors = [container.ndarray(vector) for vector in numpy.split(numpy.asarray(floats, dtype=numpy.float64), numpy.cumsum(lengths)[:-1])]
+        else:
+            vectors = [
+                container.ndarray([cls._str_to_float(value) for value in values.split(',')])
+                for values in column
+            ]
+        outputs = container.DataFrame({inputs.columns[column_index]: vectors}, generate_metadata=False)
         outputs.metadata = cls._parse_float_metadata(inputs.metadata, column_index)
         # We have to automatically generate metadata to set ndarray dimension(s).
         outputs.metadata = outputs.metadata.generate(outputs)
@@ -376,7 +449,10 @@ class ColumnParserPrimitive(transformer.TransformerPrimitiveBase[Inputs, Outputs
 
     @classmethod
     def _parse_time_data(cls, inputs: Inputs, column_index: metadata_base.SimpleSelectorSegment, fuzzy: bool) -> Outputs: # pragma: no cover
-        outputs = container.DataFrame({inputs.columns[column_index]: [utils.parse_datetime_to_float(value, fuzzy=fuzzy) for value in inputs.iloc[:, column_index]]}, generate_metadata=False)
+        values = inputs.iloc[:, column_index].to_numpy(dtype=object)
+        # An empty list, not an empty array, so that an empty column has the dtype it always had.
+        values = utils.parse_datetimes_to_float(values, fuzzy=fuzzy) if len(values) else []
+        outputs = container.DataFrame({inputs.columns[column_index]: values}, generate_metadata=False)
         outputs.metadata = cls._parse_time_metadata(inputs.metadata, column_index)
 
         return outputs
@@ -85,6 +85,10 @@ class ConstructPredictionsPrimitive(transformer.TransformerPrimitiveBase[Inputs,
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> typing.Optional[int]:
+        return 0
+
     def _filter_index_columns(self, inputs_metadata: metadata_base.DataMetadata, index_columns: typing.Sequence[int]) -> typing.Sequence[int]:
         if self.hyperparams['use_columns']: # pragma: no cover
             index_columns = [index_column_index for index_column_index in index_columns if index_column_index in self.hyperparams['use_columns']]
@@ -3,16 +3,17 @@ from d3m.primitive_interfaces import base, transformer
 from d3m.metadata import base as metadata_base, hyperparams
 import uuid
 
-import os.path
+import numpy
 from d3m import utils
 
-import time
-
 __all__ = ('ContinuityValidationPrimitive',)
 
 Inputs = container.DataFrame
 Outputs = container.DataFrame
 
+# timestamps closer than this fraction of the interval are on the same point of the grid
+_INTERVAL_TOLERANCE = 1e-6
+
 
 class Hyperparams(hyperparams.Hyperparams):
     continuity_option = hyperparams.Enumeration(
@@ -105,46 +106,37 @@ class ContinuityValidationPrimitive(transformer.TransformerPrimitiveBase[Inputs,
 
     def _find_ablation_set(self, inputs):
         """
-        Find the longest series with minimum timestamp interval of inputs
-        """
-        # find the min inteval and max interval
-        min_interval = inputs.iloc[1]['timestamp'] - inputs.iloc[0]['timestamp']
-        for i in range(2, inputs.shape[0]):
-            curr_interval = inputs.iloc[i]['timestamp'] - inputs.iloc[i - 1]['timestamp']
-            if min_interval > curr_interval:
-                min_interval = curr_interval
-
-        max_interval = ((inputs.iloc[-1]['timestamp'] - inputs.iloc[0]['timestamp']) + min_interval * (2 - inputs.shape[0]))
-
-        print((inputs.iloc[-1]['timestamp'] - inputs.iloc[0]['timestamp']), inputs.shape[0])
+        Find the longest regular series of timestamps of inputs.
 
-        interval = min_interval
-        ablation_set = list()
-        origin_set = set(inputs['timestamp'])
-
-        print(min_interval, max_interval)
-
-        while interval <= max_interval:
-            start = 0
-            while  (inputs.iloc[start]['timestamp'] <= inputs.iloc[0]['timestamp'] + max_interval) and (inputs.iloc[start]['timestamp'] <= inputs.iloc[-1]['timestamp']):
-                tmp_list = list()
-                tmp = utils.numpy.arange(start=inputs.iloc[start]['timestamp'], step=interval,stop=inputs.iloc[-1]['timestamp'])
+        The interval of the series is the most frequent interval between consecutive timestamps
+        (the smallest one on ties). The series may skip the timestamps that are not on its grid,
+        e.g. 1, 3, 5, 7, 9 is found in 1, 2, 3, 5, 7, 9 when the dominant interval is 2.
+        On ties the series that starts first is returned.
+        """
+        timestamps = numpy.unique(inputs['timestamp'].values)
+        if timestamps.shape[0] < 2:
+            return timestamps
 
-                for i in tmp:
-                    if i in origin_set:
-                        tmp_list.append(i)
-                    else: break
+        intervals, counts = numpy.unique(numpy.diff(timestamps), return_counts=True)
+        interval = intervals[numpy.argmax(counts)]
+        tolerance = interval * _INTERVAL_TOLERANCE
 
-                ablation_set.append(tmp_list)
-                start += 1
+        # successor of every timestamp on the grid of the interval, itself if there is none
+        n = timestamps.shape[0]
+        successor = numpy.searchsorted(timestamps, timestamps + interval - tolerance)
+        found = successor < n
+        found[found] = timestamps[successor[found]] <= timestamps[found] + interval + tolerance
+        successor = numpy.where(found, successor, numpy.arange(n))
 
-            interval += min_interval
+        # by pointer jumping: the number of steps from every timestamp to the end of its series, and that end
+        steps = found.astype(numpy.int64)
+        end = successor
+        while (end[end] != end).any():
+            steps = steps + steps[end]
+            end = end[end]
 
-        max_size_index = 0
-        for i in range(1, len(ablation_set)):
-            if len(ablation_set[i]) > len(ablation_set[max_size_index]):
-                max_size_index = i
-        return ablation_set[max_size_index]
+        start = numpy.argmax(steps)
+        return timestamps[(end == end[start]) & (timestamps >= timestamps[start])]
 
 
     def _continuity_imputation(self, inputs: Inputs):
@@ -152,26 +144,32 @@ class ContinuityValidationPrimitive(transformer.TransformerPrimitiveBase[Inputs,
         Linearly imputate the missing timestmap and value of inputs
         """
         interval = self.hyperparams['interval']
-        time1 = inputs.iloc[0]['timestamp']
-      
-        for i in range(1, inputs.shape[0]):
-            time2 = inputs.iloc[i]['timestamp']
-            if time2 - time1 != interval:
-            
-                blank_number = int((time2 - time1) / interval) # how many imputation should there be between two timestamps in original data
-                for j in range(1, blank_number):
-
-                    dict = {'timestamp':[time1 + interval * j], 'ground_truth':[int(inputs.iloc[i]['ground_truth'])]}
-
-                    for col in list(inputs.columns.values):
-                        if not col in ['d3mIndex', 'timestamp', 'ground_truth']:
-                            dict[col] = [inputs.iloc[i-1][col] + (inputs.iloc[i][col] - inputs.iloc[i-1][col]) / blank_number * j]
-                    
-                    inputs = inputs.append(utils.pandas.DataFrame(dict), ignore_index=True, sort=False)
-                                
-            time1 = time2
+        timestamps = inputs['timestamp'].values
+
+        # how many imputation should there be between two timestamps in original data
+        blank_numbers = ((timestamps[1:] - timestamps[:-1]) / interval).astype(numpy.int64)
+        gaps = numpy.flatnonzero(blank_numbers > 1)
+
+        if gaps.shape[0] == 0:
+            inputs = inputs.copy()
+        else:
+            # gap i gets blank_numbers[i] - 1 rows, at timestamps[i] + interval * j for j = 1, ..., blank_numbers[i] - 1
+            blank = blank_numbers[gaps]
+            counts = blank - 1
+            rows = numpy.repeat(gaps, counts)
+            j = numpy.arange(rows.shape[0]) - numpy.repeat(numpy.cumsum(counts) - counts, counts) + 1
+            blank = numpy.repeat(blank, counts)
+
+            imputed = {'timestamp': timestamps[rows] + interval * j}
+            for col in list(inputs.columns.values):
+                if col == 'ground_truth':
+                    imputed[col] = inputs[col].values[rows + 1].astype(int)
+                elif not col in ['d3mIndex', 'timestamp']:
+                    values = inputs[col].values
+                    imputed[col] = values[rows] + (values[rows + 1] - values[rows]) / blank * j
+
+            inputs = utils.pandas.concat([inputs, utils.pandas.DataFrame(imputed)], ignore_index=True, sort=False)
 
         inputs.sort_values("timestamp",inplace=True)
         inputs['d3mIndex'] = list(range(inputs.shape[0]))
         return inputs
-
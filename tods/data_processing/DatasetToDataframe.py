@@ -51,6 +51,10 @@ class DatasetToDataFramePrimitive(transformer.TransformerPrimitiveBase[Inputs, O
 
         return base.CallResult(dataframe)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> typing.Optional[int]:
+        return 0
+
     def _update_metadata(self, metadata: metadata_base.DataMetadata, resource_id: metadata_base.SelectorSegment) -> metadata_base.DataMetadata:
         resource_metadata = dict(metadata.query((resource_id,)))
 
@@ -93,6 +93,10 @@ class ExtractColumnsBySemanticTypesPrimitive(transformer.TransformerPrimitiveBas
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> typing.Optional[int]:
+        return 0
+
     def _can_use_column(self, inputs_metadata: metadata_base.DataMetadata, column_index: int) -> bool:
         column_metadata = inputs_metadata.query((metadata_base.ALL_ELEMENTS, column_index))
 
@@ -264,6 +264,10 @@ class SKImputerPrimitive(UnsupervisedLearnerPrimitiveBase[Inputs, Outputs, Param
 
     
     
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return 0
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
 
@@ -1,8 +1,4 @@
-from tods.data_processing.CategoricalToBinary import CategoricalToBinaryPrimitive
-from tods.data_processing.ColumnFilter import ColumnFilterPrimitive
-from tods.data_processing.ContinuityValidation import ContinuityValidationPrimitive
-from tods.data_processing.DatasetToDataframe import DatasetToDataFramePrimitive
-from tods.data_processing.DuplicationValidation import DuplicationValidationPrimitive
-from tods.data_processing.SKImputer import SKImputerPrimitive
-from tods.data_processing.TimeIntervalTransform import TimeIntervalTransformPrimitive
-from tods.data_processing.TimeStampValidation import TimeStampValidationPrimitive
+# The primitives are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.primitives(__name__))
@@ -4,6 +4,7 @@ import typing
 
 import dateutil.parser
 import numpy  # type: ignore
+import pandas  # type: ignore
 
 from d3m import container, deprecate
 from d3m.base import utils as base_utils
@@ -190,3 +191,61 @@ def parse_datetime_to_float(value: str, *, fuzzy: bool = True) -> float: # pragm
             return parsed.timestamp()
     except (ValueError, OverflowError, TypeError):
         return numpy.nan
+
+
+def _parse_datetimes_with_format(values: numpy.ndarray, *, fuzzy: bool) -> typing.Tuple[numpy.ndarray, numpy.ndarray]: # pragma: no cover
+    # Values parsed at once with the format of the first value, and which of them were parsed.
+    parsed_values = numpy.full(len(values), numpy.nan)
+    parsed = numpy.zeros(len(values), dtype=bool)
+
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format  # type: ignore
+    except ImportError:
+        # pandas < 1.2 only has the private name.
+        from pandas._libs.tslibs.parsing import _guess_datetime_format as guess_datetime_format  # type: ignore
+
+    datetime_format = guess_datetime_format(str(values[0]))
+    if datetime_format is None:
+        return parsed_values, parsed
+    try:
+        datetimes = pandas.to_datetime(values, format=datetime_format, errors='coerce')
+        if datetimes.tz is not None:
+            datetimes = datetimes.tz_convert('UTC').tz_localize(None)
+    except (ValueError, TypeError, OverflowError, AttributeError):
+        return parsed_values, parsed
+
+    # Values without a time zone are in UTC, as with DEFAULT_DATETIME. Microseconds are floored, as dateutil
+    # truncates fractions of seconds, and dividing them is exact below 2 ** 53, as in "datetime.timestamp".
+    microseconds = datetimes.values.astype('datetime64[us]').astype(numpy.int64)
+    parsed = ~numpy.asarray(datetimes.isna()) & (numpy.abs(microseconds) < 2 ** 53)
+    parsed_values[parsed] = microseconds[parsed] / 1e6
+
+    # The format should mean the same to pandas and dateutil, this is checked on a few values.
+    parsed_indices = numpy.flatnonzero(parsed)
+    for index in parsed_indices[[0, len(parsed_indices) // 2, -1]] if len(parsed_indices) else ():
+        if parse_datetime_to_float(values[index], fuzzy=fuzzy) != parsed_values[index]:
+            parsed[:] = False
+            break
+
+    return parsed_values, parsed
+
+
+def parse_datetimes_to_float(values: typing.Sequence[str], *, fuzzy: bool = True) -> numpy.ndarray: # pragma: no cover
+    """
+    Same as "parse_datetime_to_float" of every value.
+
+    Distinct values are parsed once. When pandas can guess the format of the first of them,
+    all those in that format are parsed at once, the others one by one.
+    """
+    codes, uniques = pandas.factorize(numpy.asarray(values, dtype=object))
+    parsed_uniques = numpy.full(len(uniques), numpy.nan)
+    parsed = numpy.zeros(len(uniques), dtype=bool)
+
+    if len(uniques) and pandas.api.types.infer_dtype(uniques, skipna=False) == 'string':
+        parsed_uniques, parsed = _parse_datetimes_with_format(numpy.asarray(uniques, dtype=object), fuzzy=fuzzy)
+
+    for index in numpy.flatnonzero(~parsed):
+        parsed_uniques[index] = parse_datetime_to_float(uniques[index], fuzzy=fuzzy)
+
+    # Missing values (code -1) cannot be parsed.
+    return numpy.where(codes >= 0, parsed_uniques[codes], numpy.nan)
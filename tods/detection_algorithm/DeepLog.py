@@ -16,6 +16,7 @@ from sklearn.utils import check_array
 from sklearn.utils.validation import check_is_fitted
 from pyod.utils.stat_models import pairwise_distances_no_broadcast
 from pyod.models.base import BaseDetector
+from .core.utils.windows import window_dataset, window_starts, split_starts
 
 # Custom import commands if any
 import warnings
@@ -115,6 +116,12 @@ class Hyperparams(Hyperparams_ODBase):
         description="window size"
     )
 
+    shuffle_buffer_size = hyperparams.Hyperparameter[typing.Union[int, None]](
+        default=None,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Number of training windows shuffled together, None to shuffle all of them and 0 not to shuffle"
+    )
+
     features = hyperparams.Hyperparameter[int](
         default=1,
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
@@ -159,6 +166,9 @@ class DeepLogPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params,
 
     """
 
+    # the input is standardized and windowed as a whole
+    _supports_streaming = False
+
     metadata = metadata_base.PrimitiveMetadata({
         '__author__': "DATA Lab @Texas A&M University",
         'name': "DeepLog Anomolay Detection",
@@ -193,6 +203,7 @@ class DeepLogPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params,
                                 l2_regularizer=hyperparams['l2_regularizer'],
                                 validation_size=hyperparams['validation_size'],
                                 window_size=hyperparams['window_size'],
+                                shuffle_buffer_size=hyperparams['shuffle_buffer_size'],
                                 stacked_layers=hyperparams['stacked_layers'],
                                 preprocessing=hyperparams['preprocessing'],
                                 verbose=hyperparams['verbose'],
@@ -265,7 +276,8 @@ class DeeplogLstm(BaseDetector):
                  optimizer : str ='adam',loss=mean_squared_error,preprocessing=True,
                  epochs : int =100, batch_size : int =32, dropout_rate : float =0.0,
                  l2_regularizer : float =0.1, validation_size : float =0.1,
-                 window_size: int = 1, stacked_layers: int  = 1, verbose : int = 1, contamination:int = 0.001):
+                 window_size: int = 1, stacked_layers: int  = 1, verbose : int = 1, contamination:int = 0.001,
+                 shuffle_buffer_size=None):
 
         super(DeeplogLstm, self).__init__(contamination=contamination)
         self.hidden_size = hidden_size
@@ -277,6 +289,7 @@ class DeeplogLstm(BaseDetector):
         self.l2_regularizer = l2_regularizer
         self.validation_size = validation_size
         self.window_size = window_size
+        self.shuffle_buffer_size = shuffle_buffer_size
         self.stacked_layers = stacked_layers
         self.preprocessing = preprocessing
         self.verbose = verbose
@@ -334,51 +347,61 @@ class DeeplogLstm(BaseDetector):
         self._set_n_classes(y)
         self.n_samples_, self.n_features_ = X.shape[0], X.shape[1]
 
-
-        X_train,Y_train = self._preprocess_data_for_LSTM(X)
+        transform = self._fit_scaler(X)
+        train_starts, validation_starts = split_starts(window_starts(X.shape[0], self.window_size + 1),
+                                                       self.validation_size)
+        train_data = window_dataset(X, train_starts, self.window_size, batch_size=self.batch_size,
+                                    shuffle_buffer_size=self.shuffle_buffer_size, transform=transform)
+        validation_data = None
+        if len(validation_starts):
+            validation_data = window_dataset(X, validation_starts, self.window_size, batch_size=self.batch_size,
+                                             transform=transform)
 
         self.model_ = self._build_model()
-        self.history_ = self.model_.fit(X_train, Y_train,
+        self.history_ = self.model_.fit(train_data,
                                         epochs=self.epochs,
-                                        batch_size=self.batch_size,
-                                        validation_split=self.validation_size,
+                                        validation_data=validation_data,
                                         verbose=self.verbose).history
-        pred_scores = np.zeros(X.shape)
-        pred_scores[self.window_size:] = self.model_.predict(X_train)
-
-        Y_train_for_decision_scores = np.zeros(X.shape)
-        Y_train_for_decision_scores[self.window_size:] = Y_train
-        self.decision_scores_ = pairwise_distances_no_broadcast(Y_train_for_decision_scores,
-                                                                pred_scores)
+        self.decision_scores_ = self._prediction_errors(X, transform)
 
         self._process_decision_scores()
         return self
 
 
-    def _preprocess_data_for_LSTM(self,X):
+    def _fit_scaler(self, X, chunk_size=2 ** 20):
         """
-        Preposses data and prepare sequence of data based on number of samples needed in a window
+        Fit the scaler of the data, chunk by chunk so that X may be memory-mapped
         Args:
             inputs : X , ndarray of size (number of sample,features)
 
         Returns:
-            return : X , Y  X being samples till (t-1) of data and Y the t time data
+            return : the transform applied to the windows, None without preprocessing
         """
-        if self.preprocessing:
-            self.scaler_ = StandardScaler()
-            X_norm = self.scaler_.fit_transform(X)
-        else:   # pragma: no cover
-            X_norm = np.copy(X)
-
-        X_data = []
-        Y_data = []
-        for index in range(X.shape[0] - self.window_size):
-            X_data.append(X_norm[index:index+self.window_size])
-            Y_data.append(X_norm[index+self.window_size])
-        X_data = np.asarray(X_data)
-        Y_data = np.asarray(Y_data)
+        if not self.preprocessing:  # pragma: no cover
+            return None
+        self.scaler_ = StandardScaler()
+        for start in range(0, X.shape[0], chunk_size):
+            self.scaler_.partial_fit(X[start:start + chunk_size])
+        return self.scaler_.transform
+
+    def _prediction_errors(self, X, transform):
+        """
+        Distance between each sample and its prediction from the window before it
+        Args:
+            inputs : X , ndarray of size (number of sample,features)
 
-        return X_data,Y_data
+        Returns:
+            return : ndarray of size (number of sample,), 0 for the first window_size samples
+        """
+        scores = np.zeros(X.shape[0])
+        dataset = window_dataset(X, window_starts(X.shape[0], self.window_size + 1), self.window_size,
+                                 batch_size=self.batch_size, transform=transform)
+        index = self.window_size
+        for inputs, targets in dataset:
+            predictions = np.asarray(self.model_.predict_on_batch(inputs))
+            scores[index:index + len(predictions)] = pairwise_distances_no_broadcast(targets.numpy(), predictions)
+            index += len(predictions)
+        return scores
 
 
 
@@ -399,15 +422,7 @@ class DeeplogLstm(BaseDetector):
         check_is_fitted(self, ['model_', 'history_'])
 
         X = check_array(X)
-        #print("inside")
-        #print(X.shape)
-        #print(X[0])
-        X_norm,Y_norm = self._preprocess_data_for_LSTM(X)
-        pred_scores = np.zeros(X.shape)
-        pred_scores[self.window_size:] = self.model_.predict(X_norm)
-        Y_norm_for_decision_scores = np.zeros(X.shape)
-        Y_norm_for_decision_scores[self.window_size:] = Y_norm
-        return pairwise_distances_no_broadcast(Y_norm_for_decision_scores, pred_scores)
+        return self._prediction_errors(X, self._fit_scaler(X))
 
 
 
@@ -282,6 +282,11 @@ class KDiscordODetectorPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs
 
         return
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        # scores windows, not rows
+        return None
+
     def set_training_data(self, *, inputs: Inputs) -> None:
         """
         Set training data for outlier detection.
@@ -230,6 +230,11 @@ class LSTMODetectorPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Pa
 
         return
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        # scores windows, not rows
+        return None
+
     def set_training_data(self, *, inputs: Inputs) -> None:
         """
         Set training data for outlier detection.
@@ -12,6 +12,7 @@ import pandas as pd
 import warnings
 import numpy as np
 from sklearn.utils import check_array
+from sklearn.utils.validation import check_is_fitted
 from sklearn.exceptions import NotFittedError
 # from numba import njit
 from pyod.utils.utility import argmaxn
@@ -35,10 +36,11 @@ import uuid
 
 from d3m import container, utils as d3m_utils
 from .core.CollectiveBase import CollectiveBaseDetector
-from .core.utility import get_sub_matrices
+from .core.utility import get_sub_matrices_view
+from .core.StreamingMatrixProfile import StreamingMatrixProfile
+from ..feature_analysis.core.matrix_profile import approximate_multi_dimensional_profile, multi_dimensional_profile
 
 from .UODBasePrimitive import Params_ODBase, Hyperparams_ODBase, UnsupervisedOutlierDetectorBase
-import stumpy
 
 from sklearn.preprocessing import MinMaxScaler
 # from typing import Union
@@ -62,16 +64,63 @@ class Hyperparams(Hyperparams_ODBase):
         semantic_types=['https://metadata.datadrivendiscovery.org/types/TuningParameter']
     )
 
+    profile_mode = hyperparams.Enumeration[str](
+        values=['self_join', 'ab_join', 'incremental'],
+        default='self_join',
+        description='self_join recomputes the profile of every input. ab_join keeps the profile of the training '
+                    'data and scores each window of an input against it. incremental keeps the profile too and '
+                    'appends each input to it, scoring each new window against all the windows before it.',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter']
+    )
+
+    profile_percentage = hyperparams.Uniform(
+        lower=0.,
+        upper=1.,
+        default=1.,
+        lower_inclusive=False,
+        upper_inclusive=True,
+        description='Fraction of the distance-matrix diagonals computed. Below 1, each window of the self_join '
+                    'mode takes its nearest neighbour among the windows on that fraction of the diagonals, in the '
+                    'multi-dimensional profile scored by the exact mode. The profile fitted by the ab_join and '
+                    'incremental modes is that of each dimension, approximated with scrump.',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter']
+    )
+
+    time_budget = hyperparams.Hyperparameter[typing.Union[float, None]](
+        default=None,
+        description='Seconds the approximate profile is refined for before the best one found is used, None for no '
+                    'limit. Setting it approximates the profile as profile_percentage does. The fraction of the '
+                    'diagonals reached is reported in the matrix_profile metadata of the outputs.',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter']
+    )
+
 class MP(CollectiveBaseDetector):
     """
     This is the class for matrix profile function
     """
-    def __init__(self, window_size, step_size, contamination):
+    # each window is scored against every other window of the input
+    supports_streaming = False
+
+    def __init__(self, window_size, step_size, contamination, profile_mode='self_join', percentage=1.,
+                 time_budget=None):
+        super(MP, self).__init__(contamination=contamination,
+                                 window_size=window_size,
+                                 step_size=step_size)
         self._window_size = window_size
         self._step_size = step_size
         self.contamination = contamination
+        self._profile_mode = profile_mode
+        self._percentage = percentage
+        self._time_budget = time_budget
+        # fraction of the distance-matrix diagonals behind the last scores
+        self.approximation_ = 1.
+        # against the fitted profile, each window is scored on its own
+        self.supports_streaming = profile_mode == 'ab_join'
         return
 
+    def _window_span(self):
+        return self._window_size
+
     def _get_right_inds(self, data):
         right_inds = []
         for row in data[1]:
@@ -94,16 +143,27 @@ class MP(CollectiveBaseDetector):
         self : object
             Fitted estimator.
         """
-        sub_matrices, self.left_inds_, self.right_inds_ = get_sub_matrices(
+        # only the window indices are needed, the view is never materialized
+        _, self.left_inds_, self.right_inds_ = get_sub_matrices_view(
             X,
             window_size=self._window_size,
-            step=self._step_size,
-            return_numpy=True,
-            flatten=True)
-        sub_matrices = sub_matrices[:-1, :]
+            step=self._step_size)
         #self.left_inds_ = self.left_inds_[:-1]
         #self.right_inds_ = self.right_inds_[:-1]
-        matrix_profile, matrix_profile_indices = stumpy.mstump(X.transpose(), m = self._window_size)
+        if self._profile_mode != 'self_join':
+            self.profile_ = StreamingMatrixProfile(self._window_size, self._percentage, self._time_budget).fit(X)
+            self.approximation_ = self.profile_.approximation_
+            self.scaler_ = MinMaxScaler().fit(self.profile_.P_)
+            self.decision_scores_ = self._profile_scores(self.profile_.P_, X.shape[0])
+            self._process_decision_scores()
+            return self
+        if self._percentage < 1. or self._time_budget is not None:
+            self.decision_scores_ = self._approximate_scores(X)
+            self._process_decision_scores()
+            return self
+
+        self.approximation_ = 1.
+        matrix_profile, matrix_profile_indices = multi_dimensional_profile(X, self._window_size)
         blank = X.shape[0] - matrix_profile.shape[0]
         for i in range(blank):
             matrix_profile = np.append(matrix_profile, [matrix_profile[-1]], axis=0)
@@ -148,14 +208,22 @@ class MP(CollectiveBaseDetector):
             transformed_columns=pd.concat([transformed_columns,output], axis=1)
         return transformed_columns
         """
-        sub_matrices, left_inds_, right_inds_ = get_sub_matrices(
+        if self._profile_mode == 'incremental':
+            return self._extend(X)
+
+        _, left_inds_, right_inds_ = get_sub_matrices_view(
             X,
             window_size=self._window_size,
-            step=self._step_size,
-            return_numpy=True,
-            flatten=True)
-        sub_matrices = sub_matrices[:-1, :]
-        matrix_profile, matrix_profile_indices = stumpy.mstump(X.transpose(), m = self._window_size)
+            step=self._step_size)
+        if self._profile_mode == 'ab_join':
+            matrix_profile = self.profile_.join(X)
+            self.approximation_ = self.profile_.approximation_
+            return self._profile_scores(matrix_profile, X.shape[0]), left_inds_, right_inds_
+        if self._percentage < 1. or self._time_budget is not None:
+            return self._approximate_scores(X), left_inds_, right_inds_
+
+        self.approximation_ = 1.
+        matrix_profile, matrix_profile_indices = multi_dimensional_profile(X, self._window_size)
         blank = X.shape[0] - matrix_profile.shape[0]
         for i in range(blank):
             matrix_profile = np.append(matrix_profile, [matrix_profile[-1]], axis=0)
@@ -177,7 +245,53 @@ class MP(CollectiveBaseDetector):
             matrix_profile = np.sum(matrix_profile, axis=1)
 
         return matrix_profile, left_inds_, right_inds_
-        
+
+    def _profile_scores(self, matrix_profile, n_samples=None, scaler=None):
+        """Min-max scale the profile of each dimension as the training profile was, and sum them.
+        The last window is repeated up to n_samples scores.
+        """
+        if n_samples is not None and n_samples > len(matrix_profile):
+            matrix_profile = np.concatenate((matrix_profile,
+                                             np.repeat(matrix_profile[-1:], n_samples - len(matrix_profile), axis=0)))
+        return np.sum((scaler or self.scaler_).transform(matrix_profile), axis=1)
+
+    def _approximate_scores(self, X):
+        """Scores of the approximate multi-dimensional profile of X, scaled on X and summed as the exact profile is.
+        """
+        matrix_profile, _, self.approximation_ = approximate_multi_dimensional_profile(
+            X, self._window_size, percentage=self._percentage, time_budget=self._time_budget)
+        return self._profile_scores(matrix_profile, X.shape[0], MinMaxScaler().fit(matrix_profile))
+
+    def _extend(self, X):
+        """Append X to the fitted profile. Each row of X is scored by the window it completes, whose
+        indices are relative to the first row of X.
+        """
+        check_is_fitted(self, ['profile_'])
+        pred_score = self._profile_scores(self.profile_.extend(X))
+        right_inds_ = np.arange(1, len(pred_score) + 1)
+        return pred_score, right_inds_ - self._window_size, right_inds_
+
+    def _stream_decision_function(self, X):
+        _, left_inds_, right_inds_ = get_sub_matrices_view(X, window_size=self._window_size, step=self._step_size)
+        return self._profile_scores(self.profile_.join(X)[left_inds_]), left_inds_, right_inds_
+
+    def update(self, X):
+        """Score the windows that the new rows of a stream complete. In incremental mode, the rows
+        are appended to the fitted profile.
+        """
+        if self._profile_mode != 'incremental':
+            return super().update(X)
+        if getattr(self, '_stream_seen', None) is None:
+            self.reset_stream()
+
+        pred_score, left_inds_, right_inds_ = self._extend(X)
+        left_inds_ += self._stream_seen
+        right_inds_ += self._stream_seen
+        self._stream_seen += len(pred_score)
+        # windows that start in the stream, every step_size rows
+        new = (left_inds_ >= 0) & (left_inds_ % self._step_size == 0)
+        return pred_score[new], left_inds_[new], right_inds_[new]
+
 class MatrixProfilePrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params, Hyperparams]):
     """
 
@@ -230,7 +344,9 @@ class MatrixProfilePrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Pa
                  docker_containers: Dict[str, DockerContainer] = None) -> None:
         super().__init__(hyperparams=hyperparams, random_seed=random_seed, docker_containers=docker_containers)
 
-        self._clf = MP(window_size=hyperparams['window_size'], step_size=hyperparams['step_size'], contamination=hyperparams['contamination'])
+        self._clf = MP(window_size=hyperparams['window_size'], step_size=hyperparams['step_size'], contamination=hyperparams['contamination'],
+                       profile_mode=hyperparams['profile_mode'], percentage=hyperparams['profile_percentage'],
+                       time_budget=hyperparams['time_budget'])
 
     def set_training_data(self, *, inputs: Inputs) -> None:
         """
@@ -264,7 +380,11 @@ class MatrixProfilePrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Pa
             Container DataFrame
             1 marks Outliers, 0 marks normal.
         """
-        return super().produce(inputs=inputs, timeout=timeout, iterations=iterations)
+        outputs = super().produce(inputs=inputs, timeout=timeout, iterations=iterations).value
+        outputs.metadata = outputs.metadata.update((), {
+            'matrix_profile': {'approximation': self._clf.approximation_},
+        })
+        return CallResult(outputs)
 
     def get_params(self) -> Params:        # pragma: no cover
         """
@@ -296,6 +296,11 @@ class PCAODetectorPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Par
 
         return
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        # scores windows, not rows
+        return None
+
     def set_training_data(self, *, inputs: Inputs) -> None:
         """
         Set training data for outlier detection.
@@ -105,6 +105,9 @@ class COFPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params, Hype
         Number of neighbors to use by default for k neighbors queries.
     """
 
+    # points are scored against the neighbours found in the input itself
+    _supports_streaming = False
+
     metadata = metadata_base.PrimitiveMetadata({
         '__author__' : "DATA Lab at Texas A&M University",
         'name': "Connectivity-Based Outlier Factor (COF)",
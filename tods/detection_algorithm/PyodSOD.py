@@ -113,6 +113,9 @@ class SODPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params, Hype
 		``threshold_`` on ``decision_scores_``.
 	"""
 
+	# points are scored against the neighbours found in the input itself
+	_supports_streaming = False
+
 	metadata = metadata_base.PrimitiveMetadata({
 	    "__author__": "DATA Lab at Texas A&M University",
 	    "name": "Subspace Outlier Detection Primitive",
@@ -116,6 +116,12 @@ class Hyperparams(Hyperparams_ODBase):
 		description="lstm model training batch size"
 	)
 
+	shuffle_buffer_size = hyperparams.Hyperparameter[typing.Union[int, None]](
+		default=0,
+		semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+		description="Number of training windows shuffled together, None to shuffle all of them and 0 not to shuffle"
+	)
+
 
 	loss_metric = hyperparams.Hyperparameter[typing.Union[str, None]](
 		default='mean_squared_error',
@@ -227,6 +233,7 @@ class TelemanomPrimitive(UnsupervisedOutlierDetectorBase[Inputs, Outputs, Params
 						validation_split = self.hyperparams['validation_split'],
 						optimizer = self.hyperparams['optimizer'],
 						lstm_batch_size = self.hyperparams['lstm_batch_size'],
+						shuffle_buffer_size = self.hyperparams['shuffle_buffer_size'],
 						loss_metric = self.hyperparams['loss_metric'],
 						layers = self.hyperparams['layers'],
 						epochs = self.hyperparams['epochs'],
@@ -313,9 +320,13 @@ class Detector(CollectiveBaseDetector):
 	"""Class to Implement Deep Log LSTM based on "https://www.cs.utah.edu/~lifeifei/papers/deeplog.pdf
 	   Only Parameter Value anomaly detection layer has been implemented for time series data"""
 
+	# errors are smoothed over the whole input
+	supports_streaming = False
+
 	def __init__(self,smoothing_perc=0.05,window_size = 10,error_buffer = 5,batch_size =30, \
 				 dropout = 0.3, validation_split=0.2,optimizer='adam',lstm_batch_size=64,loss_metric='mean_squared_error', \
-				 layers=[40,40],epochs = 1,patience =10,min_delta=0.0003,l_s=5,n_predictions=2,p = 0.05,contamination=0.1):
+				 layers=[40,40],epochs = 1,patience =10,min_delta=0.0003,l_s=5,n_predictions=2,p = 0.05,contamination=0.1, \
+				 shuffle_buffer_size=0):
 		
 		# super(Detector, self).__init__(contamination=contamination)
 		super(Detector, self).__init__(contamination=contamination,
@@ -331,6 +342,7 @@ class Detector(CollectiveBaseDetector):
 		self._validation_split = validation_split
 		self._optimizer = optimizer
 		self._lstm_batch_size = lstm_batch_size
+		self._shuffle_buffer_size = shuffle_buffer_size
 		self._loss_metric = loss_metric
 		self._layers = layers
 		self._epochs = epochs
@@ -349,6 +361,9 @@ class Detector(CollectiveBaseDetector):
 		self._channel = None
 
 
+	def _window_span(self):
+		return self._l_s + self._n_predictions
+
 	def fit(self,X,y=None):
 		"""
 		Fit data to  LSTM model.
@@ -358,7 +373,7 @@ class Detector(CollectiveBaseDetector):
 		Returns:
 			return : self object with trained model
 		"""
-		X = check_array(X).astype(np.float)
+		X = check_array(X, dtype=np.float64)
 		self._set_n_classes(None)
 
 		inputs = X
@@ -373,6 +388,7 @@ class Detector(CollectiveBaseDetector):
 							  loss_metric = self._loss_metric,
 							  optimizer = self._optimizer,
 							  lstm_batch_size = self._lstm_batch_size,
+							  shuffle_buffer_size = self._shuffle_buffer_size,
 							  epochs = self._epochs,
 							  validation_split = self._validation_split,
 							  batch_size = self._batch_size,
@@ -405,7 +421,7 @@ class Detector(CollectiveBaseDetector):
 			The anomaly score of the input samples.
 		"""
 		
-		X = check_array(X).astype(np.float)
+		X = check_array(X, dtype=np.float64)
 		self._set_n_classes(None)
 
 		inputs = X
@@ -426,17 +442,10 @@ class Detector(CollectiveBaseDetector):
 		prediction_errors = np.reshape(errors.e_s,(self._channel.X_test.shape[0],self._channel.X_test.shape[2]))
 		prediction_errors = np.sum(prediction_errors,axis=1)
 
-		left_indices = []
-		right_indices = []
-		scores = []
-		for i in range(len(prediction_errors)):
-			left_indices.append(i)
-			right_indices.append(i+self._l_s)
-			scores.append(prediction_errors[i])
-
+		left_indices = np.arange(len(prediction_errors))
+		right_indices = left_indices + self._l_s
 
-		
-		return np.asarray(scores),np.asarray(left_indices),np.asarray(right_indices)
+		return prediction_errors,left_indices,right_indices
 
 
 
@@ -31,6 +31,8 @@ from d3m.primitive_interfaces.base import CallResult, DockerContainer, Primitive
 # # from d3m.primitive_interfaces.supervised_learning import SupervisedLearnerPrimitiveBase
 from d3m.primitive_interfaces.unsupervised_learning import UnsupervisedLearnerPrimitiveBase
 from ..common.TODSBasePrimitives import TODSUnsupervisedLearnerPrimitiveBase
+from ..common import artifacts
+from ..common import metadata_cache
 from d3m.primitive_interfaces.transformer import TransformerPrimitiveBase
 
 from d3m.primitive_interfaces.base import *
@@ -133,6 +135,17 @@ class Hyperparams_ODBase(hyperparams.Hyperparams):
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
         description="Throw an exception if no input column is selected/provided. Defaults to true to behave like sklearn. To prevent pipelines from breaking set this to False.",
     )
+    n_jobs = hyperparams.Hyperparameter[int](
+        default=1,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Number of systems of a system-wise input to fit and score in parallel. -1 uses all cores.",
+    )
+    executor = hyperparams.Enumeration[str](
+        values=['thread', 'process'],
+        default='process',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Whether parallel systems run in a thread pool or a process pool. Ignored if n_jobs is 1.",
+    )
 
     return_semantic_type = hyperparams.Enumeration[str](
         values=['https://metadata.datadrivendiscovery.org/types/Attribute',
@@ -180,6 +193,11 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
         One of the mapping from decision_score to data.
         For point outlier detection, left_inds_ exactly equals the index of each data point plus 1.
         For Collective outlier detection, left_inds_ equals the ending index of each subsequence.
+
+    _supports_streaming : bool
+        Whether the point detector scores each data point independently of the rest of the input,
+        so that ``update`` only scores the new rows. Collective detectors declare it on their
+        ``CollectiveBaseDetector`` instead.
     """
     # probability_score:
     # window_size: int
@@ -187,6 +205,7 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
 
     __author__ = "DATALAB @Taxes A&M University"
     metadata: metadata_base.PrimitiveMetadata = None
+    _supports_streaming = True
 
     def __init__(self, *,
                  hyperparams: Hyperparams,
@@ -213,6 +232,7 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
         self._target_columns_metadata: List[OrderedDict] = None
         self._input_column_names = None
         self._fitted = False
+        self.reset_stream()
 #
     @abc.abstractmethod
     def set_training_data(self, *, inputs: Inputs) -> None:
@@ -227,17 +247,106 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
         self._inputs = inputs
         self._fitted = False
 
-    def _set_subseq_inds(self):
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        """
+        A point detector scores each row on its own, unless it scores it against the rest of the
+        input, see _supports_streaming. Subsequence indices count from the first row of the input.
+        """
+        if not cls._supports_streaming or hyperparams['return_subseq_inds']:
+            return None
+        return 0
 
+    def _set_subseq_inds(self, n_samples=None):
+
+        if n_samples is None:
+            n_samples = len(self._inputs)
         self.left_inds_ = getattr(self._clf, 'left_inds_', None)
         self.right_inds_ = getattr(self._clf, 'right_inds_', None)
 
         if self.left_inds_ is None or self.right_inds_ is None:
-            self.left_inds_ = numpy.arange(0, len(self._inputs), self.step_size)
-            self.right_inds_ = self.left_inds_ + self.window_size
-            self.right_inds_[self.right_inds_ > len(self._inputs)] = len(self._inputs)
+            self.left_inds_, self.right_inds_ = self._point_subseq_inds(0, n_samples, n_samples)
             # print(self.left_inds_, self.right_inds_)
 
+    def _point_subseq_inds(self, start, stop, n_samples):
+        """
+        Subsequence indices of the rows from start to stop of a series scored by a point detector.
+        A subsequence starts every step_size rows and spans window_size rows, up to the last row.
+        Args:
+            start: first row
+            stop: row after the last one
+            n_samples: number of rows of the series
+
+        Returns:
+            left indices and right indices
+        """
+        left_inds_ = numpy.arange(start + (-start) % self.step_size, stop, self.step_size)
+        right_inds_ = left_inds_ + self.window_size
+        right_inds_[right_inds_ > n_samples] = n_samples
+        return left_inds_, right_inds_
+
+    def _fit_array(self, X: ndarray) -> None:
+        """
+        Fit the detector on the selected columns, without any d3m metadata.
+        Args:
+            X: ndarray of shape (n_samples, n_features)
+
+        Returns:
+            None
+        """
+        self._clf.fit(X=X, **self._clf_fit_parameter)
+        self._fitted = True
+        self._set_subseq_inds(len(X))
+        self.reset_stream()
+
+    def _predict_array(self, X: ndarray) -> ndarray:
+        """
+        Label the selected columns, without any d3m metadata.
+        Args:
+            X: ndarray of shape (n_samples, n_features)
+
+        Returns:
+            ndarray
+            1 marks Outliers, 0 marks normal. Followed by the subsequence indices if return_subseq_inds is set.
+        """
+        if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
+            pred_label = self._clf.predict(X)
+            if not self.hyperparams['return_subseq_inds']:
+                return pred_label
+            left_inds_, right_inds_ = self._point_subseq_inds(0, len(pred_label), len(pred_label))
+        else:
+            pred_label, left_inds_, right_inds_ = self._clf.predict(X)
+            if not self.hyperparams['return_subseq_inds']:
+                return pred_label
+
+        return numpy.concatenate((numpy.expand_dims(pred_label, axis=1),
+                                  numpy.expand_dims(left_inds_, axis=1),
+                                  numpy.expand_dims(right_inds_, axis=1)), axis=1)
+
+    def _score_array(self, X: ndarray) -> ndarray:
+        """
+        Score the selected columns, without any d3m metadata.
+        Args:
+            X: ndarray of shape (n_samples, n_features)
+
+        Returns:
+            ndarray
+            Outlier scores. Followed by the subsequence indices if return_subseq_inds is set.
+        """
+        if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
+            if not self.hyperparams['return_subseq_inds']:
+                return self._clf.decision_function(X)
+            pred_score = self._clf.decision_function(X).ravel()
+            left_inds_, right_inds_ = self._point_subseq_inds(0, len(pred_score), len(pred_score))
+        else:
+            pred_score, left_inds_, right_inds_ = self._clf.decision_function(X)
+            if not self.hyperparams['return_subseq_inds']:
+                return pred_score
+
+        return numpy.concatenate((numpy.expand_dims(pred_score, axis=1),
+                                  numpy.expand_dims(left_inds_, axis=1),
+                                  numpy.expand_dims(right_inds_, axis=1)), axis=1)
+
     def _fit(self, *, timeout: float = None, iterations: int = None) -> CallResult[None]:
         """
         Fit model with training data.
@@ -265,9 +374,7 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
             # print('Fit: ', self._training_inputs.values.shape)
             # print('Fit: ', self._clf.fit(self._training_inputs.values))
 
-            self._clf.fit(X=self._training_inputs.values, **self._clf_fit_parameter)
-            self._fitted = True
-            self._set_subseq_inds()
+            self._fit_array(self._training_inputs.values)
 
         else: # pragma: no cover
             if self.hyperparams['error_on_no_input']:
@@ -294,27 +401,7 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
             sk_inputs = inputs.iloc[:, self._training_indices]
         output_columns = []
         if len(self._training_indices) > 0:
-            if self.hyperparams['return_subseq_inds']:
-
-                if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
-                    pred_label = self._clf.predict(sk_inputs.values)
-                    left_inds_ = numpy.arange(0, len(pred_label), self.step_size)
-                    right_inds_ = left_inds_ + self.window_size
-                    right_inds_[right_inds_ > len(pred_label)] = len(pred_label)
-                else:
-                    pred_label, left_inds_, right_inds_ = self._clf.predict(sk_inputs.values)
-
-                sk_output = numpy.concatenate((numpy.expand_dims(pred_label, axis=1),
-                                               numpy.expand_dims(left_inds_, axis=1),
-                                               numpy.expand_dims(right_inds_, axis=1)), axis=1)
-
-
-            else:
-                if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
-                    sk_output = self._clf.predict(sk_inputs.values)
-
-                else:
-                    sk_output, _, _ = self._clf.predict(sk_inputs.values)
+            sk_output = self._predict_array(sk_inputs.values)
 
             if sparse.issparse(sk_output): # pragma: no cover
                 sk_output = sk_output.toarray()
@@ -353,33 +440,77 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
             sk_inputs = inputs.iloc[:, self._training_indices]
         output_columns = []
         if len(self._training_indices) > 0:
+            sk_output = self._score_array(sk_inputs.values)
 
-            if self.hyperparams['return_subseq_inds']:
+            if sparse.issparse(sk_output): # pragma: no cover
+                sk_output = sk_output.toarray()
+            outputs = self._wrap_predictions(inputs, sk_output)
+            if len(outputs.columns) == len(self._input_column_names):
+                outputs.columns = self._input_column_names
+            output_columns = [outputs]
+        else: # pragma: no cover
+            if self.hyperparams['error_on_no_input']:
+                raise RuntimeError("No input columns were selected")
+            self.logger.warn("No input columns were selected")
 
-                if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
-                    pred_score = self._clf.decision_function(sk_inputs.values).ravel()
-                    left_inds_ = numpy.arange(0, len(pred_score), self.step_size)
-                    right_inds_ = left_inds_ + self.window_size
-                    right_inds_[right_inds_ > len(pred_score)] = len(pred_score)
+        outputs = base_utils.combine_columns(return_result=self.hyperparams['return_result'],
+                                             add_index_columns=self.hyperparams['add_index_columns'],
+                                             inputs=inputs, column_indices=self._training_indices,
+                                             columns_list=output_columns)
+        return CallResult(outputs)
 
-                else:
-                    pred_score, left_inds_, right_inds_ = self._clf.decision_function(sk_inputs.values)
 
-                # print(pred_score.shape, left_inds_.shape, right_inds_.shape)
+    def reset_stream(self) -> None:
+        """
+        Forget the rows seen by update, so that the next call starts a new stream.
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._stream_history = None
+        self._stream_seen = 0
+        self._stream_scored = 0
+        # scores of the rows whose subsequence is not complete yet
+        self._stream_pending = numpy.empty(0)
+        if self._clf is not None and hasattr(self._clf, 'reset_stream'):
+            self._clf.reset_stream()
+
+    def update(self, *, inputs: Inputs, timeout: float = None, iterations: int = None) -> CallResult[Outputs]:
+        """
+        Score the new rows of a stream.
+
+        The inputs of successive calls are treated as one time series, and only the scores that
+        the new rows complete are returned: one per row for point detectors, one per window ending
+        in the new rows for collective detectors. Subsequence indices count from the first row of
+        the stream. With return_subseq_inds, point detectors return the score of a row once its
+        subsequence is complete, window_size - 1 rows later, with the indices produce_score gives
+        it on the whole stream. Detectors that do not support streaming rescore the whole stream.
+        Args:
+            inputs: Container DataFrame. New rows of the time series.
 
+        Returns:
+            Container DataFrame
+            Outlier scores of the new rows or windows.
+        """
+
+        if not self._fitted: # pragma: no cover
+            raise PrimitiveNotFittedError("Primitive not fitted.")
+        sk_inputs = inputs
+        if self.hyperparams['use_semantic_types']:
+            sk_inputs = inputs.iloc[:, self._training_indices]
+        output_columns = []
+        if len(self._training_indices) > 0:
+            pred_score, left_inds_, right_inds_ = self._update_scores(sk_inputs.values)
+
+            if self.hyperparams['return_subseq_inds']:
                 sk_output = numpy.concatenate((numpy.expand_dims(pred_score, axis=1),
                                                numpy.expand_dims(left_inds_, axis=1),
                                                numpy.expand_dims(right_inds_, axis=1)), axis=1)
-
             else:
-                if getattr(self._clf, 'left_inds_', None) is None or getattr(self._clf, 'right_inds_', None) is None: # point OD
-                    sk_output = self._clf.decision_function(sk_inputs.values)
+                sk_output = pred_score
 
-                else:
-                    sk_output, _, _ = self._clf.decision_function(sk_inputs.values)
-
-            if sparse.issparse(sk_output): # pragma: no cover
-                sk_output = sk_output.toarray()
             outputs = self._wrap_predictions(inputs, sk_output)
             if len(outputs.columns) == len(self._input_column_names):
                 outputs.columns = self._input_column_names
@@ -395,6 +526,50 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
                                              columns_list=output_columns)
         return CallResult(outputs)
 
+    def _update_scores(self, X):
+        """
+        Score the new rows of a stream with the fitted detector.
+        Args:
+            X: ndarray of shape (n_new_samples, n_features)
+
+        Returns:
+            scores, left indices and right indices of the new rows or windows
+        """
+        collective = getattr(self._clf, 'left_inds_', None) is not None and getattr(self._clf, 'right_inds_', None) is not None
+        if collective and hasattr(self._clf, 'update'):
+            return self._clf.update(X)
+
+        n_seen = self._stream_seen + len(X)
+        if not collective and self._supports_streaming:
+            pred_score = self._clf.decision_function(X).ravel()
+            self._stream_seen = n_seen
+            n_complete = n_seen
+            if self.hyperparams['return_subseq_inds']:
+                # the right index of a row is clipped by the end of the series until its subsequence is complete
+                pred_score = numpy.concatenate((self._stream_pending, pred_score))
+                n_complete = max(n_seen - self.window_size + 1, self._stream_scored)
+                self._stream_pending = pred_score[n_complete - self._stream_scored:]
+                pred_score = pred_score[:n_complete - self._stream_scored]
+            left_inds_, right_inds_ = self._point_subseq_inds(self._stream_scored, n_complete, n_seen)
+            self._stream_scored = n_complete
+            return pred_score, left_inds_, right_inds_
+
+        # batch path: rescore the whole stream and return the scores not returned yet
+        if self._stream_history is None:
+            self._stream_history = X
+        else:
+            self._stream_history = numpy.concatenate((self._stream_history, X))
+        self._stream_seen = n_seen
+
+        if collective:
+            pred_score, left_inds_, right_inds_ = self._clf.decision_function(self._stream_history)
+        else:
+            pred_score = self._clf.decision_function(self._stream_history).ravel()
+            left_inds_, right_inds_ = self._point_subseq_inds(0, len(pred_score), len(pred_score))
+
+        new = slice(self._stream_scored, None)
+        self._stream_scored = len(pred_score)
+        return pred_score[new], left_inds_[new], right_inds_[new]
 
     def get_params(self) -> Params_ODBase: # pragma: no cover
         """
@@ -477,6 +652,31 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
         if params['right_inds_'] is not None:
             self._fitted = True
 
+    def save_artifact(self, *, path: str, _strip_training_state: bool = False) -> None:
+        """
+        Write the fitted parameters to an artifact directory, see ``tods.common.artifacts``.
+        The options are private arguments, as d3m only allows those to have a default value.
+        Args:
+            path: the artifact directory
+            _strip_training_state: leave out what only training needs, e.g. the training-set scores
+
+        Returns:
+            None
+        """
+        artifacts.save_artifact(self.get_params(), path, strip_training_state=_strip_training_state)
+
+    def load_artifact(self, *, path: str, _mmap: bool = True) -> None:
+        """
+        Set the parameters from an artifact written by ``save_artifact``.
+        Args:
+            path: the artifact directory
+            _mmap: memory-map the arrays, so that processes loading the same artifact share them
+
+        Returns:
+            None
+        """
+        self.set_params(params=artifacts.load_artifact(path, mmap=_mmap))
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams): # pragma: no cover
         """
@@ -605,14 +805,11 @@ class UnsupervisedOutlierDetectorBase(TODSUnsupervisedLearnerPrimitiveBase[Input
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        # target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata,
-        #                                                      self.hyperparams)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams, self.primitiveNo)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
-        # print(outputs.metadata.to_internal_simple_structure())
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams, self.primitiveNo)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata, key=self.primitiveNo)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams, primitiveNo): # pragma: no cover
@@ -1158,14 +1355,11 @@ class UnsupervisedOutlierDetectorBase2(UnsupervisedLearnerPrimitiveBase[Inputs,
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        # target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata,
-        #                                                      self.hyperparams)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams, self.primitiveNo)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
-        # print(outputs.metadata.to_internal_simple_structure())
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams, self.primitiveNo)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata, key=self.primitiveNo)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams, primitiveNo): # pragma: no cover
@@ -1,23 +1,4 @@
-from tods.detection_algorithm.AutoRegODetect import AutoRegODetectorPrimitive 
-from tods.detection_algorithm.DeepLog import DeepLogPrimitive
-from tods.detection_algorithm.Ensemble import EnsemblePrimitive
-from tods.detection_algorithm.KDiscordODetect import KDiscordODetectorPrimitive
-from tods.detection_algorithm.LSTMODetect import LSTMODetectorPrimitive
-from tods.detection_algorithm.MatrixProfile import MatrixProfilePrimitive
-from tods.detection_algorithm.PCAODetect import PCAODetectorPrimitive
-from tods.detection_algorithm.PyodABOD import ABODPrimitive
-from tods.detection_algorithm.PyodAE import AutoEncoderPrimitive
-from tods.detection_algorithm.PyodCBLOF import CBLOFPrimitive
-from tods.detection_algorithm.PyodCOF import COFPrimitive
-from tods.detection_algorithm.PyodHBOS import HBOSPrimitive
-from tods.detection_algorithm.PyodIsolationForest import IsolationForestPrimitive
-from tods.detection_algorithm.PyodKNN import KNNPrimitive
-from tods.detection_algorithm.PyodLODA import LODAPrimitive
-from tods.detection_algorithm.PyodLOF import LOFPrimitive
-from tods.detection_algorithm.PyodMoGaal import Mo_GaalPrimitive
-from tods.detection_algorithm.PyodOCSVM import OCSVMPrimitive
-from tods.detection_algorithm.PyodSOD import SODPrimitive
-from tods.detection_algorithm.PyodSoGaal import So_GaalPrimitive
-from tods.detection_algorithm.PyodVAE import VariationalAutoEncoderPrimitive
-from tods.detection_algorithm.SystemWiseDetection import SystemWiseDetectionPrimitive
-from tods.detection_algorithm.Telemanom import TelemanomPrimitive
+# The primitives are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.primitives(__name__))
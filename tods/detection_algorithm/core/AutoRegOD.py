@@ -8,7 +8,7 @@ from sklearn.linear_model import LinearRegression
 
 from .CollectiveBase import CollectiveBaseDetector
 
-from .utility import get_sub_matrices
+from .utility import get_sub_matrices_view, flatten_sub_matrices
 
 
 class AutoRegOD(CollectiveBaseDetector):
@@ -56,6 +56,10 @@ class AutoRegOD(CollectiveBaseDetector):
         self.window_size = window_size
         self.step_size = step_size
 
+    def _window_span(self):
+        # the last window is dropped unless the row it predicts is known
+        return self.window_size + self.step_size
+
     def fit(self, X: np.array) -> object:
         """Fit detector. y is ignored in unsupervised methods.
 
@@ -72,27 +76,22 @@ class AutoRegOD(CollectiveBaseDetector):
         self : object
             Fitted estimator.
         """
-        X = check_array(X).astype(np.float)
+        X = check_array(X, dtype=np.float64)
 
         # generate X and y
-        sub_matrices, self.left_inds_, self.right_inds_ = get_sub_matrices(
-            X,
-            window_size=self.window_size,
-            step=self.step_size,
-            return_numpy=True,
-            flatten=True)
+        sub_matrices, self.left_inds_, self.right_inds_ = \
+            get_sub_matrices_view(X,
+                                  window_size=self.window_size,
+                                  step=self.step_size)
         # remove the last one
-        sub_matrices = sub_matrices[:-1, :]
+        sub_matrices = flatten_sub_matrices(sub_matrices[:-1])
         self.left_inds_ = self.left_inds_[:-1]
         self.right_inds_ = self.right_inds_[:-1]
 
         self.valid_len_ = sub_matrices.shape[0]
 
-        y_buf = np.zeros([self.valid_len_, 1])
-
-        for i in range(self.valid_len_):
-            y_buf[i] = X[i * self.step_size + self.window_size]
-        # print(sub_matrices.shape, y_buf.shape)
+        # the target of each window is the point right after it
+        y_buf = X[self.right_inds_, :1]
 
         # fit the linear regression model
         self.lr_ = LinearRegression(fit_intercept=True)
@@ -149,25 +148,19 @@ class AutoRegOD(CollectiveBaseDetector):
             The anomaly score of the input samples.
         """
         check_is_fitted(self, ['lr_'])
+        X = check_array(X, dtype=np.float64)
 
         sub_matrices, X_left_inds, X_right_inds = \
-            get_sub_matrices(X,
-                             window_size=self.window_size,
-                             step=self.step_size,
-                             return_numpy=True,
-                             flatten=True)
+            get_sub_matrices_view(X,
+                                  window_size=self.window_size,
+                                  step=self.step_size)
 
         # remove the last one
-        sub_matrices = sub_matrices[:-1, :]
+        sub_matrices = flatten_sub_matrices(sub_matrices[:-1])
         X_left_inds = X_left_inds[:-1]
         X_right_inds = X_right_inds[:-1]
 
-        valid_len = sub_matrices.shape[0]
-
-        y_buf = np.zeros([valid_len, 1])
-
-        for i in range(valid_len):
-            y_buf[i] = X[i * self.step_size + self.window_size]
+        y_buf = X[X_right_inds, :1]
 
         pred_score = np.absolute(
             y_buf.ravel() - self.lr_.predict(sub_matrices).ravel())
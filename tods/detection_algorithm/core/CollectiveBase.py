@@ -18,6 +18,7 @@ from numpy import percentile
 from scipy.special import erf
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.utils import deprecated
+from sklearn.utils import check_array
 from sklearn.utils.validation import check_is_fitted
 from sklearn.utils.multiclass import check_classification_targets
 
@@ -109,8 +110,15 @@ class CollectiveBaseDetector(metaclass=ABCMeta):
         The binary labels of the training data. 0 stands for inliers
         and 1 for outliers/anomalies. It is generated by applying
         ``threshold_`` on ``decision_scores_``.
+
+    supports_streaming : bool
+        Whether each window is scored independently of the rest of the
+        input. If so, ``update`` only keeps the rows the next windows
+        overlap; otherwise it rescores the whole stream on every call.
     """
 
+    supports_streaming = True
+
     @abc.abstractmethod
     def __init__(self, contamination=0.1,
                  window_size=1,
@@ -272,6 +280,98 @@ class CollectiveBaseDetector(metaclass=ABCMeta):
             raise ValueError(method,
                              'is not a valid probability conversion method')
 
+    def _window_span(self):
+        """Number of rows ``decision_function`` needs to score its first
+        window.
+        """
+        return self.window_size
+
+    def _stream_decision_function(self, X):
+        """Score the windows that lie entirely in X. The returned indices
+        are relative to the first row of X.
+        """
+        return self.decision_function(X)
+
+    def reset_stream(self):
+        """Forget the rows seen by ``update``, so that the next call starts
+        a new stream.
+
+        Returns
+        -------
+        self
+        """
+        self._stream_buffer = None
+        self._stream_seen = 0
+        self._stream_next_left = 0
+        self._stream_scored = 0
+        return self
+
+    def update(self, X):
+        """Score the windows completed by new rows of a stream.
+
+        The rows passed to successive calls are treated as one series, and
+        every window is scored exactly once, in the call that delivers its
+        last row. Only the rows the pending windows overlap are kept, so
+        the cost of a call depends on ``window_size`` and not on the length
+        of the stream. Detectors that do not support streaming keep the
+        whole stream and rescore it with ``decision_function``.
+
+        Parameters
+        ----------
+        X : numpy array of shape (n_new_samples, n_features)
+            The new rows of the stream.
+
+        Returns
+        -------
+        anomaly_scores : numpy array of shape (n_windows,)
+            The anomaly scores of the windows completed by X.
+
+        left_inds : numpy array of shape (n_windows,)
+            The start of each window, counted from the first row of the
+            stream.
+
+        right_inds : numpy array of shape (n_windows,)
+            The end of each window, counted from the first row of the
+            stream.
+        """
+        check_is_fitted(self, ['decision_scores_'])
+        X = check_array(X, dtype=np.float64)
+
+        if getattr(self, '_stream_buffer', None) is None:
+            self.reset_stream()
+            self._stream_buffer = np.empty((0, X.shape[1]))
+
+        history = np.concatenate((self._stream_buffer, X))
+        n_seen = self._stream_seen + len(X)
+        history_start = n_seen - len(history)
+        self._stream_seen = n_seen
+
+        if not self.supports_streaming:
+            self._stream_buffer = history
+            if len(history) < self._window_span():
+                return np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=int)
+            pred_score, X_left_inds, X_right_inds = self.decision_function(history)
+            new = slice(self._stream_scored, None)
+            self._stream_scored = len(pred_score)
+            return pred_score[new], X_left_inds[new], X_right_inds[new]
+
+        pending = history[max(self._stream_next_left - history_start, 0):]
+        if len(pending) < self._window_span():
+            self._stream_buffer = pending
+            return np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+        pred_score, X_left_inds, X_right_inds = \
+            self._stream_decision_function(pending)
+        X_left_inds = X_left_inds + self._stream_next_left
+        X_right_inds = X_right_inds + self._stream_next_left
+
+        if len(X_left_inds) > 0:
+            self._stream_next_left = X_left_inds[-1] + self.step_size
+        self._stream_buffer = \
+            history[max(self._stream_next_left - history_start, 0):]
+
+        return pred_score, X_left_inds, X_right_inds
+
     def _predict_rank(self, X, normalized=False): # pragma: no cover
         """Predict the outlyingness rank of a sample by a fitted model. The
         method is for outlier detector score combination.
@@ -69,6 +69,7 @@ class CollectiveCommonTest:
         # self.test_fit_predict_score()
         self.test_prediction_labels()
         self.test_prediction_inds()
+        self.test_update()
         # self.test_predict_rank()
         # self.test_predict_rank_normalized()
         self.tearDown()
@@ -119,6 +120,25 @@ class CollectiveCommonTest:
         assert_equal(all(inds_valid), True)
 
 
+    def test_update(self):
+        X_test = np.asarray(self.X_test)
+        self.clf.reset_stream()
+        streamed = [self.clf.update(X_test[i:i + 1]) for i in range(len(X_test))]
+        pred_scores, left_inds, right_inds = \
+            [np.concatenate(output) for output in zip(*streamed)]
+        batch_scores, batch_left_inds, batch_right_inds = \
+            self.clf.decision_function(X_test)
+
+        if self.clf.supports_streaming:
+            # every window is scored once, as in batch mode
+            batch = np.isin(batch_left_inds, left_inds)
+            assert_allclose(pred_scores, batch_scores[batch])
+            assert_equal(left_inds, batch_left_inds[batch])
+            assert_equal(right_inds, batch_right_inds[batch])
+        else:
+            assert_equal(pred_scores.shape, batch_scores.shape)
+        self.clf.reset_stream()
+
     def test_prediction_proba(self):
         pred_proba, _, _ = self.clf.predict_proba(self.X_test)
         assert_greater_equal(pred_proba.min(), 0)
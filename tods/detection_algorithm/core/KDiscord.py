@@ -8,7 +8,7 @@ from sklearn.utils.validation import check_is_fitted
 from .CollectiveBase import CollectiveBaseDetector
 from pyod.models.knn import KNN
 
-from .utility import get_sub_matrices
+from .utility import get_sub_matrices_view, flatten_sub_matrices
 
 
 # TODO: add an argument to exclude "near equal" samples
@@ -182,15 +182,12 @@ class KDiscord(CollectiveBaseDetector):
         self : object
             Fitted estimator.
         """
-        X = check_array(X).astype(np.float)
+        X = check_array(X, dtype=np.float64)
 
         # first convert it into submatrices, and flatten it
-        sub_matrices, self.left_inds_, self.right_inds_ = get_sub_matrices(
-            X,
-            self.window_size,
-            self.step_size,
-            return_numpy=True,
-            flatten=True)
+        sub_matrices, self.left_inds_, self.right_inds_ = \
+            get_sub_matrices_view(X, self.window_size, self.step_size)
+        sub_matrices = flatten_sub_matrices(sub_matrices)
 
         # fit the kNN model
         self.model_.fit(sub_matrices)
@@ -217,14 +214,11 @@ class KDiscord(CollectiveBaseDetector):
             The anomaly score of the input samples.
         """
         check_is_fitted(self, ['model_'])
-        X = check_array(X).astype(np.float)
+        X = check_array(X, dtype=np.float64)
         # first convert it into submatrices, and flatten it
-        sub_matrices, X_left_inds, X_right_inds = get_sub_matrices(
-            X,
-            self.window_size,
-            self.step_size,
-            return_numpy=True,
-            flatten=True)
+        sub_matrices, X_left_inds, X_right_inds = \
+            get_sub_matrices_view(X, self.window_size, self.step_size)
+        sub_matrices = flatten_sub_matrices(sub_matrices)
 
         # return the prediction result by kNN
         return self.model_.decision_function(sub_matrices), \
@@ -7,6 +7,8 @@ from sklearn.utils.validation import check_is_fitted
 from scipy.special import erf
 from sklearn.preprocessing import MinMaxScaler
 
+from numpy.lib.stride_tricks import as_strided
+
 from .CollectiveBase import CollectiveBaseDetector
 
 # from tod.utility import get_sub_matrices
@@ -14,8 +16,110 @@ from .CollectiveBase import CollectiveBaseDetector
 from tensorflow.keras.layers import Dense, LSTM
 from tensorflow.keras.models import Sequential
 
+def _windows(x, window_size):
+    """Read-only strided view of the windows x[i:i+window_size], shape (len(x)-window_size+1, window_size).
+    """
+    n_windows = max(len(x) - window_size + 1, 0)
+    return as_strided(x, shape=(n_windows, window_size), strides=(x.strides[0], x.strides[0]), writeable=False)
+
+
+def _group_attack_windows(relative_error, error_num_buf, min_attack_time, diff_group_method):
+    """Group the attack windows that cover each point.
+
+    Every window of ``min_attack_time`` consecutive relative errors gets a
+    danger coefficient (the fraction of errors above the threshold) and an
+    averaged relative error. Each point then takes the average, max or min of
+    the windows covering it, together with the left (inclusive) and right
+    (exclusive) index of the window it was attributed to.
+
+    The result is the same, bit for bit, as visiting every window and every
+    point it covers in turn: averages are accumulated in the same order, and
+    a point is attributed to the first window reaching its max (or min), as
+    that is the last window that improved it.
+
+    Parameters
+    ----------
+    relative_error : numpy array of shape (n_samples,)
+        The relative prediction errors.
+
+    error_num_buf : numpy array of shape (n_samples,)
+        1 where the relative error is above the threshold, 0 otherwise.
+
+    min_attack_time : int
+        The number of errors in an attack window.
+
+    diff_group_method : str
+        'average', 'max' or 'min'.
+
+    Returns
+    -------
+    danger_coefficient, averaged_relative_error, left_inds, right_inds : numpy arrays of shape (n_samples,)
+    """
+    n_samples = len(relative_error)
+    n_windows = max(n_samples - min_attack_time + 1, 0)
+
+    # integer counts, so the sliding sum is exact
+    error_num_cumsum = np.concatenate(([0], np.cumsum(error_num_buf)))
+    dc_windows = (error_num_cumsum[min_attack_time:] - error_num_cumsum[:n_windows]) / min_attack_time
+    are_windows = _windows(relative_error, min_attack_time).sum(axis=1) / min_attack_time
+
+    positions = np.arange(n_samples)
+
+    if diff_group_method == 'average':
+        danger_coefficient = np.zeros(relative_error.shape)
+        averaged_relative_error = np.zeros(relative_error.shape)
+        calculated_times = np.zeros(relative_error.shape)
+
+        # a point sees the windows covering it from the leftmost one on
+        for offset in reversed(range(min_attack_time)):
+            danger_coefficient[offset:offset + n_windows] += dc_windows
+            averaged_relative_error[offset:offset + n_windows] += are_windows
+            calculated_times[offset:offset + n_windows] += 1
+
+        danger_coefficient /= calculated_times
+        averaged_relative_error /= calculated_times
+
+        if n_windows > 0:
+            left_inds = np.maximum(positions - min_attack_time + 1, 0).astype(float)
+            right_inds = (np.minimum(positions, n_windows - 1) + min_attack_time).astype(float)
+        else:
+            left_inds = np.ones((n_samples, )) * n_samples
+            right_inds = np.zeros((n_samples, ))
+
+        return danger_coefficient, averaged_relative_error, left_inds, right_inds
+
+    if diff_group_method == 'max':
+        fill, initial, select, improves = -np.inf, 0., np.argmax, np.greater
+    else:
+        fill, initial, select, improves = np.inf, np.inf, np.argmin, np.less
+
+    grouped = []
+    window_inds = []
+    for window_values in (dc_windows, are_windows):
+        # row p holds the windows p-min_attack_time+1 .. p, padded where they do not exist
+        padded = np.full(n_samples + min_attack_time - 1, fill)
+        padded[min_attack_time - 1:min_attack_time - 1 + n_windows] = window_values
+        covering = _windows(padded, min_attack_time)
+
+        first = select(covering, axis=1)
+        extreme = covering[positions, first]
+        improved = improves(extreme, initial)
+        grouped.append(np.where(improved, extreme, initial))
+        window_inds.append(np.where(improved, positions - min_attack_time + 1 + first, -1))
+
+    last_improvement = np.maximum(*window_inds)
+    attributed = last_improvement >= 0
+    left_inds = np.where(attributed, last_improvement, n_samples).astype(float)
+    right_inds = np.where(attributed, last_improvement + min_attack_time, 0).astype(float)
+
+    return grouped[0], grouped[1], left_inds, right_inds
+
+
 class LSTMOutlierDetector(CollectiveBaseDetector):
 
+    # the score of a point averages over the attack windows that follow it
+    supports_streaming = False
+
     def __init__(self,contamination=0.1,
                     train_contamination=0.0,
                     min_attack_time=5,
@@ -126,6 +230,9 @@ class LSTMOutlierDetector(CollectiveBaseDetector):
 
         return self
 
+    def _window_span(self):
+        return self.min_attack_time + 1
+
     def _get_sub_matrices(self, X: np.array):
         # return X[:-1].reshape(-1, 1, self.feature_dim), X[1:]
         return np.expand_dims(X[:-1], axis=2), X[1:]
@@ -170,64 +277,8 @@ class LSTMOutlierDetector(CollectiveBaseDetector):
         if not (self.diff_group_method in ['max', 'min', 'average']):
             raise ValueError(self.diff_group_method, "is not a valid method")
 
-        relative_error_left_inds = np.ones((len(relative_error), )) * len(relative_error)
-        relative_error_right_inds = np.zeros((len(relative_error), ))
-
-
-        if self.diff_group_method == 'average':
-            danger_coefficient = np.zeros(relative_error.shape)
-            averaged_relative_error = np.zeros(relative_error.shape)
-            calculated_times = np.zeros(relative_error.shape)
-
-            for i in range(len(relative_error) - self.min_attack_time + 1):
-                dc_tmp = error_num_buf[i:i+self.min_attack_time].sum() / self.min_attack_time
-                are_tmp = relative_error[i:i+self.min_attack_time].sum() / self.min_attack_time
-
-                for j in range(self.min_attack_time):
-                    averaged_relative_error[i + j] += are_tmp
-                    danger_coefficient[i + j] += dc_tmp
-                    calculated_times[i + j] += 1
-                    relative_error_left_inds[i + j] = i if i < relative_error_left_inds[i + j] else relative_error_left_inds[i + j]
-                    relative_error_right_inds[i + j] = i+self.min_attack_time if i+self.min_attack_time > relative_error_right_inds[i + j] else relative_error_left_inds[i + j]
-
-            # print(calculated_times)
-            danger_coefficient /= calculated_times
-            averaged_relative_error /= calculated_times
-            # print(danger_coefficient, averaged_relative_error)
-                
-
-        else: # pragma: no cover
-            danger_coefficient = np.zeros(relative_error.shape)
-            averaged_relative_error = np.zeros(relative_error.shape)
-
-            if self.diff_group_method == 'min':
-                danger_coefficient += float('inf')
-                averaged_relative_error += float('inf')
-
-            for i in range(len(relative_error) - self.min_attack_time + 1):
-                dc_tmp = error_num_buf[i:i+self.min_attack_time].sum() / self.min_attack_time
-                are_tmp = relative_error[i:i+self.min_attack_time].sum() / self.min_attack_time
-
-                if self.diff_group_method == 'max':
-                    for j in range(self.min_attack_time):
-                        if are_tmp > averaged_relative_error[i + j] or dc_tmp > danger_coefficient[i+j]:
-                            relative_error_left_inds[i + j] = i
-                            relative_error_right_inds[i + j] = i+self.min_attack_time
-                        if are_tmp > averaged_relative_error[i + j]:
-                            averaged_relative_error[i + j] = are_tmp
-                        if dc_tmp > danger_coefficient[i+j]:
-                            danger_coefficient[i + j] = dc_tmp
-
-                else:
-                    for j in range(self.min_attack_time):
-                        if are_tmp < averaged_relative_error[i + j] or dc_tmp < danger_coefficient[i+j]:
-                            relative_error_left_inds[i + j] = i
-                            relative_error_right_inds[i + j] = i+self.min_attack_time
-                        if are_tmp < averaged_relative_error[i + j]:
-                            averaged_relative_error[i + j] = are_tmp
-                        if dc_tmp < danger_coefficient[i+j]:
-                            danger_coefficient[i + j] = dc_tmp
-
+        danger_coefficient, averaged_relative_error, relative_error_left_inds, relative_error_right_inds = \
+            _group_attack_windows(relative_error, error_num_buf, self.min_attack_time, self.diff_group_method)
 
         # print(relative_error_left_inds)
         # print(relative_error_right_inds)
@@ -65,6 +65,15 @@ class MultiAutoRegOD(CollectiveBaseDetector):
         self.method = method
         self.weights = weights
 
+    def _window_span(self):
+        return self.window_size + self.step_size
+
+    def _stream_decision_function(self, X):
+        # drop the zero scores decision_function pads the output with
+        decision_scores, X_left_inds, X_right_inds = self.decision_function(X)
+        return decision_scores[self.window_size:], \
+            X_left_inds[self.window_size:], X_right_inds[self.window_size:]
+
     def _validate_weights(self):
         """Internal function for validating and adjust weights.
 
@@ -8,7 +8,7 @@ from sklearn.utils.validation import check_is_fitted
 from .CollectiveBase import CollectiveBaseDetector
 from pyod.models.pca import PCA as PCA_PYOD
 
-from .utility import get_sub_matrices
+from .utility import get_sub_matrices_view, flatten_sub_matrices
 
 
 class PCA(CollectiveBaseDetector):
@@ -176,16 +176,12 @@ class PCA(CollectiveBaseDetector):
         self : object
             Fitted estimator.
         """
-        X = check_array(X).astype(np.float)
+        X = check_array(X, dtype=np.float64)
 
         # first convert it into submatrices, and flatten it
-        sub_matrices, self.left_inds_, self.right_inds_ = get_sub_matrices(
-            X,
-            self.window_size,
-            self.step_size,
-            return_numpy=True,
-            flatten=True,
-            flatten_order='F')
+        sub_matrices, self.left_inds_, self.right_inds_ = \
+            get_sub_matrices_view(X, self.window_size, self.step_size)
+        sub_matrices = flatten_sub_matrices(sub_matrices, flatten_order='F')
 
         # if self.n_components > sub_matrices.shape[1]:
         #     raise ValueError('n_components exceeds window_size times the number of sequences.')
@@ -215,15 +211,11 @@ class PCA(CollectiveBaseDetector):
             The anomaly score of the input samples.
         """
         check_is_fitted(self, ['model_'])
-        X = check_array(X).astype(np.float)
+        X = check_array(X, dtype=np.float64)
         # first convert it into submatrices, and flatten it
-        sub_matrices, X_left_inds, X_right_inds = get_sub_matrices(
-            X,
-            self.window_size,
-            self.step_size,
-            return_numpy=True,
-            flatten=True,
-            flatten_order='F')
+        sub_matrices, X_left_inds, X_right_inds = \
+            get_sub_matrices_view(X, self.window_size, self.step_size)
+        sub_matrices = flatten_sub_matrices(sub_matrices, flatten_order='F')
 
         # return the prediction result by PCA
         return self.model_.decision_function(
@@ -243,7 +235,7 @@ if __name__ == "__main__": # pragma: no cover
          [12., 12],
          [18., 16], [20., 7], [18., 10], [23., 12], [22., 15]])
 
-    w = get_sub_matrices(X_train, window_size=3, step=2, flatten=False)
+    w = get_sub_matrices_view(X_train, window_size=3, step=2)
     X_test = np.asarray(
         [[12., 10], [8., 12], [80., 80], [92., 983],
          [18., 16], [20., 7], [18., 10], [3., 5], [5., 9], [23., 12],
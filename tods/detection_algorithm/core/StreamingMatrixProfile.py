@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Matrix profile of a multivariate time series that grows point by point.
+"""
+
+import numpy as np
+from sklearn.utils import check_array
+import stumpy
+
+from .utility import get_sub_matrices_view
+from ...feature_analysis.core.matrix_profile import approximate_matrix_profile, join_order
+
+
+def _exclusion_zone(window_size):
+    # half-width of the trivial matches ignored by a self-join, as in stumpy
+    return int(np.ceil(window_size / 4))
+
+
+class StreamingMatrixProfile(object):
+    """Matrix profile of each dimension of a time series, which can be
+    extended one point at a time.
+
+    The initial profile is a stumpy self-join. Each appended point adds a
+    window, whose sliding dot products with every earlier window are
+    updated from those of the previous window in O(n), as in
+    ``stumpy.stumpi``; the profile of every earlier window is then lowered
+    where the new window is a closer match. All dimensions are updated
+    together, and the whole state is made of arrays, so that it can be
+    saved and loaded without being recomputed.
+
+    Parameters
+    ----------
+    window_size : int
+        The length of the subsequences.
+
+    percentage : float, optional (default=1.)
+        Fraction of the distance-matrix diagonals computed by ``fit`` and
+        ``join``. Below 1, or with a ``time_budget``, the profiles are
+        approximated with ``stumpy.scrump``.
+
+    time_budget : float, optional (default=None)
+        Seconds the approximate profiles of ``fit`` and ``join`` are refined
+        for.
+
+    Attributes
+    ----------
+    T_ : numpy array of shape (n_samples, n_features)
+        The time series.
+
+    P_ : numpy array of shape (n_windows, n_features)
+        The z-normalized distance of each window to its nearest neighbour,
+        for each dimension.
+
+    I_ : numpy array of shape (n_windows, n_features)
+        The start of the nearest neighbour of each window, -1 if none.
+
+    approximation_ : float
+        The fraction of the diagonals computed by the last ``fit`` or
+        ``join``, 1 if its profile is exact. Appended windows are always
+        exact.
+    """
+
+    _STATE = ('T', 'mu', 'sigma', 'P', 'I', 'QT')
+
+    def __init__(self, window_size, percentage=1., time_budget=None):
+        self.window_size = window_size
+        self.percentage = percentage
+        self.time_budget = time_budget
+        self.approximation_ = 1.
+        self.n_samples_ = 0
+        self._T = self._mu = self._sigma = self._P = self._I = self._QT = None
+
+    @property
+    def _approximate(self):
+        return self.percentage < 1. or self.time_budget is not None
+
+    @property
+    def n_windows_(self):
+        return max(self.n_samples_ - self.window_size + 1, 0)
+
+    @property
+    def T_(self):
+        return self._T[:self.n_samples_]
+
+    @property
+    def P_(self):
+        return self._P[:self.n_windows_]
+
+    @property
+    def I_(self):
+        return self._I[:self.n_windows_]
+
+    def fit(self, X):
+        """Compute the self-join profile of X.
+
+        Parameters
+        ----------
+        X : numpy array of shape (n_samples, n_features)
+            The time series, with at least ``window_size`` samples.
+
+        Returns
+        -------
+        self : object
+        """
+        X = check_array(X, dtype=np.float64, ensure_min_samples=self.window_size)
+        m = self.window_size
+        n_samples, n_features = X.shape
+        n_windows = n_samples - m + 1
+
+        self._T = X.copy()
+        self.n_samples_ = n_samples
+        windows = get_sub_matrices_view(X, m)[0]
+        self._mu, self._sigma = windows.mean(axis=1), windows.std(axis=1)
+        self._P = np.empty((n_windows, n_features))
+        self._I = np.empty((n_windows, n_features), dtype=np.int64)
+        self._QT = np.empty((n_windows, n_features))
+        for k in range(n_features):
+            self._QT[:, k] = np.correlate(X[:, k], X[n_windows - 1:, k], mode='valid')
+
+        if self._approximate:
+            self._P, self._I, self.approximation_ = approximate_matrix_profile(
+                X, m, percentage=self.percentage, time_budget=self.time_budget)
+            return self
+        for k in range(n_features):
+            out = stumpy.stump(X[:, k], m)
+            self._P[:, k] = out[:, 0].astype(np.float64)
+            self._I[:, k] = out[:, 1].astype(np.int64)
+        self.approximation_ = 1.
+        return self
+
+    def join(self, X):
+        """AB-join: the distance of each window of X to its nearest
+        neighbour among the windows of the profiled series.
+
+        Parameters
+        ----------
+        X : numpy array of shape (n_samples, n_features)
+            The time series to score.
+
+        Returns
+        -------
+        P : numpy array of shape (n_samples - window_size + 1, n_features)
+        """
+        X = check_array(X, dtype=np.float64, ensure_min_samples=self.window_size)
+        T = self.T_
+        if self._approximate:
+            P, _, self.approximation_ = approximate_matrix_profile(
+                X, self.window_size, T, percentage=self.percentage, time_budget=self.time_budget)
+            return P
+        self.approximation_ = 1.
+        P = np.empty((X.shape[0] - self.window_size + 1, X.shape[1]))
+        for k in range(X.shape[1]):
+            T_A, T_B = join_order(X[:, k], T[:, k])
+            P[:, k] = stumpy.stump(T_A, self.window_size, T_B, ignore_trivial=False)[:, 0].astype(np.float64)
+        return P
+
+    def extend(self, X):
+        """Append the rows of X to the series.
+
+        Parameters
+        ----------
+        X : numpy array of shape (n_samples, n_features)
+            The new rows.
+
+        Returns
+        -------
+        P : numpy array of shape (n_new_windows, n_features)
+            The profile of the windows completed by X when they were
+            appended, i.e. their distance to the nearest earlier window.
+        """
+        X = check_array(X, dtype=np.float64, ensure_min_samples=0)
+        first = self.n_windows_
+        self._reserve(self.n_samples_ + len(X), X.shape[1])
+        for row in X:
+            self._append(row)
+        return self._P[first:self.n_windows_].copy()
+
+    def _reserve(self, n_samples, n_features):
+        capacity = 0 if self._T is None else len(self._T)
+        if n_samples <= capacity:
+            return
+        capacity = max(n_samples, 2 * capacity, 16)
+        n_windows = self.n_windows_
+
+        def grow(arr, length, dtype):
+            grown = np.empty((capacity, n_features), dtype=dtype)
+            if arr is not None:
+                grown[:length] = arr[:length]
+            return grown
+
+        self._T = grow(self._T, self.n_samples_, np.float64)
+        self._mu = grow(self._mu, n_windows, np.float64)
+        self._sigma = grow(self._sigma, n_windows, np.float64)
+        self._P = grow(self._P, n_windows, np.float64)
+        self._I = grow(self._I, n_windows, np.int64)
+
+    def _append(self, row):
+        m = self.window_size
+        T = self._T
+        T[self.n_samples_] = row
+        self.n_samples_ += 1
+        i = self.n_samples_ - m
+        if i < 0:
+            return
+
+        window = T[i:i + m]
+        mu, sigma = window.mean(axis=0), window.std(axis=0)
+        self._mu[i], self._sigma[i] = mu, sigma
+
+        # dot products of the new window with windows 0..i, from those of the previous window
+        QT = np.empty((i + 1, T.shape[1]))
+        if i > 0 and self._QT is not None and len(self._QT) == i:
+            QT[1:i] = self._QT[:i - 1] - T[:i - 1] * T[i - 1] + T[m:m + i - 1] * T[i + m - 1]
+            QT[0] = (T[:m] * window).sum(axis=0)
+        else:
+            QT[:i] = (get_sub_matrices_view(T[:i + m - 1], m)[0] * window).sum(axis=1)
+        QT[i] = (window * window).sum(axis=0)
+        self._QT = QT
+
+        D = self._distance(QT, self._mu[:i + 1], self._sigma[:i + 1], mu, sigma)
+        D[max(i - _exclusion_zone(m), 0):] = np.inf
+
+        closer = D[:i] < self._P[:i]
+        self._P[:i] = np.where(closer, D[:i], self._P[:i])
+        self._I[:i] = np.where(closer, i, self._I[:i])
+        self._P[i] = D.min(axis=0)
+        self._I[i] = np.where(np.isfinite(self._P[i]), D.argmin(axis=0), -1)
+
+    def _distance(self, QT, mu, sigma, mu_q, sigma_q):
+        m = self.window_size
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = (QT - m * mu * mu_q) / (m * sigma * sigma_q)
+        D2 = 2 * m * (1 - np.clip(correlation, -1., 1.))
+
+        # a constant window matches another constant window exactly and any other window poorly
+        constant, constant_q = sigma == 0, sigma_q == 0
+        D2 = np.where(constant & constant_q, 0., np.where(constant | constant_q, m, D2))
+        return np.sqrt(D2)
+
+    def save(self, file):
+        """Save the profile to a ``.npz`` file.
+
+        Parameters
+        ----------
+        file : str or file
+            Passed to ``numpy.savez``.
+        """
+        n_windows = self.n_windows_
+        np.savez(file, window_size=self.window_size, T=self.T_, mu=self._mu[:n_windows],
+                 sigma=self._sigma[:n_windows], P=self.P_, I=self.I_,
+                 QT=self._QT if self._QT is not None else np.empty((0, self.T_.shape[1])))
+
+    @classmethod
+    def load(cls, file):
+        """Load a profile saved by ``save``.
+
+        Parameters
+        ----------
+        file : str or file
+            Passed to ``numpy.load``.
+
+        Returns
+        -------
+        profile : StreamingMatrixProfile
+        """
+        with np.load(file) as data:
+            profile = cls(int(data['window_size']))
+            for name in cls._STATE:
+                setattr(profile, '_' + name, data[name].copy())
+        profile.n_samples_ = len(profile._T)
+        return profile
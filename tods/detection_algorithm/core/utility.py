@@ -3,6 +3,7 @@
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from sklearn.utils import check_array
 
 
@@ -43,6 +44,81 @@ from sklearn.utils import check_array
 
 #     return X_sub
 
+def get_sub_matrices_view(X, window_size, step=1):
+    """Chop a multivariate time series into sub sequences (matrices) without
+    copying the data. The returned windows are a read-only strided view on
+    ``X``, so no memory is allocated beyond the index arrays.
+
+    Parameters
+    ----------
+    X : numpy array of shape (n_samples, n_sequences)
+        The input samples.
+
+    window_size : int
+        The moving window size.
+
+    step : int, optional (default=1)
+        The displacement for moving window.
+
+    Returns
+    -------
+    X_sub : numpy array of shape (valid_len, window_size, n_sequences)
+        Read-only view with each entry along the first axis being a
+        submatrix of ``X``.
+
+    X_left_inds : numpy array of shape (valid_len,)
+        The left (inclusive) index of each submatrix.
+
+    X_right_inds : numpy array of shape (valid_len,)
+        The right (exclusive) index of each submatrix.
+    """
+    X = check_array(X, dtype=np.float64)
+    n_samples, n_sequences = X.shape[0], X.shape[1]
+
+    # get the valid length
+    valid_len = max(get_sub_sequences_length(n_samples, window_size, step), 0)
+
+    stride_row, stride_col = X.strides
+    X_sub = as_strided(X,
+                       shape=(valid_len, window_size, n_sequences),
+                       strides=(stride_row * step, stride_row, stride_col),
+                       writeable=False)
+
+    X_left_inds = np.arange(valid_len) * step
+    X_right_inds = X_left_inds + window_size
+
+    return X_sub, X_left_inds, X_right_inds
+
+
+def flatten_sub_matrices(X_sub, flatten_order='F'):
+    """Flatten submatrices produced by :func:`get_sub_matrices_view` into a
+    2d array. This is the only place where the windows get materialized,
+    and it is done with a single copy.
+
+    Parameters
+    ----------
+    X_sub : numpy array of shape (valid_len, window_size, n_sequences)
+        The submatrices.
+
+    flatten_order : str, optional (default='F')
+        ‘C’ means to flatten each submatrix in row-major (C-style) order.
+        ‘F’ means to flatten each submatrix in column-major (Fortran- style)
+        order.
+
+    Returns
+    -------
+    X_flat : numpy array of shape (valid_len, window_size*n_sequences)
+        C-contiguous matrix with each row stands for a flattend submatrix.
+    """
+    valid_len, window_size, n_sequences = X_sub.shape
+    if flatten_order == 'C':
+        X_flat = X_sub.reshape(valid_len, window_size * n_sequences)
+    else:
+        X_flat = X_sub.transpose(0, 2, 1).reshape(valid_len,
+                                                  window_size * n_sequences)
+    return np.ascontiguousarray(X_flat)
+
+
 def get_sub_matrices(X, window_size, step=1, return_numpy=True, flatten=True,
                      flatten_order='F'):
     """Chop a multivariate time series into sub sequences (matrices).
@@ -68,55 +144,26 @@ def get_sub_matrices(X, window_size, step=1, return_numpy=True, flatten=True,
         Decide the order of the flatten for multivarite sequences.
         ‘C’ means to flatten in row-major (C-style) order. 
         ‘F’ means to flatten in column-major (Fortran- style) order. 
-        ‘A’ means to flatten in column-major order if a is Fortran contiguous in memory, 
-        row-major order otherwise. ‘K’ means to flatten a in the order the elements occur in memory. 
         The default is ‘F’.
 
     Returns
     -------
     X_sub : numpy array of shape (valid_len, window_size*n_sequences)
         The numpy matrix with each row stands for a flattend submatrix.
+        If ``flatten`` is False, a read-only view of shape
+        (valid_len, window_size, n_sequences) is returned instead.
     """
-    X = check_array(X).astype(np.float)
-    n_samples, n_sequences = X.shape[0], X.shape[1]
-
-    # get the valid length
-    valid_len = get_sub_sequences_length(n_samples, window_size, step)
-
-    X_sub = []
-    X_left_inds = []
-    X_right_inds = []
-
-    # exclude the edge
-    steps = list(range(0, n_samples, step))
-    steps = steps[:valid_len]
-
-    # print(n_samples, n_sequences)
-    for idx, i in enumerate(steps):
-        X_sub.append(X[i: i + window_size, :])
-        X_left_inds.append(i)
-        X_right_inds.append(i + window_size)
-
-    X_sub = np.asarray(X_sub)
+    X_sub, X_left_inds, X_right_inds = get_sub_matrices_view(X, window_size,
+                                                             step)
 
     if return_numpy:
         if flatten:
-            temp_array = np.zeros([valid_len, window_size * n_sequences])
-            if flatten_order == 'C':
-                for i in range(valid_len):
-                    temp_array[i, :] = X_sub[i, :, :].flatten(order='C')
-
-            else:
-                for i in range(valid_len):
-                    temp_array[i, :] = X_sub[i, :, :].flatten(order='F')
-            return temp_array, np.asarray(X_left_inds), np.asarray(
-                X_right_inds)
-
+            return flatten_sub_matrices(X_sub, flatten_order), \
+                   X_left_inds, X_right_inds
         else:
-            return np.asarray(X_sub), np.asarray(X_left_inds), np.asarray(
-                X_right_inds)
+            return X_sub, X_left_inds, X_right_inds
     else:
-        return X_sub, np.asarray(X_left_inds), np.asarray(X_right_inds)
+        return list(X_sub), X_left_inds, X_right_inds
 
 
 def get_sub_sequences_length(n_samples, window_size, step):
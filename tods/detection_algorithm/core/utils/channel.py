@@ -1,10 +1,21 @@
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 import os
 import logging
 
 logger = logging.getLogger('telemanom')
 
 
+def _windows(arr, window_size):
+    """Read-only strided view of the windows arr[i:i + window_size] for i < len(arr) - window_size,
+    shape (len(arr) - window_size, window_size, input dimensions).
+    """
+    arr = np.asarray(arr)
+    n_windows = max(len(arr) - window_size, 0)
+    return as_strided(arr, shape=(n_windows, window_size) + arr.shape[1:],
+                      strides=(arr.strides[0],) + arr.strides, writeable=False)
+
+
 class Channel:
     def __init__(self,n_predictions,l_s):
         # , config, chan_id):
@@ -26,8 +37,8 @@ class Channel:
                 [timesteps, n_predictions, 1)
             y_test (arr): actual channel test values with dimensions
                 [timesteps, n_predictions, 1)
-            train (arr): train data loaded from .npy file
-            test(arr): test data loaded from .npy file
+            train (arr): raw training stream the training windows are drawn from
+            test(arr): raw test stream the test windows are drawn from
         """
 
         # self.id = chan_id
@@ -59,12 +70,8 @@ class Channel:
         # print("arr shape",arr.shape)
         # print("ls",self.config.l_s)
         # print("n_pred",self.config.n_predictions)
-        data = []
-
-        for i in range(len(arr) - self._l_s - self._n_predictions):
-            data.append(arr[i:i + self._l_s + self._n_predictions])
-        data = np.array(data)
-        # print("data shape",data.shape)
+        self.train = arr
+        data = _windows(arr, self._l_s + self._n_predictions)
         # assert len(data.shape) == 3
 
         # if train:
@@ -84,12 +91,8 @@ class Channel:
         
 
     def shape_test_data(self, arr):
-        data = []
-
-        for i in range(len(arr) - self._l_s - self._n_predictions):
-            data.append(arr[i:i + self._l_s + self._n_predictions])
-        data = np.array(data)
-        # print("data shape",data.shape)
+        self.test = arr
+        data = _windows(arr, self._l_s + self._n_predictions)
         self.X_test = data[:, :-self._n_predictions, :]
         self.y_test = data[:, -self._n_predictions:, :]  # telemetry value is at position 0
         self.y_test = np.reshape(self.y_test,(self.y_test.shape[0],self.y_test.shape[1]*self.y_test.shape[2]))
@@ -1,12 +1,38 @@
 import numpy as np
 import pandas as pd
-import more_itertools as mit
 import os
 import logging
 
 logger = logging.getLogger('telemanom')
 
 
+def _dilate(mask, radius):
+    """Mark every position within radius of a marked position, along the last axis.
+    """
+    counts = np.cumsum(mask, axis=-1, dtype=np.int64)
+    padding = [(0, 0)] * (mask.ndim - 1)
+    counts = np.pad(counts, padding + [(radius + 1, radius)], mode='edge')
+    counts[..., :radius + 1] = 0
+    return counts[..., 2 * radius + 1:] > counts[..., :-2 * radius - 1]
+
+
+def _consecutive_groups(indices):
+    """First and last index of each run of consecutive values of sorted, unique indices.
+    """
+    indices = np.asarray(indices)
+    if len(indices) == 0:
+        return indices, indices
+    breaks = np.flatnonzero(np.diff(indices) != 1)
+    return indices[np.r_[0, breaks + 1]], indices[np.r_[breaks, len(indices) - 1]]
+
+
+def _range_max(values, starts, ends):
+    """Max of values[start:end + 1] for each start and end.
+    """
+    bounds = np.ravel(np.column_stack((starts, np.asarray(ends) + 1)))
+    return np.maximum.reduceat(np.append(values, -np.inf), bounds)[::2]
+
+
 class Errors:
     def __init__(self, channel, window_size,batch_size, smoothing_perc,n_predictions,l_s,error_buffer,p):
         """
@@ -66,9 +92,12 @@ class Errors:
         # print(" after y_test shape",channel.y_test.shape)
         
         
+        if not len(channel.y_hat) == len(channel.y_test):
+            raise ValueError('len(y_hat) != len(y_test): {}, {}'
+                             .format(len(channel.y_hat), len(channel.y_test)))
+
         # raw prediction error
-        self.e = [abs(y_h-y_t) for y_h, y_t in
-                  zip(channel.y_hat, channel.y_test)]
+        self.e = np.abs(channel.y_hat - channel.y_test)
 
         self.e = np.reshape(self.e,(channel.X_test.shape[0],self._n_predictions,channel.X_test.shape[2]))
         # print("raw shape",self.e.shape)
@@ -93,18 +122,10 @@ class Errors:
         #         aggregated_error[i-1] /=n_pred 
 
         # Aggregation sequence wise
-        aggregated_error = []
-        for i in range(0,len(self.e)):
-            aggregated_error.append(np.sum(self.e[i],axis=0))
+        aggregated_error = np.sum(self.e, axis=1)
 
-        aggregated_error = np.asarray(aggregated_error)
-        # print(aggregated_error.shape)
-        
         smoothing_window = int(self._batch_size * self._window_size
                                * self._smoothing_perc)
-        if not len(channel.y_hat) == len(channel.y_test):
-            raise ValueError('len(y_hat) != len(y_test): {}, {}'
-                             .format(len(channel.y_hat), len(channel.y_test)))
 
         # smoothed prediction error
         self.e_s = pd.DataFrame(aggregated_error).ewm(span=smoothing_window)\
@@ -213,10 +234,9 @@ class Errors:
 
         if len(self.i_anom) > 0:
             # group anomalous indices into continuous sequences
-            groups = [list(group) for group in
-                      mit.consecutive_groups(self.i_anom)]
-            self.E_seq = [(int(g[0]), int(g[-1])) for g in groups
-                          if not g[0] == g[-1]]
+            starts, ends = _consecutive_groups(self.i_anom)
+            self.E_seq = [(int(start), int(end)) for start, end in zip(starts, ends)
+                          if not start == end]
 
             # additional shift is applied to indices so that they represent the
             # position in the original data array, obtained from the .npy files,
@@ -311,8 +331,7 @@ class ErrorWindow: # pragma: no cover
 
         self.mean_e_s = np.mean(self.e_s)
         self.sd_e_s = np.std(self.e_s)
-        self.e_s_inv = np.array([self.mean_e_s + (self.mean_e_s - e)
-                                 for e in self.e_s])
+        self.e_s_inv = self.mean_e_s + (self.mean_e_s - self.e_s)
 
         self.epsilon = self.mean_e_s + self.sd_lim * self.sd_e_s
         self.epsilon_inv = self.mean_e_s + self.sd_lim * self.sd_e_s
@@ -347,44 +366,42 @@ class ErrorWindow: # pragma: no cover
 
         max_score = -10000000
 
-        for z in np.arange(2.5, self.sd_lim, 0.5):
-            epsilon = self.mean_e_s + (self.sd_e_s * z)
-
-            pruned_e_s = e_s[e_s < epsilon]
-
-            i_anom = np.argwhere(e_s >= epsilon).reshape(-1,)
-            buffer = np.arange(1, self._error_buffer)
-            i_anom = np.sort(np.concatenate((i_anom,
-                                            np.array([i+buffer for i in i_anom])
-                                             .flatten(),
-                                            np.array([i-buffer for i in i_anom])
-                                             .flatten())))
-            i_anom = i_anom[(i_anom < len(e_s)) & (i_anom >= 0)]
-            i_anom = np.sort(np.unique(i_anom))
-
-            if len(i_anom) > 0:
-                # group anomalous indices into continuous sequences
-                groups = [list(group) for group
-                          in mit.consecutive_groups(i_anom)]
-                E_seq = [(g[0], g[-1]) for g in groups if not g[0] == g[-1]]
-
-                mean_perc_decrease = (self.mean_e_s - np.mean(pruned_e_s)) \
-                                     / self.mean_e_s
-                sd_perc_decrease = (self.sd_e_s - np.std(pruned_e_s)) \
-                                   / self.sd_e_s
-                score = (mean_perc_decrease + sd_perc_decrease) \
-                        / (len(E_seq) ** 2 + len(i_anom))
-
-                # sanity checks / guardrails
-                if score >= max_score and len(E_seq) <= 5 and \
-                        len(i_anom) < (len(e_s) * 0.5):
-                    max_score = score
-                    if not inverse:
-                        self.sd_threshold = z
-                        self.epsilon = self.mean_e_s + z * self.sd_e_s
-                    else:
-                        self.sd_threshold_inv = z
-                        self.epsilon_inv = self.mean_e_s + z * self.sd_e_s
+        # every candidate z at once, one row per z
+        z = np.arange(2.5, self.sd_lim, 0.5)
+        epsilon = self.mean_e_s + (self.sd_e_s * z)
+        above = e_s >= epsilon[:, np.newaxis]
+
+        anom = _dilate(above, max(self._error_buffer - 1, 0))
+        n_anom = anom.sum(axis=1)
+        # number of anomalous sequences longer than one index
+        first = anom & ~np.pad(anom, ((0, 0), (1, 0)))[:, :-1]
+        single = first & ~np.pad(anom, ((0, 0), (0, 1)))[:, 1:]
+        n_seq = first.sum(axis=1) - single.sum(axis=1)
+
+        pruned = ~above
+        n_pruned = pruned.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pruned_mean = np.where(pruned, e_s, 0.).sum(axis=1) / n_pruned
+            pruned_sd = np.sqrt((np.where(pruned, e_s - pruned_mean[:, np.newaxis], 0.) ** 2).sum(axis=1) / n_pruned)
+
+            mean_perc_decrease = (self.mean_e_s - pruned_mean) / self.mean_e_s
+            sd_perc_decrease = (self.sd_e_s - pruned_sd) / self.sd_e_s
+            score = (mean_perc_decrease + sd_perc_decrease) / (n_seq ** 2 + n_anom)
+
+        # sanity checks / guardrails
+        valid = (n_anom > 0) & (n_seq <= 5) & (n_anom < (len(e_s) * 0.5)) & (score >= max_score)
+        if not valid.any():
+            return
+
+        # the last z with the best score
+        score = np.where(valid, score, -np.inf)
+        best = len(z) - 1 - np.argmax(score[::-1])
+        if not inverse:
+            self.sd_threshold = z[best]
+            self.epsilon = self.mean_e_s + z[best] * self.sd_e_s
+        else:
+            self.sd_threshold_inv = z[best]
+            self.epsilon_inv = self.mean_e_s + z[best] * self.sd_e_s
 
     def compare_to_epsilon(self, errors_all, inverse=False):
         """
@@ -404,18 +421,11 @@ class ErrorWindow: # pragma: no cover
                 > (.05 * self.inter_range)) or not max(self.e_s) > 0.05:
             return
 
-        i_anom = np.argwhere((e_s >= epsilon) &
-                             (e_s > 0.05 * self.inter_range)).reshape(-1,)
+        above = (e_s >= epsilon) & (e_s > 0.05 * self.inter_range)
 
-        if len(i_anom) == 0:
+        if not above.any():
             return
-        buffer = np.arange(1, self._error_buffer+1)
-        i_anom = np.sort(np.concatenate((i_anom,
-                                         np.array([i + buffer for i in i_anom])
-                                         .flatten(),
-                                         np.array([i - buffer for i in i_anom])
-                                         .flatten())))
-        i_anom = i_anom[(i_anom < len(e_s)) & (i_anom >= 0)]
+        i_anom = np.flatnonzero(_dilate(above, self._error_buffer))
 
         # if it is first window, ignore initial errors (need some history)
         if self.window_num == 0:
@@ -423,21 +433,19 @@ class ErrorWindow: # pragma: no cover
         else:
             i_anom = i_anom[i_anom >= len(e_s) - self._batch_size]
 
-        i_anom = np.sort(np.unique(i_anom))
-
         # capture max of non-anomalous values below the threshold
         # (used in filtering process)
         batch_position = self.window_num * self._batch_size
-        window_indices = np.arange(0, len(e_s)) + batch_position
-        adj_i_anom = i_anom + batch_position
-        window_indices = np.setdiff1d(window_indices,
-                                      np.append(errors_all.i_anom, adj_i_anom))
-        candidate_indices = np.unique(window_indices - batch_position)
-        non_anom_max = np.max(np.take(e_s, candidate_indices))
+        prior_i_anom = errors_all.i_anom - batch_position
+        prior_i_anom = prior_i_anom[(prior_i_anom >= 0) & (prior_i_anom < len(e_s))]
+        anomalous = np.zeros(len(e_s), dtype=bool)
+        anomalous[i_anom] = True
+        anomalous[prior_i_anom.astype(int)] = True
+        non_anom_max = np.max(e_s[~anomalous])
 
         # group anomalous indices into continuous sequences
-        groups = [list(group) for group in mit.consecutive_groups(i_anom)]
-        E_seq = [(g[0], g[-1]) for g in groups if not g[0] == g[-1]]
+        starts, ends = _consecutive_groups(i_anom)
+        E_seq = [(start, end) for start, end in zip(starts, ends) if not start == end]
 
         if inverse:
             self.i_anom_inv = i_anom
@@ -465,7 +473,8 @@ class ErrorWindow: # pragma: no cover
         if len(E_seq) == 0:
             return
 
-        E_seq_max = np.array([max(e_s[e[0]:e[1]+1]) for e in E_seq])
+        E_seq = np.asarray(E_seq)
+        E_seq_max = _range_max(e_s, E_seq[:, 0], E_seq[:, 1])
         E_seq_max_sorted = np.sort(E_seq_max)[::-1]
         E_seq_max_sorted = np.append(E_seq_max_sorted, [non_anom_max])
 
@@ -480,7 +489,7 @@ class ErrorWindow: # pragma: no cover
         i_to_remove[::-1].sort()
 
         if len(i_to_remove) > 0:
-            E_seq = np.delete(E_seq, i_to_remove, axis=0)
+            E_seq = np.delete(E_seq, i_to_remove.astype(int), axis=0)
 
         if len(E_seq) == 0 and inverse:
             self.i_anom_inv = np.array([])
@@ -489,15 +498,16 @@ class ErrorWindow: # pragma: no cover
             self.i_anom = np.array([])
             return
 
-        indices_to_keep = np.concatenate([range(e_seq[0], e_seq[-1]+1)
-                                          for e_seq in E_seq])
+        # indices covered by the remaining sequences
+        to_keep = np.zeros(len(e_s) + 1, dtype=np.int64)
+        np.add.at(to_keep, E_seq[:, 0], 1)
+        np.add.at(to_keep, E_seq[:, 1] + 1, -1)
+        to_keep = np.cumsum(to_keep[:-1]) > 0
 
         if not inverse:
-            mask = np.isin(self.i_anom, indices_to_keep)
-            self.i_anom = self.i_anom[mask]
+            self.i_anom = self.i_anom[to_keep[self.i_anom]]
         else:
-            mask_inv = np.isin(self.i_anom_inv, indices_to_keep)
-            self.i_anom_inv = self.i_anom_inv[mask_inv]
+            self.i_anom_inv = self.i_anom_inv[to_keep[self.i_anom_inv]]
 
     def score_anomalies(self, prior_idx):
         """
@@ -509,24 +519,21 @@ class ErrorWindow: # pragma: no cover
                 values for channel
         """
 
-        groups = [list(group) for group in mit.consecutive_groups(self.i_anom)]
+        starts, ends = _consecutive_groups(self.i_anom)
 
-        for e_seq in groups:
+        scores = _range_max(np.abs(self.e_s - self.epsilon) / (self.mean_e_s + self.sd_e_s), starts, ends)
+        inv_scores = _range_max(np.abs(self.e_s_inv - self.epsilon_inv) / (self.mean_e_s + self.sd_e_s),
+                                starts, ends)
+
+        for start, end, score, inv_score in zip(starts, ends, scores, inv_scores):
 
             score_dict = {
-                "start_idx": e_seq[0] + prior_idx,
-                "end_idx": e_seq[-1] + prior_idx,
+                "start_idx": start + prior_idx,
+                "end_idx": end + prior_idx,
                 "score": 0
             }
 
-            score = max([abs(self.e_s[i] - self.epsilon)
-                         / (self.mean_e_s + self.sd_e_s) for i in
-                         range(e_seq[0], e_seq[-1] + 1)])
-            inv_score = max([abs(self.e_s_inv[i] - self.epsilon_inv)
-                             / (self.mean_e_s + self.sd_e_s) for i in
-                             range(e_seq[0], e_seq[-1] + 1)])
-
             # the max score indicates whether anomaly was from regular
             # or inverted errors
             score_dict['score'] = max([score, inv_score])
-            self.anom_scores.append(score_dict)
\ No newline at end of file
+            self.anom_scores.append(score_dict)
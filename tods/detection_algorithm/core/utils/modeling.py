@@ -7,6 +7,8 @@ import numpy as np
 import os
 import logging
 
+from .windows import window_dataset, window_starts, split_starts
+
 # suppress tensorflow CPU speedup warnings
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 logger = logging.getLogger('telemanom')
@@ -14,7 +16,8 @@ logger = logging.getLogger('telemanom')
 
 class Model:
     def __init__(self, channel,patience,min_delta,layers,dropout,n_predictions,loss_metric,
-                 optimizer,lstm_batch_size,epochs,validation_split,batch_size,l_s
+                 optimizer,lstm_batch_size,epochs,validation_split,batch_size,l_s,
+                 shuffle_buffer_size=0
                 ):
         """
         Loads/trains RNN and predicts future telemetry values for a channel.
@@ -25,6 +28,8 @@ class Model:
             run_id (str): Datetime referencing set of predictions in use
             channel (obj): Channel class object containing train/test data
                 for X,y for a single channel
+            shuffle_buffer_size (int): number of training windows shuffled
+                together, None to shuffle all of them and 0 not to shuffle
 
         Attributes:
             config (obj): see Args
@@ -54,6 +59,7 @@ class Model:
         self._validation_split = validation_split
         self._batch_size = batch_size
         self._l_s = l_s
+        self._shuffle_buffer_size = shuffle_buffer_size
         
         self.train_new(channel)
 
@@ -106,12 +112,21 @@ class Model:
         
         # print(self.model.summary())
 
-        self.model.fit(channel.X_train,
-                       channel.y_train,
-                       batch_size=self._lstm_batch_size,
+        # windows are gathered from the raw training stream batch by batch
+        train_starts, validation_starts = split_starts(
+            window_starts(len(channel.train), self._l_s + self._n_predictions, channel.X_train.shape[0]),
+            self._validation_split)
+        train_data = window_dataset(channel.train, train_starts, self._l_s, self._n_predictions,
+                                    batch_size=self._lstm_batch_size,
+                                    shuffle_buffer_size=self._shuffle_buffer_size)
+        validation_data = None
+        if len(validation_starts):
+            validation_data = window_dataset(channel.train, validation_starts, self._l_s, self._n_predictions,
+                                             batch_size=self._lstm_batch_size)
+
+        self.model.fit(train_data,
                        epochs=self._epochs,
-                       shuffle=False,
-                       validation_split=self._validation_split,
+                       validation_data=validation_data,
                        callbacks=cbs,
                        verbose=True)
 
@@ -199,7 +214,12 @@ class Model:
 
         # return channel
 
-        self.y_hat = self.model.predict(channel.X_test)        
+        test_data = window_dataset(channel.test,
+                                   window_starts(len(channel.test), self._l_s + self._n_predictions,
+                                                 channel.X_test.shape[0]),
+                                   self._l_s, self._n_predictions, batch_size=self._lstm_batch_size,
+                                   targets=False)
+        self.y_hat = self.model.predict(test_data)
         self.y_hat = np.reshape(self.y_hat,(channel.X_test.shape[0],self._n_predictions,channel.X_test.shape[2]))
         # print("shape before ",self.y_hat.shape)
         channel.y_hat = self.y_hat
@@ -0,0 +1,101 @@
+"""Windows of a time series, generated on the fly for Keras.
+
+The LSTM detectors learn to predict the ``target_length`` values that follow
+each window of ``input_length`` values. Materializing every window takes
+``input_length`` times the memory of the series, so instead ``window_dataset``
+builds a ``tf.data.Dataset`` over the window start positions: each batch of
+starts is shuffled, gathered from the series (which may be a ``numpy.memmap``)
+and transformed in a background step, and batches are prefetched while the
+model trains or predicts.
+"""
+import numpy as np
+import tensorflow as tf
+
+__all__ = ('window_starts', 'window_dataset', 'split_starts')
+
+
+def window_starts(n_samples, window_length, n_windows=None):
+    """The start of every window of window_length values in a series of n_samples values.
+
+    Args:
+        n_samples (int): length of the series
+        window_length (int): input and target length of a window
+        n_windows (int): number of windows, at most (and by default) every window that fits
+
+    Returns:
+        arr: the start of each window
+    """
+    n_fit = max(n_samples - window_length + 1, 0)
+    n_windows = n_fit if n_windows is None else max(min(n_windows, n_fit), 0)
+    return np.arange(n_windows, dtype=np.int64)
+
+
+def split_starts(starts, validation_split):
+    """Split window starts into training and validation starts, as Keras' validation_split does.
+
+    The validation windows are the last ones.
+
+    Args:
+        starts (arr): window starts
+        validation_split (float): fraction of the windows used for validation
+
+    Returns:
+        (arr, arr): training starts, validation starts
+    """
+    split_at = int(np.floor(len(starts) * (1. - validation_split)))
+    return starts[:split_at], starts[split_at:]
+
+
+def _gather(X, starts, input_length, target_length, transform):
+    rows = starts[:, np.newaxis] + np.arange(input_length + target_length)
+    windows = np.asarray(X[rows.ravel()])
+    if transform is not None:
+        windows = transform(windows)
+    windows = windows.reshape(rows.shape + (X.shape[1], )).astype(np.float32)
+    inputs = windows[:, :input_length]
+    targets = windows[:, input_length:].reshape(len(starts), target_length * X.shape[1])
+    return inputs, targets
+
+
+def window_dataset(X, starts, input_length, target_length=1, batch_size=32, targets=True,
+                   shuffle_buffer_size=0, transform=None, seed=None):
+    """Dataset of the windows X[start:start + input_length] and of the target_length values that follow them.
+
+    Args:
+        X (arr): series of shape (n_samples, n_features), in memory or memory-mapped
+        starts (arr): start of each window, in the order they are used when not shuffled
+        input_length (int): length of the inputs
+        target_length (int): number of values to predict after the inputs
+        batch_size (int): number of windows per batch
+        targets (bool): whether each element is (inputs, targets) or only inputs
+        shuffle_buffer_size (int): number of windows to shuffle from, None to shuffle
+            all of them and 0 not to shuffle. Windows are reshuffled at each epoch.
+        transform (callable): applied to the rows of X of each batch, e.g. the transform
+            of a fitted scaler
+        seed (int): shuffle seed
+
+    Returns:
+        tf.data.Dataset: batches of inputs of shape (batch, input_length, n_features) and
+        of targets of shape (batch, target_length * n_features), as float32
+    """
+    n_features = X.shape[1]
+    starts = np.asarray(starts, dtype=np.int64)
+
+    dataset = tf.data.Dataset.from_tensor_slices(starts)
+    if shuffle_buffer_size is None or shuffle_buffer_size > 0:
+        buffer_size = len(starts) if shuffle_buffer_size is None else min(shuffle_buffer_size, len(starts))
+        dataset = dataset.shuffle(max(buffer_size, 1), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+
+    def gather(batch):
+        inputs, batch_targets = tf.numpy_function(
+            lambda batch_starts: _gather(X, batch_starts, input_length, target_length, transform),
+            [batch], [tf.float32, tf.float32])
+        inputs.set_shape([None, input_length, n_features])
+        if not targets:
+            return inputs
+        batch_targets.set_shape([None, target_length * n_features])
+        return inputs, batch_targets
+
+    dataset = dataset.map(gather, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+    return dataset.prefetch(tf.data.experimental.AUTOTUNE)
@@ -1,6 +1,5 @@
 import os
 import typing
-import pandas as pd 
 import numpy as np
 
 from d3m import container, utils
@@ -9,12 +8,12 @@ from d3m.metadata import base as metadata_base, hyperparams
 from d3m.primitive_interfaces import base, transformer
 import uuid
 
-import logging
 import math
 from scipy.fft import dct
 from collections import OrderedDict
 from typing import cast, Dict, List, Union, Sequence, Optional, Tuple
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from .core.spectrum import top_k_indices
 
 
 from scipy import sparse
@@ -92,6 +91,12 @@ class Hyperparams(hyperparams.Hyperparams):
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
     )
 
+    top_k = hyperparams.Hyperparameter[typing.Union[int, None]](
+        default=None,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Return only the k coefficients of largest absolute value of each column, largest first, with their position in a column named 'column_name_dct_index'. If None, every coefficient is returned.",
+    )
+
     # parameters for column
     use_columns = hyperparams.Set(
         elements=hyperparams.Hyperparameter[int](-1),
@@ -135,28 +140,31 @@ class Hyperparams(hyperparams.Hyperparams):
     )
 
 class DCT:
-    def __init__(self,type_,n,axis,overwrite_x,norm,workers):
+    def __init__(self,type_,n,axis,overwrite_x,norm,workers,top_k=None):
         self._type = type_
         self._n = n
         self._axis = axis
         self._overwrite_x = overwrite_x
         self._norm = norm
-        self._workers = workers
+        self._workers = None if workers is None else int(workers)
+        self._top_k = top_k
         
     def produce(self, inputs):
 
         dataframe = inputs
-        processed_df = utils.pandas.DataFrame()
-        try:
-            for target_column in dataframe.columns :
-                dct_input = dataframe[target_column].values
-                dct_output = dct(x=dct_input,type=self._type,n=self._n,axis=self._axis,overwrite_x=self._overwrite_x,norm=self._norm,workers=self._workers)
-                processed_df[target_column+"_dct_coeff"]=pd.Series(dct_output)
-            
-        except IndexError:
-            logging.warning("Index not found in dataframe")
+        # every column is a series along the rows, and all of them are transformed in one call
+        dct_output = dct(x=dataframe.values.astype(np.float64),type=self._type,n=self._n,axis=0,overwrite_x=self._overwrite_x,norm=self._norm,workers=self._workers)
+
+        if self._top_k is None:
+            names = [str(target_column)+"_dct_coeff" for target_column in dataframe.columns]
+            return utils.pandas.DataFrame(dct_output, columns=names)
 
-        return processed_df;
+        indices = top_k_indices(np.abs(dct_output), self._top_k)
+        processed = np.empty((len(indices), 2 * dct_output.shape[1]))
+        processed[:, 0::2] = np.take_along_axis(dct_output, indices, axis=0)
+        processed[:, 1::2] = indices
+        names = [str(target_column)+suffix for target_column in dataframe.columns for suffix in ("_dct_coeff", "_dct_index")]
+        return utils.pandas.DataFrame(processed, columns=names)
 
 
         
@@ -189,6 +197,9 @@ class DiscreteCosineTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Outp
 
     workers: int
         Maximum number of workers to use for parallel computation. If negative, the value wraps around from os.cpu_count(). Defualt is None.
+
+    top_k: int
+        Return only the k coefficients of largest absolute value of each column, with their position. Default is None, every coefficient.
     
 
     use_columns: Set
@@ -240,7 +251,8 @@ class DiscreteCosineTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Outp
                         axis=self.hyperparams['axis'],
                         overwrite_x=self.hyperparams['overwrite_x'],
                         norm = self.hyperparams['norm'],
-                        workers = self.hyperparams['workers']
+                        workers = self.hyperparams['workers'],
+                        top_k = self.hyperparams['top_k']
                         )
 
     def _produce(self, *, inputs: Inputs, timeout: float = None, iterations: int = None) -> base.CallResult[Outputs]:
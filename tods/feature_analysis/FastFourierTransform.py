@@ -1,6 +1,5 @@
 import os
 import typing
-import pandas as pd 
 import numpy as np
 
 from d3m import container, utils
@@ -9,15 +8,14 @@ from d3m.metadata import base as metadata_base, hyperparams
 from d3m.primitive_interfaces import base, transformer
 import uuid
 
-import logging
-from cmath import polar
-from scipy.fft import fft
+from scipy.fft import fft, rfft
 from collections import OrderedDict
 from typing import cast, Dict, List, Union, Sequence, Optional, Tuple
 
 from scipy import sparse
 from numpy import ndarray
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from .core.spectrum import top_k_indices
 
 __all__ = ('FastFourierTransformPrimitive',)
 
@@ -81,6 +79,18 @@ class Hyperparams(hyperparams.Hyperparams):
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
     )
 
+    rfft = hyperparams.UniformBool(
+        default=False,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Use the real FFT. The coefficients of negative frequencies of a real series are the conjugates of the positive ones, so only the n//2+1 non-negative frequencies are computed and returned.",
+    )
+
+    top_k = hyperparams.Hyperparameter[typing.Union[int, None]](
+        default=None,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Return only the k coefficients of largest magnitude of each column, largest first, with their position in the spectrum in a column named 'column_name_fft_index'. If None, the whole spectrum is returned.",
+    )
+
     # TODO: Decide what to do with plan parameter how to work with it
     # plan
 
@@ -127,33 +137,39 @@ class Hyperparams(hyperparams.Hyperparams):
     )
 
 class FFT:
-    def __init__(self,n,axis,overwrite_x,norm,workers):
+    def __init__(self,n,axis,overwrite_x,norm,workers,rfft=False,top_k=None):
         
         self._n = n
         self._axis = axis
         self._overwrite_x = overwrite_x
         self._norm = norm
-        self._workers = workers
+        self._workers = None if workers is None else int(workers)
+        self._rfft = rfft
+        self._top_k = top_k
         
     def produce(self, inputs):
 
         dataframe = inputs
-        processed_df = utils.pandas.DataFrame()
-        try:
-            for target_column in dataframe.columns :
-
-                fft_input = dataframe[target_column].values
-                fft_output = fft(x=fft_input,n=self._n,axis=self._axis,overwrite_x=self._overwrite_x,norm=self._norm,workers=self._workers)
-                tuples = [polar(i) for i in fft_output]
-                absolute_values = [i[0] for i in tuples]
-                phase_values = [i[1] for i in tuples]
-                processed_df[target_column+"_fft_abs"]=pd.Series(absolute_values)
-                processed_df[target_column+"_fft_phse"]=pd.Series(phase_values)
-        
-        except IndexError:
-            logging.warning("Index not found in dataframe")
+        transform = rfft if self._rfft else fft
+        # every column is a series along the rows, and all of them are transformed in one call
+        fft_output = transform(x=dataframe.values.astype(np.float64),n=self._n,axis=0,overwrite_x=self._overwrite_x,norm=self._norm,workers=self._workers)
+
+        suffixes = ["_fft_abs", "_fft_phse"]
+        if self._top_k is not None:
+            indices = top_k_indices(np.abs(fft_output), self._top_k)
+            fft_output = np.take_along_axis(fft_output, indices, axis=0)
+            suffixes.append("_fft_index")
 
-        return processed_df;
+        # the columns of each input column are interleaved: abs, phase[, index]
+        width = len(suffixes)
+        processed = np.empty((fft_output.shape[0], width * fft_output.shape[1]))
+        np.abs(fft_output, out=processed[:, 0::width])
+        np.arctan2(fft_output.imag, fft_output.real, out=processed[:, 1::width])
+        if self._top_k is not None:
+            processed[:, 2::width] = indices
+
+        names = [str(target_column)+suffix for target_column in dataframe.columns for suffix in suffixes]
+        return utils.pandas.DataFrame(processed, columns=names)
 
 
         
@@ -182,6 +198,12 @@ class FastFourierTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Outputs
 
     workers: int
         Maximum number of workers to use for parallel computation. If negative, the value wraps around from os.cpu_count(). Defualt is None.
+
+    rfft: boolean
+        Use the real FFT and return only the n//2+1 non-negative frequencies, which determine the spectrum of a real series.
+
+    top_k: int
+        Return only the k coefficients of largest magnitude of each column, with their position in the spectrum. Default is None, the whole spectrum.
     
     
     use_columns: Set
@@ -230,7 +252,9 @@ class FastFourierTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Outputs
                         axis=self.hyperparams['axis'],
                         overwrite_x=self.hyperparams['overwrite_x'],
                         norm = self.hyperparams['norm'],
-                        workers = self.hyperparams['workers']
+                        workers = self.hyperparams['workers'],
+                        rfft = self.hyperparams['rfft'],
+                        top_k = self.hyperparams['top_k']
                         )
 
     def _produce(self, *, inputs: Inputs, timeout: float = None, iterations: int = None) -> base.CallResult[Outputs]:
@@ -33,7 +33,7 @@ import uuid
 
 from d3m import container, utils as d3m_utils
 
-import stumpy
+from .core.matrix_profile import approximate_multi_dimensional_profile, multi_dimensional_profile
 
 from sklearn.preprocessing import MinMaxScaler
 # from typing import Union
@@ -51,6 +51,26 @@ class Hyperparams(hyperparams.Hyperparams):
         semantic_types=['https://metadata.datadrivendiscovery.org/types/TuningParameter']
     )
 
+    profile_percentage = hyperparams.Uniform(
+        lower=0.,
+        upper=1.,
+        default=1.,
+        lower_inclusive=False,
+        upper_inclusive=True,
+        description='Fraction of the distance-matrix diagonals computed. Below 1, each window takes its nearest '
+                    'neighbour among the windows on that fraction of the diagonals, in the same multi-dimensional '
+                    'profile as the exact one.',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter']
+    )
+
+    time_budget = hyperparams.Hyperparameter[typing.Union[float, None]](
+        default=None,
+        description='Seconds the approximate profile is refined for before the best one found is returned, None for '
+                    'no limit. Setting it approximates the profile as profile_percentage does. The fraction of the '
+                    'diagonals reached is reported in the matrix_profile metadata of the outputs.',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter']
+    )
+
     # Keep previous
     dataframe_resource = hyperparams.Hyperparameter[typing.Union[str, None]](
         default=None,
@@ -103,9 +123,13 @@ class MP:
     """
     This is the class for matrix profile function
     """
-    def __init__(self, window_size):    #, step_size):
+    def __init__(self, window_size, percentage=1., time_budget=None):    #, step_size):
         self._window_size = window_size
         #self._step_size = step_size
+        self._percentage = percentage
+        self._time_budget = time_budget
+        # fraction of the distance-matrix diagonals behind the last profile
+        self.approximation_ = 1.
         return
         
     def produce(self, data):
@@ -127,7 +151,13 @@ class MP:
         	transformed_columns=pd.concat([transformed_columns,output], axis=1)
         return transformed_columns
         """
-        matrix_profile, matrix_profile_indices = stumpy.mstump(data, m = self._window_size)
+        if self._percentage < 1. or self._time_budget is not None:
+            matrix_profile, _, self.approximation_ = approximate_multi_dimensional_profile(
+                data, self._window_size, percentage=self._percentage, time_budget=self._time_budget)
+            return matrix_profile
+
+        self.approximation_ = 1.
+        matrix_profile, matrix_profile_indices = multi_dimensional_profile(data, self._window_size)
         print('matrix profile ', matrix_profile)
         #output = np.concatenate((output, left_inds_, right_inds_),axis=1)
         return matrix_profile
@@ -183,7 +213,8 @@ class MatrixProfilePrimitive(transformer.TransformerPrimitiveBase[Inputs, Output
                  docker_containers: Dict[str, DockerContainer] = None) -> None:
         super().__init__(hyperparams=hyperparams, random_seed=random_seed, docker_containers=docker_containers)
 
-        self._clf = MP(window_size=hyperparams['window_size'])  #, step_size=hyperparams['step_size'])
+        self._clf = MP(window_size=hyperparams['window_size'], percentage=hyperparams['profile_percentage'],
+                       time_budget=hyperparams['time_budget'])  #, step_size=hyperparams['step_size'])
 
 
     def produce(self, *, inputs: Inputs, timeout: float = None, iterations: int = None) -> base.CallResult[Outputs]:
@@ -224,6 +255,9 @@ class MatrixProfilePrimitive(transformer.TransformerPrimitiveBase[Inputs, Output
                                              add_index_columns=self.hyperparams['add_index_columns'],
                                              inputs=inputs, column_indices=self._columns_to_produce,
                                              columns_list=output_columns)
+        outputs.metadata = outputs.metadata.update((), {
+            'matrix_profile': {'approximation': self._clf.approximation_},
+        })
 
         # outputs = inputs
         return base.CallResult(outputs)
@@ -24,6 +24,7 @@ from d3m.metadata import hyperparams, params, base as metadata_base
 from d3m.base import utils as base_utils
 from d3m.exceptions import PrimitiveNotFittedError
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from .core import spectral_residual
 
 __all__ = ('SpectralResidualTransformPrimitive',)
 
@@ -43,6 +44,11 @@ class Hyperparams(hyperparams.Hyperparams):
        avg_filter_dimension = hyperparams.Hyperparameter(default=3, semantic_types=[
            'https://metadata.datadrivendiscovery.org/types/TuningParameter',
        ], description="Spectral Residual average filter dimension")
+       window_size = hyperparams.Hyperparameter[typing.Union[int, None]](
+           default=None,
+           semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+           description="Number of points up to each point that are transformed to score it, extended with points extrapolated from their slope as an online detector would. None transforms the whole series at once.",
+       )
        #control parameter
        use_columns = hyperparams.Set(
            elements=hyperparams.Hyperparameter[int](-1),
@@ -170,6 +176,12 @@ class SpectralResidualTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Ou
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        if hyperparams['window_size'] is None:
+            return None
+        return hyperparams['window_size'] - 1
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
         """
@@ -296,34 +308,18 @@ class SpectralResidualTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Ou
     def _spectral_residual_transform(self, X,avg_filter_dimension):
         """
         This method transform a time series into spectral residual series
-        :param values: list.
-            a list of float values.
-        :return: mag: list.
-            a list of float values as the spectral residual values
+        :param values: DataFrame.
+            the columns to transform.
+        :return: mag: DataFrame.
+            the spectral residual values of each column
         """
-        EPS = 1e-8
-        transformed_X = utils.pandas.DataFrame()
-        for column in X.columns:
-            values = X[column].values
-            trans = np.fft.fft(values)
-            mag = np.sqrt(trans.real ** 2 + trans.imag ** 2)
-            eps_index = np.where(mag <= EPS)[0]
-            mag[eps_index] = EPS
-
-            mag_log = np.log(mag)
-            mag_log[eps_index] = 0
-            spectral = np.exp(mag_log - self._average_filter(mag_log, n=avg_filter_dimension))
-
-            trans.real = trans.real * spectral / mag
-            trans.imag = trans.imag * spectral / mag
-            trans.real[eps_index] = 0
-            trans.imag[eps_index] = 0
-
-            wave_r = np.fft.ifft(trans)
-            mag = np.round(np.sqrt(wave_r.real ** 2 + wave_r.imag ** 2),4)
-            transformed_X[column + "_spectral_residual"] = mag
-
-        return transformed_X
+        values = X.values.astype(np.float64)
+        if self.hyperparams['window_size'] is None:
+            transformed = spectral_residual.spectral_residual(values, avg_filter_dimension)
+        else:
+            transformed = spectral_residual.StreamingSpectralResidual(
+                self.hyperparams['window_size'], avg_filter_dimension).update(values)
+        return utils.pandas.DataFrame(transformed, columns=[str(column) + "_spectral_residual" for column in X.columns])
 
     def _average_filter(self,values, n=3):
         """
@@ -336,18 +332,7 @@ class SpectralResidualTransformPrimitive(TODSTransformerPrimitiveBase[Inputs, Ou
         :return res: list.
             a list of value after the average_filter process.
         """
-
-        if n >= len(values):
-            n = len(values)
-
-        res = np.cumsum(values, dtype=float)
-        res[n:] = res[n:] - res[:-n]
-        res[n:] = res[n:] / n
-
-        for i in range(1, n):
-            res[i] /= (i + 1)
-
-        return res
+        return spectral_residual.average_filter(np.asarray(values), n)
 
     def _write(self, inputs: Inputs): # pragma: no cover
         inputs.to_csv(str(time.time()) + '.csv')
@@ -1,7 +1,6 @@
 import os
 from typing import Any,Optional,List
 import statsmodels.api as sm
-import numpy as np
 from d3m import container, utils as d3m_utils
 from d3m import utils
 
@@ -18,12 +17,13 @@ import time
 from d3m import container
 from d3m.primitive_interfaces import base, transformer
 
-from d3m.container import DataFrame as d3m_dataframe
 from d3m.metadata import hyperparams, params, base as metadata_base
 
 from d3m.base import utils as base_utils
 from d3m.exceptions import PrimitiveNotFittedError
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from ..common import metadata_cache
+from .core import rolling
 
 __all__ = ('StatisticalMaximumPrimitive',)
 
@@ -169,6 +169,10 @@ class StatisticalMaximumPrimitive(TODSTransformerPrimitiveBase[Inputs, Outputs,
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return rolling.lookback(hyperparams['window_size'])
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
         """
@@ -261,11 +265,11 @@ class StatisticalMaximumPrimitive(TODSTransformerPrimitiveBase[Inputs, Outputs,
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams):
@@ -305,16 +309,7 @@ class StatisticalMaximumPrimitive(TODSTransformerPrimitiveBase[Inputs, Outputs,
             DataFrame
             A object with maximum
         """
-        if(window_size==-1):
-            window_size = len(X)
         transformed_X = utils.pandas.DataFrame()
         for column in X.columns:
-            column_value = X[column].values
-            column_maximum = np.zeros(len(column_value))
-            for iter in range(window_size-1,len(column_value)):
-                sequence = column_value[iter-window_size+1:iter+1]
-                column_maximum[iter] = np.max(sequence)
-            column_maximum[:window_size-1] = column_maximum[window_size-1]
-            transformed_X[str(column) + "_maximum"] = column_maximum
-
+            transformed_X[str(column) + "_maximum"] = rolling.rolling_max(X[column].values, window_size)
         return transformed_X
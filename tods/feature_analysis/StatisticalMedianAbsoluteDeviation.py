@@ -9,7 +9,6 @@ from numpy import ndarray
 from collections import OrderedDict
 from scipy import sparse
 import os
-from scipy import stats
 
 import numpy
 import typing
@@ -19,12 +18,13 @@ import uuid
 from d3m import container
 from d3m.primitive_interfaces import base, transformer
 
-from d3m.container import DataFrame as d3m_dataframe
 from d3m.metadata import hyperparams, params, base as metadata_base
 
 from d3m.base import utils as base_utils
 from d3m.exceptions import PrimitiveNotFittedError
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from ..common import metadata_cache
+from .core import rolling
 
 __all__ = ('StatisticalMedianAbsoluteDeviationPrimitive',)
 
@@ -170,6 +170,10 @@ class StatisticalMedianAbsoluteDeviationPrimitive(TODSTransformerPrimitiveBase[I
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return rolling.lookback(hyperparams['window_size'])
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
         """
@@ -262,11 +266,11 @@ class StatisticalMedianAbsoluteDeviationPrimitive(TODSTransformerPrimitiveBase[I
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams):
@@ -306,16 +310,7 @@ class StatisticalMedianAbsoluteDeviationPrimitive(TODSTransformerPrimitiveBase[I
             DataFrame
             A object with median_absolute_deviation
         """
-        if(window_size==-1):
-            window_size = len(X)
         transformed_X = utils.pandas.DataFrame()
         for column in X.columns:
-            column_value = X[column].values
-            column_median_absolute_deviation = np.zeros(len(column_value))
-            for iter in range(window_size-1,len(column_value)):
-                sequence = column_value[iter-window_size+1:iter+1]
-                column_median_absolute_deviation[iter] = stats.median_absolute_deviation(sequence).round(4)
-            column_median_absolute_deviation[:window_size-1] = column_median_absolute_deviation[window_size-1]
-            transformed_X[column + "_median_absolute_deviation"] = column_median_absolute_deviation
-
+            transformed_X[column + "_median_absolute_deviation"] = np.round(rolling.rolling_median_absolute_deviation(X[column].values, window_size), 4)
         return transformed_X
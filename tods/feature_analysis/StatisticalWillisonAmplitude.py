@@ -1,7 +1,6 @@
 import os
 from typing import Any,Optional,List
 import statsmodels.api as sm
-import numpy as np
 from d3m import container, utils as d3m_utils
 from d3m import utils
 
@@ -18,12 +17,13 @@ import uuid
 from d3m import container
 from d3m.primitive_interfaces import base, transformer
 
-from d3m.container import DataFrame as d3m_dataframe
 from d3m.metadata import hyperparams, params, base as metadata_base
 
 from d3m.base import utils as base_utils
 from d3m.exceptions import PrimitiveNotFittedError
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from ..common import metadata_cache
+from .core import rolling
 
 __all__ = ('StatisticalWillisonAmplitudePrimitive',)
 
@@ -174,6 +174,10 @@ class StatisticalWillisonAmplitudePrimitive(TODSTransformerPrimitiveBase[Inputs,
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return rolling.lookback(hyperparams['window_size'], ('willison_amplitude', ))
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
         """
@@ -266,11 +270,11 @@ class StatisticalWillisonAmplitudePrimitive(TODSTransformerPrimitiveBase[Inputs,
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams):
@@ -310,23 +314,7 @@ class StatisticalWillisonAmplitudePrimitive(TODSTransformerPrimitiveBase[Inputs,
             DataFrame
             A object with willison_amplitude
         """
-        if(window_size==-1):
-            window_size = len(X)
         transformed_X = utils.pandas.DataFrame()
         for column in X.columns:
-            column_diff_value = np.zeros(len(X[column])+1)    # array of 1 extra row use to adjust X(t)-X(t-1)
-            column_diff_value[1:] = (X[column].values)
-            column_diff_value = np.abs(np.diff(column_diff_value))
-            willison_func_values = np.zeros(len(X[column]))
-            mask = (column_diff_value>threshold)
-            willison_func_values[mask] = 1
-
-            column_willison_amplitude = np.zeros(len(X[column].values))
-
-            for iter in range(window_size-1,len(column_diff_value)):
-                sequence = willison_func_values[iter-window_size+1:iter+1]
-                column_willison_amplitude[iter] = np.sum(sequence)
-            column_willison_amplitude[:window_size-1] = column_willison_amplitude[window_size-1]
-            transformed_X[column + "_willison_amplitude"] = column_willison_amplitude
-
+            transformed_X[column + "_willison_amplitude"] = rolling.rolling_willison_amplitude(X[column].values, window_size, threshold)
         return transformed_X
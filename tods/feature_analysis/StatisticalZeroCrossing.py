@@ -1,7 +1,6 @@
 import os
 from typing import Any,Optional,List
 import statsmodels.api as sm
-import numpy as np
 from d3m import container, utils as d3m_utils
 from d3m import utils
 
@@ -18,12 +17,13 @@ import uuid
 from d3m import container
 from d3m.primitive_interfaces import base, transformer
 
-from d3m.container import DataFrame as d3m_dataframe
 from d3m.metadata import hyperparams, params, base as metadata_base
 
 from d3m.base import utils as base_utils
 from d3m.exceptions import PrimitiveNotFittedError
 from ..common.TODSBasePrimitives import TODSTransformerPrimitiveBase
+from ..common import metadata_cache
+from .core import rolling
 
 __all__ = ('StatisticalZeroCrossingPrimitive',)
 
@@ -164,6 +164,10 @@ class StatisticalZeroCrossingPrimitive(TODSTransformerPrimitiveBase[Inputs, Outp
 
         return base.CallResult(outputs)
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return 1
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams):
         """
@@ -256,11 +260,11 @@ class StatisticalZeroCrossingPrimitive(TODSTransformerPrimitiveBase[Inputs, Outp
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+        def build_metadata(outputs):
+            target_columns_metadata = self._add_target_columns_metadata(outputs.metadata, self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata)
 
     @classmethod
     def _add_target_columns_metadata(cls, outputs_metadata: metadata_base.DataMetadata, hyperparams):
@@ -302,11 +306,5 @@ class StatisticalZeroCrossingPrimitive(TODSTransformerPrimitiveBase[Inputs, Outp
         """
         transformed_X = utils.pandas.DataFrame()
         for column in X.columns:
-            column_value = X[column].values
-            column_zero_crossing = np.zeros(len(column_value))
-            for iter in range(1,len(column_value)):
-                if(column_value[iter]*column_value[iter-1] < 0.0 ):
-                    column_zero_crossing[iter] = 1
-            transformed_X[column + "_zero_crossing"] = column_zero_crossing
-
+            transformed_X[column + "_zero_crossing"] = rolling.zero_crossing(X[column].values)
         return transformed_X
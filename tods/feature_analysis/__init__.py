@@ -1,30 +1,4 @@
-from tods.feature_analysis.AutoCorrelation import AutoCorrelationPrimitive
-from tods.feature_analysis.BKFilter import BKFilterPrimitive
-from tods.feature_analysis.DiscreteCosineTransform import DiscreteCosineTransformPrimitive
-from tods.feature_analysis.FastFourierTransform import FastFourierTransformPrimitive
-from tods.feature_analysis.HPFilter import HPFilterPrimitive
-from tods.feature_analysis.NonNegativeMatrixFactorization import NonNegativeMatrixFactorizationPrimitive
-from tods.feature_analysis.SKTruncatedSVD import SKTruncatedSVDPrimitive
-from tods.feature_analysis.SpectralResidualTransform import SpectralResidualTransformPrimitive
-from tods.feature_analysis.StatisticalAbsEnergy import StatisticalAbsEnergyPrimitive
-from tods.feature_analysis.StatisticalAbsSum import StatisticalAbsSumPrimitive
-from tods.feature_analysis.StatisticalGmean import StatisticalGmeanPrimitive
-from tods.feature_analysis.StatisticalHmean import StatisticalHmeanPrimitive
-from tods.feature_analysis.StatisticalKurtosis import StatisticalKurtosisPrimitive
-from tods.feature_analysis.StatisticalMaximum import StatisticalMaximumPrimitive
-from tods.feature_analysis.StatisticalMean import StatisticalMeanPrimitive
-from tods.feature_analysis.StatisticalMeanAbs import StatisticalMeanAbsPrimitive
-from tods.feature_analysis.StatisticalMeanAbsTemporalDerivative import StatisticalMeanAbsTemporalDerivativePrimitive
-from tods.feature_analysis.StatisticalMeanTemporalDerivative import StatisticalMeanTemporalDerivativePrimitive
-from tods.feature_analysis.StatisticalMedian import StatisticalMedianPrimitive
-from tods.feature_analysis.StatisticalMedianAbsoluteDeviation import StatisticalMedianAbsoluteDeviationPrimitive
-from tods.feature_analysis.StatisticalMinimum import StatisticalMinimumPrimitive
-from tods.feature_analysis.StatisticalSkew import StatisticalSkewPrimitive
-from tods.feature_analysis.StatisticalStd import StatisticalStdPrimitive
-from tods.feature_analysis.StatisticalVar import StatisticalVarPrimitive
-from tods.feature_analysis.StatisticalVariation import StatisticalVariationPrimitive
-from tods.feature_analysis.StatisticalVecSum import StatisticalVecSumPrimitive
-from tods.feature_analysis.StatisticalWillisonAmplitude import StatisticalWillisonAmplitudePrimitive
-from tods.feature_analysis.StatisticalZeroCrossing import StatisticalZeroCrossingPrimitive
-from tods.feature_analysis.TRMF import TRMFPrimitive
-from tods.feature_analysis.WaveletTransform import WaveletTransformPrimitive
+# The primitives are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.primitives(__name__))
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""Anytime approximation of the matrix profile shared by the MatrixProfile
+primitives.
+
+The exact profile compares every pair of windows, which is quadratic in the
+length of the series. ``stumpy.scrump`` (SCRIMP++) starts from an
+approximation of every window's nearest neighbour (PreSCRIMP) and refines it
+one random chunk of the distance-matrix diagonals at a time; the profile is
+exact once every diagonal is computed. Refinement stops at the requested
+fraction of diagonals or when the time budget runs out, whichever comes
+first, and the fraction reached is returned with the profile.
+
+``multi_dimensional_profile`` is the exact multi-dimensional profile
+(mSTAMP) the primitives compute by default, with the same layout whichever
+the version of stumpy. stumpy only approximates one-dimensional profiles,
+so ``approximate_multi_dimensional_profile`` computes the same quantity
+diagonal by diagonal: each window takes its nearest neighbour among the
+windows on the diagonals computed so far, and the profile is that of
+``multi_dimensional_profile`` once every diagonal is.
+"""
+import re
+import time
+
+import numpy as np
+import stumpy
+
+from ...detection_algorithm.core.utility import get_sub_matrices_view
+
+# fraction of the diagonals computed by each refinement step
+STEP = 0.01
+
+# below this standard deviation a window is constant, as in stumpy
+_CONSTANT = 1e-10
+
+_STUMPY_VERSION = tuple(int(part) for part in re.findall(r'\d+', stumpy.__version__)[:3])
+
+# stumpy.mstump returns one row per window up to 1.6, one row per dimension from 1.7
+_MSTUMP_ROW_PER_DIMENSION = _STUMPY_VERSION >= (1, 7)
+
+# the AB-joins of stumpy profile the windows of T_B up to 1.5.0, those of T_A from 1.5.1
+_JOIN_PROFILES_T_B = _STUMPY_VERSION < (1, 5, 1)
+
+
+def join_order(T_A, T_B):
+    """The arguments of a stumpy AB-join profiling the windows of T_A
+    against those of T_B, whichever the version of stumpy.
+
+    Returns
+    -------
+    T_A, T_B : in the order of the T_A and T_B arguments of stumpy
+    """
+    return (T_B, T_A) if _JOIN_PROFILES_T_B else (T_A, T_B)
+
+
+def multi_dimensional_profile(X, window_size):
+    """Exact multi-dimensional matrix profile of X, computed by stumpy.mstump.
+
+    Parameters
+    ----------
+    X : numpy array of shape (n_samples, n_features)
+        The time series.
+
+    window_size : int
+        The length of the subsequences.
+
+    Returns
+    -------
+    P : numpy array of shape (n_samples - window_size + 1, n_features)
+        Column k is the mean distance of each window to its nearest
+        neighbour over the k + 1 dimensions closest to it.
+
+    I : numpy array of shape (n_samples - window_size + 1, n_features)
+        The start of that neighbour.
+    """
+    P, I = stumpy.mstump(np.asarray(X, dtype=np.float64).transpose(), m=window_size)
+    if _MSTUMP_ROW_PER_DIMENSION:
+        P, I = P.transpose(), I.transpose()
+    return P, I
+
+
+def approximate_matrix_profile(X, window_size, T_B=None, percentage=1., time_budget=None, step=STEP):
+    """Approximate matrix profile of each column of X, joined with itself or
+    with the same column of T_B.
+
+    Parameters
+    ----------
+    X : numpy array of shape (n_samples, n_features)
+        The time series.
+
+    window_size : int
+        The length of the subsequences.
+
+    T_B : numpy array of shape (n_samples_B, n_features), optional (default=None)
+        The series in which the nearest neighbours are searched, None for
+        a self-join.
+
+    percentage : float, optional (default=1.)
+        Fraction of the distance-matrix diagonals to compute, 1 for the
+        exact profile.
+
+    time_budget : float, optional (default=None)
+        Wall-clock seconds after which refinement stops. The initial
+        approximation and one refinement step always run.
+
+    step : float, optional (default=STEP)
+        Fraction of the diagonals computed between two checks of the budget.
+
+    Returns
+    -------
+    P : numpy array of shape (n_samples - window_size + 1, n_features)
+        The distance of each window to its nearest neighbour found.
+
+    I : numpy array of shape (n_samples - window_size + 1, n_features)
+        The start of that neighbour.
+
+    reached : float
+        The fraction of the diagonals computed, 1 if the profile is exact.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    step = min(step, percentage)
+
+    if T_B is None:
+        approximations = [stumpy.scrump(X[:, k], window_size, percentage=step, pre_scrump=True)
+                          for k in range(X.shape[1])]
+    else:
+        T_B = np.asarray(T_B, dtype=np.float64)
+        approximations = []
+        for k in range(X.shape[1]):
+            T_first, T_second = join_order(X[:, k], T_B[:, k])
+            approximations.append(stumpy.scrump(T_first, window_size, T_second, ignore_trivial=False,
+                                                percentage=step, pre_scrump=True))
+    n_steps, n_chunks = 0, int(np.ceil(1. / step))
+    while n_steps < n_chunks and n_steps * step < percentage:
+        if n_steps > 0 and deadline is not None and time.perf_counter() >= deadline:
+            break
+        for approximation in approximations:
+            approximation.update()
+        n_steps += 1
+
+    P = np.column_stack([approximation.P_ for approximation in approximations]).astype(np.float64)
+    I = np.column_stack([approximation.I_ for approximation in approximations]).astype(np.int64)
+    return P, I, (min(n_steps * step, 1.) if n_steps < n_chunks else 1.)
+
+
+def _diagonal_profile(X, window_size, offset, means, stds, finite):
+    """Multi-dimensional distance of each window i of X to window i + offset."""
+    n_windows = len(means) - offset
+    products = np.cumsum(X[:len(X) - offset] * X[offset:], axis=0)
+    QT = products[window_size - 1:].copy()
+    QT[1:] -= products[:n_windows - 1]
+
+    mean_A, mean_B, std_A, std_B = means[:n_windows], means[offset:], stds[:n_windows], stds[offset:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        D = np.abs(2 * window_size * (1. - (QT - window_size * mean_A * mean_B) / (window_size * std_A * std_B)))
+    constant_A, constant_B = std_A < _CONSTANT, std_B < _CONSTANT
+    D[constant_A | constant_B] = window_size
+    D[constant_A & constant_B] = 0.
+    D[~(finite[:n_windows] & finite[offset:])] = np.inf
+
+    # the mean distance over the k + 1 closest dimensions, as mstump does
+    D = np.sort(np.sqrt(D), axis=1)
+    return np.cumsum(D, axis=1) / np.arange(1, D.shape[1] + 1)
+
+
+def approximate_multi_dimensional_profile(X, window_size, percentage=1., time_budget=None, step=STEP,
+                                          random_state=0):
+    """Approximate multi-dimensional matrix profile of X, joined with itself.
+
+    Parameters
+    ----------
+    X : numpy array of shape (n_samples, n_features)
+        The time series.
+
+    window_size : int
+        The length of the subsequences.
+
+    percentage : float, optional (default=1.)
+        Fraction of the distance-matrix diagonals to compute, 1 for the
+        exact profile.
+
+    time_budget : float, optional (default=None)
+        Wall-clock seconds after which refinement stops. The first step
+        always runs.
+
+    step : float, optional (default=STEP)
+        Fraction of the diagonals computed between two checks of the budget.
+
+    random_state : int, optional (default=0)
+        Seed of the order in which the diagonals are computed.
+
+    Returns
+    -------
+    P : numpy array of shape (n_samples - window_size + 1, n_features)
+        Column k is the mean distance of each window to its nearest
+        neighbour found over the k + 1 dimensions closest to it, as in
+        ``multi_dimensional_profile``.
+
+    I : numpy array of shape (n_samples - window_size + 1, n_features)
+        The start of that neighbour.
+
+    reached : float
+        The fraction of the diagonals computed, 1 if the profile is exact.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    n_windows = X.shape[0] - window_size + 1
+
+    # a window is finite when it holds no non-finite value
+    non_finite = np.concatenate((np.zeros((1, X.shape[1]), dtype=np.int64), np.cumsum(~np.isfinite(X), axis=0)))
+    finite = non_finite[window_size:] == non_finite[:n_windows]
+    # the distances do not depend on the offset of each dimension, which is removed to keep QT small
+    X = np.where(np.isfinite(X), X, 0.)
+    X = X - X.mean(axis=0)
+    windows = get_sub_matrices_view(X, window_size)[0]
+    means, stds = windows.mean(axis=1), windows.std(axis=1)
+
+    P = np.full((n_windows, X.shape[1]), np.inf)
+    I = np.full((n_windows, X.shape[1]), -1, dtype=np.int64)
+
+    # windows closer than the exclusion zone are trivial matches, as in stumpy
+    offsets = np.arange(int(np.ceil(window_size / 4)) + 1, n_windows)
+    if len(offsets) == 0:
+        return P, I, 1.
+    # the longest diagonal first, which reaches almost every window
+    offsets = np.concatenate((offsets[:1], np.random.RandomState(random_state).permutation(offsets[1:])))
+    n_target = int(np.ceil(percentage * len(offsets)))
+    chunk_size = max(int(np.ceil(step * len(offsets))), 1)
+
+    n_computed = 0
+    while n_computed < n_target:
+        if n_computed > 0 and deadline is not None and time.perf_counter() >= deadline:
+            break
+        for offset in offsets[n_computed:min(n_computed + chunk_size, n_target)]:
+            profile = _diagonal_profile(X, window_size, offset, means, stds, finite)
+            starts = np.arange(len(profile))[:, None]
+            for rows, neighbours in ((slice(None, len(profile)), starts + offset), (slice(offset, None), starts)):
+                closer = profile < P[rows]
+                P[rows] = np.where(closer, profile, P[rows])
+                I[rows] = np.where(closer, neighbours, I[rows])
+        n_computed = min(n_computed + chunk_size, n_target)
+
+    return P, I, n_computed / len(offsets)
@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+"""Rolling-window kernels shared by the Statistical* feature primitives.
+
+Every kernel takes a univariate series and a ``window_size`` and returns an
+array of the same length where entry ``i`` is the statistic of
+``X[i-window_size+1:i+1]``. The first ``window_size-1`` entries, which have
+no complete window, are back-filled with the first complete value.
+``window_size=-1`` uses the whole series as a single window.
+
+The series is cut into blocks of ``window_size`` samples, so that every
+window is the suffix of one block followed by the prefix of the next
+(van Herk/Gil-Werman). Running sums, sums of powers and extremes are then
+accumulated inside each block only, which makes every kernel O(n) while
+keeping the rounding error local to the window. The median uses pandas'
+skiplist in O(n log w). Windows that contain non-finite values, or whose
+moments are too ill-conditioned to be recovered from power sums, are
+recomputed directly so the outputs follow numpy/scipy.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import as_strided
+
+
+# scale factor of scipy.stats.median_absolute_deviation (normal consistency)
+MAD_SCALE = 1.4826
+
+# number of windows materialized at once on the direct (fallback) path
+CHUNK_SIZE = 4096
+
+# relative size of a moment against the sum of powers it was recovered
+# from, below which too many digits cancelled and the window is recomputed
+_VAR_TOLERANCE = 1e-8
+_MOMENT_TOLERANCE = 1e-6
+
+
+def _check_input(X, window_size):
+    """Validate the series and resolve ``window_size=-1``.
+    """
+    X = np.asarray(X, dtype=np.float64).ravel()
+    if window_size == -1:
+        window_size = len(X)
+    if window_size < 1 or window_size > len(X):
+        raise ValueError("window_size must be in [1, {}], got {}".format(
+            len(X), window_size))
+    return X, int(window_size)
+
+
+def _windows(X, window_size):
+    """Read-only strided view of all complete windows, shape (n-w+1, w).
+    """
+    stride = X.strides[0]
+    return as_strided(X, shape=(len(X) - window_size + 1, window_size),
+                      strides=(stride, stride), writeable=False)
+
+
+def _backfill(values, n_samples, window_size):
+    """Place per-window values at the window ends and back-fill the head.
+    """
+    output = np.empty(n_samples)
+    output[window_size - 1:] = values
+    output[:window_size - 1] = values[0]
+    return output
+
+
+def _blocks(X, window_size, fill):
+    """Pad the series to a multiple of ``window_size`` and cut it in blocks.
+    Complete windows never reach into the padding.
+    """
+    n_pad = (-len(X)) % window_size
+    return np.concatenate((X, np.full(n_pad, fill))).reshape(-1, window_size)
+
+
+def _split_accumulate(blocks, n_samples, ufunc):
+    """Accumulate ``ufunc`` over the two parts of every window.
+
+    Returns the accumulation over the suffix part (window start to block
+    end) and over the prefix part (next block start to window end). The
+    prefix part is empty for windows aligned on a block, in which case the
+    returned mask is False.
+    """
+    window_size = blocks.shape[1]
+    n_windows = n_samples - window_size + 1
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    has_prefix = np.arange(n_windows) % window_size != 0
+    return suffix[:n_windows], prefix[window_size - 1:n_samples], has_prefix
+
+
+def _window_sums(X, window_size):
+    """Sum of each complete window.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    suffix, prefix, has_prefix = _split_accumulate(
+        _blocks(X, window_size, 0.), len(X), np.add)
+    return suffix + np.where(has_prefix, prefix, 0.)
+
+
+def _window_moments(X, window_size):
+    """Mean and biased central moments m2, m3, m4 of each complete window.
+
+    Each block is centred on its own mean, raw power sums of the two parts
+    of a window are turned into central sums, and the two parts are merged
+    with the pairwise update of Chan et al. Also returns the mean of the
+    squared and fourth powers the moments were recovered from, which bound
+    their rounding error.
+    """
+    n_samples = len(X)
+    blocks = _blocks(X, window_size, np.nan)
+    finite = np.isfinite(blocks)
+    n_finite = finite.sum(axis=1)
+    shift = np.where(finite, blocks, 0.).sum(axis=1) / np.maximum(n_finite, 1)
+    Y = blocks - shift[:, None]
+
+    Y2 = Y * Y
+    parts = [_split_accumulate(power, n_samples, np.add)
+             for power in (Y, Y2, Y2 * Y, Y2 * Y2)]
+    has_prefix = parts[0][2]
+
+    starts = np.arange(n_samples - window_size + 1)
+    n_b = (starts % window_size).astype(np.float64)
+    n_a = window_size - n_b
+    shift_a = shift[starts // window_size]
+    shift_b = shift[np.minimum(starts // window_size + 1, len(shift) - 1)]
+
+    def central(s1, s2, s3, s4, count):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = np.where(count > 0, s1 / count, 0.)
+        d2 = d * d
+        m2 = s2 - count * d2
+        m3 = s3 - 3 * d * s2 + 2 * count * d2 * d
+        m4 = s4 - 4 * d * s3 + 6 * d2 * s2 - 3 * count * d2 * d2
+        return d, m2, m3, m4
+
+    sums_a = [part[0] for part in parts]
+    sums_b = [np.where(has_prefix, part[1], 0.) for part in parts]
+    d_a, m2_a, m3_a, m4_a = central(*sums_a, n_a)
+    d_b, m2_b, m3_b, m4_b = central(*sums_b, n_b)
+
+    mean_a = shift_a + d_a
+    delta = np.where(has_prefix, shift_b + d_b - mean_a, 0.)
+    n = float(window_size)
+
+    delta2 = delta * delta
+    n_ab = n_a * n_b
+    m2 = m2_a + m2_b + delta2 * n_ab / n
+    m3 = m3_a + m3_b + delta2 * delta * n_ab * (n_a - n_b) / n ** 2 \
+         + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+    m4 = m4_a + m4_b \
+         + delta2 * delta2 * n_ab * (n_a * n_a - n_ab + n_b * n_b) / n ** 3 \
+         + 6 * delta2 * (n_a * n_a * m2_b + n_b * n_b * m2_a) / n ** 2 \
+         + 4 * delta * (n_a * m3_b - n_b * m3_a) / n
+
+    mean = mean_a + delta * n_b / n
+    scale2 = (sums_a[1] + sums_b[1]) / n
+    scale4 = (sums_a[3] + sums_b[3]) / n
+    return mean, np.maximum(m2, 0.) / n, m3 / n, m4 / n, scale2, scale4
+
+
+def _recompute(values, X, window_size, mask, func):
+    """Evaluate ``func`` directly on the windows selected by ``mask``,
+    ``CHUNK_SIZE`` windows at a time. ``func`` reduces a 2d array of
+    windows along axis 1.
+    """
+    bad = np.flatnonzero(mask)
+    if len(bad):
+        windows = _windows(X, window_size)
+        for start in range(0, len(bad), CHUNK_SIZE):
+            index = bad[start:start + CHUNK_SIZE]
+            values[index] = func(windows[index])
+    return values
+
+
+def _nonfinite_windows(X, window_size):
+    """Mask of the windows holding a NaN or inf.
+    """
+    return _window_sums(~np.isfinite(X), window_size) > 0
+
+
+def _degenerate(mean, m2):
+    """Windows whose variance is below floating point resolution, treated
+    as constant the same way scipy.stats does.
+    """
+    return m2 <= (np.finfo(np.float64).resolution * mean) ** 2
+
+
+def _direct_var(windows):
+    return np.var(windows, axis=1)
+
+
+def _direct_skew(windows):
+    mean = np.mean(windows, axis=1, keepdims=True)
+    m2 = np.mean((windows - mean) ** 2, axis=1)
+    m3 = np.mean((windows - mean) ** 3, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(_degenerate(mean.ravel(), m2), 0., m3 / m2 ** 1.5)
+
+
+def _direct_kurtosis(windows):
+    mean = np.mean(windows, axis=1, keepdims=True)
+    m2 = np.mean((windows - mean) ** 2, axis=1)
+    m4 = np.mean((windows - mean) ** 4, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(_degenerate(mean.ravel(), m2), 0., m4 / m2 ** 2) - 3.
+
+
+def rolling_sum(X, window_size):
+    """Rolling sum."""
+    X, window_size = _check_input(X, window_size)
+    return _backfill(_window_sums(X, window_size), len(X), window_size)
+
+
+def rolling_abs_sum(X, window_size):
+    """Rolling sum of absolute values."""
+    return rolling_sum(np.abs(np.asarray(X, dtype=np.float64)), window_size)
+
+
+def rolling_mean(X, window_size):
+    """Rolling arithmetic mean."""
+    X, window_size = _check_input(X, window_size)
+    values = _window_sums(X, window_size) / window_size
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_mean_abs(X, window_size):
+    """Rolling mean of absolute values."""
+    return rolling_mean(np.abs(np.asarray(X, dtype=np.float64)), window_size)
+
+
+def rolling_abs_energy(X, window_size):
+    """Rolling absolute energy, the sum of squares."""
+    X = np.asarray(X, dtype=np.float64)
+    return rolling_sum(X * X, window_size)
+
+
+def _var_values(X, window_size, moments, nonfinite):
+    _, m2, _, _, scale2, _ = moments
+    mask = nonfinite | (scale2 * _VAR_TOLERANCE > m2)
+    return _recompute(m2.copy(), X, window_size, mask, _direct_var)
+
+
+def _variation_values(X, window_size, moments, nonfinite):
+    mean, m2, _, _, scale2, _ = moments
+    mask = nonfinite | (scale2 * _VAR_TOLERANCE > m2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.sqrt(m2) / mean
+        return _recompute(values, X, window_size, mask,
+                          lambda windows: np.std(windows, axis=1)
+                                          / np.mean(windows, axis=1))
+
+
+def _skew_values(X, window_size, moments, nonfinite):
+    mean, m2, m3, _, _, scale4 = moments
+    mask = nonfinite | (scale4 * _MOMENT_TOLERANCE > m2 ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(_degenerate(mean, m2), 0., m3 / (m2 * np.sqrt(m2)))
+    return _recompute(values, X, window_size, mask, _direct_skew)
+
+
+def _kurtosis_values(X, window_size, moments, nonfinite):
+    mean, m2, _, m4, _, scale4 = moments
+    mask = nonfinite | (scale4 * _MOMENT_TOLERANCE > m2 ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(_degenerate(mean, m2), 0., m4 / (m2 * m2)) - 3.
+    return _recompute(values, X, window_size, mask, _direct_kurtosis)
+
+
+def _rolling_moment_statistic(X, window_size, values_func):
+    X, window_size = _check_input(X, window_size)
+    values = values_func(X, window_size, _window_moments(X, window_size),
+                         _nonfinite_windows(X, window_size))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_var(X, window_size):
+    """Rolling population variance (``np.var`` with ``ddof=0``)."""
+    return _rolling_moment_statistic(X, window_size, _var_values)
+
+
+def rolling_std(X, window_size):
+    """Rolling population standard deviation."""
+    return np.sqrt(rolling_var(X, window_size))
+
+
+def rolling_variation(X, window_size):
+    """Rolling coefficient of variation, ``std / mean``."""
+    return _rolling_moment_statistic(X, window_size, _variation_values)
+
+
+def rolling_skew(X, window_size):
+    """Rolling biased sample skewness (``scipy.stats.skew``). Constant
+    windows have a skewness of 0.
+    """
+    return _rolling_moment_statistic(X, window_size, _skew_values)
+
+
+def rolling_kurtosis(X, window_size):
+    """Rolling biased Fisher kurtosis (``scipy.stats.kurtosis``). Constant
+    windows have a kurtosis of -3.
+    """
+    return _rolling_moment_statistic(X, window_size, _kurtosis_values)
+
+
+def _rolling_extreme(X, window_size, ufunc, fill):
+    X, window_size = _check_input(X, window_size)
+    suffix, prefix, has_prefix = _split_accumulate(
+        _blocks(X, window_size, fill), len(X), ufunc)
+    values = ufunc(suffix, np.where(has_prefix, prefix, fill))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_max(X, window_size):
+    """Rolling maximum."""
+    return _rolling_extreme(X, window_size, np.maximum, -np.inf)
+
+
+def rolling_min(X, window_size):
+    """Rolling minimum."""
+    return _rolling_extreme(X, window_size, np.minimum, np.inf)
+
+
+def rolling_median(X, window_size):
+    """Rolling median, maintained in an indexable skiplist by pandas."""
+    X, window_size = _check_input(X, window_size)
+    values = pd.Series(X).rolling(window_size).median().values[
+             window_size - 1:].copy()
+    # pandas skips NaN inside the window, numpy propagates it
+    values = _recompute(values, X, window_size,
+                        _nonfinite_windows(X, window_size),
+                        lambda windows: np.median(windows, axis=1))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_median_absolute_deviation(X, window_size, scale=MAD_SCALE):
+    """Rolling scaled median absolute deviation
+    (``scipy.stats.median_absolute_deviation``).
+
+    The window medians come from :func:`rolling_median`. The deviations
+    around them have no running form, so they are reduced directly,
+    ``CHUNK_SIZE`` windows at a time to bound memory.
+    """
+    X, window_size = _check_input(X, window_size)
+    medians = rolling_median(X, window_size)[window_size - 1:]
+    windows = _windows(X, window_size)
+
+    values = np.empty(len(windows))
+    for start in range(0, len(windows), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        deviations = np.abs(windows[start:stop] - medians[start:stop, None])
+        values[start:stop] = np.median(deviations, axis=1)
+    return _backfill(scale * values, len(X), window_size)
+
+
+def rolling_gmean(X, window_size):
+    """Rolling geometric mean from running sums of logarithms. Windows with
+    a zero give 0 and windows with a negative value give NaN.
+    """
+    X, window_size = _check_input(X, window_size)
+    log_X = np.log(np.where(X > 0, X, 1.))
+    with np.errstate(over='ignore'):
+        values = np.exp(_window_sums(log_X, window_size) / window_size)
+    values[_window_sums(X == 0, window_size) > 0] = 0.
+    values[_window_sums(X < 0, window_size) > 0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = _recompute(values, X, window_size,
+                            _nonfinite_windows(X, window_size),
+                            lambda windows: np.exp(np.mean(np.log(windows),
+                                                           axis=1)))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_hmean(X, window_size):
+    """Rolling harmonic mean from running sums of reciprocals. Windows with
+    a zero give 0.
+    """
+    X, window_size = _check_input(X, window_size)
+    if np.any(X < 0):
+        raise ValueError("Harmonic mean only defined if all elements greater "
+                         "than or equal to zero")
+    reciprocal = 1. / np.where(X == 0, 1., X)
+    values = window_size / _window_sums(reciprocal, window_size)
+    values[_window_sums(X == 0, window_size) > 0] = 0.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = _recompute(values, X, window_size,
+                            _nonfinite_windows(X, window_size),
+                            lambda windows: window_size
+                                            / np.sum(1. / windows, axis=1))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_mean_temporal_derivative(X, window_size):
+    """Rolling mean of first differences, which telescopes to
+    ``(X[i] - X[i-w+1]) / (w-1)``.
+    """
+    X, window_size = _check_input(X, window_size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = (X[window_size - 1:] - X[:len(X) - window_size + 1]) \
+                 / (window_size - 1)
+        values = _recompute(values, X, window_size,
+                            _nonfinite_windows(X, window_size),
+                            lambda windows: np.mean(np.diff(windows, axis=1),
+                                                    axis=1))
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_mean_abs_temporal_derivative(X, window_size):
+    """Rolling mean of absolute first differences."""
+    X, window_size = _check_input(X, window_size)
+    if window_size == 1:
+        return np.full(len(X), np.nan)
+    values = _window_sums(np.abs(np.diff(X)), window_size - 1) \
+             / (window_size - 1)
+    return _backfill(values, len(X), window_size)
+
+
+def rolling_willison_amplitude(X, window_size, threshold):
+    """Rolling count of absolute first differences above ``threshold``. The
+    first sample is differenced against 0.
+    """
+    X, window_size = _check_input(X, window_size)
+    abs_diff = np.abs(np.diff(np.concatenate(([0.], X))))
+    values = _window_sums(abs_diff > threshold, window_size)
+    return _backfill(values, len(X), window_size)
+
+
+def zero_crossing(X):
+    """Indicator of a sign change between consecutive samples."""
+    X = np.asarray(X, dtype=np.float64).ravel()
+    crossing = np.zeros(len(X))
+    crossing[1:] = X[1:] * X[:-1] < 0.
+    return crossing
+
+
+# statistics derived from the shared window moments
+_MOMENT_STATISTICS = {
+    'var': _var_values,
+    'std': lambda *args: np.sqrt(_var_values(*args)),
+    'variation': _variation_values,
+    'skew': _skew_values,
+    'kurtosis': _kurtosis_values,
+}
+
+# statistics with a kernel of their own, keyed by the suffix the
+# corresponding Statistical* primitive gives to its output columns
+_KERNEL_STATISTICS = {
+    'mean': rolling_mean,
+    'median': rolling_median,
+    'gmean': rolling_gmean,
+    'hmean': rolling_hmean,
+    'abs_energy': rolling_abs_energy,
+    'abs_sum': rolling_abs_sum,
+    'maximum': rolling_max,
+    'minimum': rolling_min,
+    'mean_abs': rolling_mean_abs,
+    'mean_abs_temporal_derivative': rolling_mean_abs_temporal_derivative,
+    'mean_temporal_derivative': rolling_mean_temporal_derivative,
+    'median_absolute_deviation': rolling_median_absolute_deviation,
+    'vec_sum': rolling_sum,
+}
+
+STATISTICS = tuple(sorted(list(_MOMENT_STATISTICS) + list(_KERNEL_STATISTICS)
+                          + ['willison_amplitude', 'zero_crossing']))
+
+
+def rolling_statistics(X, window_size, statistics, threshold=0):
+    """Compute several rolling statistics of one series in a single pass.
+
+    The window moments behind var, std, variation, skew and kurtosis, and
+    the non-finite window mask, are computed once and shared.
+
+    Parameters
+    ----------
+    X : numpy array of shape (n_samples,)
+        The input series.
+
+    window_size : int
+        The moving window size, -1 for the whole series.
+
+    statistics : list of str
+        Names from ``STATISTICS``.
+
+    threshold : float, optional (default=0)
+        Threshold of the Willison amplitude.
+
+    Returns
+    -------
+    output : OrderedDict
+        Statistic name to numpy array of shape (n_samples,), in the order
+        of ``statistics``.
+    """
+    X, window_size = _check_input(X, window_size)
+    unknown = set(statistics) - set(STATISTICS)
+    if unknown:
+        raise ValueError("Unknown statistics {}".format(sorted(unknown)))
+
+    output = OrderedDict()
+    moments, nonfinite = None, None
+    for statistic in statistics:
+        if statistic in _MOMENT_STATISTICS:
+            if moments is None:
+                moments = _window_moments(X, window_size)
+                nonfinite = _nonfinite_windows(X, window_size)
+            values = _MOMENT_STATISTICS[statistic](X, window_size, moments,
+                                                   nonfinite)
+            output[statistic] = _backfill(values, len(X), window_size)
+        elif statistic in _KERNEL_STATISTICS:
+            output[statistic] = _KERNEL_STATISTICS[statistic](X, window_size)
+        elif statistic == 'willison_amplitude':
+            output[statistic] = rolling_willison_amplitude(X, window_size,
+                                                           threshold)
+        else:
+            output[statistic] = zero_crossing(X)
+    return output
+
+
+def lookback(window_size, statistics=()):
+    """Number of samples before each sample that its statistics depend on.
+
+    A window reaches ``window_size - 1`` samples back. The Willison amplitude
+    also differences the first sample of the window against the one before
+    it, and the zero crossing differences each sample against the previous
+    one. Returns None for ``window_size=-1``, whose window is the whole
+    series.
+    """
+    if window_size == -1:
+        return None
+    samples = window_size - 1
+    if 'willison_amplitude' in statistics:
+        samples = window_size
+    if 'zero_crossing' in statistics:
+        samples = max(samples, 1)
+    return samples
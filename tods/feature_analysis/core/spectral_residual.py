@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Spectral Residual (SR) saliency of time series.
+
+``spectral_residual`` transforms every column of a series with one FFT
+along the time axis: the log amplitude spectrum minus its moving average is
+the spectral residual, and the magnitude of its inverse transform (keeping
+the phase) is the saliency map.
+
+``StreamingSpectralResidual`` scores points as they arrive. Each point is
+the last of a trailing window, which is extended with a few points
+extrapolated from its recent slope before the transform, as in SR-CNN
+(Ren et al., 2019), so that the newest point is not at the border of the
+window. Each point then costs one FFT of the window, O(w log w).
+"""
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+EPS = 1e-8
+
+# number of windows transformed at once by the streaming transform
+CHUNK_SIZE = 1024
+
+# number of points appended to a window, and of slopes averaged to extrapolate them
+N_ESTIMATES = 5
+N_GRADIENTS = 5
+
+
+def average_filter(values, n=3, axis=0):
+    """Moving average along axis: res[i] = sum(values[i-t+1:i+1]) / t, where t = min(n, i+1).
+    """
+    if n >= values.shape[axis]:
+        n = values.shape[axis]
+
+    res = np.cumsum(values, axis=axis, dtype=float)
+    # a view with the averaged axis first, so that the result is filled in place
+    view = np.moveaxis(res, axis, 0)
+    view[n:] = view[n:] - view[:-n]
+    view[n:] = view[n:] / n
+    view[:n] /= np.arange(1, n + 1).reshape((n, ) + (1, ) * (view.ndim - 1))
+    return res
+
+
+def spectral_residual(X, avg_filter_dimension=3, axis=0):
+    """Saliency map of every series of X along axis, rounded to 4 decimals.
+    """
+    # transform along the last, contiguous axis
+    X = np.ascontiguousarray(np.moveaxis(np.asarray(X, dtype=np.float64), axis, -1))
+    trans = np.fft.fft(X, axis=-1)
+    mag = np.sqrt(trans.real ** 2 + trans.imag ** 2)
+    eps_index = mag <= EPS
+    mag[eps_index] = EPS
+
+    mag_log = np.log(mag)
+    mag_log[eps_index] = 0
+    spectral = np.exp(mag_log - average_filter(mag_log, n=avg_filter_dimension, axis=-1))
+
+    trans.real = trans.real * spectral / mag
+    trans.imag = trans.imag * spectral / mag
+    trans.real[eps_index] = 0
+    trans.imag[eps_index] = 0
+
+    wave_r = np.fft.ifft(trans, axis=-1)
+    mag = np.round(np.sqrt(wave_r.real ** 2 + wave_r.imag ** 2), 4)
+    return np.moveaxis(mag, -1, axis)
+
+
+def extrapolate(windows, n_estimates=N_ESTIMATES, n_gradients=N_GRADIENTS):
+    """Append n_estimates points to each window of shape (..., window_length, n_features).
+
+    The estimate is x[n-m+1] + m * g, where g is the mean slope between the last point x[n] and
+    each of the m points before it.
+    """
+    m = min(n_gradients, windows.shape[-2] - 1)
+    if m > 0:
+        recent = windows[..., -m - 1:, :]
+        distances = np.arange(m, 0, -1).reshape(m, 1)
+        slopes = (recent[..., -1:, :] - recent[..., :-1, :]) / distances
+        estimate = recent[..., 1, :] + slopes.sum(axis=-2)
+    else:
+        estimate = windows[..., -1, :]
+    estimates = np.repeat(estimate[..., np.newaxis, :], n_estimates, axis=-2)
+    return np.concatenate((windows, estimates), axis=-2)
+
+
+class StreamingSpectralResidual(object):
+    """Spectral Residual saliency of each point of a stream, in a trailing window.
+
+    Parameters
+    ----------
+    window_size : int
+        The number of points, up to and including the newest one, that are
+        transformed.
+
+    avg_filter_dimension : int, optional (default=3)
+        The width of the moving average of the log amplitude spectrum.
+
+    n_estimates : int, optional (default=N_ESTIMATES)
+        The number of extrapolated points appended to the window.
+
+    n_gradients : int, optional (default=N_GRADIENTS)
+        The number of slopes averaged to extrapolate them.
+    """
+
+    def __init__(self, window_size, avg_filter_dimension=3, n_estimates=N_ESTIMATES, n_gradients=N_GRADIENTS):
+        self.window_size = window_size
+        self.avg_filter_dimension = avg_filter_dimension
+        self.n_estimates = n_estimates
+        self.n_gradients = n_gradients
+        self.reset()
+
+    def reset(self):
+        """Forget the points seen, so that the next call starts a new stream.
+        """
+        self._buffer = None
+        return self
+
+    def _saliency(self, windows):
+        extended = extrapolate(windows, self.n_estimates, self.n_gradients)
+        saliency = spectral_residual(extended, self.avg_filter_dimension, axis=-2)
+        return saliency[..., windows.shape[-2] - 1, :]
+
+    def update(self, X):
+        """Saliency of each new point of the stream.
+
+        Parameters
+        ----------
+        X : numpy array of shape (n_samples, n_features)
+            The new points.
+
+        Returns
+        -------
+        saliency : numpy array of shape (n_samples, n_features)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if self._buffer is None:
+            self._buffer = np.empty((0, X.shape[1]))
+        history = np.concatenate((self._buffer, X))
+        n_old = len(self._buffer)
+        saliency = np.empty(X.shape)
+
+        # the first points of the stream have shorter windows
+        n_short = min(max(self.window_size - 1 - n_old, 0), len(X))
+        for i in range(n_short):
+            saliency[i] = self._saliency(history[:n_old + i + 1])
+
+        for start in range(n_short, len(X), CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, len(X))
+            first = n_old + start - self.window_size + 1
+            windows = as_strided(history[first:], shape=(stop - start, self.window_size, X.shape[1]),
+                                 strides=(history.strides[0], ) + history.strides, writeable=False)
+            saliency[start:stop] = self._saliency(windows)
+
+        self._buffer = history[-(self.window_size - 1):] if self.window_size > 1 else history[:0]
+        return saliency
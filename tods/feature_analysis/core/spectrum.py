@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the spectral transform primitives.
+"""
+import numpy as np
+
+
+def top_k_indices(magnitude, k):
+    """Row indices of the k largest values of each column, largest first.
+
+    Parameters
+    ----------
+    magnitude : numpy array of shape (n_coefficients, n_columns)
+        The magnitude of each coefficient of each column.
+
+    k : int
+        The number of coefficients kept, at most n_coefficients.
+
+    Returns
+    -------
+    indices : numpy array of shape (min(k, n_coefficients), n_columns)
+    """
+    k = min(k, len(magnitude))
+    # an unordered top k in O(n), then only those are sorted
+    indices = np.argpartition(-magnitude, k - 1, axis=0)[:k]
+    order = np.argsort(-np.take_along_axis(magnitude, indices, axis=0), axis=0, kind='stable')
+    return np.take_along_axis(indices, order, axis=0)
@@ -21,7 +21,8 @@ from d3m.primitive_interfaces.base import CallResult, DockerContainer
 
 
 import os.path
-import re
+
+from .core.rule import compile_rule, BACKENDS
 
 
 Inputs = container.DataFrame
@@ -35,6 +36,17 @@ class Hyperparams(hyperparams.Hyperparams):   # pragma: no cover
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
         description='The rule of filtering.'
     )
+    backend = hyperparams.Enumeration[str](
+        values=list(BACKENDS),
+        default='auto',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Evaluate the rule with numpy or numexpr. 'auto' uses numexpr when it is installed and supports the rule.",
+    )
+    chunk_size = hyperparams.Hyperparameter[int](
+        default=0,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description="Number of rows the rule is evaluated on at a time, which bounds the memory of intermediate arrays. 0 evaluates all rows at once.",
+    )
 
     # Control
     use_columns = hyperparams.Set(
@@ -88,6 +100,13 @@ class RuleBasedFilter(transformer.TransformerPrimitiveBase[Inputs, Outputs, Hype
         The rule to follow when performing the filter. Write it like how we write 'if' in python. And wrap column index with two '#': #col_num#.
         e.g. "#1# > 10" means that the numbers in column 1 must be greater than 10.
         The indicies of columns should be same with those in 'use_columns'. 
+        Only comparisons, and/or/not, arithmetic, numbers and column references are allowed.
+
+    backend: Enumeration
+        Evaluate the rule with 'numpy' or 'numexpr'. 'auto' uses numexpr when it is installed and supports the rule.
+
+    chunk_size: Int
+        Number of rows the rule is evaluated on at a time. 0 evaluates all rows at once.
 
     use_columns: Set
         A set of column indices to force primitive to operate on. If any specified column cannot be parsed, it is skipped.
@@ -139,7 +158,7 @@ class RuleBasedFilter(transformer.TransformerPrimitiveBase[Inputs, Outputs, Hype
         self._input_column_names = self._training_inputs.columns
 
 
-        operated_col = [int(x.strip('#')) for x in re.findall(r'#\d*#', self.hyperparams['rule'])]
+        operated_col = compile_rule(self.hyperparams['rule']).columns
 
         
         if set(operated_col) != set(self._training_indices):
@@ -331,13 +350,8 @@ class RuleBasedFilter(transformer.TransformerPrimitiveBase[Inputs, Outputs, Hype
         Returns:
             Dataframe, results of Rule-Based Filter
         """
-        list_result = [0] * X.shape[0]
-
-        rule = re.sub(r'#\d*#', lambda x: 'row[' + x.group(0).strip('#') + ']', rule)
-        
-        for index, row in X.iterrows():
-            if not eval(rule):
-                list_result[index] = 1
+        satisfied = compile_rule(rule)(X, backend=self.hyperparams['backend'],
+                                       chunk_size=self.hyperparams['chunk_size'] or None)
 
-        return utils.pandas.DataFrame({'result': list_result})
+        return utils.pandas.DataFrame({'result': numpy.logical_not(satisfied).astype(int)})
 
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""Safe, vectorized evaluation of the rules of the RuleBasedFilter.
+
+A rule is a Python boolean expression in which ``#i#`` stands for column
+``i`` of the input, e.g. ``"#4# % 2 == 0 and #2# <= 0.3"``. It is parsed
+once into an AST, checked against a whitelist (comparisons, ``and``/``or``/
+``not``, arithmetic, numeric constants and column references; no names,
+calls or attributes) and compiled into a function that evaluates the whole
+rule column-wise on numpy arrays. When numexpr is installed the rule can be
+evaluated by numexpr instead, which avoids numpy's temporaries.
+
+The truth value of every row is the one ``eval`` gives on that row: ``and``
+and ``or`` combine the truth values of their operands, chained comparisons
+are expanded, and a numeric result is true when it is non-zero.
+"""
+import ast
+import functools
+import operator
+import re
+
+import numpy as np
+
+try:
+    import numexpr
+except ImportError: # pragma: no cover
+    numexpr = None
+
+__all__ = ('RuleSyntaxError', 'CompiledRule', 'compile_rule', 'BACKENDS')
+
+BACKENDS = ('auto', 'numpy', 'numexpr')
+
+_COLUMN_PATTERN = re.compile(r'#(\d+)#')
+_COLUMN_PREFIX = '__column_'
+
+_BINARY_OPERATORS = {
+    ast.Add: (operator.add, '+'),
+    ast.Sub: (operator.sub, '-'),
+    ast.Mult: (operator.mul, '*'),
+    ast.Div: (operator.truediv, '/'),
+    ast.FloorDiv: (operator.floordiv, None), # not supported by numexpr
+    ast.Mod: (operator.mod, '%'),
+    ast.Pow: (operator.pow, '**'),
+}
+_UNARY_OPERATORS = {
+    ast.UAdd: (operator.pos, '+'),
+    ast.USub: (operator.neg, '-'),
+}
+_COMPARISONS = {
+    ast.Eq: (operator.eq, '=='),
+    ast.NotEq: (operator.ne, '!='),
+    ast.Lt: (operator.lt, '<'),
+    ast.LtE: (operator.le, '<='),
+    ast.Gt: (operator.gt, '>'),
+    ast.GtE: (operator.ge, '>='),
+}
+
+
+class RuleSyntaxError(ValueError):
+    """Raised when a rule cannot be parsed or uses a construct outside the whitelist.
+    """
+
+
+class _Node:
+    """A compiled sub-expression.
+
+    ``evaluate`` maps the column arrays to the value of the sub-expression,
+    ``source`` is its numexpr source (None if numexpr cannot evaluate it) and
+    ``boolean`` tells whether its value is already a truth value.
+    """
+
+    def __init__(self, evaluate, source, boolean):
+        self.evaluate = evaluate
+        self.source = source
+        self.boolean = boolean
+
+
+def _truth(node):
+    """The truth value of a compiled sub-expression, as a boolean node.
+    """
+    if node.boolean:
+        return node
+    evaluate = node.evaluate
+    return _Node(lambda columns: np.not_equal(evaluate(columns), 0),
+                 None if node.source is None else '({} != 0)'.format(node.source),
+                 True)
+
+
+def _join_sources(separator, nodes):
+    if any(node.source is None for node in nodes):
+        return None
+    return '(' + separator.join(node.source for node in nodes) + ')'
+
+
+def _compile_node(node, rule):
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, rule)
+
+    if isinstance(node, ast.Constant) and type(node.value) in (bool, int, float):
+        value = node.value
+        return _Node(lambda columns: value, repr(value), isinstance(value, bool))
+
+    if isinstance(node, ast.Name) and node.id.startswith(_COLUMN_PREFIX):
+        column = int(node.id[len(_COLUMN_PREFIX):])
+        return _Node(lambda columns: columns[column], node.id, False)
+
+    if isinstance(node, ast.Name) and node.id in ('True', 'False'): # pragma: no cover
+        # Python < 3.8 parses them as names
+        value = node.id == 'True'
+        return _Node(lambda columns: value, node.id, True)
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        function, symbol = _BINARY_OPERATORS[type(node.op)]
+        left, right = _compile_node(node.left, rule), _compile_node(node.right, rule)
+        source = None if symbol is None else _join_sources(' {} '.format(symbol), (left, right))
+        return _Node(lambda columns: function(left.evaluate(columns), right.evaluate(columns)), source, False)
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        function, symbol = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, rule)
+        return _Node(lambda columns: function(operand.evaluate(columns)),
+                     None if operand.source is None else '({}{})'.format(symbol, operand.source), False)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _truth(_compile_node(node.operand, rule))
+        return _Node(lambda columns: np.logical_not(operand.evaluate(columns)),
+                     None if operand.source is None else '(~{})'.format(operand.source), True)
+
+    if isinstance(node, ast.BoolOp):
+        values = [_truth(_compile_node(value, rule)) for value in node.values]
+        return _and(values) if isinstance(node.op, ast.And) else _or(values)
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARISONS for op in node.ops):
+        # a < b < c is a < b and b < c
+        operands = [_compile_node(operand, rule) for operand in [node.left] + node.comparators]
+        pairs = [_compare(op, left, right) for op, left, right in zip(node.ops, operands[:-1], operands[1:])]
+        return pairs[0] if len(pairs) == 1 else _and(pairs)
+
+    raise RuleSyntaxError("{} is not allowed in rule {!r}. Rules may only use column references (#i#), "
+                          "numbers, arithmetic, comparisons and and/or/not.".format(type(node).__name__, rule))
+
+
+def _compare(op, left, right):
+    function, symbol = _COMPARISONS[type(op)]
+    return _Node(lambda columns: function(left.evaluate(columns), right.evaluate(columns)),
+                 _join_sources(' {} '.format(symbol), (left, right)), True)
+
+
+def _reduce(function, symbol, nodes):
+    def evaluate(columns):
+        result = nodes[0].evaluate(columns)
+        for node in nodes[1:]:
+            result = function(result, node.evaluate(columns))
+        return result
+    return _Node(evaluate, _join_sources(' {} '.format(symbol), nodes), True)
+
+
+def _and(nodes):
+    return _reduce(np.logical_and, '&', nodes)
+
+
+def _or(nodes):
+    return _reduce(np.logical_or, '|', nodes)
+
+
+class CompiledRule:
+    """A rule parsed and compiled once, to be evaluated on any number of inputs.
+
+    Parameters
+    ----------
+    rule : str
+        The rule, with columns written as ``#i#``.
+
+    Attributes
+    ----------
+    rule : str
+        The rule as given.
+
+    columns : list of int
+        The sorted indices of the columns the rule refers to.
+    """
+
+    def __init__(self, rule):
+        self.rule = rule
+        if _COLUMN_PREFIX in rule:
+            raise RuleSyntaxError("Invalid name in rule {!r}".format(rule))
+        self.columns = sorted(set(int(column) for column in _COLUMN_PATTERN.findall(rule)))
+
+        source = _COLUMN_PATTERN.sub(lambda match: _COLUMN_PREFIX + match.group(1), rule).strip()
+        try:
+            tree = ast.parse(source, mode='eval')
+        except SyntaxError as error:
+            raise RuleSyntaxError("Cannot parse rule {!r}: {}".format(rule, error.msg)) from error
+        self._node = _truth(_compile_node(tree, rule))
+
+    @property
+    def numexpr_supported(self):
+        """Whether numexpr is installed and can evaluate this rule.
+        """
+        return numexpr is not None and self._node.source is not None
+
+    def __call__(self, X, backend='auto', chunk_size=None):
+        """Evaluate the rule on every row.
+
+        Parameters
+        ----------
+        X : 2-D array-like or DataFrame
+            The input; ``#i#`` refers to its i-th column, by position.
+
+        backend : str, optional (default='auto')
+            'numpy', 'numexpr', or 'auto' to use numexpr when it can
+            evaluate the rule and the columns are numeric.
+
+        chunk_size : int, optional (default=None)
+            Evaluate that many rows at a time, which bounds the memory
+            taken by intermediate arrays. None evaluates all rows at once.
+
+        Returns
+        -------
+        result : numpy array of shape (n_samples,) of bool
+            Whether each row satisfies the rule.
+        """
+        if backend not in BACKENDS:
+            raise ValueError("backend must be one of {}, got {!r}".format(BACKENDS, backend))
+
+        n_samples = X.shape[0]
+        if hasattr(X, 'iloc'):
+            n_columns = X.shape[1]
+            columns = {column: np.asarray(X.iloc[:, column]) for column in self.columns if column < n_columns}
+        else:
+            X = np.asarray(X)
+            n_columns = X.shape[1]
+            columns = {column: X[:, column] for column in self.columns if column < n_columns}
+        if len(columns) != len(self.columns):
+            raise ValueError("Rule {!r} refers to column {}, but the input has {} columns.".format(
+                self.rule, max(self.columns), n_columns))
+
+        if backend == 'auto':
+            numeric = all(values.dtype.kind in 'biuf' for values in columns.values())
+            backend = 'numexpr' if self.numexpr_supported and numeric else 'numpy'
+        elif backend == 'numexpr' and not self.numexpr_supported:
+            raise ValueError("numexpr is not installed or cannot evaluate rule {!r}".format(self.rule))
+        evaluate = self._evaluate_numexpr if backend == 'numexpr' else self._evaluate_numpy
+
+        if chunk_size is None or chunk_size >= n_samples:
+            return self._broadcast(evaluate(columns), n_samples)
+
+        result = np.empty(n_samples, dtype=bool)
+        for start in range(0, n_samples, chunk_size):
+            stop = min(start + chunk_size, n_samples)
+            chunk = {column: values[start:stop] for column, values in columns.items()}
+            result[start:stop] = self._broadcast(evaluate(chunk), stop - start)
+        return result
+
+    def evaluate_chunks(self, chunks, backend='auto'):
+        """Evaluate the rule on a stream of inputs, one chunk at a time.
+
+        Parameters
+        ----------
+        chunks : iterable of 2-D array-like or DataFrame
+            The chunks, all with the same columns.
+
+        backend : str, optional (default='auto')
+            See ``__call__``.
+
+        Yields
+        ------
+        result : numpy array of bool
+            Whether each row of the chunk satisfies the rule.
+        """
+        for chunk in chunks:
+            yield self(chunk, backend=backend)
+
+    def _evaluate_numpy(self, columns):
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            return self._node.evaluate(columns)
+
+    def _evaluate_numexpr(self, columns):
+        return numexpr.evaluate(self._node.source,
+                                local_dict={_COLUMN_PREFIX + str(column): values for column, values in columns.items()},
+                                global_dict={})
+
+    @staticmethod
+    def _broadcast(result, n_samples):
+        return np.broadcast_to(np.asarray(result, dtype=bool), (n_samples,)).copy()
+
+
+@functools.lru_cache(maxsize=128)
+def compile_rule(rule):
+    """Parse and compile a rule, see ``CompiledRule``. Compiled rules are cached.
+    """
+    return CompiledRule(rule)
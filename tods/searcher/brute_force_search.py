@@ -1,4 +1,8 @@
 # A Brute-Force Search
+import concurrent.futures
+import multiprocessing
+import os
+import time
 import uuid
 import random
 
@@ -6,9 +10,28 @@ from d3m.metadata.pipeline import Pipeline
 
 from axolotl.algorithms.base import PipelineSearchBase
 from axolotl.utils import  schemas as schemas_utils
+from axolotl.utils.pipeline import PipelineResult
+
+from .runtime import evaluate_pipelines
 
 class BruteForceSearch(PipelineSearchBase): # pragma: no cover
-    def __init__(self, problem_description, backend, *, primitives_blocklist=None, ranking_function=None):
+    """
+    Evaluate every combination of the primitives in primitive_python_paths.
+
+    Args:
+        n_jobs: number of worker processes evaluating candidates concurrently, -1 for all cores.
+            With 1 and no cache_prefixes, the candidates are evaluated by the backend. The workers
+            are spawned, so a script searching with several jobs needs an ``if __name__ == '__main__'`` guard.
+        batch_size: number of candidates evaluated per search iteration. Defaults to n_jobs.
+        cache_prefixes: run each step shared by several candidates (same primitive and
+            hyperparams over the same input) once per worker instead of once per candidate.
+            The candidates are then evaluated by the d3m runtime in the search process, as they
+            are in the workers when n_jobs is above 1, and not by the backend.
+        cache_dir: with cache_prefixes, also store step outputs in this directory, shared by the
+            workers, and replay those stored by earlier searches.
+    """
+    def __init__(self, problem_description, backend, *, primitives_blocklist=None, ranking_function=None,
+                 n_jobs=1, batch_size=None, cache_prefixes=False, cache_dir=None):
         super().__init__(problem_description=problem_description, backend=backend,
                 primitives_blocklist=primitives_blocklist, ranking_function=ranking_function)
         if self.ranking_function is None:
@@ -24,8 +47,15 @@ class BruteForceSearch(PipelineSearchBase): # pragma: no cover
         self.scoring_pipeline = _generate_scoring_pipeline()
         self.data_preparation_params = _generate_data_preparation_params()
 
+        if n_jobs < 0:
+            n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+        self.n_jobs = n_jobs
+        self.cache_prefixes = cache_prefixes
+        self.cache_dir = cache_dir
+        self._pool = None
+
         self.current_pipeline_index = 0
-        self.offset = 1
+        self.offset = batch_size or n_jobs
 
     def evaluate(self, pipeline_to_eval, input_data=None):
         if input_data is None:
@@ -41,19 +71,33 @@ class BruteForceSearch(PipelineSearchBase): # pragma: no cover
         
         return pipeline_result
 
+    def search(self, time_limit):
+        try:
+            return super().search(time_limit)
+        finally:
+            if self._pool is not None:
+                # workers do not start new pipelines past the deadline
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
     def _search(self, time_left):
         # Read all the pipelines to be evaluated
         pipelines_to_eval = self.available_pipelines[self.current_pipeline_index: self.current_pipeline_index+self.offset]
-        self.current_pipeline_index += 1
-        
-        pipeline_results = self.backend.evaluate_pipelines(
-                problem_description=self.problem_description,
-                pipelines=pipelines_to_eval,
-                input_data=self.input_data,
-                metrics=self.metrics,
-                data_preparation_pipeline=self.data_preparation_pipeline,
-                scoring_pipeline=self.scoring_pipeline,
-                data_preparation_params=self.data_preparation_params)
+        self.current_pipeline_index += len(pipelines_to_eval)
+        if not pipelines_to_eval:
+            return []
+
+        if self.n_jobs == 1 and not self.cache_prefixes:
+            pipeline_results = self.backend.evaluate_pipelines(
+                    problem_description=self.problem_description,
+                    pipelines=pipelines_to_eval,
+                    input_data=self.input_data,
+                    metrics=self.metrics,
+                    data_preparation_pipeline=self.data_preparation_pipeline,
+                    scoring_pipeline=self.scoring_pipeline,
+                    data_preparation_params=self.data_preparation_params)
+        else:
+            pipeline_results = self._evaluate_batch(pipelines_to_eval, time.time() + time_left)
 
         # DEBUG
         ####################
@@ -69,6 +113,57 @@ class BruteForceSearch(PipelineSearchBase): # pragma: no cover
 
         return [self.ranking_function(pipeline_result) for pipeline_result in pipeline_results]
 
+    def _evaluate_batch(self, pipelines, deadline):
+        """
+        Evaluate pipelines in the worker processes, without starting any after the deadline.
+
+        Neighbouring candidates share most of their steps, so the batch is cut into one
+        contiguous group per worker and each group runs in a single worker, on its cache.
+        """
+        evaluate_kwargs = dict(
+            problem_description=self.problem_description,
+            input_data=self.input_data,
+            metrics=self.metrics,
+            data_preparation_pipeline=self.data_preparation_pipeline,
+            scoring_pipeline=self.scoring_pipeline,
+            data_preparation_params=self.data_preparation_params,
+            random_seed=self.random_seed,
+            volumes_dir=self.volumes_dir,
+            scratch_dir=self.scratch_dir,
+            deadline=deadline,
+            cache_prefixes=self.cache_prefixes,
+            cache_dir=self.cache_dir)
+
+        if self.n_jobs == 1:
+            return evaluate_pipelines(pipelines, **evaluate_kwargs)
+
+        if self._pool is None:
+            # forking a process that already ran TensorFlow or numba primitives crashes the workers
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.n_jobs,
+                                                                mp_context=multiprocessing.get_context('spawn'))
+
+        n_groups = min(self.n_jobs, len(pipelines))
+        bounds = [len(pipelines) * group // n_groups for group in range(n_groups + 1)]
+        groups = [pipelines[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        futures = [self._pool.submit(evaluate_pipelines, group, **evaluate_kwargs) for group in groups]
+
+        concurrent.futures.wait(futures, timeout=max(deadline - time.time(), 0))
+        pipeline_results = []
+        for group, future in zip(groups, futures):
+            if future.done() and future.exception() is None:
+                pipeline_results.extend(future.result())
+                continue
+            future.cancel()
+            error = future.exception() if future.done() else \
+                TimeoutError("The search ran out of time before the pipeline was evaluated.")
+            for pipeline in group:
+                pipeline_result = PipelineResult(pipeline=pipeline)
+                pipeline_result.method_called = "evaluate"
+                pipeline_result.status = "ERRORED"
+                pipeline_result.error = [error]
+                pipeline_results.append(pipeline_result)
+        return pipeline_results
+
     def _return_pipelines(self, task_type, task_subtype, data_type):
         pipeline_candidates = _generate_pipelines(primitive_python_paths)
         return pipeline_candidates
@@ -115,6 +210,7 @@ primitive_python_paths = { # pragma: no cover
         #'d3m.primitives.tods.feature_analysis.statistical_vec_sum',
         #'d3m.primitives.tods.feature_analysis.statistical_willison_amplitude',
         #'d3m.primitives.tods.feature_analysis.statistical_zero_crossing',
+        'd3m.primitives.tods.feature_analysis.statistical_features',
         #'d3m.primitives.tods.feature_analysis.spectral_residual_transform',
         #'d3m.primitives.tods.feature_analysis.fast_fourier_transform',
         #'d3m.primitives.tods.feature_analysis.discrete_cosine_transform',
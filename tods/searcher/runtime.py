@@ -0,0 +1,303 @@
+"""Evaluate many candidate pipelines that share their first steps.
+
+The candidates of a search mostly differ in their last steps: they all start
+with the same data preparation, dataset_to_dataframe, column_parser and
+extract_columns_by_semantic_types, and many share the same processing
+step. ``PrefixCachingRuntime`` memoizes the outputs (and fitted params) of
+every primitive step under a key made of the primitive, its hyperparams and
+the keys of its inputs, so a step that was already run on the same input by
+an earlier candidate is replayed from the cache instead of being run again.
+Pipeline inputs are keyed by a digest of their content.
+
+Keys only depend on content, so step outputs can also be kept on local disk
+and replayed by later runs: ``caching_runtime(cache_dir=...)`` adds a
+``DiskStepCache`` behind the in-memory cache for the duration of a run.
+
+``evaluate_pipelines`` evaluates a list of pipelines the way the axolotl
+SimpleRunner does, with the caching runtime and an optional deadline. It is
+meant to be run in the worker processes of a search, one cache per worker.
+"""
+import collections
+import contextlib
+import copy
+import hashlib
+import json
+import time
+import typing
+
+import pandas
+
+from d3m import container
+from d3m import runtime as runtime_module
+from d3m.metadata import base as metadata_base
+from d3m.metadata import pipeline_run as pipeline_run_module
+
+from axolotl.utils.pipeline import PipelineResult
+
+from tods.common import step_cache
+
+__all__ = ('PrefixCachingRuntime', 'caching_runtime', 'evaluate_pipelines', 'value_digest')
+
+# number of step outputs kept per process
+CACHE_SIZE = 128
+
+
+def value_digest(value) -> typing.Optional[str]:
+    """
+    Digest of the content and metadata of a pipeline input.
+    Args:
+        value: a container Dataset or DataFrame
+
+    Returns:
+        hex digest, or None if the value cannot be digested
+    """
+    if isinstance(value, container.Dataset):
+        frames = [(resource_id, value[resource_id]) for resource_id in sorted(value.keys())]
+    elif isinstance(value, container.DataFrame):
+        frames = [(None, value)]
+    else:
+        return None
+
+    digest = hashlib.sha1()
+    for resource_id, frame in frames:
+        if not isinstance(frame, pandas.DataFrame):
+            return None
+        digest.update(repr((resource_id, list(frame.columns), [str(dtype) for dtype in frame.dtypes])).encode())
+        digest.update(pandas.util.hash_pandas_object(frame, index=True).values.tobytes())
+    digest.update(repr(value.metadata.to_internal_simple_structure()).encode())
+    return digest.hexdigest()
+
+
+class _StepCache:
+    """
+    Least recently used step outputs, keyed by step key, in front of an optional disk store.
+    The entries are never None, which get returns for a missing key.
+    """
+
+    def __init__(self, max_size: int, store: typing.Optional[step_cache.DiskStepCache] = None) -> None:
+        self.max_size = max_size
+        self.store = store
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None and self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self._put(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _put(self, key: str, entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def put(self, key: str, entry) -> None:
+        self._put(key, entry)
+        if self.store is not None:
+            self.store.put(key, entry)
+
+    def clear(self) -> None:
+        """
+        Forget the entries in memory and reset the counters; entries on disk are kept.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> typing.Dict[str, typing.Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'store': self.store.info() if self.store is not None else None,
+        }
+
+
+_CacheEntry = collections.namedtuple('_CacheEntry', ('outputs', 'params'))
+
+
+class PrefixCachingRuntime(runtime_module.Runtime):
+    """
+    A d3m Runtime that replays primitive steps it has already run on the same inputs.
+
+    A step is cached when its hyperparams are plain values set in the pipeline. Its key
+    combines the primitive id and version, the hyperparams, the random seed of the step,
+    the phase and the keys of its arguments; in the produce phase the key of the fitted
+    step is used instead of the hyperparams. The cache is shared by all instances in a process.
+
+    Outputs are copied into the cache and out of it, as primitives may write into their
+    inputs (the system-wise ones do) and would otherwise change what later pipelines replay.
+    """
+
+    cache = _StepCache(CACHE_SIZE)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._value_keys: typing.Dict[str, str] = {}
+        self._input_keys: typing.Dict[str, typing.Tuple[int, typing.Optional[str]]] = {}
+        self._fit_keys: typing.Dict[int, str] = {}
+
+    def _data_key(self, data_reference: str) -> typing.Optional[str]:
+        if data_reference.startswith('inputs.'):
+            value = self.data_values.get(data_reference)
+            cached = self._input_keys.get(data_reference)
+            if cached is None or cached[0] != id(value):
+                cached = (id(value), value_digest(value))
+                self._input_keys[data_reference] = cached
+            return cached[1]
+        return self._value_keys.get(data_reference)
+
+    def _step_key(self, step) -> typing.Optional[str]:
+        if self.hyperparams is not None and self.hyperparams[self.current_step]:
+            return None
+
+        arguments = {}
+        for name, argument in step.arguments.items():
+            data = argument['data']
+            references = data if isinstance(data, list) else [data]
+            keys = [self._data_key(reference) for reference in references]
+            if any(key is None for key in keys):
+                return None
+            arguments[name] = keys
+
+        if self.phase == metadata_base.PipelineRunPhase.FIT:
+            if any(hyperparameter['type'] != metadata_base.ArgumentType.VALUE
+                   for hyperparameter in step.hyperparams.values()):
+                return None
+            primitive_metadata = step.primitive.metadata.query()
+            description = ['fit', primitive_metadata['id'], primitive_metadata['version'],
+                           {name: hyperparameter['data'] for name, hyperparameter in step.hyperparams.items()},
+                           self.random_seed + self.current_step, arguments]
+        else:
+            fit_key = self._fit_keys.get(step.index)
+            if fit_key is None:
+                return None
+            description = ['produce', fit_key, arguments]
+
+        return hashlib.sha1(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _produce_methods(self, step) -> typing.List[str]:
+        produce_methods = list(step.outputs)
+        step_reference_prefix = 'steps.{i}.'.format(i=step.index)
+        for output_to_expose in self.outputs_to_expose:
+            if output_to_expose.startswith(step_reference_prefix):
+                produce_method = output_to_expose[len(step_reference_prefix):]
+                if produce_method not in produce_methods:
+                    produce_methods.append(produce_method)
+        return produce_methods
+
+    def _run_primitive(self, step) -> None:
+        key = self._step_key(step) if step.primitive is not None and step.arguments else None
+        if key is None:
+            return super()._run_primitive(step)
+
+        produce_methods = self._produce_methods(step)
+        entry = self.cache.get(key)
+
+        if entry is not None and set(produce_methods) <= set(entry.outputs):
+            # what _run_primitive records, without running the primitive
+            self.pipeline_run.add_primitive_step(step)
+            hyperparams, pipeline_hyperparams = self._prepare_primitive_hyperparams(self.current_step, step)
+            if self.phase == metadata_base.PipelineRunPhase.FIT:
+                self.pipeline_run.set_primitive_step_hyperparams(self.current_step, hyperparams, pipeline_hyperparams)
+                self.steps_state[self.current_step] = entry.params
+            for output_id in produce_methods:
+                self.data_values['steps.{i}.{output_id}'.format(i=step.index, output_id=output_id)] = \
+                    copy.copy(entry.outputs[output_id])
+        else:
+            super()._run_primitive(step)
+            outputs = {output_id: copy.copy(
+                           self.data_values['steps.{i}.{output_id}'.format(i=step.index, output_id=output_id)])
+                       for output_id in produce_methods}
+            params = self.steps_state[self.current_step] if self.phase == metadata_base.PipelineRunPhase.FIT else None
+            self.cache.put(key, _CacheEntry(outputs, params))
+
+        if self.phase == metadata_base.PipelineRunPhase.FIT:
+            self._fit_keys[step.index] = key
+        for output_id in produce_methods:
+            self._value_keys['steps.{i}.{output_id}'.format(i=step.index, output_id=output_id)] = \
+                hashlib.sha1((key + output_id).encode()).hexdigest()
+
+
+@contextlib.contextmanager
+def caching_runtime(cache_dir: typing.Optional[str] = None, max_bytes: int = step_cache.MAX_BYTES):
+    """
+    Make the d3m runtime functions (fit, produce, evaluate, ...) use PrefixCachingRuntime.
+    Args:
+        cache_dir: also store step outputs in this directory and replay those stored by earlier runs
+        max_bytes: size of the entries in cache_dir above which the least recently used ones are removed
+
+    Returns:
+        the cache, whose hits and misses count the steps replayed and run
+    """
+    original = runtime_module.Runtime
+    original_store = PrefixCachingRuntime.cache.store
+    if cache_dir is not None:
+        PrefixCachingRuntime.cache.store = step_cache.DiskStepCache(cache_dir, max_bytes)
+    runtime_module.Runtime = PrefixCachingRuntime
+    try:
+        yield PrefixCachingRuntime.cache
+    finally:
+        runtime_module.Runtime = original
+        PrefixCachingRuntime.cache.store = original_store
+
+
+def evaluate_pipelines(pipelines, *, problem_description, input_data, metrics, data_preparation_pipeline,
+                       scoring_pipeline, data_preparation_params, random_seed=0, volumes_dir=None,
+                       scratch_dir=None, deadline=None, cache_prefixes=True,
+                       cache_dir=None) -> typing.List[PipelineResult]:
+    """
+    Evaluate pipelines one after the other, as the axolotl SimpleRunner does.
+
+    Pipelines that would start after the deadline are not run, their result has the ERRORED
+    status and a TimeoutError.
+    Args:
+        pipelines: the pipelines to evaluate
+        deadline: time.time() after which no pipeline is started, None for no limit
+        cache_prefixes: replay steps already run on the same inputs, see PrefixCachingRuntime
+        cache_dir: with cache_prefixes, also replay steps stored in this directory by earlier runs
+
+    Returns:
+        list of PipelineResult, in the order of the pipelines
+    """
+    runtime_environment = pipeline_run_module.RuntimeEnvironment()
+    results = []
+    with caching_runtime(cache_dir) if cache_prefixes else contextlib.ExitStack():
+        for pipeline in pipelines:
+            pipeline_result = PipelineResult(pipeline=pipeline)
+            pipeline_result.method_called = "evaluate"
+
+            if deadline is not None and time.time() > deadline:
+                pipeline_result.status = "ERRORED"
+                pipeline_result.error = [TimeoutError("The search ran out of time before the pipeline was evaluated.")]
+                results.append(pipeline_result)
+                continue
+
+            scores, run_results = runtime_module.evaluate(
+                pipeline=pipeline, inputs=input_data, data_pipeline=data_preparation_pipeline,
+                scoring_pipeline=scoring_pipeline, problem_description=problem_description,
+                data_params=data_preparation_params, metrics=metrics, context=metadata_base.Context.TESTING,
+                scoring_params=None, hyperparams=None, random_seed=random_seed,
+                data_random_seed=random_seed, scoring_random_seed=random_seed,
+                volumes_dir=volumes_dir, scratch_dir=scratch_dir, runtime_environment=runtime_environment,
+            )
+
+            if run_results.has_error():
+                pipeline_result.status = "ERRORED"
+                pipeline_result.error = [result.error for result in run_results]
+            else:
+                pipeline_result.status = "COMPLETED"
+                pipeline_result.scores = runtime_module.combine_folds(scores)
+                pipeline_result.outputs = [result.values for result in run_results]
+            results.append(pipeline_result)
+
+    return results
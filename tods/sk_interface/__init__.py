@@ -1,3 +1,10 @@
-from tods.sk_interface.data_ensemble import *
-from tods.sk_interface.feature_analysis import *
-from tods.sk_interface.detection_algorithm import *
+# The estimators are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+_PACKAGES = ('data_ensemble', 'feature_analysis', 'detection_algorithm')
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, {
+    name: module
+    for package in _PACKAGES
+    for name, module in lazy.estimators('{}.{}'.format(__name__, package)).items()
+})
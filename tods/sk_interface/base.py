@@ -1,5 +1,16 @@
 from d3m import container
 import numpy as np
+import pandas as pd
+
+from tods.common import step_cache
+from tods.common.executor import map_systems, SystemExecutionError
+from tods.common.profiling import traced
+
+# produce methods of the detectors and the ndarray methods that back them
+FAST_METHODS = {
+    '_produce': '_predict_array',
+    '_produce_score': '_score_array',
+}
 
 def get_default_hyperparameter(primitive, hyperparameter):
 
@@ -19,8 +30,55 @@ def get_default_hyperparameter(primitive, hyperparameter):
 
     return hyperparams
 
+def _column_names(n_columns):
+    return [str(col_index) for col_index in range(n_columns)]
+
+def _to_dataframe(X):
+    return container.DataFrame(X, columns=_column_names(X.shape[1]), generate_metadata=True)
+
+def _fit_system(primitive, X, fast_path):
+    if fast_path and not primitive._fitted:
+        # what _fit derives from the metadata when use_semantic_types is off
+        primitive._training_indices = list(range(X.shape[1]))
+        primitive._input_column_names = pd.Index(_column_names(X.shape[1]))
+        primitive._fit_array(X)
+    else:
+        primitive.set_training_data(inputs=_to_dataframe(X))
+        primitive.fit()
+    # returned so that primitives fitted in a worker process come back fitted
+    return primitive
+
+def _primitive_key(primitive):
+    metadata = primitive.metadata.query()
+    return [metadata['id'], metadata['version'], dict(primitive.hyperparams), primitive.random_seed]
+
+def _forward_system(primitive, X, method, fast_path):
+    if fast_path:
+        output = getattr(primitive, FAST_METHODS[method])(X)
+        return output.reshape(-1, 1) if output.ndim == 1 else output
+    forward_method = getattr(primitive, method, None)
+    return forward_method(inputs=_to_dataframe(X)).value.values
+
 class BaseSKI:
-    def __init__(self, primitive, system_num=1, **hyperparameter):
+    """
+    Scikit-learn style wrapper of a primitive, with one primitive per system.
+
+    Args:
+        primitive: the primitive class to wrap
+        system_num: number of systems, one primitive is created for each
+        n_jobs: number of systems fitted and scored at the same time, -1 for all cores
+        executor: 'thread' or 'process', the pool used when n_jobs is not 1
+        fast_path: hand numeric ndarrays straight to the detector instead of wrapping them
+            into d3m DataFrames. Only used by detectors that select every column
+            (use_semantic_types off) and return new columns only; the outputs are the same.
+        cache_dir: directory where fitted primitives and outputs are stored, keyed by the primitive,
+            its hyperparams and random seed and a digest of the data, so that fitting or producing
+            on the same data again replays them. None to always compute them. ``step_cache``
+            counts the hits and misses.
+        **hyperparameter: hyperparameters of the primitive
+    """
+    def __init__(self, primitive, system_num=1, n_jobs=1, executor='thread', fast_path=True, cache_dir=None,
+                 **hyperparameter):
 
         self.fit_available = True if 'fit' in primitive.__dict__ else False
         self.predict_available = True if 'produce' in primitive.__dict__ else False
@@ -30,16 +88,27 @@ class BaseSKI:
         # print(primitive, self.fit_available, self.predict_available, self.predict_score_available, self.produce_available)
 
         self.system_num = system_num
+        self.n_jobs = n_jobs
+        self.executor = executor
         hyperparams = get_default_hyperparameter(primitive, hyperparameter)
+        self.fast_path = fast_path and hasattr(primitive, '_fit_array') \
+                         and not hyperparams.get('use_semantic_types', True) \
+                         and hyperparams.get('return_result') == 'new' \
+                         and not hyperparams.get('add_index_columns', True)
 
         if system_num >= 1:
             self.primitives = [primitive(hyperparams=hyperparams) for sys_idx in range(system_num)]
         else:
             raise AttributeError('BaseSKI must have positive system_num.')
 
+        self.step_cache = step_cache.DiskStepCache(cache_dir) if cache_dir is not None else None
+        # key of the fit of each primitive, which keys its outputs; None if it was not fitted on cacheable data
+        self._fit_keys = [None] * system_num
+
 
         #print(hyperparams)
 
+    @traced
     def fit(self, data):
 
         if not self.fit_available:
@@ -47,14 +116,18 @@ class BaseSKI:
 
         data = self._sys_data_check(data)
 
-        for sys_idx, primitive in enumerate(self.primitives):
-            sys_data = data[sys_idx]
-            sys_data = self._transform(sys_data)
-            primitive.set_training_data(inputs=sys_data)
-            primitive.fit()
+        arguments = [(primitive, sys_data, self._use_fast_path(sys_data))
+                     for primitive, sys_data in zip(self.primitives, data)]
+        if self.step_cache is None:
+            fitted = self._map_systems(_fit_system, arguments)
+        else:
+            self._fit_keys = [self._cache_key(primitive, 'fit', sys_data) for primitive, sys_data in zip(self.primitives, data)]
+            fitted = self._cached_map(_fit_system, self._fit_keys, arguments)
+        self._adopt_fitted(fitted)
 
         return
     
+    @traced
     def predict(self, data):
 
         if not self.predict_available:
@@ -65,6 +138,7 @@ class BaseSKI:
 
         return output_data
     
+    @traced
     def predict_score(self, data):
 
         if not self.predict_available:
@@ -75,6 +149,7 @@ class BaseSKI:
 
         return output_data
 
+    @traced
     def produce(self, data):    #produce function for other primitive types
 
         if not self.produce_available:
@@ -110,14 +185,57 @@ class BaseSKI:
 
         return data
 
+    def _adopt_fitted(self, fitted):
+        """
+        Copy the state of the fitted primitives onto self.primitives. Those fitted in worker
+        processes or read from the cache are copies, and callers may hold the primitives.
+        """
+        for primitive, fitted_primitive in zip(self.primitives, fitted):
+            if fitted_primitive is not primitive:
+                primitive.__dict__.update(fitted_primitive.__dict__)
+
+    def _map_systems(self, func, arguments):
+        try:
+            return map_systems(func, arguments, n_jobs=self.n_jobs, executor=self.executor)
+        except SystemExecutionError as error:
+            if self.system_num == 1: # keep raising what the primitive raised
+                raise error.errors[0]
+            raise
+
+    def _use_fast_path(self, X):
+        return self.fast_path and X.dtype.kind in 'biuf'
+
+    def _cache_key(self, primitive, method, X, fit_key=None):
+        digest = step_cache.array_digest(X)
+        if digest is None:
+            return None
+        return step_cache.step_key(_primitive_key(primitive), fit_key, method, digest)
+
+    def _cached_map(self, func, keys, arguments):
+        """
+        _map_systems over the systems whose key has no entry in the cache, the others are read from it.
+        A result of None is not cached, and is computed again on every call.
+        """
+        results = [self.step_cache.get(key) if key is not None else None for key in keys]
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            computed = self._map_systems(func, [arguments[index] for index in missing])
+            for index, result in zip(missing, computed):
+                results[index] = result
+                if keys[index] is not None:
+                    self.step_cache.put(keys[index], result)
+        return results
+
     def _forward(self, data, method):
-        output_data = []
-        for sys_idx, primitive in enumerate(self.primitives):
-            sys_data = data[sys_idx]
-            sys_data = self._transform(sys_data)
-            forward_method = getattr(primitive, method, None)
-            output_data.append(forward_method(inputs=sys_data).value.values)
-            # print(forward_method(inputs=sys_data).value.values.shape)
+        arguments = [(primitive, sys_data, method, method in FAST_METHODS and self._use_fast_path(sys_data))
+                     for primitive, sys_data in zip(self.primitives, data)]
+        if self.step_cache is None:
+            output_data = self._map_systems(_forward_system, arguments)
+        else:
+            # the outputs of a fitted primitive depend on what it was fitted on
+            keys = [None if self.fit_available and fit_key is None else self._cache_key(primitive, method, sys_data, fit_key)
+                    for primitive, sys_data, fit_key in zip(self.primitives, data, self._fit_keys)]
+            output_data = self._cached_map(_forward_system, keys, arguments)
 
         # print(type(output_data), len(output_data), output_data[0].shape)
         # print(np.array(output_data))
@@ -135,8 +253,7 @@ class BaseSKI:
 
 
     def _transform(self, X):     #transform the ndarray to d3m dataframe, select columns to use
-        column_name = [str(col_index) for col_index in range(X.shape[1])]
-        return container.DataFrame(X, columns=column_name, generate_metadata=True)
+        return _to_dataframe(X)
 
     # def set_training_data(self, data):
     #     return self.primitive.set_training_data(inputs=data)
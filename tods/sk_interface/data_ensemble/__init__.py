@@ -1 +1,4 @@
-from tods.sk_interface.data_ensemble.Ensemble_skinterface import EnsembleSKI
+# The estimators are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.estimators(__name__))
@@ -1,22 +1,4 @@
-from tods.sk_interface.detection_algorithm.ABOD_skinterface import ABODSKI
-from tods.sk_interface.detection_algorithm.AutoEncoder_skinterface import AutoEncoderSKI
-from tods.sk_interface.detection_algorithm.AutoRegODetector_skinterface import AutoRegODetectorSKI
-from tods.sk_interface.detection_algorithm.CBLOF_skinterface import CBLOFSKI
-from tods.sk_interface.detection_algorithm.COF_skinterface import COFSKI
-from tods.sk_interface.detection_algorithm.DeepLog_skinterface import DeepLogSKI
-from tods.sk_interface.detection_algorithm.HBOS_skinterface import HBOSSKI
-from tods.sk_interface.detection_algorithm.IsolationForest_skinterface import IsolationForestSKI
-from tods.sk_interface.detection_algorithm.KDiscordODetector_skinterface import KDiscordODetectorSKI
-from tods.sk_interface.detection_algorithm.KNN_skinterface import KNNSKI
-from tods.sk_interface.detection_algorithm.LODA_skinterface import LODASKI
-from tods.sk_interface.detection_algorithm.LOF_skinterface import LOFSKI
-from tods.sk_interface.detection_algorithm.LSTMODetector_skinterface import LSTMODetectorSKI
-from tods.sk_interface.detection_algorithm.MatrixProfile_skinterface import MatrixProfileSKI
-from tods.sk_interface.detection_algorithm.Mo_Gaal_skinterface import Mo_GaalSKI
-from tods.sk_interface.detection_algorithm.OCSVM_skinterface import OCSVMSKI
-from tods.sk_interface.detection_algorithm.PCAODetector_skinterface import PCAODetectorSKI
-from tods.sk_interface.detection_algorithm.SOD_skinterface import SODSKI
-from tods.sk_interface.detection_algorithm.So_Gaal_skinterface import So_GaalSKI
-from tods.sk_interface.detection_algorithm.SystemWiseDetection_skinterface import SystemWiseDetectionSKI
-from tods.sk_interface.detection_algorithm.Telemanom_skinterface import TelemanomSKI
-from tods.sk_interface.detection_algorithm.VariationalAutoEncoder_skinterface import VariationalAutoEncoderSKI
+# The estimators are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.estimators(__name__))
@@ -1,30 +1,4 @@
-from tods.sk_interface.feature_analysis.AutoCorrelation_skinterface import AutoCorrelationSKI
-from tods.sk_interface.feature_analysis.BKFilter_skinterface import BKFilterSKI
-from tods.sk_interface.feature_analysis.DiscreteCosineTransform_skinterface import DiscreteCosineTransformSKI
-from tods.sk_interface.feature_analysis.FastFourierTransform_skinterface import FastFourierTransformSKI
-from tods.sk_interface.feature_analysis.HPFilter_skinterface import HPFilterSKI
-from tods.sk_interface.feature_analysis.NonNegativeMatrixFactorization_skinterface import NonNegativeMatrixFactorizationSKI
-from tods.sk_interface.feature_analysis.SKTruncatedSVD_skinterface import SKTruncatedSVDSKI
-from tods.sk_interface.feature_analysis.SpectralResidualTransform_skinterface import SpectralResidualTransformSKI
-from tods.sk_interface.feature_analysis.StatisticalAbsEnergy_skinterface import StatisticalAbsEnergySKI
-from tods.sk_interface.feature_analysis.StatisticalAbsSum_skinterface import StatisticalAbsSumSKI
-from tods.sk_interface.feature_analysis.StatisticalGmean_skinterface import StatisticalGmeanSKI
-from tods.sk_interface.feature_analysis.StatisticalHmean_skinterface import StatisticalHmeanSKI
-from tods.sk_interface.feature_analysis.StatisticalKurtosis_skinterface import StatisticalKurtosisSKI
-from tods.sk_interface.feature_analysis.StatisticalMaximum_skinterface import StatisticalMaximumSKI
-from tods.sk_interface.feature_analysis.StatisticalMeanAbsTemporalDerivative_skinterface import StatisticalMeanAbsTemporalDerivativeSKI
-from tods.sk_interface.feature_analysis.StatisticalMeanAbs_skinterface import StatisticalMeanAbsSKI
-from tods.sk_interface.feature_analysis.StatisticalMeanTemporalDerivative_skinterface import StatisticalMeanTemporalDerivativeSKI
-from tods.sk_interface.feature_analysis.StatisticalMean_skinterface import StatisticalMeanSKI
-from tods.sk_interface.feature_analysis.StatisticalMedianAbsoluteDeviation_skinterface import StatisticalMedianAbsoluteDeviationSKI
-from tods.sk_interface.feature_analysis.StatisticalMedian_skinterface import StatisticalMedianSKI
-from tods.sk_interface.feature_analysis.StatisticalMinimum_skinterface import StatisticalMinimumSKI
-from tods.sk_interface.feature_analysis.StatisticalSkew_skinterface import StatisticalSkewSKI
-from tods.sk_interface.feature_analysis.StatisticalStd_skinterface import StatisticalStdSKI
-from tods.sk_interface.feature_analysis.StatisticalVar_skinterface import StatisticalVarSKI
-from tods.sk_interface.feature_analysis.StatisticalVariation_skinterface import StatisticalVariationSKI
-from tods.sk_interface.feature_analysis.StatisticalVecSum_skinterface import StatisticalVecSumSKI
-from tods.sk_interface.feature_analysis.StatisticalWillisonAmplitude_skinterface import StatisticalWillisonAmplitudeSKI
-from tods.sk_interface.feature_analysis.StatisticalZeroCrossing_skinterface import StatisticalZeroCrossingSKI
-from tods.sk_interface.feature_analysis.TRMF_skinterface import TRMFSKI
-from tods.sk_interface.feature_analysis.WaveletTransform_skinterface import WaveletTransformSKI
+# The estimators are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.estimators(__name__))
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from d3m.container import DataFrame as d3m_dataframe
+from pyod.models.iforest import IForest
+from pyod.utils.data import generate_data
+
+from tods.common import artifacts
+from tods.detection_algorithm.PyodIsolationForest import IsolationForestPrimitive
+
+
+class ArtifactsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.X_train, _, self.X_test, _ = generate_data(n_train=2000, n_test=100, contamination=0.1, random_state=42)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_detector(self):
+        clf = IForest(random_state=0).fit(self.X_train)
+        header = artifacts.save_artifact(clf, self.path)
+        with open(os.path.join(self.path, 'header.json')) as f:
+            self.assertEqual(json.load(f), header)
+        self.assertEqual(header['family'], 'pyod')
+        self.assertEqual(header['stripped'], [])
+        # the training-set scores are large enough to be mapped
+        self.assertTrue(any(array['shape'] == [2000] for array in header['arrays']))
+
+        loaded = artifacts.load_artifact(self.path)
+        self.assertIsInstance(loaded.decision_scores_, np.memmap)
+        np.testing.assert_array_equal(loaded.decision_scores_, clf.decision_scores_)
+        np.testing.assert_allclose(loaded.decision_function(self.X_test), clf.decision_function(self.X_test))
+
+        loaded = artifacts.load_artifact(self.path, mmap=False)
+        self.assertNotIsInstance(loaded.decision_scores_, np.memmap)
+
+    def test_strip_training_state(self):
+        clf = IForest(random_state=0).fit(self.X_train)
+        header = artifacts.save_artifact(clf, self.path, strip_training_state=True)
+        self.assertEqual(header['stripped'], ['decision_scores_', 'labels_'])
+        # the fitted detector itself is untouched
+        self.assertEqual(clf.decision_scores_.shape, (2000, ))
+
+        loaded = artifacts.load_artifact(self.path)
+        self.assertEqual(loaded.decision_scores_.shape, (0, ))
+        np.testing.assert_array_equal(loaded.predict(self.X_test), clf.predict(self.X_test))
+
+    def test_registry(self):
+        self.assertEqual(artifacts.family_of(IForest()).name, 'pyod')
+        self.assertEqual(artifacts.family_of(object()).name, 'generic')
+
+    def test_primitive(self):
+        hyperparams = IsolationForestPrimitive.metadata.get_hyperparams().defaults()
+        primitive = IsolationForestPrimitive(hyperparams=hyperparams)
+        primitive.set_training_data(inputs=d3m_dataframe(self.X_train, generate_metadata=True))
+        primitive.fit()
+        primitive.save_artifact(path=self.path, _strip_training_state=True)
+
+        X_test = d3m_dataframe(self.X_test, generate_metadata=True)
+        loaded = IsolationForestPrimitive(hyperparams=hyperparams)
+        loaded.load_artifact(path=self.path)
+        self.assertEqual(loaded.get_params()['left_inds_'].shape, (0, ))
+        np.testing.assert_allclose(loaded.produce_score(inputs=X_test).value.values,
+                                   primitive.produce_score(inputs=X_test).value.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
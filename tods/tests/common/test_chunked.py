@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from d3m import container, runtime as runtime_module
+from d3m.metadata import base as metadata_base
+from d3m.metadata.pipeline import Pipeline, PrimitiveStep
+
+from tods.common import chunked
+from tods.data_processing.DatasetToDataframe import DatasetToDataFramePrimitive
+from tods.data_processing.ColumnParser import ColumnParserPrimitive
+from tods.data_processing.ExtractColumnsBySemanticTypes import ExtractColumnsBySemanticTypesPrimitive
+from tods.feature_analysis.StatisticalMean import StatisticalMeanPrimitive
+from tods.feature_analysis.StatisticalMaximum import StatisticalMaximumPrimitive
+
+
+def _add_step(pipeline, primitive, data_reference, **hyperparams):
+    step = PrimitiveStep(primitive=primitive)
+    step.add_argument(name='inputs', argument_type=metadata_base.ArgumentType.CONTAINER, data_reference=data_reference)
+    step.add_output('produce')
+    for name, value in hyperparams.items():
+        step.add_hyperparameter(name=name, argument_type=metadata_base.ArgumentType.VALUE, data=value)
+    pipeline.add_step(step)
+    return 'steps.{i}.produce'.format(i=step.index)
+
+
+def _build_pipeline(mean_window_size, maximum_window_size):
+    pipeline = Pipeline()
+    pipeline.add_input(name='inputs')
+
+    data_reference = _add_step(pipeline, DatasetToDataFramePrimitive, 'inputs.0')
+    data_reference = _add_step(pipeline, ColumnParserPrimitive, data_reference)
+    data_reference = _add_step(pipeline, ExtractColumnsBySemanticTypesPrimitive, data_reference,
+                               semantic_types=['https://metadata.datadrivendiscovery.org/types/Attribute'])
+    data_reference = _add_step(pipeline, StatisticalMeanPrimitive, data_reference, window_size=mean_window_size)
+    data_reference = _add_step(pipeline, StatisticalMaximumPrimitive, data_reference, window_size=maximum_window_size)
+
+    pipeline.add_output(name='output', data_reference=data_reference)
+    return pipeline
+
+
+class ChunkedTestCase(unittest.TestCase):
+    def setUp(self):
+        dataset_doc_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'datasets', 'anomaly', 'yahoo_sub_5', 'TRAIN', 'dataset_TRAIN', 'datasetDoc.json'))
+        self.dataset = container.Dataset.load('file://{dataset_doc_path}'.format(dataset_doc_path=dataset_doc_path))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookback(self):
+        self.assertEqual(chunked.pipeline_lookback(_build_pipeline(5, 3)), 6)
+        self.assertEqual(chunked.pipeline_lookback(_build_pipeline(5, 3), [{}, {}, {}, {}, {'window_size': 10}]), 13)
+
+        with self.assertRaises(ValueError):
+            chunked.pipeline_lookback(_build_pipeline(-1, 3))
+
+    def test_produce_chunked(self):
+        fitted_runtime, _, result = runtime_module.fit(_build_pipeline(5, 3), [self.dataset], problem_description=None,
+                                                      context=metadata_base.Context.TESTING, is_standard_pipeline=False)
+        result.check_success()
+
+        result = fitted_runtime.produce(inputs=[self.dataset])
+        result.check_success()
+        expected = result.values['outputs.0']
+
+        output_path = os.path.join(self.directory.name, 'outputs.csv')
+        for chunk_size in (100, 7, len(expected) + 1):
+            n_written = chunked.produce_chunked(fitted_runtime, self.dataset, output_path, chunk_size=chunk_size)
+            self.assertEqual(n_written, len(expected))
+
+            output = pd.read_csv(output_path)
+            self.assertEqual(list(output.columns), list(expected.columns))
+            np.testing.assert_allclose(output.values, expected.values.astype(np.float64))
+
+        with self.assertRaises(ValueError):
+            chunked.produce_chunked(fitted_runtime, self.dataset, output_path, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from tods.common import ColumnarReader
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class ColumnarReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({
+            'timestamp': np.arange(100, dtype=np.int64),
+            'value_0': np.linspace(0., 1., 100),
+            'value_1': np.linspace(1., 2., 100).astype(np.float32),
+            'anomaly': np.zeros(100, dtype=np.int8),
+        })
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_npy(self):
+        path = self._path('values.npy')
+        np.save(path, self.data[['value_0', 'value_0']].values)
+
+        data = ColumnarReader.read_columnar_file(path)
+        self.assertEqual(list(data.columns), ['0', '1'])
+        self.assertEqual(data.dtypes.tolist(), [np.float64, np.float64])
+        np.testing.assert_array_equal(data['0'], self.data['value_0'])
+
+        data = ColumnarReader.read_columnar_file(path, ['a', 'b'])
+        self.assertEqual(list(data.columns), ['a', 'b'])
+
+        with self.assertRaises(ValueError):
+            ColumnarReader.read_columnar_file(path, ['a'])
+
+    def test_structured_npy(self):
+        path = self._path('values.npy')
+        np.save(path, self.data.to_records(index=False))
+
+        data = ColumnarReader.read_columnar_file(path, ['value_1', 'timestamp'])
+        self.assertEqual(list(data.columns), ['value_1', 'timestamp'])
+        pd.testing.assert_frame_equal(data, self.data[['value_1', 'timestamp']])
+
+    def test_npz(self):
+        path = self._path('values.npz')
+        np.savez(path, **{name: self.data[name].values for name in self.data.columns})
+
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path), self.data)
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path, ['anomaly', 'value_0']),
+                                      self.data[['anomaly', 'value_0']])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        path = self._path('values.parquet')
+        self.data.to_parquet(path)
+
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path), self.data)
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path, ['value_1', 'anomaly']),
+                                      self.data[['value_1', 'anomaly']])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_feather(self):
+        path = self._path('values.feather')
+        self.data.to_feather(path)
+
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path), self.data)
+        pd.testing.assert_frame_equal(ColumnarReader.read_columnar_file(path, ['timestamp']), self.data[['timestamp']])
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            ColumnarReader.read_columnar_file(self._path('values.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+from d3m import container
+from d3m.primitive_interfaces.base import CallResult
+
+from tods.common.executor import map_systems, run_systems, SystemExecutionError
+
+
+class MeanPrimitive:
+    # fits the column means of a system and subtracts them
+    def __init__(self, n_jobs=1, executor='process'):
+        self.hyperparams = {'n_jobs': n_jobs, 'executor': executor}
+        self._means = None
+
+    def set_training_data(self, *, inputs):
+        self._inputs = inputs
+
+    def _fit(self, *, timeout=None, iterations=None):
+        if (self._inputs.values < 0).any():
+            raise ValueError("negative values")
+        self._means = self._inputs.values.mean(axis=0)
+        return CallResult(None)
+
+    def _produce(self, *, inputs, timeout=None, iterations=None):
+        return CallResult(container.DataFrame(inputs.values - self._means, generate_metadata=True))
+
+
+class ExecutorTestCase(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.systems = [container.DataFrame(random_state.rand(20 + i, 2), columns=['a', 'b'], generate_metadata=True)
+                        for i in range(6)]
+        self.expected = [system.values - system.values.mean(axis=0) for system in self.systems]
+
+    def test_order(self):
+        for n_jobs in [1, 3, -1]:
+            for executor in ['thread', 'process']:
+                with self.subTest(n_jobs=n_jobs, executor=executor):
+                    primitive = MeanPrimitive(n_jobs=n_jobs, executor=executor)
+                    results = run_systems(primitive, '_produce', self.systems, fit=True)
+                    self.assertEqual(len(results), len(self.systems))
+                    for result, expected in zip(results, self.expected):
+                        np.testing.assert_allclose(result.value.values, expected)
+
+    def test_errors(self):
+        self.systems[1].iloc[0, 0] = -1.
+        self.systems[4].iloc[0, 1] = -1.
+        for executor in ['thread', 'process']:
+            with self.subTest(executor=executor):
+                with self.assertRaises(SystemExecutionError) as context:
+                    run_systems(MeanPrimitive(n_jobs=2, executor=executor), '_produce', self.systems, fit=True)
+                self.assertEqual(sorted(context.exception.errors), [1, 4])
+                self.assertIsInstance(context.exception.errors[1], ValueError)
+
+    def test_map_systems(self):
+        arguments = [(system.values,) for system in self.systems]
+        for executor in ['thread', 'process']:
+            with self.subTest(executor=executor):
+                results = map_systems(np.mean, arguments, n_jobs=3, executor=executor)
+                self.assertEqual(results, [system.values.mean() for system in self.systems])
+
+        with self.assertRaises(SystemExecutionError) as context:
+            map_systems(np.reshape, [(system.values, (2, -1 if i % 2 else 7)) for i, system in enumerate(self.systems)])
+        self.assertEqual(sorted(context.exception.errors), [0, 2, 4])
+
+    def test_executor(self):
+        self.assertRaises(ValueError, run_systems, MeanPrimitive(n_jobs=2, executor='cluster'), '_produce', self.systems)
+
+
+if __name__ == '__main__':
+    unittest.main()
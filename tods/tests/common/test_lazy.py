@@ -0,0 +1,44 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+
+import tods
+from tods.common import lazy
+from tods.detection_algorithm import PyodHBOS
+
+
+class LazyTestCase(unittest.TestCase):
+    def test_import_is_lazy(self):
+        code = ("import sys, tods; "
+                "print(sorted(m for m in sys.modules if m.split('.')[0] in ('tensorflow', 'keras', 'stumpy', 'pyod')"
+                " or m.startswith('tods.detection_algorithm.')))")
+        output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+    def test_names(self):
+        for name in ['HBOSPrimitive', 'TelemanomPrimitive', 'StatisticalMeanPrimitive',
+                     'SKStandardScalerPrimitive', 'DatasetToDataFramePrimitive', 'HBOSSKI', 'EnsembleSKI']:
+            self.assertIn(name, tods.__all__)
+            self.assertIn(name, dir(tods))
+        self.assertIn('generate_dataset', tods.__all__)
+
+        # every module listed can be found
+        for package in ['tods.data_processing', 'tods.timeseries_processing', 'tods.feature_analysis',
+                        'tods.detection_algorithm']:
+            for module in lazy.primitives(package).values():
+                self.assertIsNotNone(importlib.util.find_spec(module), module)
+        self.assertEqual(lazy.estimators('tods.sk_interface.detection_algorithm')['HBOSSKI'],
+                         'tods.sk_interface.detection_algorithm.HBOS_skinterface')
+
+    def test_getattr(self):
+        self.assertIs(tods.HBOSPrimitive, PyodHBOS.HBOSPrimitive)
+        self.assertIs(tods.detection_algorithm.HBOSPrimitive, PyodHBOS.HBOSPrimitive)
+        self.assertIn('HBOSPrimitive', vars(tods))
+        with self.assertRaises(AttributeError):
+            tods.NotAPrimitive
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from d3m import container, utils
+
+from tods.common import metadata_cache
+from tods.feature_analysis import StatisticalMean
+from tods.timeseries_processing import SKStandardScaler
+
+
+def _frame(n_rows, names=('timestamp', 'values', 'b')):
+    columns = {name: np.arange(n_rows, dtype=np.float64) * (index + 1) for index, name in enumerate(names)}
+    return container.DataFrame(columns, columns=list(names), generate_metadata=True)
+
+
+def _structure(outputs):
+    return utils.to_json_structure(outputs.metadata.to_internal_simple_structure())
+
+
+class MetadataCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        metadata_cache.clear()
+        metadata_cache.enable()
+
+    def tearDown(self):
+        metadata_cache.clear()
+        metadata_cache.enable()
+
+    def _mean(self, **hyperparams):
+        hyperparams_class = StatisticalMean.StatisticalMeanPrimitive.metadata.get_hyperparams()
+        hp = hyperparams_class.defaults().replace(dict({'use_columns': [1, 2], 'use_semantic_types': True,
+                                                        'window_size': 2}, **hyperparams))
+        return StatisticalMean.StatisticalMeanPrimitive(hyperparams=hp)
+
+    def test_same_metadata(self):
+        for n_rows in (4, 10, 4):
+            metadata_cache.disable()
+            expected = self._mean()._produce(inputs=_frame(n_rows)).value
+            metadata_cache.enable()
+            output = self._mean()._produce(inputs=_frame(n_rows)).value
+
+            self.assertEqual(_structure(output), _structure(expected))
+            np.testing.assert_array_equal(output.values, expected.values)
+
+        info = metadata_cache.info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 2)
+
+    def test_key(self):
+        self._mean()._produce(inputs=_frame(4))
+        self._mean(window_size=3)._produce(inputs=_frame(4))
+        self._mean()._produce(inputs=_frame(4, names=('timestamp', 'values', 'c')))
+        self.assertEqual(metadata_cache.info()['misses'], 3)
+        self.assertEqual(metadata_cache.info()['hits'], 0)
+
+    def test_scaler(self):
+        hyperparams_class = SKStandardScaler.SKStandardScalerPrimitive.metadata.get_hyperparams()
+        for n_rows in (20, 30):
+            metadata_cache.disable()
+            primitive = SKStandardScaler.SKStandardScalerPrimitive(hyperparams=hyperparams_class.defaults())
+            primitive.set_training_data(inputs=_frame(n_rows))
+            primitive.fit()
+            expected = primitive.produce(inputs=_frame(n_rows)).value
+
+            metadata_cache.enable()
+            output = primitive.produce(inputs=_frame(n_rows)).value
+            self.assertEqual(_structure(output), _structure(expected))
+
+        self.assertEqual(metadata_cache.info()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
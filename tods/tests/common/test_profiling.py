@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tods.common import profiling
+
+
+class _Estimator(object):
+    def __init__(self, inner=None):
+        self.inner = inner
+
+    @profiling.traced
+    def produce(self, *, inputs):
+        outputs = np.ones((len(inputs), 2))
+        if self.inner is not None:
+            self.inner.produce(inputs=inputs)
+        return outputs
+
+    @profiling.traced
+    def fail(self, data):
+        raise ValueError('bad input')
+
+
+class _ListSink(object):
+    def __init__(self):
+        self.events = []
+        self.closed = False
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def close(self):
+        self.closed = True
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.X = np.zeros((100, 3))
+
+    def tearDown(self):
+        profiling.disable()
+        shutil.rmtree(self.path)
+
+    def test_disabled(self):
+        sink = _ListSink()
+        with profiling.profile(sink):
+            pass
+        self.assertTrue(sink.closed)
+        _Estimator().produce(inputs=self.X)
+        self.assertEqual(sink.events, [])
+
+    def test_events(self):
+        sink = _ListSink()
+        with profiling.profile(sink, trace_memory=True):
+            _Estimator(inner=_Estimator()).produce(inputs=self.X)
+            with self.assertRaises(ValueError):
+                _Estimator().fail(self.X)
+
+        inner, outer, failed = sink.events
+        self.assertEqual(outer['name'], '_Estimator.produce')
+        self.assertEqual((outer['depth'], inner['depth']), (0, 1))
+        self.assertEqual(outer['input_shape'], [100, 3])
+        self.assertEqual(outer['output_shape'], [100, 2])
+        self.assertGreaterEqual(outer['wall_time'], inner['wall_time'])
+        self.assertAlmostEqual(outer['kernel_time'], outer['wall_time'] - outer['metadata_time'])
+        # both calls allocate their outputs
+        self.assertGreaterEqual(outer['peak_memory'], 100 * 2 * 8)
+        if profiling._RESET_PEAK:
+            self.assertGreaterEqual(inner['peak_memory'], 100 * 2 * 8)
+        self.assertEqual(failed['input_shape'], [100, 3])
+        self.assertEqual(failed['error'], 'ValueError: bad input')
+
+    def test_memory_without_reset_peak(self):
+        # Python 3.7 and 3.8
+        sink = _ListSink()
+        with mock.patch.object(profiling, '_RESET_PEAK', False):
+            with profiling.profile(sink, trace_memory=True):
+                _Estimator(inner=_Estimator()).produce(inputs=self.X)
+
+        inner, outer = sink.events
+        self.assertIsNone(inner['peak_memory'])
+        self.assertGreaterEqual(outer['peak_memory'], 100 * 2 * 8)
+
+    def test_sinks(self):
+        jsonl_path = os.path.join(self.path, 'trace.jsonl')
+        chrome_path = os.path.join(self.path, 'trace.json')
+        with profiling.profile(profiling.JSONLinesSink(jsonl_path), profiling.ChromeTraceSink(chrome_path),
+                               profiling.LoggingSink(level=logging.DEBUG)):
+            _Estimator().produce(inputs=self.X)
+            _Estimator().produce(inputs=self.X)
+
+        with open(jsonl_path) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual([event['name'] for event in events], ['_Estimator.produce'] * 2)
+
+        with open(chrome_path) as f:
+            trace = json.load(f)['traceEvents']
+        self.assertEqual(len(trace), 2)
+        self.assertEqual(trace[0]['ph'], 'X')
+        self.assertAlmostEqual(trace[0]['dur'], events[0]['wall_time'] * 1e6, places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
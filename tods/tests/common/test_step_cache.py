@@ -0,0 +1,74 @@
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from tods.common import step_cache
+
+
+class StepCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_put(self):
+        cache = step_cache.DiskStepCache(self.directory.name)
+        self.assertIsNone(cache.get('a'))
+        self.assertTrue(cache.put('a', {'outputs': np.arange(10.)}))
+        np.testing.assert_array_equal(cache.get('a')['outputs'], np.arange(10.))
+
+        # another cache on the same directory, as in a later run
+        cache = step_cache.DiskStepCache(self.directory.name)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertFalse(cache.put('b', lambda: None))
+        self.assertFalse(cache.put('b', None))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.info()['entries'], 0)
+
+    def test_eviction(self):
+        entry_size = len(pickle.dumps(np.zeros(1000), protocol=pickle.HIGHEST_PROTOCOL))
+        cache = step_cache.DiskStepCache(self.directory.name, max_bytes=3 * entry_size)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, np.zeros(1000))
+            time.sleep(0.01)
+        cache.get('a')
+        time.sleep(0.01)
+        cache.put('d', np.zeros(1000))
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['a.pkl', 'c.pkl', 'd.pkl'])
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.info()['bytes'], cache.max_bytes)
+        self.assertFalse(cache.put('e', np.zeros(10000)))
+
+    def test_replace(self):
+        entry_size = len(pickle.dumps(np.zeros(1000), protocol=pickle.HIGHEST_PROTOCOL))
+        cache = step_cache.DiskStepCache(self.directory.name, max_bytes=3 * entry_size)
+        cache.put('a', np.zeros(1000))
+        for _ in range(5):
+            cache.put('b', np.zeros(1000))
+
+        self.assertEqual(cache._size, 2 * entry_size)
+        self.assertEqual(cache.evictions, 0)
+
+    def test_array_digest(self):
+        X = np.arange(6.).reshape(2, 3)
+        self.assertEqual(step_cache.array_digest(X), step_cache.array_digest(X.copy()))
+        self.assertEqual(step_cache.array_digest(X.T), step_cache.array_digest(np.ascontiguousarray(X.T)))
+        self.assertNotEqual(step_cache.array_digest(X), step_cache.array_digest(X.reshape(3, 2)))
+        self.assertNotEqual(step_cache.array_digest(X), step_cache.array_digest(X.astype(np.float32)))
+        self.assertIsNone(step_cache.array_digest(np.array(['a'], dtype=object)))
+
+        self.assertEqual(step_cache.step_key('id', {'b': 1, 'a': 2}), step_cache.step_key('id', {'a': 2, 'b': 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
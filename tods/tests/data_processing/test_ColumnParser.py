@@ -8,6 +8,7 @@ from d3m import container, utils
 from d3m.metadata import base as metadata_base
 
 from tods.data_processing import DatasetToDataframe, ColumnParser
+from tods.data_processing import utils as data_processing_utils
 
 import utils as test_utils
 
@@ -438,6 +439,42 @@ class ColumnParserPrimitiveTestCase(unittest.TestCase):
         self.assertEqual(list(parsed_dataframe.iloc[0:2, 0]), [1.0, 2.0])
         self.assertTrue(math.isnan(parsed_dataframe.iloc[2, 0]))
 
+    def test_vectorized(self):
+        hyperparams_class = ColumnParser.ColumnParserPrimitive.metadata.get_hyperparams()
+
+        primitive = ColumnParser.ColumnParserPrimitive(hyperparams=hyperparams_class.defaults())
+
+        columns = {
+            'integer': (['1', ' 2', '-0.5', '', '1_000', 'nan', '7.9'], 'http://schema.org/Integer'),
+            'float': (['1.5', ' 2 ', 'abc', '', '1e400', 'nan', '-0'], 'http://schema.org/Float'),
+            'categorical': ([' a', 'a', 'b ', 'c', 'a', 'b', 'c'], 'https://metadata.datadrivendiscovery.org/types/CategoricalData'),
+            'vector': (['1,2,3', '4', '', '5,x, 6', '7', '8,9', '0'], 'https://metadata.datadrivendiscovery.org/types/FloatVector'),
+            'time': (['2020-01-02 03:04:05', '2020-01-02 03:04:06.5', '1960-01-01 00:00:00', 'garbage',
+                      '2020-01-02 03:04:05', '01/02/2020', ''], 'http://schema.org/DateTime'),
+        }
+
+        dataframe = container.DataFrame({name: values for name, (values, semantic_type) in columns.items()},
+                                        columns=list(columns), generate_metadata=True)
+        for column_index, (values, semantic_type) in enumerate(columns.values()):
+            dataframe.metadata = dataframe.metadata.update((metadata_base.ALL_ELEMENTS, column_index), {
+                'semantic_types': [semantic_type],
+            })
+
+        parsed_dataframe = primitive.produce(inputs=dataframe).value
+
+        # The values are the same as those parsed one by one.
+        numpy.testing.assert_array_equal(parsed_dataframe['integer'],
+                                         [ColumnParser.ColumnParserPrimitive._str_to_int(value) for value in columns['integer'][0]])
+        numpy.testing.assert_array_equal(parsed_dataframe['float'],
+                                         [ColumnParser.ColumnParserPrimitive._str_to_float(value) for value in columns['float'][0]])
+        self.assertEqual(parsed_dataframe['categorical'][0], parsed_dataframe['categorical'][1])
+        self.assertEqual(parsed_dataframe['categorical'][2], parsed_dataframe['categorical'][5])
+        self.assertEqual(len(set(parsed_dataframe['categorical'])), 3)
+        for vector, values in zip(parsed_dataframe['vector'], columns['vector'][0]):
+            numpy.testing.assert_array_equal(vector, [ColumnParser.ColumnParserPrimitive._str_to_float(value) for value in values.split(',')])
+        numpy.testing.assert_array_equal(parsed_dataframe['time'],
+                                         [data_processing_utils.parse_datetime_to_float(value) for value in columns['time'][0]])
+
 
 
 
@@ -186,6 +186,31 @@ class ContinuityValidationTest(unittest.TestCase):
 
 
 
+    def test_gaps(self):
+        main = container.DataFrame({'d3mIndex': [0, 1, 2, 3, 4, 5], 'timestamp': [1., 2., 5., 7., 9., 10.],
+                                    'a': [1., 2., 5., 1., 3., 4.], 'ground_truth': [0, 0, 1, 0, 1, 0]},
+                                   columns=['d3mIndex', 'timestamp', 'a', 'ground_truth'],
+                                   generate_metadata=True)
+        hyperparams_class = ContinuityValidation.ContinuityValidationPrimitive.metadata.get_hyperparams()
+
+        primitive = ContinuityValidation.ContinuityValidationPrimitive(hyperparams=hyperparams_class.defaults())
+        new_main = primitive.produce(inputs=main).value
+        self.assertEqual(new_main['timestamp'].tolist(), [1., 2., 3., 4., 5., 6., 7., 8., 9., 10.])
+        self.assertEqual(new_main['a'].tolist(), [1., 2., 3., 4., 5., 3., 1., 2., 3., 4.])
+        self.assertEqual(new_main['ground_truth'].tolist(), [0, 0, 1, 1, 1, 0, 0, 1, 1, 0])
+        self.assertEqual(new_main['d3mIndex'].tolist(), list(range(10)))
+        self.assertEqual(main['timestamp'].tolist(), [1., 2., 5., 7., 9., 10.])
+        self._test_continuity(new_main)
+
+        # the dominant interval is 2, the series 1, 3, 5, 7, 9 skips 2
+        hyperparams = hyperparams_class.defaults().replace({'continuity_option': 'ablation'})
+        primitive = ContinuityValidation.ContinuityValidationPrimitive(hyperparams=hyperparams)
+        main['timestamp'] = [1., 2., 3., 5., 7., 9.]
+        new_main = primitive.produce(inputs=main).value
+        self.assertEqual(new_main['timestamp'].tolist(), [1., 3., 5., 7., 9.])
+        self.assertEqual(new_main['a'].tolist(), [1., 5., 1., 3., 4.])
+        self._test_continuity(new_main)
+
     def _test_continuity(self, data_value):
         tmp_col = data_value['timestamp']
         interval = tmp_col[1] - tmp_col[0]
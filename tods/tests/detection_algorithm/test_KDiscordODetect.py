@@ -105,6 +105,13 @@ class KDiscordODetectTestCase(unittest.TestCase):
             },
         }])
 
+    def test_update(self):
+        self.primitive.reset_stream()
+        streamed = [self.primitive.update(inputs=self.X_test.iloc[i:i + 1]).value.values
+                    for i in range(0, len(self.X_test), 1)]
+        batch = self.primitive._produce_score(inputs=self.X_test).value.values
+        np.testing.assert_allclose(np.concatenate(streamed), batch)
+
     def test_params(self):
         params = self.primitive.get_params()
         self.primitive.set_params(params=params)
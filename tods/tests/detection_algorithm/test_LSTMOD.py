@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from tods.detection_algorithm.core.LSTMOD import _group_attack_windows
+
+
+def _loop(relative_error, error_num_buf, min_attack_time, diff_group_method):
+    # the per-window loops of LSTMOutlierDetector.decision_function before vectorization
+    relative_error_left_inds = np.ones((len(relative_error), )) * len(relative_error)
+    relative_error_right_inds = np.zeros((len(relative_error), ))
+
+    if diff_group_method == 'average':
+        danger_coefficient = np.zeros(relative_error.shape)
+        averaged_relative_error = np.zeros(relative_error.shape)
+        calculated_times = np.zeros(relative_error.shape)
+
+        for i in range(len(relative_error) - min_attack_time + 1):
+            dc_tmp = error_num_buf[i:i+min_attack_time].sum() / min_attack_time
+            are_tmp = relative_error[i:i+min_attack_time].sum() / min_attack_time
+
+            for j in range(min_attack_time):
+                averaged_relative_error[i + j] += are_tmp
+                danger_coefficient[i + j] += dc_tmp
+                calculated_times[i + j] += 1
+                relative_error_left_inds[i + j] = i if i < relative_error_left_inds[i + j] else relative_error_left_inds[i + j]
+                relative_error_right_inds[i + j] = i+min_attack_time if i+min_attack_time > relative_error_right_inds[i + j] else relative_error_left_inds[i + j]
+
+        with np.errstate(invalid='ignore'):
+            danger_coefficient /= calculated_times
+            averaged_relative_error /= calculated_times
+
+    else:
+        danger_coefficient = np.zeros(relative_error.shape)
+        averaged_relative_error = np.zeros(relative_error.shape)
+
+        if diff_group_method == 'min':
+            danger_coefficient += float('inf')
+            averaged_relative_error += float('inf')
+
+        for i in range(len(relative_error) - min_attack_time + 1):
+            dc_tmp = error_num_buf[i:i+min_attack_time].sum() / min_attack_time
+            are_tmp = relative_error[i:i+min_attack_time].sum() / min_attack_time
+
+            for j in range(min_attack_time):
+                if diff_group_method == 'max':
+                    better_are, better_dc = are_tmp > averaged_relative_error[i + j], dc_tmp > danger_coefficient[i + j]
+                else:
+                    better_are, better_dc = are_tmp < averaged_relative_error[i + j], dc_tmp < danger_coefficient[i + j]
+                if better_are or better_dc:
+                    relative_error_left_inds[i + j] = i
+                    relative_error_right_inds[i + j] = i+min_attack_time
+                if better_are:
+                    averaged_relative_error[i + j] = are_tmp
+                if better_dc:
+                    danger_coefficient[i + j] = dc_tmp
+
+    return danger_coefficient, averaged_relative_error, relative_error_left_inds, relative_error_right_inds
+
+
+class GroupAttackWindowsTestCase(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        relative_error = random_state.exponential(size=400)
+        relative_error[100:130] = 0.
+        relative_error[200:230] = relative_error[230]
+        self.relative_error = relative_error
+        self.error_num_buf = (relative_error > np.percentile(relative_error, 80)).astype(int)
+
+    def test_equivalence(self):
+        for diff_group_method in ['average', 'max', 'min']:
+            for min_attack_time in [1, 2, 5, 17]:
+                for n_samples in [0, 3, min_attack_time - 1, min_attack_time, 400]:
+                    relative_error = self.relative_error[:n_samples]
+                    error_num_buf = self.error_num_buf[:n_samples]
+                    with self.subTest(method=diff_group_method, min_attack_time=min_attack_time, n_samples=n_samples):
+                        with np.errstate(invalid='ignore'):
+                            result = _group_attack_windows(relative_error, error_num_buf,
+                                                           min_attack_time, diff_group_method)
+                        expected = _loop(relative_error, error_num_buf, min_attack_time, diff_group_method)
+                        for output, expected_output in zip(result, expected):
+                            self.assertEqual(output.dtype, expected_output.dtype)
+                            np.testing.assert_array_equal(output, expected_output)
+
+
+if __name__ == '__main__':
+    unittest.main()
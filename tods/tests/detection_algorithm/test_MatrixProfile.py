@@ -1,8 +1,10 @@
 import unittest
 
+import numpy as np
+
 from d3m import container, utils
 from d3m.metadata import base as metadata_base
-from tods.detection_algorithm.MatrixProfile import MatrixProfilePrimitive
+from tods.detection_algorithm.MatrixProfile import MatrixProfilePrimitive, MP
 
 
 
@@ -100,6 +102,47 @@ class MatrixProfileTest(unittest.TestCase):
             'metadata': {'structural_type': 'numpy.float64', 'name': 'c'}
         }])
 
+    def test_profile_modes(self):
+        values = np.random.RandomState(0).rand(60, 2)
+        train = container.DataFrame(values[:40], columns=['a', 'b'], generate_metadata=True)
+        test = container.DataFrame(values[40:], columns=['a', 'b'], generate_metadata=True)
+        hyperparams_class = MatrixProfilePrimitive.metadata.get_hyperparams()
+
+        for profile_mode in ['ab_join', 'incremental']:
+            hyperparams = hyperparams_class.defaults().replace({'window_size': 4, 'profile_mode': profile_mode})
+            primitive = MatrixProfilePrimitive(hyperparams=hyperparams)
+            primitive.set_training_data(inputs=train)
+            primitive.fit()
+            labels = primitive.produce(inputs=test).value
+            self.assertEqual(labels.shape[0], 20)
+            self.assertTrue(np.isin(labels.values, [0, 1]).all())
+
+        # the incremental profile has grown by the scored rows
+        self.assertEqual(primitive._clf.profile_.n_samples_, 60)
+        primitive.reset_stream()
+        streamed = primitive.update(inputs=test).value
+        self.assertEqual(streamed.shape[0], 17)
+        self.assertEqual(primitive._clf.profile_.n_samples_, 80)
+
+    def test_approximation(self):
+        main = container.DataFrame(np.random.RandomState(0).rand(200, 2), columns=['a', 'b'], generate_metadata=True)
+        hyperparams_class = MatrixProfilePrimitive.metadata.get_hyperparams()
+        hyperparams = hyperparams_class.defaults().replace({'window_size': 8, 'profile_percentage': 0.5})
+        primitive = MatrixProfilePrimitive(hyperparams=hyperparams)
+        primitive.set_training_data(inputs=main)
+        primitive.fit()
+        new_main = primitive.produce(inputs=main).value
+        self.assertEqual(new_main.shape[0], 200)
+        self.assertEqual(new_main.metadata.query(())['matrix_profile']['approximation'], 0.5)
+
+    def test_approximate_scores(self):
+        # with every diagonal, the approximate scores are those of the exact profile
+        X = np.random.RandomState(0).rand(200, 3)
+        exact = MP(window_size=8, step_size=1, contamination=0.1).fit(X)
+        approximate = MP(window_size=8, step_size=1, contamination=0.1, percentage=1.)
+        np.testing.assert_allclose(approximate._approximate_scores(X), exact.decision_scores_, atol=1e-9)
+        self.assertEqual(approximate.approximation_, 1.)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -94,6 +94,16 @@ class PyodKNNTestCase(unittest.TestCase):
             },
         }])
 
+    def test_update(self):
+        self.primitive.reset_stream()
+        streamed = [self.primitive.update(inputs=self.X_test.iloc[i:i + 7]).value.values
+                    for i in range(0, len(self.X_test), 7)]
+        streamed = np.concatenate(streamed)
+        # each row is returned once its subsequence of window_size rows is complete
+        n_complete = len(self.X_test) - self.primitive.window_size + 1
+        batch = self.primitive._produce_score(inputs=self.X_test).value.values
+        np.testing.assert_allclose(streamed, batch[:n_complete])
+
     def test_params(self):
         params = self.primitive.get_params()
         self.primitive.set_params(params=params)
@@ -0,0 +1,72 @@
+import io
+import unittest
+
+import numpy as np
+
+from tods.detection_algorithm.core.StreamingMatrixProfile import StreamingMatrixProfile
+
+
+def _brute_force(T, window_size):
+    windows = np.array([T[i:i + window_size] for i in range(len(T) - window_size + 1)])
+    z = (windows - windows.mean(axis=1, keepdims=True)) / windows.std(axis=1, keepdims=True)
+    D = np.sqrt(np.maximum(2 * window_size * (1 - z @ z.T / window_size), 0))
+    exclusion_zone = int(np.ceil(window_size / 4))
+    for i in range(len(D)):
+        D[i, max(i - exclusion_zone, 0):i + exclusion_zone + 1] = np.inf
+    return D.min(axis=1)
+
+
+def _brute_force_join(T_A, T_B, window_size):
+    def normalized(T):
+        windows = np.array([T[i:i + window_size] for i in range(len(T) - window_size + 1)])
+        return (windows - windows.mean(axis=1, keepdims=True)) / windows.std(axis=1, keepdims=True)
+    D = np.sqrt(np.maximum(2 * window_size * (1 - normalized(T_A) @ normalized(T_B).T / window_size), 0))
+    return D.min(axis=1)
+
+
+class StreamingMatrixProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.X = np.random.RandomState(0).rand(150, 2)
+        self.window_size = 8
+
+    def test_fit(self):
+        profile = StreamingMatrixProfile(self.window_size).fit(self.X)
+        for k in range(self.X.shape[1]):
+            np.testing.assert_allclose(profile.P_[:, k], _brute_force(self.X[:, k], self.window_size), atol=1e-6)
+
+    def test_extend(self):
+        fitted = StreamingMatrixProfile(self.window_size).fit(self.X)
+        profile = StreamingMatrixProfile(self.window_size).fit(self.X[:50])
+        new = profile.extend(self.X[50:])
+        self.assertEqual(new.shape, (100, 2))
+        np.testing.assert_allclose(profile.P_, fitted.P_, atol=1e-6)
+        np.testing.assert_array_equal(profile.I_, fitted.I_)
+
+        # from an empty profile too
+        profile = StreamingMatrixProfile(self.window_size)
+        profile.extend(self.X[:5])
+        profile.extend(self.X[5:])
+        np.testing.assert_allclose(profile.P_, fitted.P_, atol=1e-6)
+
+    def test_save(self):
+        profile = StreamingMatrixProfile(self.window_size).fit(self.X[:100])
+        buffer = io.BytesIO()
+        profile.save(buffer)
+        buffer.seek(0)
+        loaded = StreamingMatrixProfile.load(buffer)
+        np.testing.assert_array_equal(loaded.extend(self.X[100:]), profile.extend(self.X[100:]))
+        np.testing.assert_array_equal(loaded.P_, profile.P_)
+
+    def test_join(self):
+        profile = StreamingMatrixProfile(self.window_size).fit(self.X[:100])
+        P = profile.join(self.X[100:])
+        self.assertEqual(P.shape, (50 - self.window_size + 1, 2))
+        # the windows of the scored rows against those of the fitted ones
+        np.testing.assert_allclose(P[:, 0], _brute_force_join(self.X[100:, 0], self.X[:100, 0], self.window_size),
+                                   atol=1e-6)
+        # a window of the reference is at distance 0
+        self.assertAlmostEqual(profile.join(self.X[10:10 + self.window_size]).max(), 0., places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import types
+import unittest
+
+import numpy as np
+
+from tods.detection_algorithm.core.utils.channel import Channel
+from tods.detection_algorithm.core.utils.errors import Errors, ErrorWindow, _consecutive_groups, _dilate, _range_max
+
+
+class TelemanomErrorsTest(unittest.TestCase):
+    def setUp(self):
+        self.random_state = np.random.RandomState(0)
+
+    def test_helpers(self):
+        mask = self.random_state.rand(3, 50) < 0.1
+        for radius in [0, 1, 4]:
+            expected = np.zeros_like(mask)
+            for row, i in zip(*np.nonzero(mask)):
+                expected[row, max(i - radius, 0):i + radius + 1] = True
+            np.testing.assert_array_equal(_dilate(mask, radius), expected)
+
+        starts, ends = _consecutive_groups([1, 2, 3, 7, 9, 10])
+        np.testing.assert_array_equal(starts, [1, 7, 9])
+        np.testing.assert_array_equal(ends, [3, 7, 10])
+        self.assertEqual(len(_consecutive_groups([])[0]), 0)
+
+        values = self.random_state.rand(20)
+        np.testing.assert_array_equal(_range_max(values, starts, ends),
+                                      [values[1:4].max(), values[7], values[9:11].max()])
+
+    def test_channel(self):
+        arr = self.random_state.rand(30, 2)
+        channel = Channel(n_predictions=3, l_s=5)
+        channel.shape_test_data(arr)
+        data = np.array([arr[i:i + 8] for i in range(30 - 8)])
+        np.testing.assert_array_equal(channel.X_test, data[:, :5, :])
+        np.testing.assert_array_equal(channel.y_test, data[:, 5:, :].reshape(22, 6))
+
+    def test_errors(self):
+        n, n_predictions, n_features = 400, 2, 1
+        channel = types.SimpleNamespace(X_test=np.zeros((n, 10, n_features)),
+                                        y_test=self.random_state.rand(n, n_predictions * n_features),
+                                        y_hat=self.random_state.rand(n, n_predictions, n_features))
+        y_test, y_hat = channel.y_test.copy(), channel.y_hat.copy()
+        errors = Errors(channel, window_size=3, batch_size=50, smoothing_perc=0.05, n_predictions=n_predictions,
+                        l_s=10, error_buffer=5, p=0.13)
+
+        e = np.array([abs(y_h - y_t) for y_h, y_t in zip(y_hat.ravel(), y_test.ravel())])
+        np.testing.assert_array_equal(errors.e.ravel(), e)
+        self.assertEqual(errors.e_s.shape, (n, ))
+
+        # a spike well above the other errors is found and scored
+        errors.e_s[200:206] += 5.
+        channel.y_test = channel.y_test[::n_predictions]
+        errors.process_batches(channel)
+        self.assertEqual(errors.E_seq[0][0] - 10, errors.i_anom.min())
+        self.assertTrue(np.isin(np.arange(200, 206), errors.i_anom).all())
+        self.assertTrue(all(score['score'] > 0 for score in errors.anom_scores))
+
+    def test_find_epsilon(self):
+        # a single spike: every z below it scores the same, the last one wins
+        e_s = self.random_state.rand(200) * 0.1
+        e_s[100] = 5.
+        errors = types.SimpleNamespace(e_s=e_s)
+        channel = types.SimpleNamespace(y_test=self.random_state.rand(2000))
+        window = ErrorWindow(channel, 0, 200, errors, 0, 10, 3, 50, 0.13)
+        window.find_epsilon()
+        self.assertEqual(window.sd_threshold, 11.5)
+        self.assertEqual(window.epsilon, window.mean_e_s + 11.5 * window.sd_e_s)
+
+        window.find_epsilon(inverse=True)
+        self.assertEqual(window.sd_threshold_inv, window.sd_lim)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from tods.detection_algorithm.core.utility import get_sub_matrices, \
+    get_sub_matrices_view, flatten_sub_matrices, get_sub_sequences_length
+
+
+def _loop_sub_matrices(X, window_size, step, flatten_order):
+    valid_len = get_sub_sequences_length(X.shape[0], window_size, step)
+    X_sub = np.zeros([valid_len, window_size * X.shape[1]])
+    for idx, i in enumerate(range(0, valid_len * step, step)):
+        X_sub[idx, :] = X[i: i + window_size, :].flatten(order=flatten_order)
+    left_inds = np.arange(valid_len) * step
+    return X_sub, left_inds, left_inds + window_size
+
+
+class UtilityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.X = np.asarray(
+            [[3., 5], [5., 9], [7., 2], [42., 20], [8., 12], [10., 12],
+             [12., 12], [18., 16], [20., 7], [18., 10], [23., 12], [22., 15]])
+
+    def test_get_sub_matrices(self):
+        for window_size in [1, 3, 5]:
+            for step in [1, 2, 3]:
+                for flatten_order in ['C', 'F']:
+                    expected = _loop_sub_matrices(self.X, window_size, step,
+                                                  flatten_order)
+                    result = get_sub_matrices(self.X, window_size, step,
+                                              flatten_order=flatten_order)
+                    for e, r in zip(expected, result):
+                        np.testing.assert_array_equal(e, r)
+
+    def test_view_is_read_only(self):
+        X_sub, left_inds, right_inds = get_sub_matrices_view(self.X, 3, 2)
+        self.assertEqual(X_sub.shape, (5, 3, 2))
+        self.assertFalse(X_sub.flags.writeable)
+        self.assertTrue(np.shares_memory(X_sub, self.X))
+        np.testing.assert_array_equal(left_inds, [0, 2, 4, 6, 8])
+        np.testing.assert_array_equal(right_inds, [3, 5, 7, 9, 11])
+        np.testing.assert_array_equal(X_sub[2], self.X[4:7])
+
+    def test_flatten_sub_matrices(self):
+        X_sub, _, _ = get_sub_matrices_view(self.X, 4)
+        X_flat = flatten_sub_matrices(X_sub, flatten_order='F')
+        self.assertTrue(X_flat.flags.c_contiguous)
+        self.assertFalse(np.shares_memory(X_flat, self.X))
+        np.testing.assert_array_equal(X_flat[1], self.X[1:5].flatten(order='F'))
+
+    def test_window_larger_than_series(self):
+        X_sub, left_inds, right_inds = get_sub_matrices(self.X, 20)
+        self.assertEqual(X_sub.shape, (0, 40))
+        self.assertEqual(len(left_inds), 0)
+        self.assertEqual(len(right_inds), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
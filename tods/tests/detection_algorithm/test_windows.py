@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from tods.detection_algorithm.core.utils.windows import window_dataset, window_starts, split_starts
+
+
+class WindowDatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.X = np.random.RandomState(0).rand(50, 3)
+        self.windows = np.array([self.X[i:i + 7] for i in range(50 - 7 + 1)])
+
+    def test_starts(self):
+        self.assertEqual(len(window_starts(50, 7)), 44)
+        self.assertEqual(len(window_starts(50, 7, 43)), 43)
+        self.assertEqual(len(window_starts(5, 7)), 0)
+        train, validation = split_starts(np.arange(44), 0.2)
+        np.testing.assert_array_equal(train, np.arange(35))
+        np.testing.assert_array_equal(validation, np.arange(35, 44))
+
+    def test_windows(self):
+        dataset = window_dataset(self.X, window_starts(50, 7), 5, 2, batch_size=8)
+        inputs, targets = zip(*[(x.numpy(), y.numpy()) for x, y in dataset])
+        np.testing.assert_allclose(np.concatenate(inputs), self.windows[:, :5], rtol=1e-6)
+        np.testing.assert_allclose(np.concatenate(targets), self.windows[:, 5:].reshape(44, 6), rtol=1e-6)
+
+        # without targets and with a transform
+        dataset = window_dataset(self.X, window_starts(50, 7), 5, 2, batch_size=8, targets=False,
+                                 transform=lambda rows: rows * 2)
+        inputs = np.concatenate([x.numpy() for x in dataset])
+        np.testing.assert_allclose(inputs, self.windows[:, :5] * 2, rtol=1e-6)
+
+    def test_shuffle(self):
+        for shuffle_buffer_size in [None, 10]:
+            dataset = window_dataset(self.X, window_starts(50, 7), 5, 2, batch_size=8,
+                                     shuffle_buffer_size=shuffle_buffer_size, seed=0)
+            inputs = np.concatenate([x.numpy() for x, _ in dataset])
+            self.assertEqual(inputs.shape, (44, 5, 3))
+            order = np.argsort(inputs[:, 0, 0])
+            np.testing.assert_allclose(inputs[order], self.windows[np.argsort(self.windows[:, 0, 0]), :5],
+                                       rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
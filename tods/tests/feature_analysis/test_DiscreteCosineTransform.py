@@ -119,6 +119,17 @@ class DctTestCase(unittest.TestCase):
 			},
 		}])
 
+	def test_top_k(self):
+		main = container.DataFrame({'A': [1., 2., 3.], 'C': [4., 1., 7.]},
+									columns=['A', 'C'],
+									generate_metadata=True)
+		hyperparams_class = DiscreteCosineTransform.DiscreteCosineTransformPrimitive.metadata.get_hyperparams()
+		hp = hyperparams_class.defaults().replace({'top_k': 2})
+		new_main = DiscreteCosineTransform.DiscreteCosineTransformPrimitive(hyperparams=hp)._produce(inputs=main).value
+
+		self.assertEqual(list(new_main.columns), ['A_dct_coeff', 'A_dct_index', 'C_dct_coeff', 'C_dct_index'])
+		np.testing.assert_allclose(new_main.values, [[12., 0., 24., 0.], [-3.464102, 1., 9., 2.]], atol=1e-6)
+
 
 if __name__ == '__main__':
 	unittest.main()
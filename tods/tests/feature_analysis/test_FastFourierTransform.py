@@ -127,6 +127,22 @@ class FftTestCase(unittest.TestCase):
             },
         }])
 
+    def test_rfft_top_k(self):
+        main = container.DataFrame({'A': [1., 2., 3.], 'C': [4., 1., 7.]},
+                                    columns=['A', 'C'],
+                                    generate_metadata=True)
+        hyperparams_class = FastFourierTransform.FastFourierTransformPrimitive.metadata.get_hyperparams()
+
+        hp = hyperparams_class.defaults().replace({'rfft': True})
+        new_main = FastFourierTransform.FastFourierTransformPrimitive(hyperparams=hp)._produce(inputs=main).value
+        self.assertEqual(list(new_main.columns), ['A_fft_abs', 'A_fft_phse', 'C_fft_abs', 'C_fft_phse'])
+        np.testing.assert_allclose(new_main.values, [[6., 0., 12., 0.], [1.732051, 2.617994, 5.196152, 1.570796]], atol=1e-6)
+
+        hp = hyperparams_class.defaults().replace({'top_k': 1})
+        new_main = FastFourierTransform.FastFourierTransformPrimitive(hyperparams=hp)._produce(inputs=main).value
+        self.assertEqual(list(new_main.columns), ['A_fft_abs', 'A_fft_phse', 'A_fft_index', 'C_fft_abs', 'C_fft_phse', 'C_fft_index'])
+        np.testing.assert_allclose(new_main.values, [[6., 0., 0., 12., 0., 0.]], atol=1e-6)
+
 
 if __name__ == '__main__':
     unittest.main()
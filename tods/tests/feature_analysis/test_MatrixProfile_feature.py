@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from d3m import container, utils
 from d3m.metadata import base as metadata_base
 from tods.feature_analysis.MatrixProfile import MatrixProfilePrimitive
@@ -97,6 +99,25 @@ class MatrixProfileTest(unittest.TestCase):
             'metadata': {'structural_type': 'numpy.float64', 'name': 'c'}
         }])
 
+    def test_approximation(self):
+        main = container.DataFrame(np.random.RandomState(0).rand(200, 2), columns=['a', 'b'], generate_metadata=True)
+        hyperparams_class = MatrixProfilePrimitive.metadata.get_hyperparams()
+        exact = MatrixProfilePrimitive(hyperparams=hyperparams_class.defaults().replace({'window_size': 8}))
+        exact = exact.produce(inputs=main).value
+        self.assertEqual(exact.shape, (193, 2))
+
+        # refined until every diagonal is computed, the approximate profile is the exact one
+        hyperparams = hyperparams_class.defaults().replace({'window_size': 8, 'time_budget': 60.})
+        new_main = MatrixProfilePrimitive(hyperparams=hyperparams).produce(inputs=main).value
+        np.testing.assert_allclose(new_main.values, exact.values, atol=1e-9)
+        self.assertEqual(new_main.metadata.query(())['matrix_profile']['approximation'], 1.)
+
+        hyperparams = hyperparams_class.defaults().replace({'window_size': 8, 'time_budget': 0.})
+        primitive = MatrixProfilePrimitive(hyperparams=hyperparams)
+        new_main = primitive.produce(inputs=main).value
+        self.assertEqual(new_main.shape, (193, 2))
+        self.assertLess(new_main.metadata.query(())['matrix_profile']['approximation'], 1.)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from d3m import container, utils
+
+from tods.feature_analysis import StatisticalFeatures, StatisticalSkew
+
+class StatisticalFeaturesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.main = container.DataFrame({'timestamp': [1, 3, 2, 5], 'values': [1.0, 2.0, 3.0, 4.0], 'b': [1.0, 4.0, 5.0, 6.0]},
+                                        columns=['timestamp', 'values', 'b'],
+                                        generate_metadata=True)
+
+    def test_basic(self):
+        self.maxDiff=None
+        hyperparams_class = StatisticalFeatures.StatisticalFeaturesPrimitive.metadata.get_hyperparams()
+
+        hp = hyperparams_class.defaults().replace({
+            'use_columns': [1,2],
+            'use_semantic_types' : True,
+            'window_size':2,
+            'statistics': ['mean', 'maximum', 'var'],
+        })
+
+        primitive = StatisticalFeatures.StatisticalFeaturesPrimitive(hyperparams=hp)
+
+        output_main = primitive._produce(inputs=self.main).value
+        print(output_main)
+        columns = ['timestamp', 'values', 'b', 'values_mean', 'values_maximum', 'values_var',
+                   'b_mean', 'b_maximum', 'b_var']
+        expected_output = container.DataFrame(
+            {'timestamp': [1, 3, 2, 5], 'values': [1.0, 2.0, 3.0, 4.0], 'b': [1.0, 4.0, 5.0, 6.0],
+             'values_mean': [1.5, 1.5, 2.5, 3.5], 'values_maximum': [2.0, 2.0, 3.0, 4.0],
+             'values_var': [0.25, 0.25, 0.25, 0.25],
+             'b_mean': [2.5, 2.5, 4.5, 5.5], 'b_maximum': [4.0, 4.0, 5.0, 6.0],
+             'b_var': [2.25, 2.25, 0.25, 0.25]},
+            columns=columns)
+
+        self.assertEqual(list(output_main.columns), columns)
+        self.assertEqual(output_main[columns].values.tolist(), expected_output[columns].values.tolist())
+
+        metadata = utils.to_json_structure(output_main.metadata.to_internal_simple_structure())
+        self.assertEqual(metadata[1]['metadata']['dimension']['length'], 9)
+        for column_index in range(3, 9):
+            self.assertEqual(metadata[column_index + 2], {
+                'selector': ['__ALL_ELEMENTS__', column_index],
+                'metadata': {'name': columns[column_index],
+                             'semantic_types': ['https://metadata.datadrivendiscovery.org/types/Attribute'],
+                             'structural_type': 'numpy.float64'},
+            })
+
+        params = primitive.get_params()
+        primitive.set_params(params=params)
+
+    def test_matches_single_statistic(self):
+        hp = StatisticalFeatures.StatisticalFeaturesPrimitive.metadata.get_hyperparams().defaults().replace({
+            'use_columns': [1,2],
+            'use_semantic_types' : True,
+            'window_size':3,
+            'statistics': ['skew'],
+        })
+        fused_output = StatisticalFeatures.StatisticalFeaturesPrimitive(hyperparams=hp)._produce(inputs=self.main).value
+
+        hp = StatisticalSkew.StatisticalSkewPrimitive.metadata.get_hyperparams().defaults().replace({
+            'use_columns': [1,2],
+            'use_semantic_types' : True,
+            'window_size':3,
+        })
+        skew_output = StatisticalSkew.StatisticalSkewPrimitive(hyperparams=hp)._produce(inputs=self.main).value
+
+        self.assertEqual(fused_output.values.tolist(), skew_output.values.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
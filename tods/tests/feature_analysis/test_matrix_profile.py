@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+import stumpy
+
+from tods.feature_analysis.core.matrix_profile import approximate_matrix_profile, approximate_multi_dimensional_profile, \
+    multi_dimensional_profile
+
+
+class ApproximateMatrixProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.X = np.random.RandomState(0).rand(300, 2)
+        self.window_size = 10
+        self.exact = np.column_stack([stumpy.stump(self.X[:, k], self.window_size)[:, 0] for k in range(2)])
+        self.exact = self.exact.astype(np.float64)
+
+    def test_exact(self):
+        P, I, reached = approximate_matrix_profile(self.X, self.window_size, percentage=1.)
+        self.assertEqual(reached, 1.)
+        self.assertEqual(P.shape, (291, 2))
+        np.testing.assert_allclose(P, self.exact, rtol=1e-6)
+
+    def test_partial(self):
+        P, I, reached = approximate_matrix_profile(self.X, self.window_size, percentage=0.1, step=0.05)
+        self.assertAlmostEqual(reached, 0.1)
+        # every approximate distance is that of an actual neighbour, so it bounds the exact one
+        self.assertTrue((P >= self.exact - 1e-6).all())
+
+    def test_time_budget(self):
+        P, I, reached = approximate_matrix_profile(self.X, self.window_size, time_budget=0.)
+        self.assertAlmostEqual(reached, 0.01)
+        self.assertTrue(np.isfinite(P).all())
+
+    def test_join(self):
+        P, I, reached = approximate_matrix_profile(self.X[:100], self.window_size, T_B=self.X, percentage=1.)
+        self.assertEqual(P.shape, (91, 2))
+        np.testing.assert_allclose(P, 0., atol=1e-5)
+
+    def test_multi_dimensional(self):
+        P, I = multi_dimensional_profile(self.X, self.window_size)
+        self.assertEqual(P.shape, (291, 2))
+        self.assertEqual(I.shape, (291, 2))
+        # the one-dimensional profile of a single column is its profile
+        P, I = multi_dimensional_profile(self.X[:, :1], self.window_size)
+        np.testing.assert_allclose(P[:, 0], self.exact[:, 0], rtol=1e-6)
+
+    def test_multi_dimensional_approximation(self):
+        X = self.X.copy()
+        X[40:60, 0] = 3.
+        exact, _ = multi_dimensional_profile(X, self.window_size)
+
+        P, I, reached = approximate_multi_dimensional_profile(X, self.window_size, percentage=1.)
+        self.assertEqual(reached, 1.)
+        np.testing.assert_allclose(P, exact, atol=1e-9)
+
+        P, I, reached = approximate_multi_dimensional_profile(X, self.window_size, percentage=0.1, step=0.05)
+        self.assertAlmostEqual(reached, 0.1, places=2)
+        self.assertTrue((P >= exact - 1e-9).all())
+
+        P, I, reached = approximate_multi_dimensional_profile(X, self.window_size, time_budget=0.)
+        self.assertLess(reached, 0.1)
+        self.assertTrue(np.isfinite(P).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
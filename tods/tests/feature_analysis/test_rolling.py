@@ -0,0 +1,124 @@
+import unittest
+
+import numpy as np
+from scipy import stats
+
+from tods.feature_analysis.core import rolling
+
+
+def _loop(X, window_size, func):
+    # the per-window loop the Statistical* primitives used before the kernels
+    if window_size == -1:
+        window_size = len(X)
+    output = np.zeros(len(X))
+    for iter in range(window_size - 1, len(X)):
+        output[iter] = func(X[iter - window_size + 1:iter + 1])
+    output[:window_size - 1] = output[window_size - 1]
+    return output
+
+
+def _median_absolute_deviation(sequence):
+    return 1.4826 * np.median(np.abs(sequence - np.median(sequence)))
+
+
+REFERENCES = {
+    'rolling_sum': np.sum,
+    'rolling_abs_sum': lambda sequence: np.sum(np.abs(sequence)),
+    'rolling_mean': np.mean,
+    'rolling_mean_abs': lambda sequence: np.mean(np.abs(sequence)),
+    'rolling_abs_energy': lambda sequence: np.sum(sequence * sequence),
+    'rolling_var': np.var,
+    'rolling_std': np.std,
+    'rolling_variation': stats.variation,
+    'rolling_skew': stats.skew,
+    'rolling_kurtosis': stats.kurtosis,
+    'rolling_max': np.max,
+    'rolling_min': np.min,
+    'rolling_median': np.median,
+    'rolling_median_absolute_deviation': _median_absolute_deviation,
+    'rolling_gmean': stats.gmean,
+    'rolling_hmean': stats.hmean,
+    'rolling_mean_temporal_derivative': lambda sequence: np.mean(np.diff(sequence)),
+    'rolling_mean_abs_temporal_derivative': lambda sequence: np.mean(np.abs(np.diff(sequence))),
+}
+
+
+class RollingTestCase(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        self.series = {
+            'positive': random_state.uniform(0.5, 10., 300),
+            'offset': random_state.normal(1e4, 2., 300),
+            'trend': np.cumsum(random_state.normal(size=300)) * 100 + 1e6,
+        }
+        self.window_sizes = [2, 3, 10, 37, -1]
+
+    def test_equivalence(self):
+        for series_name, X in self.series.items():
+            for window_size in self.window_sizes:
+                for kernel, func in REFERENCES.items():
+                    if kernel == 'rolling_hmean' and np.any(X < 0):
+                        continue
+                    with self.subTest(series=series_name, window_size=window_size, kernel=kernel):
+                        np.testing.assert_allclose(getattr(rolling, kernel)(X, window_size),
+                                                   _loop(X, window_size, func),
+                                                   rtol=1e-7, atol=1e-7)
+
+    def test_nonfinite(self):
+        X = self.series['positive'].copy()
+        X[[20, 150]] = np.nan
+        X[200] = np.inf
+        for kernel in ['rolling_sum', 'rolling_mean', 'rolling_var', 'rolling_kurtosis',
+                       'rolling_max', 'rolling_median', 'rolling_gmean']:
+            with self.subTest(kernel=kernel):
+                np.testing.assert_allclose(getattr(rolling, kernel)(X, 10),
+                                           _loop(X, 10, REFERENCES[kernel]))
+
+    def test_degenerate_windows(self):
+        X = np.concatenate((np.full(20, 3.), self.series['offset'][:50]))
+        np.testing.assert_array_equal(rolling.rolling_var(X, 5)[:16], 0.)
+        np.testing.assert_array_equal(rolling.rolling_skew(X, 5)[:16], 0.)
+        np.testing.assert_array_equal(rolling.rolling_kurtosis(X, 5)[:16], -3.)
+
+        X = np.array([2., 0., 1., 4., -1., 3.])
+        np.testing.assert_array_equal(rolling.rolling_gmean(X, 2),
+                                      [0., 0., 0., 2., np.nan, np.nan])
+        self.assertRaises(ValueError, rolling.rolling_hmean, X, 2)
+
+    def test_willison_amplitude_and_zero_crossing(self):
+        X = np.array([1., -2., 3., 3.5, -1., 0.5])
+        np.testing.assert_array_equal(rolling.rolling_willison_amplitude(X, 3, 1.),
+                                      [2., 2., 2., 2., 2., 2.])
+        np.testing.assert_array_equal(rolling.zero_crossing(X),
+                                      [0., 1., 1., 0., 1., 1.])
+
+    def test_rolling_statistics(self):
+        X = self.series['offset']
+        output = rolling.rolling_statistics(X, 10, ['kurtosis', 'mean', 'std', 'zero_crossing'])
+        self.assertEqual(list(output), ['kurtosis', 'mean', 'std', 'zero_crossing'])
+        np.testing.assert_array_equal(output['kurtosis'], rolling.rolling_kurtosis(X, 10))
+        np.testing.assert_array_equal(output['mean'], rolling.rolling_mean(X, 10))
+        np.testing.assert_array_equal(output['std'], rolling.rolling_std(X, 10))
+        np.testing.assert_array_equal(output['zero_crossing'], rolling.zero_crossing(X))
+        self.assertRaises(ValueError, rolling.rolling_statistics, X, 10, ['mode'])
+
+    def test_window_size(self):
+        X = self.series['positive']
+        self.assertRaises(ValueError, rolling.rolling_mean, X, 0)
+        self.assertRaises(ValueError, rolling.rolling_mean, X, len(X) + 1)
+
+    def test_lookback(self):
+        # a statistic of a suffix of the series is the same after the lookback
+        X = self.series['offset']
+        for start in (1, 17, 50):
+            for statistic in rolling.STATISTICS:
+                lookback = rolling.lookback(10, [statistic])
+                expected = rolling.rolling_statistics(X, 10, [statistic], 0.5)[statistic]
+                output = rolling.rolling_statistics(X[start:], 10, [statistic], 0.5)[statistic]
+                np.testing.assert_allclose(output[lookback:], expected[start + lookback:], rtol=1e-6, atol=1e-9,
+                                           err_msg=statistic)
+        self.assertIsNone(rolling.lookback(-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from tods.feature_analysis.core.spectral_residual import spectral_residual, extrapolate, StreamingSpectralResidual
+
+
+def _reference(values, n=3):
+    # the per-column transform the primitive used to run
+    trans = np.fft.fft(values)
+    mag = np.sqrt(trans.real ** 2 + trans.imag ** 2)
+    eps_index = np.where(mag <= 1e-8)[0]
+    mag[eps_index] = 1e-8
+    mag_log = np.log(mag)
+    mag_log[eps_index] = 0
+    n = min(n, len(mag_log))
+    avg = np.cumsum(mag_log, dtype=float)
+    avg[n:] = avg[n:] - avg[:-n]
+    avg[n:] = avg[n:] / n
+    for i in range(1, n):
+        avg[i] /= (i + 1)
+    spectral = np.exp(mag_log - avg)
+    trans.real = trans.real * spectral / mag
+    trans.imag = trans.imag * spectral / mag
+    trans.real[eps_index] = 0
+    trans.imag[eps_index] = 0
+    wave_r = np.fft.ifft(trans)
+    return np.round(np.sqrt(wave_r.real ** 2 + wave_r.imag ** 2), 4)
+
+
+class SpectralResidualTest(unittest.TestCase):
+    def setUp(self):
+        self.X = np.random.RandomState(0).rand(200, 3)
+        self.X[:, 2] = 1.
+
+    def test_batched(self):
+        out = spectral_residual(self.X, 5)
+        self.assertEqual(out.shape, self.X.shape)
+        for k in range(self.X.shape[1]):
+            np.testing.assert_array_equal(out[:, k], _reference(self.X[:, k], 5))
+
+    def test_extrapolate(self):
+        windows = np.arange(10, dtype=np.float64).reshape(1, 10, 1)
+        extended = extrapolate(windows, n_estimates=3, n_gradients=4)
+        self.assertEqual(extended.shape, (1, 13, 1))
+        # a line is extrapolated to its value m steps ahead of x[n-m+1]
+        np.testing.assert_allclose(extended[0, 10:, 0], [10., 10., 10.])
+
+    def test_streaming(self):
+        window_size = 16
+        stream = StreamingSpectralResidual(window_size)
+        out = stream.update(self.X)
+        for i in [0, 5, 15, 16, 199]:
+            window = self.X[max(i - window_size + 1, 0):i + 1]
+            expected = spectral_residual(extrapolate(window[np.newaxis]), 3, axis=-2)[0, len(window) - 1]
+            np.testing.assert_allclose(out[i], expected)
+
+        chunked = StreamingSpectralResidual(window_size)
+        parts = [chunked.update(self.X[start:start + 7]) for start in range(0, len(self.X), 7)]
+        np.testing.assert_allclose(np.concatenate(parts), out)
+
+        stream.reset()
+        np.testing.assert_allclose(stream.update(self.X[:20]), out[:20])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from d3m import container
+from d3m.metadata import base as metadata_base
+
+from tods.reinforcement.RuleBasedFilter import RuleBasedFilter
+from tods.reinforcement.core.rule import RuleSyntaxError
+
+
+class RuleBasedFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.main = container.DataFrame({'a': [1., 2., 3., 4., 5.], 'b': [0.1, 0.5, 0.2, 0.9, 0.3],
+                                         'c': [2, 5, 4, 8, 7]},
+                                        columns=['a', 'b', 'c'],
+                                        generate_metadata=True)
+        for column_index in range(3):
+            self.main.metadata = self.main.metadata.add_semantic_type(
+                (metadata_base.ALL_ELEMENTS, column_index), 'https://metadata.datadrivendiscovery.org/types/Attribute')
+        self.hyperparams_class = RuleBasedFilter.metadata.get_hyperparams()
+
+    def test_basic(self):
+        for backend in ['auto', 'numpy']:
+            for chunk_size in [0, 2]:
+                with self.subTest(backend=backend, chunk_size=chunk_size):
+                    hp = self.hyperparams_class.defaults().replace({
+                        'use_columns': (1, 2),
+                        'rule': '#2# % 2 == 0 and #1# <= 0.3',
+                        'return_result': 'new',
+                        'backend': backend,
+                        'chunk_size': chunk_size,
+                    })
+                    primitive = RuleBasedFilter(hyperparams=hp)
+                    output_main = primitive.produce(inputs=self.main).value
+                    self.assertEqual(output_main.iloc[:, 0].tolist(), [0, 1, 0, 1, 1])
+
+    def test_rule_errors(self):
+        hp = self.hyperparams_class.defaults().replace({
+            'use_columns': (1,),
+            'rule': '#1# > 0 and #2# > 0',
+        })
+        self.assertRaises(RuntimeError, RuleBasedFilter(hyperparams=hp).produce, inputs=self.main)
+
+        hp = self.hyperparams_class.defaults().replace({
+            'use_columns': (1,),
+            'rule': '__import__("os").getcwd() or #1# > 0',
+        })
+        self.assertRaises(RuleSyntaxError, RuleBasedFilter(hyperparams=hp).produce, inputs=self.main)
+
+
+if __name__ == '__main__':
+    unittest.main()
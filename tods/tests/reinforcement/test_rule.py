@@ -0,0 +1,81 @@
+import re
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tods.reinforcement.core import rule as rule_module
+from tods.reinforcement.core.rule import compile_rule, RuleSyntaxError
+
+
+def _eval_rows(X, rule):
+    # the per-row evaluation RuleBasedFilter used before the compiler
+    rule = re.sub(r'#\d*#', lambda x: 'row[' + x.group(0).strip('#') + ']', rule)
+    return np.array([bool(eval(rule)) for row in X])
+
+
+RULES = [
+    '#4# % 2 == 0 and #2# <= 0.3',
+    '#0# > 0.5',
+    '0.2 < #1# <= #3# < 0.9',
+    'not (#0# > 0.5 or #1# < 0.2)',
+    '#0# + #1# * 2 - #2# / 4 >= -#3# ** 2',
+    '#4# // 3 != 1 and #0#',
+    '#1# - #1#',
+    '#2# == #2# and not #4# % 3',
+    'True',
+    '1 > 2',
+]
+
+
+class RuleTestCase(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.X = np.column_stack((random_state.rand(500, 4), random_state.randint(-5, 6, 500)))
+        self.X[::17, 2] = np.nan
+
+    def test_equivalence(self):
+        backends = ['numpy', 'auto'] + (['numexpr'] if rule_module.numexpr is not None else [])
+        for rule in RULES:
+            compiled = compile_rule(rule)
+            expected = _eval_rows(self.X, rule)
+            for backend in backends:
+                if backend == 'numexpr' and not compiled.numexpr_supported:
+                    continue
+                for chunk_size in [None, 1, 64, 499]:
+                    with self.subTest(rule=rule, backend=backend, chunk_size=chunk_size):
+                        result = compiled(self.X, backend=backend, chunk_size=chunk_size)
+                        self.assertEqual(result.dtype, bool)
+                        np.testing.assert_array_equal(result, expected)
+
+    def test_columns(self):
+        self.assertEqual(compile_rule('#4# % 2 == 0 and #2# <= 0.3 or #4# > 1').columns, [2, 4])
+        frame = pd.DataFrame(self.X, columns=['a', 'b', 'c', 'd', 'e'])
+        np.testing.assert_array_equal(compile_rule(RULES[0])(frame), _eval_rows(self.X, RULES[0]))
+        self.assertRaises(ValueError, compile_rule('#5# > 0'), self.X)
+
+    def test_evaluate_chunks(self):
+        compiled = compile_rule(RULES[0])
+        chunks = np.array_split(self.X, 7)
+        results = list(compiled.evaluate_chunks(chunks))
+        self.assertEqual([len(result) for result in results], [len(chunk) for chunk in chunks])
+        np.testing.assert_array_equal(np.concatenate(results), _eval_rows(self.X, RULES[0]))
+
+    def test_whitelist(self):
+        for rule in ['__import__("os").system("ls")', '#1#.real > 0', 'abs(#1#) > 0', 'x > 1',
+                     '#1# if #2# else #3#', '[#1#][0] > 0', '#1# in (1, 2)', '"a" < #1#',
+                     '#1# > (lambda: 0)()', '__column_1 > 0', '#1# >', '#1# & 1']:
+            with self.subTest(rule=rule):
+                self.assertRaises(RuleSyntaxError, compile_rule, rule)
+
+    def test_backend(self):
+        compiled = compile_rule(RULES[0])
+        self.assertRaises(ValueError, compiled, self.X, backend='numba')
+        if rule_module.numexpr is None:
+            return
+        self.assertFalse(compile_rule('#4# // 3 > 0').numexpr_supported)
+        self.assertRaises(ValueError, compile_rule('#4# // 3 > 0'), self.X, backend='numexpr')
+
+
+if __name__ == '__main__':
+    unittest.main()
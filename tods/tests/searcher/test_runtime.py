@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+from d3m import container, runtime as runtime_module
+from d3m.metadata import base as metadata_base
+from d3m.metadata.pipeline import Pipeline, PrimitiveStep
+
+from tods.data_processing.DatasetToDataframe import DatasetToDataFramePrimitive
+from tods.data_processing.ColumnParser import ColumnParserPrimitive
+from tods.data_processing.ExtractColumnsBySemanticTypes import ExtractColumnsBySemanticTypesPrimitive
+from tods.searcher.runtime import caching_runtime, value_digest
+
+
+def _build_pipeline(semantic_types):
+    pipeline = Pipeline()
+    pipeline.add_input(name='inputs')
+
+    step_0 = PrimitiveStep(primitive=DatasetToDataFramePrimitive)
+    step_0.add_argument(name='inputs', argument_type=metadata_base.ArgumentType.CONTAINER, data_reference='inputs.0')
+    step_0.add_output('produce')
+    pipeline.add_step(step_0)
+
+    step_1 = PrimitiveStep(primitive=ColumnParserPrimitive)
+    step_1.add_argument(name='inputs', argument_type=metadata_base.ArgumentType.CONTAINER, data_reference='steps.0.produce')
+    step_1.add_output('produce')
+    pipeline.add_step(step_1)
+
+    step_2 = PrimitiveStep(primitive=ExtractColumnsBySemanticTypesPrimitive)
+    step_2.add_argument(name='inputs', argument_type=metadata_base.ArgumentType.CONTAINER, data_reference='steps.1.produce')
+    step_2.add_output('produce')
+    step_2.add_hyperparameter(name='semantic_types', argument_type=metadata_base.ArgumentType.VALUE, data=semantic_types)
+    pipeline.add_step(step_2)
+
+    pipeline.add_output(name='output', data_reference='steps.2.produce')
+    return pipeline
+
+
+class PrefixCachingRuntimeTestCase(unittest.TestCase):
+    def setUp(self):
+        dataset_doc_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'datasets', 'anomaly', 'yahoo_sub_5', 'TRAIN', 'dataset_TRAIN', 'datasetDoc.json'))
+        self.dataset = container.Dataset.load('file://{dataset_doc_path}'.format(dataset_doc_path=dataset_doc_path))
+
+    def _fit(self, pipeline):
+        _, _, result = runtime_module.fit(pipeline, [self.dataset], problem_description=None,
+                                          context=metadata_base.Context.TESTING, is_standard_pipeline=False)
+        result.check_success()
+        return result.values['outputs.0'], result
+
+    def test_shared_prefix(self):
+        attributes = ['https://metadata.datadrivendiscovery.org/types/Attribute']
+        targets = ['https://metadata.datadrivendiscovery.org/types/SuggestedTarget']
+        expected, _ = self._fit(_build_pipeline(attributes))
+
+        with caching_runtime() as cache:
+            cache.clear()
+            output, _ = self._fit(_build_pipeline(attributes))
+            self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+            output, _ = self._fit(_build_pipeline(attributes))
+            self.assertEqual(cache.hits, 3)
+            self.assertTrue(output.equals(expected))
+
+            # the first two steps are shared, the last one differs
+            output, _ = self._fit(_build_pipeline(targets))
+            self.assertEqual((cache.hits, cache.misses), (5, 4))
+            self.assertEqual(list(output.columns), ['ground_truth'])
+
+        self.assertNotEqual(runtime_module.Runtime.__name__, 'PrefixCachingRuntime')
+
+    def test_cache_dir(self):
+        attributes = ['https://metadata.datadrivendiscovery.org/types/Attribute']
+        expected, _ = self._fit(_build_pipeline(attributes))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with caching_runtime(cache_dir) as cache:
+                cache.clear()
+                self._fit(_build_pipeline(attributes))
+                self.assertEqual(cache.store.info()['entries'], 3)
+
+            # a later run, with nothing in memory
+            with caching_runtime(cache_dir) as cache:
+                cache.clear()
+                output, _ = self._fit(_build_pipeline(attributes))
+                self.assertEqual((cache.hits, cache.misses), (3, 0))
+                self.assertEqual(cache.store.hits, 3)
+                self.assertTrue(output.equals(expected))
+
+        with caching_runtime() as cache:
+            self.assertIsNone(cache.store)
+
+    def test_replay_after_mutation(self):
+        attributes = ['https://metadata.datadrivendiscovery.org/types/Attribute']
+        expected, _ = self._fit(_build_pipeline(attributes))
+
+        with caching_runtime() as cache:
+            cache.clear()
+            for _ in range(3):
+                output, _ = self._fit(_build_pipeline(attributes))
+                self.assertTrue(output.equals(expected))
+                # a downstream step writing into its input, as the system-wise primitives do
+                output.iat[0, 0] = output.iat[1, 0]
+            self.assertEqual((cache.hits, cache.misses), (6, 3))
+
+    def test_value_digest(self):
+        dataframe = DatasetToDataFramePrimitive(
+            hyperparams=DatasetToDataFramePrimitive.metadata.get_hyperparams().defaults()).produce(inputs=self.dataset).value
+        self.assertEqual(value_digest(self.dataset), value_digest(self.dataset.copy()))
+        self.assertEqual(value_digest(dataframe), value_digest(dataframe.copy()))
+
+        changed = dataframe.copy()
+        changed.iloc[0, 1] = 'changed'
+        self.assertNotEqual(value_digest(dataframe), value_digest(changed))
+        self.assertIsNone(value_digest([1, 2, 3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from pyod.utils.data import generate_data
+from tods.sk_interface.detection_algorithm.KNN_skinterface import KNNSKI
+from tods.sk_interface.detection_algorithm.AutoRegODetector_skinterface import AutoRegODetectorSKI
+
+
+class BaseSKI_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.X_train, _, self.X_test, _ = generate_data(
+            n_train=200, n_test=100, n_features=3, contamination=0.1, random_state=42)
+        self.n_sys = 3
+        self.X_train_sys = [self.X_train + i for i in range(self.n_sys)]
+        self.X_test_sys = [self.X_test + i for i in range(self.n_sys)]
+
+    def _assert_same_outputs(self, ski_class, **hyperparameter):
+        slow = ski_class(fast_path=False, **hyperparameter)
+        fast = ski_class(**hyperparameter)
+        self.assertFalse(slow.fast_path)
+        self.assertTrue(fast.fast_path)
+
+        slow.fit(self.X_train)
+        fast.fit(self.X_train)
+        assert_array_equal(fast.predict(self.X_test), slow.predict(self.X_test))
+        assert_allclose(fast.predict_score(self.X_test), slow.predict_score(self.X_test))
+
+    def test_fast_path_point_detector(self):
+        self._assert_same_outputs(KNNSKI, contamination=0.1)
+
+    def test_fast_path_collective_detector(self):
+        self._assert_same_outputs(AutoRegODetectorSKI, contamination=0.1, window_size=10)
+
+    def test_semantic_types_disable_fast_path(self):
+        transformer = KNNSKI(use_semantic_types=True)
+        self.assertFalse(transformer.fast_path)
+
+    def test_n_jobs(self):
+        serial = KNNSKI(system_num=self.n_sys)
+        serial.fit(self.X_train_sys)
+        expected = serial.predict_score(self.X_test_sys)
+
+        for executor in ['thread', 'process']:
+            with self.subTest(executor=executor):
+                parallel = KNNSKI(system_num=self.n_sys, n_jobs=-1, executor=executor)
+                primitives = list(parallel.primitives)
+                parallel.fit(self.X_train_sys)
+                # the primitives passed to the workers are the fitted ones
+                for primitive, fitted in zip(primitives, parallel.primitives):
+                    self.assertIs(fitted, primitive)
+                    self.assertTrue(primitive._fitted)
+                scores = parallel.predict_score(self.X_test_sys)
+                self.assertEqual(len(scores), self.n_sys)
+                for score, expected_score in zip(scores, expected):
+                    assert_allclose(score, expected_score)
+
+    def test_step_cache(self):
+        expected = KNNSKI(contamination=0.1)
+        expected.fit(self.X_train)
+        expected_scores = expected.predict_score(self.X_test)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for n_hits in (0, 2):
+                cached = KNNSKI(contamination=0.1, cache_dir=cache_dir)
+                cached.fit(self.X_train)
+                assert_allclose(cached.predict_score(self.X_test), expected_scores)
+                self.assertEqual((cached.step_cache.hits, cached.step_cache.misses), (n_hits, 2 - n_hits))
+
+            # other hyperparams or other data miss
+            cached = KNNSKI(contamination=0.2, cache_dir=cache_dir)
+            cached.fit(self.X_train)
+            cached.predict_score(self.X_test + 1)
+            self.assertEqual((cached.step_cache.hits, cached.step_cache.misses), (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,8 @@ from scipy import sparse
 import logging
 import uuid
 
+from ..common import metadata_cache
+
 __all__ = ('SKAxiswiseScalerPrimitive',)
 
 Inputs = container.DataFrame
@@ -342,13 +344,12 @@ class SKAxiswiseScalerPrimitive(transformer.TransformerPrimitiveBase[Inputs, Out
             Dataframe
         """
 
-        outputs = container.DataFrame(predictions, generate_metadata=True)
-        target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._columns_to_produce, outputs.metadata,
-                                                             self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
-        # print(outputs.metadata.to_internal_simple_structure())
+        def build_metadata(outputs):
+            target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._columns_to_produce, outputs.metadata,
+                                                                 self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
 
-        return outputs
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata, key=self._columns_to_produce)
 
 
     @classmethod
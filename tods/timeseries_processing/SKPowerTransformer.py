@@ -31,6 +31,8 @@ import pandas
 
 from d3m import container, utils as d3m_utils
 
+from ..common import metadata_cache
+
 Inputs = d3m_dataframe
 # Inputs = container.Dataset
 Outputs = d3m_dataframe
@@ -315,6 +317,10 @@ class SKPowerTransformerPrimitive(UnsupervisedLearnerPrimitiveBase[Inputs, Outpu
             self._fitted = True
 
 
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return 0
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams): # pragma: no cover
         """
@@ -445,11 +451,12 @@ class SKPowerTransformerPrimitive(UnsupervisedLearnerPrimitiveBase[Inputs, Outpu
             Dataframe
         """
 
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata,
-                                                             self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
-        return outputs
+        def build_metadata(outputs):
+            target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata,
+                                                                 self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata, key=self._training_indices)
 
 
     @classmethod
@@ -21,6 +21,8 @@ from d3m.primitive_interfaces.base import CallResult, DockerContainer
 from d3m.primitive_interfaces.unsupervised_learning import UnsupervisedLearnerPrimitiveBase
 import uuid
 
+from ..common import metadata_cache
+
 
 Inputs = d3m_dataframe
 Outputs = d3m_dataframe
@@ -330,6 +332,10 @@ class SKQuantileTransformerPrimitive(UnsupervisedLearnerPrimitiveBase[Inputs, Ou
             self._fitted = True
 
     
+    @classmethod
+    def _lookback(cls, hyperparams: Hyperparams) -> Optional[int]:
+        return 0
+
     @classmethod
     def _get_columns_to_fit(cls, inputs: Inputs, hyperparams: Hyperparams): # pragma: no cover
         """
@@ -449,10 +455,11 @@ class SKQuantileTransformerPrimitive(UnsupervisedLearnerPrimitiveBase[Inputs, Ou
         Returns:
             Dataframe
         """
-        outputs = d3m_dataframe(predictions, generate_metadata=True)
-        target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata, self.hyperparams)
-        outputs.metadata = self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
-        return outputs
+        def build_metadata(outputs):
+            target_columns_metadata = self._copy_inputs_metadata(inputs.metadata, self._training_indices, outputs.metadata, self.hyperparams)
+            return self._update_predictions_metadata(inputs.metadata, outputs, target_columns_metadata)
+
+        return metadata_cache.wrap_predictions(self, inputs, predictions, build_metadata, key=self._training_indices)
 
 
     @classmethod
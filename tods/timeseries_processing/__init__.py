@@ -1,9 +1,4 @@
-from tods.timeseries_processing.HoltSmoothing import HoltSmoothingPrimitive 
-from tods.timeseries_processing.HoltWintersExponentialSmoothing import HoltWintersExponentialSmoothingPrimitive
-from tods.timeseries_processing.MovingAverageTransformer import MovingAverageTransformerPrimitive
-from tods.timeseries_processing.SKStandardScaler import SKStandardScalerPrimitive 
-from tods.timeseries_processing.SKAxiswiseScaler import SKAxiswiseScalerPrimitive
-from tods.timeseries_processing.SKPowerTransformer import SKPowerTransformerPrimitive
-from tods.timeseries_processing.SKQuantileTransformer import SKQuantileTransformerPrimitive
-from tods.timeseries_processing.SimpleExponentialSmoothing import SimpleExponentialSmoothingPrimitive
-from tods.timeseries_processing.TimeSeriesSeasonalityTrendDecomposition import TimeSeriesSeasonalityTrendDecompositionPrimitive
+# The primitives are imported on first use, see tods.common.lazy
+from tods.common import lazy
+
+__getattr__, __dir__, __all__ = lazy.attach(__name__, lazy.primitives(__name__))
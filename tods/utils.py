@@ -29,6 +29,29 @@ def generate_dataset(df, target_index, system_dir=None): # pragma: no cover
 
     return dataset
 
+def generate_dataset_from_file(path, target_index, columns=None, system_dir=None): # pragma: no cover
+    """Generate dataset from a Parquet, Arrow IPC/Feather, .npy or .npz file
+
+    Unlike ``generate_dataset`` on a DataFrame read from a CSV file, the
+    columns keep the dtypes they have in the file and are not parsed by
+    the pipeline, but get the same semantic types.
+
+    Args:
+        path (str): The file, its format is given by its extension
+        target_index (int): The column index of the target, among the read columns
+        columns (list): The names of the columns to read, all of them if None
+        system_dir (str): Where the systems will be stored
+
+    returns:
+        dataset
+    """
+    from axolotl.utils import data_problem
+    from tods.common.ColumnarReader import read_columnar_file
+    df = read_columnar_file(path, columns=columns)
+    dataset = data_problem.import_input_data(df, target_index=target_index, media_dir=system_dir, parse=True)
+
+    return dataset
+
 def generate_problem(dataset, metric): # pragma: no cover
     """Generate dataset
 
@@ -61,7 +84,7 @@ def generate_problem(dataset, metric): # pragma: no cover
     
     return problem_description
 
-def evaluate_pipeline(dataset, pipeline, metric='F1', seed=0): # pragma: no cover
+def evaluate_pipeline(dataset, pipeline, metric='F1', seed=0, cache_dir=None): # pragma: no cover
     """Evaluate a Pipeline
 
     Args:
@@ -70,12 +93,18 @@ def evaluate_pipeline(dataset, pipeline, metric='F1', seed=0): # pragma: no cove
         metric (str): `F1` for computing F1 on label 1, 'F1_MACRO` for 
             macro-F1 on both 0 and 1
         seed (int): A random seed
+        cache_dir (str): Where the outputs of the steps are stored, so that
+            later evaluations replay the steps run on the same inputs with the
+            same hyperparams. None to run every step. See
+            `tods.searcher.runtime.caching_runtime` for the hit and miss counters.
 
     Returns:
         pipeline_result
     """
+    import contextlib
     from axolotl.utils import schemas as schemas_utils
     from axolotl.backend.simple import SimpleRunner
+    from tods.searcher.runtime import caching_runtime
 
     problem_description = generate_problem(dataset, metric)
     data_preparation_pipeline = schemas_utils.get_splitting_pipeline("TRAINING_DATA")
@@ -84,13 +113,54 @@ def evaluate_pipeline(dataset, pipeline, metric='F1', seed=0): # pragma: no cove
     metrics = problem_description['problem']['performance_metrics']
 
     backend = SimpleRunner(random_seed=seed) 
-    pipeline_result = backend.evaluate_pipeline(problem_description=problem_description,
-                                                pipeline=pipeline,
-                                                input_data=[dataset],
-                                                metrics=metrics,
-                                                data_preparation_pipeline=data_preparation_pipeline,
-                                                scoring_pipeline=scoring_pipeline,
-                                                data_preparation_params=data_preparation_params)
+    with caching_runtime(cache_dir) if cache_dir is not None else contextlib.ExitStack():
+        pipeline_result = backend.evaluate_pipeline(problem_description=problem_description,
+                                                    pipeline=pipeline,
+                                                    input_data=[dataset],
+                                                    metrics=metrics,
+                                                    data_preparation_pipeline=data_preparation_pipeline,
+                                                    scoring_pipeline=scoring_pipeline,
+                                                    data_preparation_params=data_preparation_params)
     return pipeline_result
 
+def fit_pipeline(dataset, pipeline, metric='F1', seed=0): # pragma: no cover
+    """Fit a Pipeline
+
+    Args:
+        dataset: A dataset
+        pipeline: A pipeline
+        metric (str): The metric of the problem, see `generate_problem`
+        seed (int): A random seed
+
+    Returns:
+        fitted_runtime
+    """
+    from d3m import runtime as runtime_module
+    from d3m.metadata import base as metadata_base
+
+    problem_description = generate_problem(dataset, metric)
+    fitted_runtime, _, result = runtime_module.fit(pipeline, [dataset], problem_description=problem_description,
+                                                   context=metadata_base.Context.TESTING, random_seed=seed)
+    result.check_success()
+    return fitted_runtime
+
+def produce_pipeline_chunked(fitted_runtime, dataset, output_path, chunk_size=100000): # pragma: no cover
+    """Produce a fitted Pipeline on chunks of rows, writing its outputs to a CSV file
+
+    Only one chunk and the outputs of its steps are in memory at a time. Every
+    primitive of the pipeline must declare how many rows before a row it reads,
+    see `tods.common.chunked`.
+
+    Args:
+        fitted_runtime: A runtime returned by `fit_pipeline`
+        dataset: A dataset
+        output_path (str): The CSV file the outputs are written to
+        chunk_size (int): The number of rows produced at once
+
+    Returns:
+        number of rows written
+    """
+    from tods.common.chunked import produce_chunked
+    return produce_chunked(fitted_runtime, dataset, output_path, chunk_size=chunk_size)
+
 